@@ -4,9 +4,12 @@ LICENSE file in the root directory of this source tree.
 """
 
 # import constraints
+import os
 from typing import Dict, Callable
 import gurobipy as gp
 
+from src.constraint import ConstraintParser
+
 # define and register training loops
 constraints: Dict[str, Callable[[], None]] = dict()
 
@@ -17,3 +20,7 @@ from inputs.constraints.multiple_constraints import multiple_constraints
 # register available constraints function
 constraints['total_bw_500gbps'] = total_bw_500gbps_constraints
 constraints['multiple_constraints'] = multiple_constraints
+
+# register available declarative constraints
+constraints['design_constraints'] = ConstraintParser().parse(
+    path=os.path.join(os.path.dirname(__file__), 'design_constraints.yml'))
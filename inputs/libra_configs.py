@@ -1,9 +1,11 @@
 from typing import Any, Dict
 from src.communicator import CommunicatorParser, CommunicatorError
 from src.cost_model import CostModelParser, CostModelError
-from src.model import Model, ModelError, SolverObjective
+from src.model import Model, ModelError, ModelScaling, SolverObjective, WorkloadAggregation, WorkloadEntry
 from src.network import NetworkParser, NetworkError
-from src.workload import WorkloadParser, WorkloadError
+from src.robust import RobustObjective, ScenarioParser
+from src.trace import TraceImporter
+from src.workload import ComputeScaling, WorkloadParser, WorkloadError
 from inputs.constraints import constraints
 from inputs.training_loop import training_loops
 from src.model import SolverObjective
@@ -19,6 +21,8 @@ def libra_configs():
 
     workload_parser = WorkloadParser()
     workload = workload_parser.parse(path='./inputs/workload/GPT_3.txt')
+    # workload imported from per-rank json execution traces instead
+    # workload = TraceImporter().import_traces(paths=['./traces/rank_0.json', './traces/rank_1.json'])
 
     cost_model_parser = CostModelParser()
     cost_model = cost_model_parser.parse(path='./inputs/cost_model/4d_cost_model.yml')
@@ -27,10 +31,81 @@ def libra_configs():
     communicator = communicator_parser.parse(path='./inputs/communicator/GPT_3_4d.yml')
 
     constraint = constraints['multiple_constraints']
+    # constraint = constraints['design_constraints']  # same constraints, declared in yaml
     training_loop = training_loops['no_overlap']
 
     objective = SolverObjective.PerfOpt
     # objective = SolverObjective.PerfPerCostOpt
+
+    # units the Gurobi model is built in (None for input units: ns and GB/s)
+    model_scaling = None
+    # model_scaling = ModelScaling.automatic()  # from the magnitudes of the (first) workload
+    # model_scaling = ModelScaling(time_unit=1e6, bw_unit=32)
+
+    # Gurobi parameters tuned per problem class, cached in a json file (None to solve with the default parameters):
+    # problems of a class not in the cache yet are tuned first, by Gurobi's tuner for up to time_limit seconds
+    parameter_tuning = None
+    # parameter_tuning = dict(path='./outputs/libra_parameters.json', time_limit=60)
+
+    # workloads sharing the network, optimized jointly (None to optimize the workload above alone)
+    workloads = None
+    # workloads = [
+    #     WorkloadEntry(workload=workload, communicator=communicator, training_loop=training_loop,
+    #                   weight=2.0, sla=4e9),
+    #     WorkloadEntry(workload=workload_parser.parse(path='./inputs/workload/MSFT_1T.txt'),
+    #                   communicator=communicator_parser.parse(path='./inputs/communicator/MSFT_1T_4d.yml'),
+    #                   training_loop=training_loop, weight=1.0, sla=8e9),
+    # ]
+
+    # how the e2e times of the workloads are aggregated:
+    # weighted sum, worst slowdown (e2e time / SLA), or worst e2e time
+    aggregation = WorkloadAggregation.WeightedSum
+    # aggregation = WorkloadAggregation.MaxSlowdown
+    # aggregation = WorkloadAggregation.MaxE2ETime
+
+    # uncertainty scenarios of the workload above, optimized over (None to optimize its nominal e2e time)
+    scenarios = None
+    # scenarios = ScenarioParser().parse(path='./inputs/scenario/4d_scenarios.yml')
+
+    # which e2e time over the scenarios is optimized: expected (probability-weighted), or worst-case
+    robust_objective = RobustObjective.Expected
+    # robust_objective = RobustObjective.WorstCase
+
+    # rescale the compute times of the workload(s) (None to keep them as given), e.g., for a 2x faster NPU
+    compute_scaling = None
+    # compute_scaling = ComputeScaling(factor=0.5)
+    # compute_scaling = ComputeScaling(layer_factors={'softmax*': 0.8, 'X*W*': 0.5})
+    # compute_scaling = ComputeScaling(reference_tflops=312, target_tflops=989)
+
+    # compute scales (e.g., NPU speeds) to re-solve for after the solve, reusing the compiled model (None to skip)
+    compute_scale_sweep = None
+    # compute_scale_sweep = [1.0, 0.5, 0.25]
+
+    # solve by decomposition instead of the monolithic model (None to skip), with DecompositionSolver options
+    decomposition = None
+    # decomposition = dict(layers_per_block=1000, processes=4)
+
+    # also solve the monolithic model and compare the decomposition against it (on small cases)
+    decomposition_reference = False
+
+    # SQLite database to store the result into (None to skip)
+    results_store = None
+    # results_store = './outputs/libra_results.db'
+
+    # print marginal values of bandwidth and constraints after the solve
+    sensitivity = False
+
+    # pick bandwidths from the cost model's BwSkus after the solve
+    discrete_bw = False
+
+    # validate the bandwidths by a discrete-event simulation, with Simulator options (None to skip)
+    simulation = None
+    # simulation = dict(chunks_count=4)
+
+    # Chrome trace-event JSON to export the iteration's timeline under the optimized bandwidths into (None to skip),
+    # viewable in chrome://tracing or https://ui.perfetto.dev (with simulation, the simulated timeline as well)
+    timeline = None
+    # timeline = './outputs/libra_timeline.json'
     # ==========================================================
 
     # setup and return configs
@@ -41,5 +116,20 @@ def libra_configs():
     configs['constraint'] = constraint
     configs['training_loop'] = training_loop
     configs['objective'] = objective
+    configs['model_scaling'] = model_scaling
+    configs['parameter_tuning'] = parameter_tuning
+    configs['workloads'] = workloads
+    configs['aggregation'] = aggregation
+    configs['scenarios'] = scenarios
+    configs['robust_objective'] = robust_objective
+    configs['compute_scaling'] = compute_scaling
+    configs['compute_scale_sweep'] = compute_scale_sweep
+    configs['results_store'] = results_store
+    configs['sensitivity'] = sensitivity
+    configs['discrete_bw'] = discrete_bw
+    configs['decomposition'] = decomposition
+    configs['decomposition_reference'] = decomposition_reference
+    configs['simulation'] = simulation
+    configs['timeline'] = timeline
 
     return configs
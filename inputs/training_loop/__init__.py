@@ -14,6 +14,12 @@ training_loops: Dict[str, Callable[[Model], gp.LinExpr]] = dict()
 
 # import available training loops
 from inputs.training_loop.no_overlap import no_overlap
+from inputs.training_loop.overlap import overlap
+from inputs.training_loop.bucketed_overlap import bucketed_overlap
+from inputs.training_loop.pipeline import pipeline
 
 # register training loops
 training_loops['no_overlap'] = no_overlap
+training_loops['overlap'] = overlap
+training_loops['bucketed_overlap'] = bucketed_overlap
+training_loops['pipeline'] = pipeline
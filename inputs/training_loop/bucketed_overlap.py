@@ -0,0 +1,69 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from typing import List, Tuple
+
+from src.task_graph import TaskGraph, TaskGraphTrainingLoop
+from src.workload import Collective, Workload
+
+# weight gradients are communicated once this many Bytes are ready (25 MiB, as PyTorch DDP)
+bucket_size = 25 * 2 ** 20
+
+
+def bucketed_overlap_graph(workload: Workload) -> TaskGraph:
+    task_graph = TaskGraph()
+
+    # forward pass: activations are needed right away, so collectives block compute
+    for layer_idx, layer in enumerate(workload.layers):
+        task_graph.add_compute(name=f'fwd_compute_{layer_idx}', compute_time=layer.forward.compute_time)
+        task_graph.add_collective(name=f'fwd_comm_{layer_idx}', layer_idx=layer_idx, phase_idx=0)
+
+    # backward pass: weight gradients are fused into buckets,
+    # each communicated on a separate stream once its last gradient is computed
+    bucket: List[Tuple[int, int]] = list()
+    bucket_type = Collective.NoComm
+    bucket_bytes = 0.0
+
+    def flush_bucket(last_compute: str) -> None:
+        # a bucket is ready once the compute of its last gradient is done
+        nonlocal bucket, bucket_bytes
+        if len(bucket) > 0:
+            task_graph.add_fused_collective(name=f'wg_bucket_{bucket[0][0]}', phases=bucket, deps=[last_compute],
+                                            stream='comm')
+        bucket, bucket_bytes = list(), 0.0
+
+    # compute task of the last gradient added to the bucket
+    bucket_compute = ''
+
+    for layer_idx in reversed(range(workload.layers_count)):
+        layer = workload.layers[layer_idx]
+
+        task_graph.add_compute(name=f'ig_compute_{layer_idx}', compute_time=layer.input_grad.compute_time)
+        task_graph.add_collective(name=f'ig_comm_{layer_idx}', layer_idx=layer_idx, phase_idx=1)
+
+        wg_compute = task_graph.add_compute(name=f'wg_compute_{layer_idx}',
+                                            compute_time=layer.weight_grad.compute_time)
+
+        if layer.weight_grad.comm_type == Collective.NoComm:
+            continue
+
+        # only the same collective type can be fused
+        if layer.weight_grad.comm_type != bucket_type:
+            flush_bucket(last_compute=bucket_compute)
+            bucket_type = layer.weight_grad.comm_type
+
+        bucket.append((layer_idx, 2))
+        bucket_bytes += layer.weight_grad.comm_size
+        bucket_compute = wg_compute
+
+        if bucket_bytes >= bucket_size:
+            flush_bucket(last_compute=bucket_compute)
+
+    flush_bucket(last_compute=bucket_compute)
+
+    return task_graph
+
+
+bucketed_overlap = TaskGraphTrainingLoop(build=bucketed_overlap_graph)
@@ -0,0 +1,34 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from src.task_graph import TaskGraph, TaskGraphTrainingLoop
+from src.workload import Workload
+
+
+def overlap_graph(workload: Workload) -> TaskGraph:
+    task_graph = TaskGraph()
+
+    # forward pass: activations are needed right away, so collectives block compute
+    for layer_idx, layer in enumerate(workload.layers):
+        task_graph.add_compute(name=f'fwd_compute_{layer_idx}', compute_time=layer.forward.compute_time)
+        task_graph.add_collective(name=f'fwd_comm_{layer_idx}', layer_idx=layer_idx, phase_idx=0)
+
+    # backward pass
+    for layer_idx in reversed(range(workload.layers_count)):
+        layer = workload.layers[layer_idx]
+
+        task_graph.add_compute(name=f'ig_compute_{layer_idx}', compute_time=layer.input_grad.compute_time)
+        task_graph.add_collective(name=f'ig_comm_{layer_idx}', layer_idx=layer_idx, phase_idx=1)
+
+        # weight gradients are communicated on a separate stream, overlapping with the remaining backward pass
+        wg_compute = task_graph.add_compute(name=f'wg_compute_{layer_idx}',
+                                            compute_time=layer.weight_grad.compute_time)
+        task_graph.add_collective(name=f'wg_comm_{layer_idx}', layer_idx=layer_idx, phase_idx=2,
+                                  deps=[wg_compute], stream='comm')
+
+    return task_graph
+
+
+overlap = TaskGraphTrainingLoop(build=overlap_graph)
@@ -0,0 +1,18 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from src.task_graph import PipelineSchedule, TaskGraphTrainingLoop
+from src.workload import Workload
+
+# number of microbatches per training iteration
+microbatches_count = 64
+
+
+def pipeline_schedule(workload: Workload) -> PipelineSchedule:
+    # 1F1B (or GPipe) schedule over the pipeline stages of the workload
+    return PipelineSchedule(workload=workload, microbatches_count=microbatches_count)
+
+
+pipeline = TaskGraphTrainingLoop(build=pipeline_schedule)
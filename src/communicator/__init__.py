@@ -6,3 +6,4 @@ LICENSE file in the root directory of this source tree.
 from src.communicator.communicator import Communicator
 from src.communicator.communicator_error import CommunicatorError
 from src.communicator.communicator_parser import CommunicatorParser
+from src.communicator.parallelism import create_tp_dp_communicator, enumerate_communicators
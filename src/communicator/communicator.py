@@ -3,20 +3,41 @@ This source code is licensed under the MIT license found in the
 LICENSE file in the root directory of this source tree.
 """
 
-from typing import List
+from fnmatch import fnmatchcase
+from typing import Dict, List, Optional, Tuple
 
 from src.communicator.communicator_error import CommunicatorError
+from src.workload import Collective
 
 
 class Communicator:
     def __init__(self,
                  forward_communicator: List[int],
                  input_grad_communicator: List[int],
-                 weight_grad_communicator: List[int]):
+                 weight_grad_communicator: List[int],
+                 dims_order: Optional[Dict[Collective, List[int]]] = None,
+                 pipeline_communicator: Optional[List[int]] = None,
+                 groups: Optional[Dict[str, List[int]]] = None,
+                 layer_groups: Optional[Dict[str, Tuple[Optional[str], Optional[str], Optional[str]]]] = None):
         self.forward_communicator = forward_communicator
         self.input_grad_communicator = input_grad_communicator
         self.weight_grad_communicator = weight_grad_communicator
 
+        # communicator of point-to-point sends between pipeline stages (None if not pipelined)
+        self.pipeline_communicator = pipeline_communicator
+
+        # order each collective traverses the dimensions in (default order if not given)
+        self.dims_order = dims_order if dims_order is not None else dict()
+
+        # named communicator groups (e.g., an expert-parallel group),
+        # and the group Forward, InputGrad, and WeightGrad phases of the matching layers communicate over
+        # (layer name pattern -> group name per phase, None for the phase type's communicator; first match wins)
+        self.groups = groups if groups is not None else dict()
+        self.layer_groups = layer_groups if layer_groups is not None else dict()
+
+        # layer name -> group name per phase, memoized as many layers share names and patterns
+        self._layer_group_names: Dict[str, Tuple[Optional[str], Optional[str], Optional[str]]] = dict()
+
         # check communicator validity
         if len(self.forward_communicator) != len(self.input_grad_communicator):
             raise CommunicatorError(
@@ -32,3 +53,75 @@ class Communicator:
             raise CommunicatorError(
                 f"Forward communicator {self.forward_communicator} and "
                 f"WeightGrad communicator {self.weight_grad_communicator} length mismatches.")
+
+        if self.pipeline_communicator is not None and \
+                len(self.pipeline_communicator) != len(self.forward_communicator):
+            raise CommunicatorError(
+                f"Pipeline communicator {self.pipeline_communicator} and "
+                f"Forward communicator {self.forward_communicator} length mismatches.")
+
+        for name, group in self.groups.items():
+            if len(group) != len(self.forward_communicator):
+                raise CommunicatorError(
+                    f"{name} communicator {group} and "
+                    f"Forward communicator {self.forward_communicator} length mismatches.")
+
+        for pattern, group_names in self.layer_groups.items():
+            if len(group_names) != 3:
+                raise CommunicatorError(f"Layers {pattern} should name a group per each phase type, not {group_names}.")
+
+            for group_name in group_names:
+                if group_name is not None and group_name not in self.groups:
+                    raise CommunicatorError(f"Group {group_name} of layers {pattern} is not defined.")
+
+        for collective, dims_order in self.dims_order.items():
+            if sorted(dims_order) != list(range(len(self.forward_communicator))):
+                raise CommunicatorError(
+                    f"{collective.name} DimsOrder {dims_order} is not an order of all "
+                    f"{len(self.forward_communicator)} dimensions.")
+
+    def get_dims_order(self, collective: Collective) -> Optional[List[int]]:
+        """
+        Get the order the given collective traverses the dimensions in.
+
+        :param collective: collective type
+        :return: dimensions in traversal order (None if the collective uses the default order)
+        """
+        return self.dims_order.get(collective)
+
+    def get_phase_communicator(self, phase_idx: int, comm_type: Collective, layer_name: str = '') -> List[int]:
+        """
+        Get the communicator a phase communicates over: the pipeline communicator for point-to-point sends,
+        the group of the first layer name pattern matching the layer (if any), and the phase type's communicator
+        otherwise.
+
+        :param phase_idx: phase type (0: Forward, 1: InputGrad, 2: WeightGrad)
+        :param comm_type: collective type of the phase
+        :param layer_name: name of the layer the phase belongs to
+        :return: communicator size per each dimension
+        """
+        if comm_type == Collective.PointToPoint:
+            if self.pipeline_communicator is None:
+                raise CommunicatorError("Point-to-point phases require a Pipeline communicator.")
+
+            return self.pipeline_communicator
+
+        group_name = self.get_layer_group_names(layer_name=layer_name)[phase_idx]
+        if group_name is not None:
+            return self.groups[group_name]
+
+        return (self.forward_communicator, self.input_grad_communicator, self.weight_grad_communicator)[phase_idx]
+
+    def get_layer_group_names(self, layer_name: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """
+        Get the group each phase of a layer communicates over.
+
+        :param layer_name: name of the layer
+        :return: group name per each phase type (None for the phase type's communicator)
+        """
+        if layer_name not in self._layer_group_names:
+            self._layer_group_names[layer_name] = next(
+                (tuple(group_names) for pattern, group_names in self.layer_groups.items()
+                 if fnmatchcase(layer_name, pattern)), (None, None, None))
+
+        return self._layer_group_names[layer_name]
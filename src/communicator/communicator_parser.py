@@ -4,11 +4,13 @@ LICENSE file in the root directory of this source tree.
 """
 
 import os
+from typing import Dict, List, Optional, Tuple
 
 import yaml
 
 from src.communicator.communicator import Communicator
 from src.communicator.communicator_error import CommunicatorError
+from src.workload import Collective
 
 
 class CommunicatorParser:
@@ -42,7 +44,34 @@ class CommunicatorParser:
         input_grad_communicator = communicator_data['InputGrad']
         weight_grad_communicator = communicator_data['WeightGrad']
 
+        # optional per-collective dimension traversal order
+        dims_order: Dict[Collective, List[int]] = dict()
+        for collective_name, order in communicator_data.get('DimsOrder', dict()).items():
+            try:
+                dims_order[Collective[collective_name]] = order
+            except KeyError:
+                raise CommunicatorError(f"{collective_name} is not a valid collective name.")
+
+        # optional communicator of point-to-point sends between pipeline stages
+        pipeline_communicator = communicator_data.get('Pipeline')
+
+        # optional named communicator groups, and the layers (by name pattern) communicating over them
+        groups: Dict[str, List[int]] = communicator_data.get('Groups', dict())
+
+        layer_groups: Dict[str, Tuple[Optional[str], Optional[str], Optional[str]]] = dict()
+        for pattern, phase_groups in communicator_data.get('Layers', dict()).items():
+            unknown_phases = set(phase_groups.keys()) - {'Forward', 'InputGrad', 'WeightGrad'}
+            if len(unknown_phases) > 0:
+                raise CommunicatorError(f"{sorted(unknown_phases)} of layers {pattern} are not valid phase names.")
+
+            layer_groups[str(pattern)] = (phase_groups.get('Forward'), phase_groups.get('InputGrad'),
+                                          phase_groups.get('WeightGrad'))
+
         # create and return communicator
         return Communicator(forward_communicator=forward_communicator,
                             input_grad_communicator=input_grad_communicator,
-                            weight_grad_communicator=weight_grad_communicator)
+                            weight_grad_communicator=weight_grad_communicator,
+                            dims_order=dims_order,
+                            pipeline_communicator=pipeline_communicator,
+                            groups=groups,
+                            layer_groups=layer_groups)
@@ -0,0 +1,136 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+import math
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.communicator.communicator import Communicator
+from src.communicator.communicator_error import CommunicatorError
+
+
+def create_tp_dp_communicator(npus_count: List[int], tp_size: int) -> Communicator:
+    """
+    Create the communicator of a TP-DP parallelized workload,
+    where tensor parallelism (TP) occupies the innermost NPUs and data parallelism (DP) the rest.
+    Forward and InputGrad phases communicate over the TP group, and WeightGrad phase over the DP group.
+
+    e.g., npus_count [4, 8, 4, 32] with TP-16 (DP-256):
+    Forward/InputGrad: [4, 4, -1, -1], WeightGrad: [-1, 2, 4, 32]
+
+    :param npus_count: npus_count per each dimension
+    :param tp_size: TP size
+    :return: TP-DP communicator
+    """
+    tp_communicator: List[int] = list()
+    dp_communicator: List[int] = list()
+
+    # TP group size yet to be mapped
+    remaining_tp_size = tp_size
+
+    for npus in npus_count:
+        # size of the TP group within this dimension
+        tp_npus = min(remaining_tp_size, npus)
+
+        if remaining_tp_size % tp_npus != 0 or npus % tp_npus != 0:
+            raise CommunicatorError(f"TP-{tp_size} cannot be mapped onto NpusCount {npus_count}.")
+
+        dp_npus = npus // tp_npus
+        remaining_tp_size //= tp_npus
+
+        # dimensions with a single NPU in the group don't communicate
+        tp_communicator.append(tp_npus if tp_npus > 1 else -1)
+        dp_communicator.append(dp_npus if dp_npus > 1 else -1)
+
+    if remaining_tp_size != 1:
+        raise CommunicatorError(f"TP-{tp_size} is larger than the network with NpusCount {npus_count}.")
+
+    return Communicator(forward_communicator=tp_communicator,
+                        input_grad_communicator=list(tp_communicator),
+                        weight_grad_communicator=dp_communicator)
+
+
+def enumerate_communicators(npus_count: List[int],
+                            parallelism: Dict[str, int],
+                            phase_groups: Tuple[str, str, str] = ('TP', 'TP', 'DP'),
+                            layer_phase_groups: Optional[Dict[str, Tuple[Optional[str], ...]]] = None) \
+        -> Iterator[Communicator]:
+    """
+    Enumerate every communicator mapping the given parallelism groups onto the network dimensions.
+    Each dimension's NPUs are split among the groups, such that each group spans its degree in total.
+
+    e.g., npus_count [4, 8] with {'TP': 4, 'DP': 8} yields TP over [4, -1], [2, 2], and [-1, 4] (DP the rest).
+
+    :param npus_count: npus_count per each dimension
+    :param parallelism: degree per each parallelism group (e.g., {'TP': 16, 'DP': 256}),
+        whose product should match the total NPUs count
+    :param phase_groups: group that Forward, InputGrad, and WeightGrad phases communicate over
+    :param layer_phase_groups: group that Forward, InputGrad, and WeightGrad phases of the layers matching
+        each layer name pattern communicate over instead (None for phase_groups), e.g., {'*moe*': ('EP', 'EP', None)}
+    :return: iterator of Communicator
+    """
+    group_names = list(parallelism.keys())
+    degrees = tuple(parallelism[name] for name in group_names)
+
+    # check validity
+    if math.prod(degrees) != math.prod(npus_count):
+        raise CommunicatorError(f"Parallelism {parallelism} doesn't cover NpusCount {npus_count}.")
+
+    layer_phase_groups = layer_phase_groups if layer_phase_groups is not None else dict()
+
+    for phase_group in list(phase_groups) + [group for groups in layer_phase_groups.values() for group in groups]:
+        if phase_group is not None and phase_group not in parallelism:
+            raise CommunicatorError(f"Phase group {phase_group} is not in parallelism {parallelism}.")
+
+    for splits in _split_dims(npus_count=npus_count, degrees=degrees):
+        # communicator of each group: its size per each dimension (-1 if it doesn't span the dimension)
+        group_communicators = {name: [split[idx] if split[idx] > 1 else -1 for split in splits]
+                               for idx, name in enumerate(group_names)}
+
+        yield Communicator(forward_communicator=list(group_communicators[phase_groups[0]]),
+                           input_grad_communicator=list(group_communicators[phase_groups[1]]),
+                           weight_grad_communicator=list(group_communicators[phase_groups[2]]),
+                           groups=group_communicators if len(layer_phase_groups) > 0 else None,
+                           layer_groups=layer_phase_groups)
+
+
+def _split_dims(npus_count: List[int], degrees: Tuple[int, ...]) -> Iterator[List[Tuple[int, ...]]]:
+    """
+    Enumerate per-dimension splits of NPUs among the groups.
+
+    :param npus_count: npus_count per each dimension
+    :param degrees: remaining degree per each group
+    :return: iterator of [group sizes per each dimension]
+    """
+    if len(npus_count) == 0:
+        if all(degree == 1 for degree in degrees):
+            yield []
+        return
+
+    for split in _split_npus(npus=npus_count[0], degrees=degrees):
+        remaining_degrees = tuple(degree // size for degree, size in zip(degrees, split))
+
+        for rest in _split_dims(npus_count=npus_count[1:], degrees=remaining_degrees):
+            yield [split] + rest
+
+
+def _split_npus(npus: int, degrees: Tuple[int, ...]) -> Iterator[Tuple[int, ...]]:
+    """
+    Enumerate splits of a dimension's NPUs into group sizes, each dividing its group's remaining degree.
+
+    :param npus: npus_count of the dimension
+    :param degrees: remaining degree per each group
+    :return: iterator of group sizes
+    """
+    if len(degrees) == 1:
+        if degrees[0] % npus == 0:
+            yield npus,
+        return
+
+    for size in range(1, min(npus, degrees[0]) + 1):
+        if npus % size != 0 or degrees[0] % size != 0:
+            continue
+
+        for rest in _split_npus(npus=npus // size, degrees=degrees[1:]):
+            yield (size,) + rest
@@ -0,0 +1,10 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from src.constraint.bw_constraints import BwConstraints
+from src.constraint.constraint_error import ConstraintError
+from src.constraint.constraint_expression import compile_expression
+from src.constraint.constraint_parser import ConstraintParser
+from src.constraint.constraint_set import ConstraintSet
@@ -0,0 +1,142 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from typing import List, Optional, Union
+
+import gurobipy as gp
+import numpy as np
+from gurobipy import GRB
+
+from src.constraint.constraint_error import ConstraintError
+from src.model import Model
+
+
+class BwConstraints:
+    """
+    Linear constraints over bandwidths, A @ bw {<=, >=, ==} b,
+    added to a solver in bulk and checked for many bandwidth vectors at once.
+    """
+
+    def __init__(self, coefficients: np.ndarray, senses: List[str], rhs: np.ndarray,
+                 expressions: Optional[List[str]] = None):
+        """
+        Initializer.
+
+        :param coefficients: coefficients of shape (constraints_count, dims_count)
+        :param senses: sense of each constraint (GRB.LESS_EQUAL, GRB.GREATER_EQUAL, or GRB.EQUAL)
+        :param rhs: right-hand side of each constraint
+        :param expressions: readable expression of each constraint (for reports)
+        """
+        self.coefficients = np.asarray(coefficients, dtype=float)
+        self.senses = list(senses)
+        self.rhs = np.asarray(rhs, dtype=float)
+        self.expressions = list(expressions) if expressions is not None else [''] * len(self.senses)
+
+        self.constraints_count = len(self.senses)
+
+        if self.coefficients.ndim != 2 or len(self.coefficients) != self.constraints_count or \
+                len(self.rhs) != self.constraints_count or len(self.expressions) != self.constraints_count:
+            raise ConstraintError(f"Coefficients of shape {self.coefficients.shape}, {self.constraints_count} senses, "
+                                  f"and {len(self.rhs)} right-hand sides don't describe the same constraints.")
+
+        for sense in self.senses:
+            if sense not in (GRB.LESS_EQUAL, GRB.GREATER_EQUAL, GRB.EQUAL):
+                raise ConstraintError(f"Constraint sense {sense} is unknown.")
+
+        self.dims_count = self.coefficients.shape[1]
+
+    @classmethod
+    def from_model(cls) -> 'BwConstraints':
+        """
+        Linear constraints over bandwidths of the problem currently built in Model
+        (added by constraint functions, with a linear network cost substituted by its definition).
+
+        :return: constraints of the current Model
+        """
+        coefficients, senses, rhs = Model.get_bw_constraints()
+        return cls(coefficients=coefficients, senses=senses, rhs=rhs)
+
+    def lhs(self, bw: np.ndarray) -> np.ndarray:
+        """
+        Left-hand side of every constraint.
+
+        :param bw: bandwidths of shape (dims_count,) or (N, dims_count)
+        :return: left-hand sides of shape (constraints_count,) or (N, constraints_count)
+        """
+        return np.asarray(bw, dtype=float) @ self.coefficients.T
+
+    def violations(self, bw: np.ndarray) -> np.ndarray:
+        """
+        How much each constraint is violated by (0 if satisfied).
+
+        :param bw: bandwidths of shape (dims_count,) or (N, dims_count)
+        :return: violations of shape (constraints_count,) or (N, constraints_count)
+        """
+        excess = self.lhs(bw=bw) - self.rhs
+        less_equal = np.array([sense == GRB.LESS_EQUAL for sense in self.senses])
+        greater_equal = np.array([sense == GRB.GREATER_EQUAL for sense in self.senses])
+
+        return np.where(less_equal, np.maximum(excess, 0), np.where(greater_equal, np.maximum(-excess, 0),
+                                                                     np.abs(excess)))
+
+    def is_feasible(self, bw: np.ndarray, tolerance: float = 1e-6) -> Union[bool, np.ndarray]:
+        """
+        Whether bandwidths satisfy every constraint.
+
+        :param bw: bandwidths of shape (dims_count,) or (N, dims_count)
+        :param tolerance: relative tolerance of constraint satisfaction
+        :return: feasibility (of shape (N,) if N bandwidths are given)
+        """
+        bw = np.asarray(bw, dtype=float)
+        lhs = self.lhs(bw=bw.reshape(-1, self.dims_count))
+        feasible = self.satisfied(lowest_lhs=lhs, highest_lhs=lhs, tolerance=tolerance)
+
+        return bool(feasible[0]) if bw.ndim == 1 else feasible
+
+    def satisfied(self, lowest_lhs: np.ndarray, highest_lhs: np.ndarray, tolerance: float = 1e-6) -> np.ndarray:
+        """
+        Whether every constraint can be satisfied by a left-hand side within the given range.
+
+        :param lowest_lhs: lowest left-hand sides of shape (N, constraints_count)
+        :param highest_lhs: highest left-hand sides of shape (N, constraints_count)
+        :param tolerance: relative tolerance of constraint satisfaction
+        :return: satisfiability of shape (N,)
+        """
+        tolerances = tolerance * np.maximum(1.0, np.abs(self.rhs))
+        satisfied = np.ones(len(lowest_lhs), dtype=bool)
+
+        for i, sense in enumerate(self.senses):
+            if sense in (GRB.LESS_EQUAL, GRB.EQUAL):
+                satisfied &= lowest_lhs[:, i] <= self.rhs[i] + tolerances[i]
+            if sense in (GRB.GREATER_EQUAL, GRB.EQUAL):
+                satisfied &= highest_lhs[:, i] >= self.rhs[i] - tolerances[i]
+
+        return satisfied
+
+    def add_to(self, gp_model: gp.Model, bw: gp.tupledict) -> List[gp.Constr]:
+        """
+        Add every constraint to a Gurobi model, each as a sparse row over the bandwidths.
+
+        :param gp_model: Gurobi model to add the constraints to
+        :param bw: bandwidth variable per each dimension
+        :return: added constraints
+        """
+        if len(bw) != self.dims_count:
+            raise ConstraintError(f"Constraints over {self.dims_count} dimensions can't be added "
+                                  f"to a {len(bw)}-dimensional network.")
+
+        constrs = list()
+        for row, sense, rhs in zip(self.coefficients, self.senses, self.rhs):
+            dims = np.flatnonzero(row)
+            constrs.append(gp_model.addLConstr(gp.LinExpr(row[dims].tolist(), [bw[dim] for dim in dims]),
+                                               sense, float(rhs)))
+
+        return constrs
+
+    def __call__(self) -> None:
+        """
+        Apply the constraints to the problem currently built in Model, as a constraint function.
+        """
+        self.add_to(gp_model=Model._gp_model, bw=Model._bw)
@@ -0,0 +1,165 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+import ast
+from typing import List, Tuple
+
+import numpy as np
+from gurobipy import GRB
+
+from src.constraint.constraint_error import ConstraintError
+from src.network import Network
+
+# comparison operator -> Gurobi constraint sense
+_senses = {ast.Eq: GRB.EQUAL, ast.LtE: GRB.LESS_EQUAL, ast.GtE: GRB.GREATER_EQUAL}
+
+
+def parse_expression(expression: str) -> ast.Compare:
+    """
+    Parse a constraint expression, e.g., "sum(bw) == 1000", "bw[0] >= bw[1]", or "100 <= bw[InterPod] <= 200".
+
+    :param expression: constraint expression
+    :return: parsed comparison
+    """
+    try:
+        tree = ast.parse(expression.strip(), mode='eval').body
+    except SyntaxError:
+        raise ConstraintError(f"Constraint {expression} is not a valid expression.")
+
+    if not isinstance(tree, ast.Compare):
+        raise ConstraintError(f"Constraint {expression} is not a comparison (==, <=, or >=).")
+
+    for operator in tree.ops:
+        if type(operator) not in _senses:
+            raise ConstraintError(f"Constraint {expression} can only compare with ==, <=, or >=.")
+
+    return tree
+
+
+def compile_expression(expression: str, network: Network) -> Tuple[np.ndarray, List[str], np.ndarray]:
+    """
+    Compile a constraint expression into linear constraints over the bandwidths of the network.
+    A chained comparison (e.g., "100 <= bw[0] <= 200") compiles into a constraint per each comparison.
+
+    Expressions are linear in bw: numbers, bw[dim] (dim is an index, possibly negative, or the unique dimension
+    of a cost dimension, e.g., bw[InterPod]), sum(bw), sum(bw[start:end]), and sum(bw[CostDimension]),
+    combined by +, -, and multiplications or divisions by numbers.
+
+    :param expression: constraint expression
+    :param network: network whose bandwidths are constrained
+    :return: (coefficients of shape (constraints_count, dims_count), senses, right-hand sides)
+    """
+    tree = parse_expression(expression=expression)
+
+    # each side as (coefficients, constant)
+    sides = [_compile_linear(node=node, expression=expression, network=network)
+             for node in [tree.left] + tree.comparators]
+
+    coefficients, senses, rhs = list(), list(), list()
+    for (left_coefficients, left_constant), operator, (right_coefficients, right_constant) \
+            in zip(sides[:-1], tree.ops, sides[1:]):
+        coefficients.append(left_coefficients - right_coefficients)
+        senses.append(_senses[type(operator)])
+        rhs.append(right_constant - left_constant)
+
+    return np.array(coefficients), senses, np.array(rhs, dtype=float)
+
+
+def _compile_linear(node: ast.AST, expression: str, network: Network) -> Tuple[np.ndarray, float]:
+    """
+    Compile a linear expression over bandwidths.
+
+    :param node: expression node
+    :param expression: whole constraint expression (for error messages)
+    :param network: network whose bandwidths are constrained
+    :return: (coefficient per each dimension, constant)
+    """
+    dims_count = network.dims_count
+
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+        return np.zeros(dims_count), float(node.value)
+
+    if isinstance(node, ast.Subscript):
+        dims = _select_dims(node=node, expression=expression, network=network)
+        if len(dims) != 1 or isinstance(node.slice, ast.Slice):
+            raise ConstraintError(f"{ast.unparse(node)} in constraint {expression} selects {len(dims)} dimensions, "
+                                  f"use sum({ast.unparse(node)}) instead.")
+        return np.eye(dims_count)[dims[0]], 0.0
+
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == 'sum':
+        if len(node.args) != 1 or len(node.keywords) > 0:
+            raise ConstraintError(f"sum in constraint {expression} takes a single argument.")
+
+        argument = node.args[0]
+        if isinstance(argument, ast.Name) and argument.id == 'bw':
+            return np.ones(dims_count), 0.0
+        if isinstance(argument, ast.Subscript):
+            coefficients = np.zeros(dims_count)
+            coefficients[_select_dims(node=argument, expression=expression, network=network)] = 1
+            return coefficients, 0.0
+
+        raise ConstraintError(f"sum in constraint {expression} can only sum bw or its dimensions.")
+
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+        coefficients, constant = _compile_linear(node=node.operand, expression=expression, network=network)
+        return (-coefficients, -constant) if isinstance(node.op, ast.USub) else (coefficients, constant)
+
+    if isinstance(node, ast.BinOp):
+        left_coefficients, left_constant = _compile_linear(node=node.left, expression=expression, network=network)
+        right_coefficients, right_constant = _compile_linear(node=node.right, expression=expression, network=network)
+
+        if isinstance(node.op, ast.Add):
+            return left_coefficients + right_coefficients, left_constant + right_constant
+        if isinstance(node.op, ast.Sub):
+            return left_coefficients - right_coefficients, left_constant - right_constant
+
+        # products and quotients stay linear only when scaled by a number
+        if isinstance(node.op, ast.Mult):
+            if not right_coefficients.any():
+                return left_coefficients * right_constant, left_constant * right_constant
+            if not left_coefficients.any():
+                return right_coefficients * left_constant, right_constant * left_constant
+        if isinstance(node.op, ast.Div) and not right_coefficients.any():
+            if right_constant == 0:
+                raise ConstraintError(f"Constraint {expression} divides by zero.")
+            return left_coefficients / right_constant, left_constant / right_constant
+
+        raise ConstraintError(f"{ast.unparse(node)} in constraint {expression} is not linear in bw.")
+
+    raise ConstraintError(f"{ast.unparse(node)} in constraint {expression} is not supported.")
+
+
+def _select_dims(node: ast.Subscript, expression: str, network: Network) -> List[int]:
+    """
+    Dimensions selected by bw[...]: an index, a slice of indices, or the dimensions of a cost dimension.
+
+    :param node: subscript node
+    :param expression: whole constraint expression (for error messages)
+    :param network: network whose bandwidths are constrained
+    :return: selected dimensions
+    """
+    if not isinstance(node.value, ast.Name) or node.value.id != 'bw':
+        raise ConstraintError(f"{ast.unparse(node)} in constraint {expression} is not a bandwidth.")
+
+    dims = list(range(network.dims_count))
+    index = node.slice
+
+    # cost dimension name
+    if isinstance(index, ast.Name):
+        selected = [dim for dim in dims if network.cost_dimension[dim] == index.id]
+        if len(selected) == 0:
+            raise ConstraintError(f"Cost dimension {index.id} in constraint {expression} is not in the network.")
+        return selected
+
+    try:
+        if isinstance(index, ast.Slice):
+            bounds = [ast.literal_eval(bound) if bound is not None else None
+                      for bound in (index.lower, index.upper, index.step)]
+            return dims[slice(*bounds)]
+
+        return [dims[ast.literal_eval(index)]]
+    except (ValueError, TypeError, IndexError):
+        raise ConstraintError(f"{ast.unparse(node)} in constraint {expression} is not a dimension "
+                              f"of the {network.dims_count}D network.")
@@ -0,0 +1,47 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+import os
+
+import yaml
+
+from src.constraint.constraint_error import ConstraintError
+from src.constraint.constraint_set import ConstraintSet
+
+
+class ConstraintParser:
+    """
+    ConstraintParser helps parse the yaml constraint file.
+    """
+
+    def __init__(self):
+        """
+        ConstraintParser initializer.
+        """
+        pass
+
+    def parse(self, path: str) -> ConstraintSet:
+        """
+        Parse the given yaml constraints.
+
+        :param path: path to the yaml constraints
+        :return: parsed ConstraintSet
+        """
+        # check the file exists
+        if not os.path.exists(path):
+            raise ConstraintError(f"Constraints {path} does not exist.")
+
+        # load yaml file
+        with open(path, 'r') as yaml_file:
+            constraint_data = yaml.safe_load(yaml_file)
+
+        # parse constraint expressions
+        expressions = [str(expression) for expression in constraint_data.get('Constraints') or list()]
+
+        # parse per-dimension bandwidth bounds: cost dimension (or dimension index) -> [min, max]
+        bounds = {key: tuple(bound) for key, bound in (constraint_data.get('Bounds') or dict()).items()}
+
+        # create and return parsed constraint set
+        return ConstraintSet(expressions=expressions, bounds=bounds)
@@ -0,0 +1,103 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from gurobipy import GRB
+
+from src.constraint.bw_constraints import BwConstraints
+from src.constraint.constraint_error import ConstraintError
+from src.constraint.constraint_expression import compile_expression, parse_expression
+from src.model import Model
+from src.network import Network
+
+
+class ConstraintSet:
+    """
+    Declarative design constraints: linear expressions over bw and per-dimension bandwidth bounds.
+    Compiled once per network shape into BwConstraints, and usable as a constraint function.
+    """
+
+    def __init__(self, expressions: List[str],
+                 bounds: Optional[Dict[Union[str, int], Tuple[Optional[float], Optional[float]]]] = None):
+        """
+        Initializer.
+
+        :param expressions: constraint expressions, e.g., "sum(bw) == 1000" or "bw[0] >= bw[1]"
+        :param bounds: (min, max) bandwidth (None if unbounded) of every dimension of a cost dimension,
+            or of a single dimension index
+        """
+        self.expressions = list(expressions)
+        self.bounds = dict(bounds) if bounds is not None else dict()
+
+        # check syntax early, as compiling waits for the network
+        for expression in self.expressions:
+            parse_expression(expression=expression)
+
+        for key, bound in self.bounds.items():
+            if len(bound) != 2:
+                raise ConstraintError(f"Bounds of {key} should be [min, max], not {bound}.")
+
+        # (dims_count, cost dimensions) -> compiled constraints
+        self._compiled: Dict[Tuple[int, Tuple[str, ...]], BwConstraints] = dict()
+
+    def compile(self, network: Network) -> BwConstraints:
+        """
+        Compile the constraints over the bandwidths of the network.
+
+        :param network: network whose bandwidths are constrained
+        :return: compiled constraints
+        """
+        key = (network.dims_count, tuple(network.cost_dimension))
+        if key in self._compiled:
+            return self._compiled[key]
+
+        coefficients: List[np.ndarray] = list()
+        senses: List[str] = list()
+        rhs: List[float] = list()
+        expressions: List[str] = list()
+
+        for expression in self.expressions:
+            expression_coefficients, expression_senses, expression_rhs = compile_expression(expression=expression,
+                                                                                            network=network)
+            coefficients.extend(expression_coefficients)
+            senses.extend(expression_senses)
+            rhs.extend(expression_rhs)
+            expressions.extend([expression] * len(expression_senses))
+
+        for key_dims, (min_bw, max_bw) in self.bounds.items():
+            for dim in self._bounded_dims(key=key_dims, network=network):
+                for bound, sense, operator in ((min_bw, GRB.GREATER_EQUAL, '>='), (max_bw, GRB.LESS_EQUAL, '<=')):
+                    if bound is not None:
+                        coefficients.append(np.eye(network.dims_count)[dim])
+                        senses.append(sense)
+                        rhs.append(float(bound))
+                        expressions.append(f"bw[{dim}] {operator} {bound}")
+
+        compiled = BwConstraints(coefficients=np.array(coefficients).reshape(len(senses), network.dims_count),
+                                 senses=senses, rhs=np.array(rhs, dtype=float), expressions=expressions)
+        self._compiled[key] = compiled
+
+        return compiled
+
+    def __call__(self) -> None:
+        """
+        Apply the constraints to the problem currently built in Model, as a constraint function.
+        """
+        self.compile(network=Model.network)()
+
+    @staticmethod
+    def _bounded_dims(key: Union[str, int], network: Network) -> List[int]:
+        if isinstance(key, int):
+            if not -network.dims_count <= key < network.dims_count:
+                raise ConstraintError(f"Bounded dimension {key} is not in the {network.dims_count}D network.")
+            return [key % network.dims_count]
+
+        dims = [dim for dim in range(network.dims_count) if network.cost_dimension[dim] == key]
+        if len(dims) == 0:
+            raise ConstraintError(f"Bounded cost dimension {key} is not in the network.")
+
+        return dims
@@ -3,6 +3,7 @@ This source code is licensed under the MIT license found in the
 LICENSE file in the root directory of this source tree.
 """
 
+from src.cost_model.cost_coefficients import CostCoefficients, CostTier
 from src.cost_model.cost_element import CostElement
 from src.cost_model.cost_model import CostModel
 from src.cost_model.cost_model_error import CostModelError
@@ -0,0 +1,188 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from typing import Dict, List, Optional
+
+import gurobipy as gp
+import numpy as np
+from gurobipy import GRB
+
+from src.cost_model.cost_element import CostElement
+from src.cost_model.cost_model_error import CostModelError
+
+
+class CostTier:
+    """
+    CostTier is the piecewise-linear cost of a volume-tiered cost element of one dimension.
+    """
+
+    def __init__(self, dim: int, cost_element: CostElement, volume_coefficient: float,
+                 starts: np.ndarray, cumulative_costs: np.ndarray, unit_costs: np.ndarray):
+        """
+        Initializer.
+
+        :param dim: dimension of the network
+        :param cost_element: tiered cost element
+        :param volume_coefficient: total bandwidth of the element per 1 GB/s of bandwidth (per NPU)
+        :param starts: start volume of each tier, plus one more breakpoint past the last tier
+        :param cumulative_costs: cost at each start volume
+        :param unit_costs: unit cost of each tier
+        """
+        self.dim = dim
+        self.cost_element = cost_element
+        self.volume_coefficient = volume_coefficient
+        self.starts = starts
+        self.cumulative_costs = cumulative_costs
+        self.unit_costs = unit_costs
+
+    def cost(self, bw: np.ndarray) -> np.ndarray:
+        """
+        Cost of the element (extrapolated by the last tier's unit cost), vectorized over bandwidths.
+
+        :param bw: bandwidth (per NPU) of the dimension, of any shape
+        :return: cost of the same shape
+        """
+        volume = self.volume_coefficient * bw
+        tier = self._tier(volume=volume)
+        return self.cumulative_costs[tier] + self.unit_costs[tier] * (volume - self.starts[tier])
+
+    def rate(self, bw: np.ndarray) -> np.ndarray:
+        """
+        Cost per unit bandwidth (per NPU) at the given bandwidths (towards more bandwidth).
+
+        :param bw: bandwidth (per NPU) of the dimension, of any shape
+        :return: rate of the same shape
+        """
+        return self.unit_costs[self._tier(volume=self.volume_coefficient * bw)] * self.volume_coefficient
+
+    def _tier(self, volume: np.ndarray) -> np.ndarray:
+        return np.clip(np.searchsorted(self.starts, volume, side='right') - 1, 0, len(self.unit_costs) - 1)
+
+
+class CostCoefficients:
+    """
+    CostCoefficients is the network cost of a (network, cost model) pair compiled into arrays:
+        network cost = fixed_cost + bw @ coefficients + sum(tier.cost(bw[tier.dim]) for each tier),
+    with the coefficients broken down per CostElement, and the fixed cost per its source.
+    Compiled once (see CostModel.get_cost_coefficients), it costs batches of bandwidths with a single dot product,
+    and emits the solver's network cost expression in bulk.
+    """
+
+    def __init__(self, dims_count: int, element_coefficients: Dict[CostElement, np.ndarray],
+                 fixed_costs: Dict[str, float], tiers: List[CostTier]):
+        """
+        Initializer.
+
+        :param dims_count: number of network dimensions
+        :param element_coefficients: linear cost per unit bandwidth (per NPU) of each cost element, per dimension
+        :param fixed_costs: fixed cost per its source (e.g., Npu, SwitchDevice)
+        :param tiers: piecewise-linear costs of the tiered cost elements
+        """
+        self.dims_count = dims_count
+        self.element_coefficients = element_coefficients
+        self.fixed_costs = fixed_costs
+        self.tiers = tiers
+
+        self.coefficients = sum(element_coefficients.values(), np.zeros(dims_count))
+        self.fixed_cost = float(sum(fixed_costs.values()))
+
+    def is_linear(self) -> bool:
+        """
+        Whether the network cost is linear in bandwidths (i.e., no cost element is tiered).
+
+        :return: True if linear (up to the fixed cost)
+        """
+        return len(self.tiers) == 0
+
+    def evaluate(self, bw: np.ndarray) -> np.ndarray:
+        """
+        Network cost under fixed bandwidths, vectorized over any leading batch dimensions.
+
+        :param bw: bandwidth (per NPU) of shape (..., dims_count)
+        :return: network cost of shape (...)
+        """
+        bw = np.asarray(bw, dtype=float)
+        network_cost = self.fixed_cost + bw @ self.coefficients
+
+        for tier in self.tiers:
+            network_cost = network_cost + tier.cost(bw=bw[..., tier.dim])
+
+        return network_cost
+
+    def gradient(self, bw: np.ndarray) -> np.ndarray:
+        """
+        Derivative of the network cost w.r.t. each dimension's bandwidth (towards more bandwidth).
+
+        :param bw: bandwidth (per NPU) of shape (dims_count,)
+        :return: gradient of shape (dims_count,)
+        """
+        bw = np.asarray(bw, dtype=float)
+        gradient = self.coefficients.copy()
+
+        for tier in self.tiers:
+            gradient[tier.dim] += float(tier.rate(bw=bw[tier.dim]))
+
+        return gradient
+
+    def lowest_rates(self) -> np.ndarray:
+        """
+        Lowest cost per unit bandwidth (per NPU) of each dimension, i.e., at its cheapest tiers.
+        network cost >= fixed cost + sum(bw * lowest rates), with equality if the cost is linear.
+
+        :return: cost rates of shape (dims_count,)
+        """
+        rates = self.coefficients.copy()
+
+        for tier in self.tiers:
+            rates[tier.dim] += tier.unit_costs.min() * tier.volume_coefficient
+
+        return rates
+
+    def breakdown(self, bw: np.ndarray) -> Dict[str, float]:
+        """
+        Network cost under fixed bandwidths, broken down per cost element and fixed cost source.
+
+        :param bw: bandwidth (per NPU) of shape (dims_count,)
+        :return: cost element (or fixed cost source) name -> cost
+        """
+        bw = np.asarray(bw, dtype=float)
+        costs: Dict[str, float] = {cost_element.name: float(bw @ coefficients)
+                                   for cost_element, coefficients in self.element_coefficients.items()}
+
+        for tier in self.tiers:
+            name = tier.cost_element.name
+            costs[name] = costs.get(name, 0.0) + float(tier.cost(bw=bw[tier.dim]))
+
+        for source, fixed_cost in self.fixed_costs.items():
+            costs[source] = costs.get(source, 0.0) + fixed_cost
+
+        return costs
+
+    def compute_expr(self, bw: gp.tupledict, gp_model: Optional[gp.Model] = None) -> gp.LinExpr:
+        """
+        Network cost expression over the solver's bandwidth variables.
+        Each tiered cost element gets a piecewise-linear general constraint,
+        which Gurobi formulates with SOS2 (or as an LP, if the unit costs increase with the volume).
+
+        :param bw: bandwidth (per NPU) variable of each dimension
+        :param gp_model: Gurobi model to add the tiered cost variables to (only required for tiered costs)
+        :return: network cost expression
+        """
+        dims = [dim for dim in range(self.dims_count) if self.coefficients[dim] != 0]
+        network_cost = gp.LinExpr([float(self.coefficients[dim]) for dim in dims], [bw[dim] for dim in dims])
+        network_cost.addConstant(self.fixed_cost)
+
+        for tier in self.tiers:
+            if gp_model is None:
+                raise CostModelError(f"Tiered {tier.cost_element.name} cost requires a Gurobi model to formulate.")
+
+            volume = gp_model.addVar(lb=0, vtype=GRB.CONTINUOUS)
+            cost = gp_model.addVar(lb=0, vtype=GRB.CONTINUOUS)
+            gp_model.addLConstr(volume == tier.volume_coefficient * bw[tier.dim])
+            gp_model.addGenConstrPWL(volume, cost, tier.starts.tolist(), tier.cumulative_costs.tolist())
+
+            network_cost += cost
+
+        return network_cost
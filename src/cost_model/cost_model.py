@@ -4,10 +4,12 @@ LICENSE file in the root directory of this source tree.
 """
 
 import math
-from typing import Dict
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
 import gurobipy as gp
+import numpy as np
 
+from src.cost_model.cost_coefficients import CostCoefficients, CostTier
 from src.cost_model.cost_element import CostElement
 from src.cost_model.cost_model_error import CostModelError
 from src.network import Network, NetworkBuildingBlock
@@ -16,6 +18,11 @@ from src.network import Network, NetworkBuildingBlock
 class CostModel:
     """
     Cost model defines the cost of each CostElement per each given dimensions.
+
+    Each cost element is either priced linearly ($ per GB/s), or by volume tiers:
+    a piecewise-linear cost over the total bandwidth of the element within the dimension,
+    where each tier's unit cost applies to the volume above its start.
+    On top of these, the cost model can charge a fixed cost per switch device (with limited radix) and per NPU.
     """
 
     def __init__(self):
@@ -25,16 +32,34 @@ class CostModel:
         # cost model
         self.cost_model: Dict[str, Dict[CostElement, float]] = dict()
 
+        # volume tiers ((start volume in GB/s, unit cost) in ascending order) of tiered cost elements
+        self.cost_tiers: Dict[str, Dict[CostElement, List[Tuple[float, float]]]] = dict()
+
+        # fixed cost and radix (ports) of each switch device per cost dimension
+        self.switch_device_cost: Dict[str, float] = dict()
+        self.switch_radix: Dict[str, int] = dict()
+
+        # fixed cost per NPU
+        self.npu_cost: float = 0
+
+        # available bandwidths (per NPU) of each cost dimension, for discrete bandwidth solving
+        self.bw_skus: Dict[str, List[float]] = dict()
+
         # network variable to be set
         self.network: Network = None
 
+        # network cost compiled for the network (invalidated whenever the network or costs change)
+        self._cost_coefficients: Optional[CostCoefficients] = None
+
     def set_network(self, network: Network) -> None:
         """
         Attach the network object to the cost model.
 
         :param network: target network
         """
-        self.network = network
+        if network is not self.network:
+            self.network = network
+            self._cost_coefficients = None
 
     def set_unit_cost(self, cost_dim: str, cost_element: CostElement, cost: float) -> None:
         """
@@ -49,7 +74,7 @@ class CostModel:
             self.cost_model[cost_dim] = dict()
 
         # check the cost is not set
-        if cost_element in self.cost_model[cost_dim]:
+        if cost_element in self.cost_model[cost_dim] or cost_element in self.cost_tiers.get(cost_dim, dict()):
             raise CostModelError(f"{cost_element.name} is already set for dim {cost_dim}.")
 
         # check the cost validity
@@ -59,28 +84,185 @@ class CostModel:
 
         # set the cost
         self.cost_model[cost_dim][cost_element] = cost
+        self._cost_coefficients = None
+
+    def set_cost_tiers(self, cost_dim: str, cost_element: CostElement, tiers: Sequence[Sequence[float]]) -> None:
+        """
+        Set the volume tiers of the given network element of a specific dimension.
+
+        :param cost_dim: cost dimension of the network to query
+        :param cost_element: cost element type
+        :param tiers: (start volume (total GB/s of the element in the dimension), unit cost) of each tier,
+            where the first tier starts at 0
+        """
+        # check whether the dimension exists
+        if cost_dim not in self.cost_tiers:
+            self.cost_tiers[cost_dim] = dict()
+
+        # check the cost is not set
+        if cost_element in self.cost_tiers[cost_dim] or cost_element in self.cost_model.get(cost_dim, dict()):
+            raise CostModelError(f"{cost_element.name} is already set for dim {cost_dim}.")
+
+        # check the tiers validity
+        if len(tiers) == 0 or any(len(tier) != 2 for tier in tiers):
+            raise CostModelError(
+                f"{cost_element.name} tiers at dim {cost_dim} ({tiers}) should be [start volume, unit cost] pairs.")
+
+        starts = [float(start) for start, _ in tiers]
+        if starts[0] != 0 or any(start >= next_start for start, next_start in zip(starts[:-1], starts[1:])):
+            raise CostModelError(
+                f"{cost_element.name} tiers at dim {cost_dim} ({tiers}) should start at 0 in ascending order.")
+
+        if any(cost <= 0 for _, cost in tiers):
+            raise CostModelError(
+                f"{cost_element.name} tier costs at dim {cost_dim} ({tiers}) should be positive values.")
+
+        # set the tiers
+        self.cost_tiers[cost_dim][cost_element] = [(float(start), float(cost)) for start, cost in tiers]
+        self._cost_coefficients = None
+
+    def set_switch_device_cost(self, cost_dim: str, cost: float, radix: Optional[int] = None) -> None:
+        """
+        Set the fixed cost of each switch device of a specific dimension.
+
+        :param cost_dim: cost dimension of the network
+        :param cost: fixed cost per switch device
+        :param radix: ports per switch device (unlimited if None)
+        """
+        if cost <= 0:
+            raise CostModelError(f"SwitchDevice cost at dim {cost_dim} ({cost}) should be a positive value.")
+
+        # a folded Clos only grows in ports if each device has at least 2 ports facing down and 2 facing up
+        if radix is not None and radix < 4:
+            raise CostModelError(f"SwitchRadix at dim {cost_dim} ({radix}) should be >= 4.")
+
+        self.switch_device_cost[cost_dim] = cost
+        if radix is not None:
+            self.switch_radix[cost_dim] = radix
+        self._cost_coefficients = None
+
+    def set_npu_cost(self, cost: float) -> None:
+        """
+        Set the fixed cost of each NPU.
+
+        :param cost: cost per NPU
+        """
+        if cost <= 0:
+            raise CostModelError(f"Npu cost ({cost}) should be a positive value.")
+
+        self.npu_cost = cost
+        self._cost_coefficients = None
+
+    def set_bw_skus(self, cost_dim: str, bw_skus: List[float]) -> None:
+        """
+        Set the bandwidths (per NPU) a dimension of the given cost dimension can be built with.
+
+        :param cost_dim: cost dimension of the network
+        :param bw_skus: available bandwidths (in GB/s)
+        """
+        if len(bw_skus) == 0:
+            raise CostModelError(f"BwSkus of dim {cost_dim} is empty.")
+
+        if any(bw <= 0 for bw in bw_skus):
+            raise CostModelError(f"BwSkus of dim {cost_dim} ({bw_skus}) should be positive values.")
+
+        self.bw_skus[cost_dim] = sorted(set(float(bw) for bw in bw_skus))
+
+    def get_bw_skus(self, cost_dim: str) -> Optional[List[float]]:
+        """
+        Get the bandwidths (per NPU) a dimension of the given cost dimension can be built with.
+
+        :param cost_dim: cost dimension of the network
+        :return: available bandwidths in ascending order (None if not set)
+        """
+        return self.bw_skus.get(cost_dim)
+
+    def is_linear(self) -> bool:
+        """
+        Whether the network cost is linear in bandwidths (i.e., no cost element is tiered).
+
+        :return: True if linear (up to the fixed costs)
+        """
+        return all(len(tiers) == 0 for tiers in self.cost_tiers.values())
 
-    def compute_network_cost(self, bw: gp.tupledict) -> gp.LinExpr:
+    def get_cost_coefficients(self) -> CostCoefficients:
+        """
+        Get the network cost compiled into per-dimension coefficients (with a breakdown per cost element),
+        compiled once per attached network and cost model.
+
+        :return: compiled network cost
+        """
+        if self._cost_coefficients is None:
+            self._cost_coefficients = self._compile_cost_coefficients()
+
+        return self._cost_coefficients
+
+    def compute_network_cost(self, bw: gp.tupledict, gp_model: Optional[gp.Model] = None) -> gp.LinExpr:
         """
         Calculate the cost of the network.
 
         :param bw: bandwidth (per NPU) of each network dimensions.
+        :param gp_model: Gurobi model to add the tiered cost variables to (only required for tiered costs)
         :return: estimated network cost of the given topology.
         """
-        # initialize network costs
-        network_cost = gp.LinExpr()
+        return self.get_cost_coefficients().compute_expr(bw=bw, gp_model=gp_model)
 
-        # iterate over all dimensions
-        for dim in range(self.network.dims_count):
-            # get the number of (building block) topologies and their cost
-            topologies_count = self._get_topologies_count(dim)
-            topology_cost = self._get_topology_cost(dim=dim,
-                                                    bandwidth=bw[dim])
-            # increment the total network cost
-            network_cost += topologies_count * topology_cost
+    def evaluate_network_cost(self, bw: np.ndarray) -> np.ndarray:
+        """
+        Closed-form network cost under fixed bandwidths, vectorized over any leading batch dimensions.
+
+        :param bw: bandwidth (per NPU) of shape (..., dims_count)
+        :return: network cost of shape (...)
+        """
+        return self.get_cost_coefficients().evaluate(bw=bw)
+
+    def _compile_cost_coefficients(self) -> CostCoefficients:
+        """
+        Compile the network cost of the attached network.
+
+        :return: compiled network cost
+        """
+        if self.network is None:
+            raise CostModelError("Network is not set to the cost model.")
 
-        # return network cost
-        return network_cost
+        dims_count = self.network.dims_count
+        element_coefficients: Dict[CostElement, np.ndarray] = dict()
+        tiers: List[CostTier] = list()
+
+        # iterate over all dimensions
+        for dim in range(dims_count):
+            for cost_element, volume_coefficient in self._get_volume_coefficients(dim=dim).items():
+                cost = self._get_element_cost(dim=dim, cost_element=cost_element)
+
+                if isinstance(cost, list):
+                    starts, cumulative_costs, unit_costs = self._get_tier_breakpoints(tiers=cost)
+                    tiers.append(CostTier(dim=dim, cost_element=cost_element, volume_coefficient=volume_coefficient,
+                                          starts=starts, cumulative_costs=cumulative_costs, unit_costs=unit_costs))
+                    continue
+
+                if cost_element not in element_coefficients:
+                    element_coefficients[cost_element] = np.zeros(dims_count)
+                element_coefficients[cost_element][dim] += cost * volume_coefficient
+
+        # fixed costs
+        fixed_costs: Dict[str, float] = dict()
+        if self.npu_cost > 0:
+            fixed_costs[CostElement.Npu.name] = self.npu_cost * self.network.total_npus_count
+
+        for dim in range(dims_count):
+            cost_dimension = self.network.cost_dimension[dim]
+            if self.network.topology[dim] != NetworkBuildingBlock.Switch or \
+                    cost_dimension not in self.switch_device_cost:
+                continue
+
+            devices_count = self._get_switch_devices_count(ports_count=self._get_links_count(dim=dim),
+                                                           radix=self.switch_radix.get(cost_dimension))
+            switch_devices_cost = (self.switch_device_cost[cost_dimension] * devices_count
+                                   * self._get_topologies_count(dim))
+            fixed_costs['SwitchDevice'] = fixed_costs.get('SwitchDevice', 0.0) + switch_devices_cost
+
+        return CostCoefficients(dims_count=dims_count, element_coefficients=element_coefficients,
+                                fixed_costs=fixed_costs, tiers=tiers)
 
     def _get_unit_cost(self, cost_dim: str, cost_element: CostElement) -> float:
         """
@@ -100,6 +282,62 @@ class CostModel:
         # return unit cost
         return self.cost_model[cost_dim][cost_element]
 
+    def _get_element_cost(self, dim: int, cost_element: CostElement) -> Union[float, List[Tuple[float, float]]]:
+        """
+        Return the unit cost, or the volume tiers, of the queried cost element at a specific network dimension.
+
+        :param dim: dimension of the network to query
+        :param cost_element: cost element type
+        :return: unit cost (if linear) or volume tiers (if tiered)
+        """
+        cost_dimension = self.network.cost_dimension[dim]
+
+        if cost_element in self.cost_tiers.get(cost_dimension, dict()):
+            return self.cost_tiers[cost_dimension][cost_element]
+
+        return self._get_unit_cost(cost_dim=cost_dimension, cost_element=cost_element)
+
+    @staticmethod
+    def _get_tier_breakpoints(tiers: List[Tuple[float, float]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Breakpoints of the piecewise-linear cost of the given volume tiers,
+        with one more breakpoint past the last tier to fix the extrapolated slope.
+
+        :param tiers: (start volume, unit cost) of each tier
+        :return: (start volumes, cumulative costs at the starts, unit costs)
+        """
+        starts = [start for start, _ in tiers]
+        unit_costs = [cost for _, cost in tiers]
+        starts.append(starts[-1] + 1)
+
+        cumulative_costs = [0.0]
+        for i, unit_cost in enumerate(unit_costs):
+            cumulative_costs.append(cumulative_costs[-1] + unit_cost * (starts[i + 1] - starts[i]))
+
+        return np.array(starts), np.array(cumulative_costs), np.array(unit_costs)
+
+    def _get_volume_coefficients(self, dim: int) -> Dict[CostElement, float]:
+        """
+        Total bandwidth of each cost element within the queried dimension, per unit bandwidth (per NPU).
+
+        :param dim: dimension to query
+        :return: cost element -> total bandwidth of the element per 1 GB/s of bandwidth (per NPU)
+        """
+        # links of every basic network topology of the dimension
+        topologies_count = self._get_topologies_count(dim)
+        link_bandwidth = self._get_link_bandwidth(dim=dim, bandwidth=1)
+        links_count = self._get_links_count(dim=dim)
+        volume = topologies_count * link_bandwidth * links_count
+
+        volume_coefficients = {CostElement.Link: volume}
+
+        # if the network is switch, add NIC and Switch costs
+        if self.network.topology[dim] == NetworkBuildingBlock.Switch:
+            volume_coefficients[CostElement.Nic] = volume
+            volume_coefficients[CostElement.Switch] = volume
+
+        return volume_coefficients
+
     def _get_topologies_count(self, dim: int) -> int:
         """
         Get the number of basic topologies for the given dimension.
@@ -122,46 +360,31 @@ class CostModel:
         # should not reach here
         raise CostModelError(f"Unknown topology: {topology.name}")
 
-    def _get_topology_cost(self,
-                           dim: int,
-                           bandwidth: gp.Var) -> gp.LinExpr:
+    @staticmethod
+    def _get_switch_devices_count(ports_count: int, radix: Optional[int]) -> int:
         """
-        Calculate the cost of each basic network topology of the queried dimension.
-
-        :param dim: dimension to query
-        :param bandwidth: bandwidth (per NPU) of the target dimension.
-        :return: cost of the basic network topology
+        Number of switch devices to build a non-blocking switch of the given ports.
+        Beyond a single device's radix, the switch is built as a folded Clos:
+        every level below the top takes 2 * ports / radix devices (half of their ports facing down),
+        and the top level takes ports / radix devices.
+
+        :param ports_count: number of ports of the switch
+        :param radix: ports per switch device (unlimited if None)
+        :return: number of switch devices
         """
-        # calculate topology cost
-        topology_cost = gp.LinExpr()
-
-        # dimension data
-        topology = self.network.topology[dim]
-        cost_dimension = self.network.cost_dimension[dim]
-
-        # calculate link cost
-        link_cost = self._get_unit_cost(cost_dim=cost_dimension, cost_element=CostElement.Link)
-        link_bandwidth = self._get_link_bandwidth(dim=dim, bandwidth=bandwidth)
-        links_count = self._get_links_count(dim=dim)
-
-        topology_cost += link_cost * link_bandwidth * links_count
-
-        # if the network is switch, add NIC and Switch costs
-        if topology == NetworkBuildingBlock.Switch:
-            # NIC cost
-            nic_cost = self._get_unit_cost(cost_dim=cost_dimension, cost_element=CostElement.Nic)
-            topology_cost += nic_cost * link_bandwidth * links_count
+        if radix is None or ports_count <= radix:
+            return 1
 
-            # switch cost
-            switch_cost = self._get_unit_cost(cost_dim=cost_dimension, cost_element=CostElement.Switch)
-            topology_cost += switch_cost * link_bandwidth * links_count
+        # levels such that radix * (radix / 2)^(levels - 1) >= ports
+        levels_count = 1
+        while radix * (radix // 2) ** (levels_count - 1) < ports_count:
+            levels_count += 1
 
-        # return the calculated cost
-        return topology_cost
+        return (levels_count - 1) * math.ceil(2 * ports_count / radix) + math.ceil(ports_count / radix)
 
     def _get_link_bandwidth(self,
                             dim: int,
-                            bandwidth: gp.Var) -> gp.Var:
+                            bandwidth: Union[gp.Var, float]) -> Union[gp.Var, float]:
         """
         Get the bandwidth of each link, by dividing the given bw
         by the number of links of the given topology.
@@ -43,14 +43,38 @@ class CostModelParser:
 
         # iterate over all dimensions
         for dim, costs in cost_data.items():
+            # fixed cost per NPU
+            if dim == CostElement.Npu.name:
+                cost_model.set_npu_cost(costs)
+                continue
+
+            # fixed cost per switch device
+            if 'SwitchDevice' in costs:
+                cost_model.set_switch_device_cost(dim, costs['SwitchDevice'], radix=costs.get('SwitchRadix'))
+            elif 'SwitchRadix' in costs:
+                raise CostModelError(f"SwitchRadix of dim {dim} is given without SwitchDevice.")
+
             # iterate over all cost elements
             for cost_element_name, unit_cost in costs.items():
+                # available bandwidths (for discrete bandwidth solving)
+                if cost_element_name == 'BwSkus':
+                    cost_model.set_bw_skus(dim, unit_cost)
+                    continue
+
+                if cost_element_name in ('SwitchDevice', 'SwitchRadix'):
+                    continue
+
                 # insert this cost element to the cost model
                 try:
                     cost_element = CostElement[cost_element_name]
-                    cost_model.set_unit_cost(dim, cost_element, unit_cost)
                 except KeyError:
                     raise CostModelError(f"{cost_element_name} is not a valid cost element.")
 
+                # a list of [start volume, unit cost] pairs is a volume-tiered cost
+                if isinstance(unit_cost, list):
+                    cost_model.set_cost_tiers(dim, cost_element, unit_cost)
+                else:
+                    cost_model.set_unit_cost(dim, cost_element, unit_cost)
+
         # return parsed cost_model
         return cost_model
@@ -0,0 +1,8 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from src.decomposition.decomposition_block import DecompositionBlock, evaluate_block
+from src.decomposition.decomposition_error import DecompositionError
+from src.decomposition.decomposition_solver import DecompositionSolver
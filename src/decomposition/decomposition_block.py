@@ -0,0 +1,103 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from src.evaluator import Evaluator
+from src.model import WorkloadEntry
+from src.network import Network
+
+
+class DecompositionBlock:
+    """
+    DecompositionBlock is one subproblem of the decomposition solver:
+    the share of a workload's e2e time contributed by a contiguous group of its layers,
+    a convex function of the shared bandwidths only.
+    A task graph couples its layers through the critical path, so it is a single block of all its layers.
+    """
+
+    def __init__(self, workload_idx: int, layers_start: int, layers_end: int, includes_constant: bool):
+        """
+        Initializer.
+
+        :param workload_idx: index of the workload the block belongs to
+        :param layers_start: first layer of the block
+        :param layers_end: layer past the last layer of the block
+        :param includes_constant: whether the block carries the workload's constant (compute) time
+        """
+        self.workload_idx = workload_idx
+        self.layers_start = layers_start
+        self.layers_end = layers_end
+        self.includes_constant = includes_constant
+
+
+def evaluate_block(evaluator: Evaluator, block: DecompositionBlock, bw: np.ndarray) -> Tuple[float, np.ndarray]:
+    """
+    Value and a subgradient (w.r.t. bandwidths) of the block's e2e time share.
+    Each collective contributes through one of its slowest dimensions,
+    and task graphs through their critical path at the given bandwidths.
+
+    :param evaluator: evaluator of the block's workload
+    :param block: block to evaluate
+    :param bw: bandwidths of shape (dims_count,), positive wherever the block sends traffic
+    :return: (value, subgradient of shape (dims_count,))
+    """
+    layers = slice(block.layers_start, block.layers_end)
+    msg_sizes = evaluator.msg_sizes[layers]
+
+    # dim time of the block's layers only (as in Evaluator.dim_time)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dim_time = np.where(msg_sizes > 0, evaluator.latencies[layers] + msg_sizes / bw, 0.0)
+    coll_time = dim_time.max(axis=-1)
+
+    constant, coll_time_weights, dim_time_weights = \
+        evaluator.e2e_constant, evaluator.coll_time_weights[layers], evaluator.dim_time_weights[layers]
+    if evaluator.task_graph is not None:
+        constant, coll_time_weights, dim_time_weights = evaluator.task_graph.critical_path(
+            coll_time=coll_time, dim_time=dim_time, latency=evaluator.latencies[layers])
+
+    value = float((coll_time * coll_time_weights).sum() + (dim_time * dim_time_weights).sum())
+    if block.includes_constant:
+        value += constant
+
+    # d(latency + msg / bw)/d(bw) = -msg / bw^2, through the (first) slowest dimension of each collective
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dim_time_gradient = np.where(msg_sizes > 0, -msg_sizes / (bw * bw), 0.0)
+
+    slowest = np.eye(len(bw), dtype=bool)[dim_time.argmax(axis=-1)]
+    subgradient = ((dim_time_gradient * slowest * coll_time_weights[..., np.newaxis]).sum(axis=(0, 1))
+                   + (dim_time_gradient * dim_time_weights).sum(axis=(0, 1)))
+
+    return value, subgradient
+
+
+# evaluators of the worker process (see initialize_worker)
+_worker_evaluators: Optional[List[Evaluator]] = None
+
+
+def initialize_worker(network: Network, entries: List[WorkloadEntry]) -> None:
+    """
+    Build the evaluators of every workload once per worker process.
+
+    :param network: target network
+    :param entries: workloads to evaluate
+    """
+    global _worker_evaluators
+    _worker_evaluators = [Evaluator(network=network, workload=entry.workload, communicator=entry.communicator,
+                                    training_loop=entry.training_loop, bw_scale=entry.bw_scale)
+                          for entry in entries]
+
+
+def evaluate_blocks(blocks: List[DecompositionBlock], bw: np.ndarray) -> List[Tuple[float, np.ndarray]]:
+    """
+    Evaluate blocks in a worker process.
+
+    :param blocks: blocks to evaluate
+    :param bw: bandwidths of shape (dims_count,)
+    :return: (value, subgradient) per each block
+    """
+    return [evaluate_block(evaluator=_worker_evaluators[block.workload_idx], block=block, bw=bw) for block in blocks]
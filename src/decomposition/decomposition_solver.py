@@ -0,0 +1,395 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+import gurobipy as gp
+import numpy as np
+from gurobipy import GRB
+
+from src.constraint import BwConstraints
+from src.decomposition.decomposition_block import DecompositionBlock, evaluate_block, evaluate_blocks, \
+    initialize_worker
+from src.decomposition.decomposition_error import DecompositionError
+from src.evaluator import Evaluator
+from src.model import Model, SolverObjective, SolverResult, WorkloadAggregation, WorkloadEntry
+
+
+class DecompositionSolver:
+    """
+    DecompositionSolver optimizes the bandwidths of (jointly optimized) workloads without building the monolithic QP.
+    The problem is split into blocks (per workload, or per group of its layers) coupled only through the shared
+    bandwidths. Each block's e2e time share is convex in the bandwidths, so a Benders-style master LP over the
+    bandwidths and one epigraph variable per block is refined by the blocks' subgradient cuts until its lower bound
+    meets the best evaluated allocation. Blocks are evaluated by the fixed-BW evaluator, optionally in a process pool.
+    Cuts are taken between the incumbent and the master's solution (in-out stabilization), keeping them well-posed.
+    PerfPerCostOpt is solved as a sequence of PerfOpt + lambda * cost problems sharing their cuts,
+    with lambda = e2e time / cost of the incumbent (its stationarity condition).
+
+    The constraints are taken from Model, which should be initialized with its constraints applied
+    (workloads added to Model are ignored).
+    """
+
+    def __init__(self,
+                 entries: List[WorkloadEntry],
+                 layers_per_block: Optional[int] = None,
+                 processes: int = 1,
+                 tolerance: float = 1e-4,
+                 max_iterations: int = 1000,
+                 time_limit: Optional[float] = None):
+        """
+        Initializer.
+
+        :param entries: workloads to optimize
+        :param layers_per_block: number of layers per block (one block per workload if None)
+        :param processes: number of worker processes evaluating the blocks (evaluated in-process if 1)
+        :param tolerance: relative optimality gap to stop at
+        :param max_iterations: maximum number of master solves
+        :param time_limit: time limit (in seconds), unlimited if None
+        """
+        if Model._bw is None:
+            raise DecompositionError("Model should be initialized (with its constraints applied) to decompose.")
+
+        if len(entries) == 0:
+            raise DecompositionError("At least one workload should be given.")
+
+        if layers_per_block is not None and layers_per_block <= 0:
+            raise DecompositionError(f"Layers per block ({layers_per_block}) should be positive.")
+
+        self.entries = entries
+        self.processes = max(1, processes)
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.time_limit = time_limit
+
+        self.network = Model.network
+        self.dims_count = Model.network.dims_count
+        self.cost_coefficients = Model.cost_model.get_cost_coefficients()
+        self.constraints = BwConstraints.from_model()
+
+        self.evaluators = [Evaluator(network=self.network, workload=entry.workload, communicator=entry.communicator,
+                                     training_loop=entry.training_loop, bw_scale=entry.bw_scale)
+                           for entry in entries]
+
+        # task graphs couple their layers through the critical path, so they aren't split
+        self.blocks: List[DecompositionBlock] = list()
+        for workload_idx, evaluator in enumerate(self.evaluators):
+            layers_count = evaluator.msg_sizes.shape[0]
+            block_size = layers_count if layers_per_block is None or evaluator.task_graph is not None \
+                else layers_per_block
+
+            for layers_start in range(0, max(layers_count, 1), max(block_size, 1)):
+                self.blocks.append(DecompositionBlock(workload_idx=workload_idx, layers_start=layers_start,
+                                                      layers_end=min(layers_start + block_size, layers_count),
+                                                      includes_constant=(layers_start == 0)))
+
+        # (iteration, lower bound, upper bound) of the master objective, per each master solve
+        self.history: List[Tuple[int, float, float]] = list()
+
+        # result of the last solve
+        self.result: Optional[SolverResult] = None
+
+        # whether the last cuts cut off the master's solution
+        self._last_cuts_separated = False
+
+        # units of each workload's epigraphs, and of the master objective (see _build_epigraphs)
+        self._e2e_time_units = np.ones(len(entries))
+        self._time_unit = 1.0
+
+    def solve(self, objective: SolverObjective,
+              aggregation: WorkloadAggregation = WorkloadAggregation.WeightedSum) -> SolverResult:
+        """
+        Optimize the bandwidths by decomposition.
+
+        :param objective: objective type
+        :param aggregation: how the e2e times of the workloads are aggregated into the objective
+        :return: optimized bandwidths and objective values (nodes_count is 0; iterations_count is master solves)
+        """
+        start_time = time.time()
+        self.history = list()
+
+        if aggregation == WorkloadAggregation.MaxSlowdown and any(entry.sla is None for entry in self.entries):
+            raise DecompositionError("SLA of every workload is required to bound its slowdown.")
+
+        master = gp.Model("LibraDecomposition")
+        master.setParam(paramname='OutputFlag', newval=False)
+
+        pool = ProcessPoolExecutor(max_workers=self.processes, initializer=initialize_worker,
+                                   initargs=(self.network, self.entries)) if self.processes > 1 else None
+
+        try:
+            bw, network_cost = self._build_master(master=master)
+            incumbent = self._initial_bw(master=master, bw=bw)
+            thetas, time_expr = self._build_epigraphs(master=master, aggregation=aggregation, initial_bw=incumbent)
+
+            if objective == SolverObjective.PerfOpt:
+                status, incumbent = self._solve_master(master=master, bw=bw, thetas=thetas, objective_expr=time_expr,
+                                                       incumbent=incumbent, aggregation=aggregation, cost_weight=0.0,
+                                                       pool=pool, start_time=start_time)
+            elif objective == SolverObjective.PerfPerCostOpt:
+                status, incumbent = self._solve_perf_per_cost(master=master, bw=bw, network_cost=network_cost,
+                                                              thetas=thetas, time_expr=time_expr,
+                                                              incumbent=incumbent, aggregation=aggregation,
+                                                              pool=pool, start_time=start_time)
+            else:
+                # should not reach here
+                raise DecompositionError(f"Objective {objective} is unknown.")
+        finally:
+            master.dispose()
+            if pool is not None:
+                pool.shutdown()
+
+        return self._get_result(bw=incumbent, objective=objective, aggregation=aggregation, status=status,
+                                runtime=time.time() - start_time)
+
+    def print_convergence(self, reference: Optional[SolverResult] = None) -> None:
+        """
+        Print the lower and upper bounds of every master solve,
+        and the difference from a reference (e.g., monolithic Model.solve) result, if given.
+
+        :param reference: result to compare the last decomposition result against
+        """
+        print("=" * 80)
+        print("Decomposition Convergence:")
+        for iteration, lower_bound, upper_bound in self.history:
+            gap = (upper_bound - lower_bound) / max(abs(upper_bound), 1e-12)
+            print(f"Iteration {iteration}: Lower Bound: {lower_bound:.6e}, Upper Bound: {upper_bound:.6e}, "
+                  f"Gap: {gap:.3e}")
+
+        if reference is not None and self.result is not None:
+            difference = (self.result.objective_value - reference.objective_value) / abs(reference.objective_value)
+            print(f"Objective: {self.result.objective_value:.6e} (reference: {reference.objective_value:.6e}, "
+                  f"relative difference: {difference:.3e})")
+            print("BW: " + "\t".join(f"{bw:.2f}" for bw in self.result.bw)
+                  + " (reference: " + "\t".join(f"{bw:.2f}" for bw in reference.bw) + ")")
+
+    def _build_master(self, master: gp.Model) -> Tuple[gp.tupledict, gp.Var]:
+        bw = master.addVars(self.dims_count, lb=0, vtype=GRB.CONTINUOUS)
+
+        self.constraints.add_to(gp_model=master, bw=bw)
+
+        network_cost = master.addVar(lb=0, vtype=GRB.CONTINUOUS)
+        master.addLConstr(network_cost == self.cost_coefficients.compute_expr(bw=bw, gp_model=master))
+
+        return bw, network_cost
+
+    def _build_epigraphs(self, master: gp.Model, aggregation: WorkloadAggregation,
+                         initial_bw: np.ndarray) -> Tuple[gp.tupledict, gp.LinExpr]:
+        # e2e times (in ns) and slowdowns differ by orders of magnitude, which a MIP master (of tiered costs) can't
+        # afford: epigraphs are in units of their workload's initial e2e time, and the objective of its initial value
+        values = np.array([value for value, _ in self._evaluate(bw=initial_bw, pool=None)])
+        e2e_times = self._workload_e2e_times(values=values)
+        self._e2e_time_units = np.where(e2e_times > 0, e2e_times, 1.0)
+        self._time_unit = max(self._aggregate(values=values, aggregation=aggregation), 1e-12)
+
+        # epigraph of each block's e2e time share (e2e times are non-negative)
+        thetas = master.addVars(len(self.blocks), lb=0, vtype=GRB.CONTINUOUS)
+        scaled_e2e_times = [gp.quicksum(thetas[block_idx] for block_idx, block in enumerate(self.blocks)
+                                        if block.workload_idx == workload_idx)
+                            for workload_idx in range(len(self.entries))]
+
+        # aggregated as in Model._set_objective
+        time_bounds = self._get_time_bounds(aggregation=aggregation)
+        if time_bounds is None:
+            time_expr = gp.quicksum(entry.weight * e2e_time_unit / self._time_unit * scaled_e2e_time
+                                    for entry, e2e_time_unit, scaled_e2e_time
+                                    in zip(self.entries, self._e2e_time_units, scaled_e2e_times))
+        else:
+            max_time = master.addVar(lb=0, vtype=GRB.CONTINUOUS)
+            for time_bound, e2e_time_unit, scaled_e2e_time in zip(time_bounds, self._e2e_time_units,
+                                                                  scaled_e2e_times):
+                master.addLConstr(max_time * (time_bound * self._time_unit / e2e_time_unit) >= scaled_e2e_time)
+            time_expr = gp.LinExpr(max_time)
+
+        return thetas, time_expr
+
+    def _initial_bw(self, master: gp.Model, bw: gp.tupledict) -> np.ndarray:
+        # the most balanced feasible allocation: maximize the least bandwidth of the dimensions with traffic
+        traffic_dims = [dim for dim in range(self.dims_count)
+                        if any((evaluator.msg_sizes[..., dim] > 0).any() for evaluator in self.evaluators)]
+
+        margin = master.addVar(lb=-GRB.INFINITY, vtype=GRB.CONTINUOUS)
+        margin_constrs = [master.addLConstr(bw[dim] >= margin) for dim in traffic_dims]
+        master.setObjective(expr=gp.LinExpr(margin), sense=GRB.MAXIMIZE)
+        master.optimize()
+
+        if master.Status in (GRB.UNBOUNDED, GRB.INF_OR_UNBD):
+            raise DecompositionError("Bandwidths are unbounded: the constraints should bound them.")
+        if master.Status != GRB.OPTIMAL:
+            raise DecompositionError(f"No feasible bandwidths found (status: {master.Status}).")
+        if len(traffic_dims) > 0 and margin.X <= 0:
+            raise DecompositionError("The constraints leave no bandwidth to a dimension with traffic.")
+
+        initial_bw = np.array(master.getAttr('x', bw.values()))
+
+        for constr in margin_constrs:
+            master.remove(constr)
+        master.remove(margin)
+
+        return initial_bw
+
+    def _solve_perf_per_cost(self, master: gp.Model, bw: gp.tupledict, network_cost: gp.Var, thetas: gp.tupledict,
+                             time_expr: gp.LinExpr, incumbent: np.ndarray, aggregation: WorkloadAggregation,
+                             pool: Optional[ProcessPoolExecutor], start_time: float) -> Tuple[str, np.ndarray]:
+        status = 'OPTIMAL'
+
+        cost_weight = self._cost_weight(bw=incumbent, aggregation=aggregation)
+        while len(self.history) < self.max_iterations:
+            objective_expr = time_expr + (cost_weight / self._time_unit) * network_cost
+            status, incumbent = self._solve_master(master=master, bw=bw, thetas=thetas, objective_expr=objective_expr,
+                                                   incumbent=incumbent, aggregation=aggregation,
+                                                   cost_weight=cost_weight, pool=pool, start_time=start_time)
+            if status != 'OPTIMAL':
+                break
+
+            # stationary once lambda = e2e time / cost of the optimum
+            next_cost_weight = self._cost_weight(bw=incumbent, aggregation=aggregation)
+            if abs(next_cost_weight - cost_weight) <= self.tolerance * cost_weight:
+                break
+            cost_weight = next_cost_weight
+
+        return status, incumbent
+
+    def _solve_master(self, master: gp.Model, bw: gp.tupledict, thetas: gp.tupledict, objective_expr: gp.LinExpr,
+                      incumbent: np.ndarray, aggregation: WorkloadAggregation, cost_weight: float,
+                      pool: Optional[ProcessPoolExecutor], start_time: float) -> Tuple[str, np.ndarray]:
+        master.setObjective(expr=objective_expr, sense=GRB.MINIMIZE)
+
+        upper_bound = self._add_cuts(master=master, bw=bw, thetas=thetas, query=incumbent,
+                                     aggregation=aggregation, cost_weight=cost_weight, pool=pool)
+        in_out_weight = 0.5
+
+        while True:
+            if len(self.history) >= self.max_iterations:
+                return 'ITERATION_LIMIT', incumbent
+            if self.time_limit is not None and time.time() - start_time > self.time_limit:
+                return 'TIME_LIMIT', incumbent
+
+            master.optimize()
+            if master.Status != GRB.OPTIMAL:
+                raise DecompositionError(f"Master problem isn't solved to optimality (status: {master.Status}).")
+
+            lower_bound = master.ObjVal * self._time_unit
+            self.history.append((len(self.history) + 1, lower_bound, upper_bound))
+            if upper_bound - lower_bound <= self.tolerance * abs(upper_bound):
+                return 'OPTIMAL', incumbent
+
+            master_bw = np.array(master.getAttr('x', bw.values()))
+            master_thetas = np.array(master.getAttr('x', thetas.values()))
+
+            # the query point stays strictly inside the allocations with traffic on every used dimension
+            query = in_out_weight * incumbent + (1 - in_out_weight) * master_bw
+            query_value = self._add_cuts(master=master, bw=bw, thetas=thetas, query=query, aggregation=aggregation,
+                                         cost_weight=cost_weight, pool=pool, master_bw=master_bw,
+                                         master_thetas=master_thetas)
+
+            if query_value < upper_bound:
+                incumbent, upper_bound = query, query_value
+            elif self._last_cuts_separated is False:
+                # the cuts didn't cut off the master's solution: move the query towards it
+                in_out_weight /= 2
+
+    def _add_cuts(self, master: gp.Model, bw: gp.tupledict, thetas: gp.tupledict, query: np.ndarray,
+                  aggregation: WorkloadAggregation, cost_weight: float, pool: Optional[ProcessPoolExecutor],
+                  master_bw: Optional[np.ndarray] = None, master_thetas: Optional[np.ndarray] = None) -> float:
+        """
+        Add the cut of each block at the query bandwidths.
+
+        :return: objective value at the query bandwidths
+        """
+        evaluations = self._evaluate(bw=query, pool=pool)
+        self._last_cuts_separated = False
+
+        for block_idx, (value, subgradient) in enumerate(evaluations):
+            # theta >= value + subgradient * (bw - query), in units of the workload's initial e2e time
+            unit = self._e2e_time_units[self.blocks[block_idx].workload_idx]
+            master.addLConstr(thetas[block_idx] - gp.LinExpr((subgradient / unit).tolist(), list(bw.values()))
+                              >= (value - float(subgradient @ query)) / unit)
+
+            if master_bw is not None:
+                cut_value = (value + float(subgradient @ (master_bw - query))) / unit
+                if cut_value > master_thetas[block_idx] + self.tolerance * max(abs(cut_value), 1.0):
+                    self._last_cuts_separated = True
+
+        values = np.array([value for value, _ in evaluations])
+        return self._aggregate(values=values, aggregation=aggregation) \
+            + cost_weight * float(self.cost_coefficients.evaluate(bw=query))
+
+    def _evaluate(self, bw: np.ndarray, pool: Optional[ProcessPoolExecutor]) -> List[Tuple[float, np.ndarray]]:
+        if pool is None:
+            return [evaluate_block(evaluator=self.evaluators[block.workload_idx], block=block, bw=bw)
+                    for block in self.blocks]
+
+        chunks = [self.blocks[index::self.processes] for index in range(self.processes)]
+        chunk_evaluations = list(pool.map(evaluate_blocks, chunks, [bw] * len(chunks)))
+
+        # restore the block order
+        evaluations: List[Optional[Tuple[float, np.ndarray]]] = [None] * len(self.blocks)
+        for index, chunk_evaluation in enumerate(chunk_evaluations):
+            evaluations[index::self.processes] = chunk_evaluation
+        return evaluations
+
+    def _workload_e2e_times(self, values: np.ndarray) -> np.ndarray:
+        e2e_times = np.zeros(len(self.entries))
+        for block, value in zip(self.blocks, values):
+            e2e_times[block.workload_idx] += value
+        return e2e_times
+
+    def _aggregate(self, values: np.ndarray, aggregation: WorkloadAggregation) -> float:
+        # same aggregation as Model._set_objective
+        e2e_times = self._workload_e2e_times(values=values)
+
+        time_bounds = self._get_time_bounds(aggregation=aggregation)
+        if time_bounds is None:
+            return float(sum(entry.weight * e2e_time for entry, e2e_time in zip(self.entries, e2e_times)))
+
+        return float(max(e2e_time / time_bound for time_bound, e2e_time in zip(time_bounds, e2e_times)))
+
+    def _get_time_bounds(self, aggregation: WorkloadAggregation) -> Optional[List[float]]:
+        # same divisors as Model.get_time_bounds
+        if aggregation == WorkloadAggregation.WeightedSum:
+            return None
+        if aggregation == WorkloadAggregation.MaxSlowdown:
+            return [entry.sla for entry in self.entries]
+        return [1.0 for _ in self.entries]
+
+    def _cost_weight(self, bw: np.ndarray, aggregation: WorkloadAggregation) -> float:
+        network_cost = float(self.cost_coefficients.evaluate(bw=bw))
+        if network_cost <= 0:
+            raise DecompositionError("PerfPerCostOpt requires a positive network cost.")
+
+        values = np.array([value for value, _ in self._evaluate(bw=bw, pool=None)])
+        return self._aggregate(values=values, aggregation=aggregation) / network_cost
+
+    def _get_result(self, bw: np.ndarray, objective: SolverObjective, aggregation: WorkloadAggregation,
+                    status: str, runtime: float) -> SolverResult:
+        values = np.array([value for value, _ in self._evaluate(bw=bw, pool=None)])
+        e2e_times = self._workload_e2e_times(values=values)
+        aggregated_time = self._aggregate(values=values, aggregation=aggregation)
+        network_cost = float(self.cost_coefficients.evaluate(bw=bw))
+
+        if objective == SolverObjective.PerfOpt:
+            objective_value = aggregated_time
+        else:
+            # same scaling as Model._set_objective
+            objective_value = aggregated_time * network_cost / Model.get_time_scale(aggregation=aggregation)
+
+        self.result = SolverResult(objective=objective,
+                                   status=status,
+                                   bw=bw.tolist(),
+                                   e2e_time=float(sum(entry.weight * e2e_time
+                                                      for entry, e2e_time in zip(self.entries, e2e_times))),
+                                   network_cost=network_cost,
+                                   objective_value=objective_value,
+                                   runtime=runtime,
+                                   iterations_count=len(self.history),
+                                   nodes_count=0,
+                                   cost_breakdown=self.cost_coefficients.breakdown(bw=bw),
+                                   aggregation=aggregation,
+                                   workload_e2e_times={entry.name: float(e2e_time)
+                                                       for entry, e2e_time in zip(self.entries, e2e_times)})
+        return self.result
@@ -0,0 +1,8 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from src.evaluator.evaluator import Evaluator, compile_compute_weights, compile_training_loop, compute_phase_msg_sizes
+from src.evaluator.evaluator_error import EvaluatorError
+from src.evaluator.incremental_evaluator import IncrementalEvaluator
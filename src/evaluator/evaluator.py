@@ -0,0 +1,591 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import gurobipy as gp
+import numpy as np
+from gurobipy import GRB
+
+from src.communicator import Communicator
+from src.cost_model import CostCoefficients, CostModel
+from src.evaluator.evaluator_error import EvaluatorError
+from src.model import SolverObjective, compute_latencies, memoized_message_sizes
+from src.network import Network
+from src.task_graph import PipelineSchedule, TaskGraph, TaskGraphTrainingLoop
+from src.workload import Collective, Layer, Phase, Workload
+
+
+class Evaluator:
+    """
+    Evaluator computes the e2e time and network cost of fixed bandwidths without running the solver.
+    Bandwidths are given either as a single vector of shape (dims_count,)
+    or as a batch of shape (N, dims_count), in which case all outputs are vectorized over the batch.
+    Task graph training loops are evaluated by their critical path.
+    """
+
+    # number of bandwidth vectors evaluated at once (bounds memory of batched evaluation)
+    batch_chunk_size = 4096
+
+    def __init__(self,
+                 network: Network,
+                 workload: Workload,
+                 communicator: Communicator,
+                 training_loop: Callable,
+                 cost_model: Optional[CostModel] = None,
+                 bw_scale: Optional[List[float]] = None):
+        """
+        Initializer.
+
+        :param network: target network
+        :param workload: target workload
+        :param communicator: target communicator
+        :param training_loop: training loop function (see inputs/training_loop)
+        :param cost_model: cost model, required only to evaluate network cost
+        :param bw_scale: fraction of each dimension's bandwidth the workload gets (as in Model), 1 if None
+        """
+        self.network = network
+        self.workload = workload
+        self.communicator = communicator
+        self.cost_model = cost_model
+
+        # message size per each [layer, phase, dim]
+        # (a scaled bandwidth takes as long as a message scaled inversely)
+        self.msg_sizes = self._compute_msg_sizes()
+        if bw_scale is not None:
+            self.msg_sizes = self.msg_sizes / np.asarray(bw_scale, dtype=float)
+
+        # latency per each [layer, phase, dim] (0 where no message is sent)
+        self.latencies = self._compute_latencies()
+
+        # e2e time = constant + sum(coll_time * coll_time_weights) + sum(dim_time * dim_time_weights)
+        # (for task graphs, the weights of the critical path under uniform bandwidths, a lower bound of the e2e time)
+        if isinstance(training_loop, TaskGraphTrainingLoop):
+            self.task_graph = training_loop.task_graph(workload=workload)
+
+            uniform_bw = np.ones(network.dims_count)
+            self.e2e_constant, self.coll_time_weights, self.dim_time_weights = self.task_graph.critical_path(
+                coll_time=self.coll_time(bw=uniform_bw), dim_time=self.dim_time(bw=uniform_bw), latency=self.latencies)
+        else:
+            self.task_graph = None
+            self.e2e_constant, self.coll_time_weights, self.dim_time_weights = compile_training_loop(
+                training_loop=training_loop, workload=workload, dims_count=network.dims_count)
+
+        # network cost >= fixed_cost + sum(bw * cost_coefficients) (with equality if the cost is linear)
+        self.compiled_cost: Optional[CostCoefficients] = None
+        self.cost_coefficients: Optional[np.ndarray] = None
+        self.fixed_cost = 0.0
+        if cost_model is not None:
+            cost_model.set_network(network=network)
+            self.compiled_cost = cost_model.get_cost_coefficients()
+            self.cost_coefficients = self.compiled_cost.lowest_rates()
+            self.fixed_cost = self.compiled_cost.fixed_cost
+
+    def dim_time(self, bw: np.ndarray) -> np.ndarray:
+        """
+        Communication time of each [layer, phase, dim].
+
+        :param bw: bandwidths of shape (..., dims_count)
+        :return: dim time of shape (..., layers_count, 3, dims_count)
+        """
+        bw = np.asarray(bw, dtype=float)[..., np.newaxis, np.newaxis, :]
+
+        # dims without traffic take no time, regardless of their bandwidth
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(self.msg_sizes > 0, self.latencies + self.msg_sizes / bw, 0.0)
+
+    def coll_time(self, bw: np.ndarray) -> np.ndarray:
+        """
+        Collective time (i.e., max dim time) of each [layer, phase].
+
+        :param bw: bandwidths of shape (..., dims_count)
+        :return: collective time of shape (..., layers_count, 3)
+        """
+        return self.dim_time(bw=bw).max(axis=-1)
+
+    def e2e_time(self, bw: np.ndarray) -> Union[float, np.ndarray]:
+        """
+        End-to-end time under the given bandwidths.
+
+        :param bw: bandwidths of shape (dims_count,) or (N, dims_count)
+        :return: e2e time (float, or array of shape (N,) for batched bandwidths)
+        """
+        bw = np.asarray(bw, dtype=float)
+
+        if bw.ndim == 1:
+            return float(self._e2e_time(bw=bw))
+
+        # evaluate in chunks, so that per-phase intermediates fit in memory
+        return np.concatenate([self._e2e_time(bw=bw[start:(start + Evaluator.batch_chunk_size)])
+                               for start in range(0, len(bw), Evaluator.batch_chunk_size)])
+
+    def scenario_e2e_time(self, bw: np.ndarray, comm_scale: np.ndarray, compute_scale: np.ndarray,
+                          bw_scale: np.ndarray) -> np.ndarray:
+        """
+        End-to-end time of fixed bandwidths under each of N scenarios,
+        which scale every message size, every compute time, and each dimension's bandwidth.
+        A scenario's dim time latency + (comm_scale * msg) / (bw_scale * bw) is the dim time
+        under the effective bandwidth bw * bw_scale / comm_scale, so all scenarios are evaluated as one batch.
+
+        :param bw: bandwidths of shape (dims_count,)
+        :param comm_scale: message size scale of shape (N,)
+        :param compute_scale: compute time scale of shape (N,)
+        :param bw_scale: bandwidth scale of shape (N, dims_count)
+        :return: e2e time of shape (N,)
+        """
+        comm_scale = np.asarray(comm_scale, dtype=float)
+        compute_scale = np.asarray(compute_scale, dtype=float)
+        effective_bw = np.asarray(bw, dtype=float) * np.asarray(bw_scale, dtype=float) / comm_scale[:, np.newaxis]
+
+        return np.concatenate([self._e2e_time(bw=effective_bw[start:(start + Evaluator.batch_chunk_size)],
+                                              compute_scale=compute_scale[start:(start + Evaluator.batch_chunk_size)])
+                               for start in range(0, len(effective_bw), Evaluator.batch_chunk_size)])
+
+    def _e2e_time(self, bw: np.ndarray, compute_scale: Union[float, np.ndarray] = 1.0) -> np.ndarray:
+        dim_time = self.dim_time(bw=bw)
+        coll_time = dim_time.max(axis=-1)
+
+        if self.task_graph is not None:
+            return self.task_graph.evaluate(coll_time=coll_time, dim_time=dim_time, compute_scale=compute_scale,
+                                            latency=self.latencies)
+
+        # unweighted times never contribute, even if infinite (i.e., zero bandwidth)
+        with np.errstate(invalid='ignore'):
+            coll_time_contribution = np.where(self.coll_time_weights != 0, coll_time * self.coll_time_weights, 0.0)
+            dim_time_contribution = np.where(self.dim_time_weights != 0, dim_time * self.dim_time_weights, 0.0)
+
+        # the constant of a linear training loop is its compute time
+        return (self.e2e_constant * compute_scale
+                + coll_time_contribution.sum(axis=(-2, -1))
+                + dim_time_contribution.sum(axis=(-3, -2, -1)))
+
+    def e2e_time_gradient(self, bw: np.ndarray) -> np.ndarray:
+        """
+        Rate of change of the e2e time when the bandwidth of a single dimension increases, others kept fixed.
+        A collective whose bottleneck is shared by several dimensions doesn't speed up
+        by increasing only one of them, so it contributes nothing to their rates.
+
+        :param bw: bandwidths of shape (dims_count,)
+        :return: d(e2e time)/d(bw) of shape (dims_count,), in ns per GB/s
+        """
+        bw = np.asarray(bw, dtype=float)
+        dim_time = self.dim_time(bw=bw)
+
+        # task graphs change at the rate of their critical path
+        coll_time_weights, dim_time_weights = self.coll_time_weights, self.dim_time_weights
+        if self.task_graph is not None:
+            _, coll_time_weights, dim_time_weights = self.task_graph.critical_path(
+                coll_time=dim_time.max(axis=-1), dim_time=dim_time, latency=self.latencies)
+
+        # collectives whose bottleneck is a single dimension
+        bottleneck = (dim_time > 0) & np.isclose(dim_time, dim_time.max(axis=-1, keepdims=True), rtol=1e-9, atol=0)
+        unique_bottleneck = bottleneck & (bottleneck.sum(axis=-1, keepdims=True) == 1)
+
+        # d(latency + msg / bw)/d(bw) = -(msg / bw) / bw
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dim_time_gradient = np.where(self.msg_sizes > 0, -(dim_time - self.latencies) / bw, 0.0)
+
+        coll_time_contribution = np.where(unique_bottleneck,
+                                          dim_time_gradient * coll_time_weights[..., np.newaxis], 0.0)
+        dim_time_contribution = dim_time_gradient * dim_time_weights
+
+        return coll_time_contribution.sum(axis=(0, 1)) + dim_time_contribution.sum(axis=(0, 1))
+
+    def iteration_task_graph(self) -> TaskGraph:
+        """
+        Task graph of a training iteration, e.g., to be simulated or laid out on a timeline:
+        the training loop's task graph, the expanded pipeline schedule,
+        or for linear training loops, a serial iteration of the collectives they charge.
+
+        :return: task graph of the iteration
+        """
+        if isinstance(self.task_graph, TaskGraph):
+            return self.task_graph
+
+        if isinstance(self.task_graph, PipelineSchedule):
+            return self.task_graph.task_graph()
+
+        coll_time_weights = self.coll_time_weights
+        if (self.dim_time_weights != 0).any() or (coll_time_weights < 0).any() \
+                or not np.allclose(coll_time_weights, np.round(coll_time_weights)):
+            raise EvaluatorError("Training loop is not a sequence of collectives, "
+                                 "declare it as a task graph (see TaskGraphTrainingLoop) instead.")
+        collectives_count = np.round(coll_time_weights).astype(int)
+
+        # phases in the order of a serial iteration (forward, then backward in reverse)
+        phase_order = [(layer_idx, 0) for layer_idx in range(self.workload.layers_count)]
+        for layer_idx in reversed(range(self.workload.layers_count)):
+            phase_order.extend([(layer_idx, 1), (layer_idx, 2)])
+
+        layer_phases = [(layer.forward, layer.input_grad, layer.weight_grad) for layer in self.workload.layers]
+        compute_times = [layer_phases[layer_idx][phase_idx].compute_time for layer_idx, phase_idx in phase_order]
+
+        # interleave compute if the training loop charges the workload's compute time, otherwise charge it upfront
+        interleaved = bool(np.isclose(sum(compute_times), self.e2e_constant))
+
+        task_graph = TaskGraph()
+        if not interleaved:
+            task_graph.add_compute(name='compute', compute_time=self.e2e_constant)
+
+        for (layer_idx, phase_idx), compute_time in zip(phase_order, compute_times):
+            phase_name = ('fwd', 'ig', 'wg')[phase_idx]
+            if interleaved:
+                task_graph.add_compute(name=f'{phase_name}_compute_{layer_idx}', compute_time=compute_time)
+
+            for k in range(collectives_count[layer_idx, phase_idx]):
+                suffix = f'_{k}' if k > 0 else ''
+                task_graph.add_collective(name=f'{phase_name}_comm_{layer_idx}{suffix}', layer_idx=layer_idx,
+                                          phase_idx=phase_idx)
+
+        return task_graph
+
+    def network_cost(self, bw: np.ndarray) -> Union[float, np.ndarray]:
+        """
+        Network cost under the given bandwidths.
+
+        :param bw: bandwidths of shape (dims_count,) or (N, dims_count)
+        :return: network cost (float, or array of shape (N,) for batched bandwidths)
+        """
+        if self.compiled_cost is None:
+            raise EvaluatorError("Cost model is not given to the evaluator.")
+
+        cost = self.compiled_cost.evaluate(bw=bw)
+        return float(cost) if np.ndim(cost) == 0 else cost
+
+    def network_cost_gradient(self, bw: np.ndarray) -> np.ndarray:
+        """
+        Derivative of the network cost w.r.t. each dimension's bandwidth (towards more bandwidth).
+
+        :param bw: bandwidths of shape (dims_count,)
+        :return: gradient of shape (dims_count,)
+        """
+        if self.compiled_cost is None:
+            raise EvaluatorError("Cost model is not given to the evaluator.")
+
+        return self.compiled_cost.gradient(bw=bw)
+
+    def network_cost_breakdown(self, bw: np.ndarray) -> Dict[str, float]:
+        """
+        Network cost under the given bandwidths, broken down per cost element and fixed cost source.
+
+        :param bw: bandwidths of shape (dims_count,)
+        :return: cost element (or fixed cost source) name -> cost
+        """
+        if self.compiled_cost is None:
+            raise EvaluatorError("Cost model is not given to the evaluator.")
+
+        return self.compiled_cost.breakdown(bw=bw)
+
+    def objective_value(self, bw: np.ndarray, objective: SolverObjective) -> Union[float, np.ndarray]:
+        """
+        Solver objective value under the given bandwidths.
+
+        :param bw: bandwidths of shape (dims_count,) or (N, dims_count)
+        :param objective: solver objective
+        :return: objective value (float, or array of shape (N,) for batched bandwidths)
+        """
+        if objective == SolverObjective.PerfOpt:
+            return self.e2e_time(bw=bw)
+
+        if objective == SolverObjective.PerfPerCostOpt:
+            # same scaling as Model._set_objective
+            return self.e2e_time(bw=bw) * self.network_cost(bw=bw) / 1e10
+
+        # should not reach here
+        raise EvaluatorError(f"Objective {objective} is unknown.")
+
+    def objective_lower_bound(self, total_bw: float, objective: SolverObjective) -> float:
+        """
+        Analytic lower bound of the solver objective over every bandwidth allocation with sum(bw) == total_bw.
+
+        :param total_bw: total bandwidth budget
+        :param objective: solver objective
+        :return: lower bound of the objective (-inf if the training loop admits no bound)
+        """
+        # negatively weighted times cannot be bounded from below
+        if (self.coll_time_weights < 0).any() or (self.dim_time_weights < 0).any():
+            return -float('inf')
+
+        e2e_time_lower_bound = max(lower_bound for lower_bound, _ in self._bottleneck_bounds(total_bw=total_bw))
+
+        if objective == SolverObjective.PerfOpt:
+            return float(e2e_time_lower_bound)
+
+        if objective == SolverObjective.PerfPerCostOpt:
+            # at best, the entire budget is spent on the cheapest dimension at its cheapest tier
+            network_cost_lower_bound = self.fixed_cost + total_bw * self.cost_coefficients.min()
+            return float(e2e_time_lower_bound * network_cost_lower_bound / 1e10)
+
+        # should not reach here
+        raise EvaluatorError(f"Objective {objective} is unknown.")
+
+    def heuristic_bw(self, total_bw: float) -> np.ndarray:
+        """
+        Cheap bandwidth allocations spending the total bandwidth budget:
+        the allocations found while bounding the objective, and a uniform allocation.
+        Their evaluated objective values are upper bounds of the optimum.
+
+        :param total_bw: total bandwidth budget
+        :return: bandwidth allocations of shape (N, dims_count)
+        """
+        allocations = [bw for _, bw in self._bottleneck_bounds(total_bw=total_bw)]
+        allocations.append(np.full(self.network.dims_count, total_bw / self.network.dims_count))
+
+        return np.array(allocations)
+
+    def _bottleneck_bounds(self, total_bw: float, iterations: int = 30) -> List[Tuple[float, np.ndarray]]:
+        """
+        Lower-bound the e2e time by splitting each collective over its dimensions with shares summing to 1:
+        since max_d(dim_time_d) >= sum_d(share_d * (latency_d + msg_d / bw_d)), the e2e time is at least
+        constant + latency + sum_d(traffic_d / bw_d), whose minimum under sum(bw) == total_bw is
+        constant + latency + (sum_d sqrt(traffic_d))^2 / total_bw, at bw_d proportional to sqrt(traffic_d).
+        Shares are moved towards each collective's bottleneck dimension under that allocation (Frank-Wolfe steps),
+        and every iteration yields a valid bound.
+
+        :param total_bw: total bandwidth budget
+        :param iterations: number of share updates
+        :return: (e2e time lower bound, its minimizing allocation) per each iteration
+        """
+        dims = np.arange(self.network.dims_count)
+
+        # traffic (and latency) always charged to each dimension, regardless of the shares
+        dim_traffic = (self.msg_sizes * self.dim_time_weights).sum(axis=(0, 1))
+        dim_latency = (self.latencies * self.dim_time_weights).sum()
+        coll_traffic = self.msg_sizes * self.coll_time_weights[..., np.newaxis]
+        coll_latency = self.latencies * self.coll_time_weights[..., np.newaxis]
+
+        # start from the allocation proportional to the traffic
+        bw = coll_traffic.sum(axis=(0, 1)) + dim_traffic
+        bw = total_bw * bw / bw.sum() if bw.sum() > 0 else np.full(self.network.dims_count, total_bw)
+        shares = (self.dim_time(bw=bw).argmax(axis=-1)[..., np.newaxis] == dims).astype(float)
+
+        bounds: List[Tuple[float, np.ndarray]] = list()
+        for iteration in range(iterations):
+            traffic = (coll_traffic * shares).sum(axis=(0, 1)) + dim_traffic
+            latency = (coll_latency * shares).sum() + dim_latency
+
+            sqrt_traffic = np.sqrt(traffic)
+            lower_bound = self.e2e_constant + latency + sqrt_traffic.sum() ** 2 / total_bw
+
+            if sqrt_traffic.sum() <= 0:
+                # no communication at all
+                bounds.append((lower_bound, bw))
+                break
+
+            bw = total_bw * sqrt_traffic / sqrt_traffic.sum()
+            bounds.append((lower_bound, bw))
+
+            # move shares towards the bottleneck dimension of each collective
+            bottleneck = (self.dim_time(bw=bw).argmax(axis=-1)[..., np.newaxis] == dims).astype(float)
+            step = 2 / (iteration + 3)
+            shares = (1 - step) * shares + step * bottleneck
+
+        return bounds
+
+    def _compute_msg_sizes(self) -> np.ndarray:
+        communicators = (self.communicator.forward_communicator,
+                         self.communicator.input_grad_communicator,
+                         self.communicator.weight_grad_communicator)
+
+        # hashable dimension orders
+        dims_order = tuple((collective, tuple(self.communicator.dims_order[collective]))
+                           for collective in Collective if collective in self.communicator.dims_order)
+
+        pipeline_communicator = self.communicator.pipeline_communicator
+        pipeline_communicator = tuple(pipeline_communicator) if pipeline_communicator is not None else None
+
+        # (layer, communicator) of every layer communicating over a group, per each phase type
+        layer_communicators = [list() for _ in communicators]
+        if len(self.communicator.layer_groups) > 0:
+            for layer_idx, layer in enumerate(self.workload.layers):
+                for phase_idx, group_name in enumerate(self.communicator.get_layer_group_names(layer_name=layer.name)):
+                    if group_name is not None:
+                        layer_communicators[phase_idx].append((layer_idx, tuple(self.communicator.groups[group_name])))
+
+        # [layer, phase, dim]
+        return np.stack([compute_phase_msg_sizes(workload=self.workload, phase_idx=phase_idx,
+                                                 communicator=tuple(communicator), dims_order=dims_order,
+                                                 pipeline_communicator=pipeline_communicator,
+                                                 layer_communicators=tuple(layer_communicators[phase_idx]))
+                         for phase_idx, communicator in enumerate(communicators)], axis=1)
+
+    def _compute_latencies(self) -> np.ndarray:
+        latencies = np.zeros(self.msg_sizes.shape)
+
+        if self.network.latency is None:
+            return latencies
+
+        for layer_idx, layer in enumerate(self.workload.layers):
+            for phase_idx, phase in enumerate((layer.forward, layer.input_grad, layer.weight_grad)):
+                communicator = self.communicator.get_phase_communicator(phase_idx=phase_idx, comm_type=phase.comm_type,
+                                                                        layer_name=layer.name)
+                latencies[layer_idx, phase_idx] = compute_latencies(comm_type=phase.comm_type,
+                                                                    communicator=communicator, network=self.network)
+
+        return np.where(self.msg_sizes > 0, latencies, 0.0)
+
+
+@lru_cache(maxsize=65536)
+def compute_phase_msg_sizes(workload: Workload, phase_idx: int, communicator: Tuple[int, ...],
+                            dims_order: Tuple[Tuple[Collective, Tuple[int, ...]], ...] = (),
+                            pipeline_communicator: Optional[Tuple[int, ...]] = None,
+                            layer_communicators: Tuple[Tuple[int, Tuple[int, ...]], ...] = ()) -> np.ndarray:
+    """
+    Message size per each [layer, dim] of one phase type of the workload, memoized per communicator and
+    dimension orders, so that designs sharing them (e.g., the same TP mapping) share the computation.
+
+    :param workload: target workload
+    :param phase_idx: phase type (0: Forward, 1: InputGrad, 2: WeightGrad)
+    :param communicator: communicator of the phase type
+    :param dims_order: (collective, dimension traversal order) pairs, for collectives not using the default order
+    :param pipeline_communicator: communicator of point-to-point phases (None if not pipelined)
+    :param layer_communicators: (layer index, communicator) pairs, for layers communicating over another group
+    :return: read-only message sizes of shape (layers_count, dims_count)
+    """
+    dims_orders = {collective: order for collective, order in dims_order}
+    layer_communicator = dict(layer_communicators)
+    msg_sizes = np.zeros((workload.layers_count, len(communicator)))
+
+    for layer_idx, layer in enumerate(workload.layers):
+        phase = (layer.forward, layer.input_grad, layer.weight_grad)[phase_idx]
+
+        phase_communicator = layer_communicator.get(layer_idx, communicator)
+        if phase.comm_type == Collective.PointToPoint:
+            if pipeline_communicator is None:
+                raise EvaluatorError("Point-to-point phases require a Pipeline communicator.")
+            phase_communicator = pipeline_communicator
+
+        msg_sizes[layer_idx] = memoized_message_sizes(comm_type=phase.comm_type, comm_size=phase.comm_size,
+                                                      communicator=phase_communicator,
+                                                      dims_count=len(communicator),
+                                                      dims_order=dims_orders.get(phase.comm_type))
+
+    msg_sizes.flags.writeable = False
+    return msg_sizes
+
+
+class _TrainingLoopProbe:
+    """
+    Stand-in for Model, handed to a training loop so that its e2e time expression can be inspected.
+    """
+
+    def __init__(self, workload: Workload, coll_time: gp.tupledict, dim_time: gp.tupledict):
+        self.workload = workload
+        self.coll_time = coll_time
+        self.dim_time = dim_time
+
+
+@lru_cache(maxsize=64)
+def compile_training_loop(training_loop: Callable, workload: Workload,
+                          dims_count: int) -> Tuple[float, np.ndarray, np.ndarray]:
+    """
+    Compile a (linear) training loop into the weights of its e2e time expression,
+    i.e., e2e time = constant + sum(coll_time * coll_time_weights) + sum(dim_time * dim_time_weights).
+    The training loop is given a probe exposing only workload, coll_time, and dim_time.
+
+    :param training_loop: training loop function
+    :param workload: target workload
+    :param dims_count: number of network dimensions
+    :return: (constant, coll_time_weights of shape (layers, 3), dim_time_weights of shape (layers, 3, dims))
+    """
+    probe_model = gp.Model("LibraTrainingLoopProbe")
+
+    try:
+        coll_time = probe_model.addVars(workload.layers_count, 3, lb=0, vtype=GRB.CONTINUOUS)
+        dim_time = probe_model.addVars(workload.layers_count, 3, dims_count, lb=0, vtype=GRB.CONTINUOUS)
+        probe_model.update()
+
+        try:
+            e2e_time = training_loop(_TrainingLoopProbe(workload=workload, coll_time=coll_time, dim_time=dim_time))
+        except AttributeError as e:
+            raise EvaluatorError(f"Training loop {training_loop.__name__} cannot be evaluated: {e}")
+
+        if isinstance(e2e_time, (int, float)):
+            e2e_time = gp.LinExpr(e2e_time)
+
+        if not isinstance(e2e_time, gp.LinExpr):
+            raise EvaluatorError(f"Training loop {training_loop.__name__} is not linear in coll_time and dim_time.")
+
+        # map each variable back into its [layer, phase(, dim)] position
+        positions = {var.index: ('coll', key) for key, var in coll_time.items()}
+        positions.update({var.index: ('dim', key) for key, var in dim_time.items()})
+
+        coll_time_weights = np.zeros((workload.layers_count, 3))
+        dim_time_weights = np.zeros((workload.layers_count, 3, dims_count))
+
+        for i in range(e2e_time.size()):
+            kind, key = positions[e2e_time.getVar(i).index]
+            weights = coll_time_weights if kind == 'coll' else dim_time_weights
+            weights[key] += e2e_time.getCoeff(i)
+
+        return e2e_time.getConstant(), coll_time_weights, dim_time_weights
+    finally:
+        probe_model.dispose()
+
+
+class _PhaseProbe:
+    """
+    Stand-in for Phase whose compute time is a variable, so that its weight in the e2e time can be inspected.
+    """
+
+    def __init__(self, phase: Phase, compute_time: gp.Var):
+        self.compute_time = compute_time
+        self.comm_type = phase.comm_type
+        self.comm_size = phase.comm_size
+
+
+def compile_compute_weights(training_loop: Callable, workload: Workload,
+                            dims_count: int) -> Optional[Tuple[float, np.ndarray]]:
+    """
+    Split the constant of a (linear) training loop's e2e time expression (see compile_training_loop)
+    into the weight of each compute time, i.e., constant = rest + sum(compute_time * compute_weights).
+    The training loop is given the compute times as variables, so a training loop using them other than linearly
+    (e.g., comparing them) can't be split.
+
+    :param training_loop: training loop function
+    :param workload: target workload
+    :param dims_count: number of network dimensions
+    :return: (rest of the constant, compute_weights of shape (layers, 3)), None if the constant can't be split
+    """
+    probe_model = gp.Model("LibraComputeProbe")
+
+    try:
+        compute_time = probe_model.addVars(workload.layers_count, 3, lb=0, vtype=GRB.CONTINUOUS)
+        coll_time = probe_model.addVars(workload.layers_count, 3, lb=0, vtype=GRB.CONTINUOUS)
+        dim_time = probe_model.addVars(workload.layers_count, 3, dims_count, lb=0, vtype=GRB.CONTINUOUS)
+        probe_model.update()
+
+        layers = [Layer(forward=_PhaseProbe(phase=layer.forward, compute_time=compute_time[layer_idx, 0]),
+                        input_grad=_PhaseProbe(phase=layer.input_grad, compute_time=compute_time[layer_idx, 1]),
+                        weight_grad=_PhaseProbe(phase=layer.weight_grad, compute_time=compute_time[layer_idx, 2]),
+                        stage=layer.stage, name=layer.name)
+                  for layer_idx, layer in enumerate(workload.layers)]
+        probe_workload = Workload(layers=layers, name=workload.name)
+
+        try:
+            e2e_time = training_loop(_TrainingLoopProbe(workload=probe_workload, coll_time=coll_time,
+                                                        dim_time=dim_time))
+        except (AttributeError, TypeError, gp.GurobiError):
+            return None
+
+        if isinstance(e2e_time, (int, float)):
+            e2e_time = gp.LinExpr(e2e_time)
+
+        if not isinstance(e2e_time, gp.LinExpr):
+            return None
+
+        # map each compute time variable back into its [layer, phase] position
+        positions = {var.index: key for key, var in compute_time.items()}
+
+        compute_weights = np.zeros((workload.layers_count, 3))
+        for i in range(e2e_time.size()):
+            key = positions.get(e2e_time.getVar(i).index)
+            if key is not None:
+                compute_weights[key] += e2e_time.getCoeff(i)
+
+        return e2e_time.getConstant(), compute_weights
+    finally:
+        probe_model.dispose()
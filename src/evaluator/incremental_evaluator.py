@@ -0,0 +1,514 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+from src.communicator import Communicator
+from src.cost_model import CostModel
+from src.evaluator.evaluator import Evaluator, compile_compute_weights, compile_training_loop
+from src.evaluator.evaluator_error import EvaluatorError
+from src.model import Model, SolverObjective, SolverResult, compute_latencies, memoized_message_sizes
+from src.network import Network
+from src.task_graph import TaskGraphTrainingLoop
+from src.workload import Collective, Layer, Phase, Workload
+
+
+class IncrementalEvaluator:
+    """
+    IncrementalEvaluator keeps the e2e time of a workload under fixed bandwidths up to date through small edits
+    (e.g., of an interactive what-if session): a phase's compute time, collective, or communication size,
+    the communicator, or a dimension's bandwidth.
+    The contribution of every [layer, phase] to the e2e time is cached, and an edit only re-evaluates
+    the phases it changes (e.g., the phases with traffic on a dimension whose bandwidth changes).
+
+    How much the e2e time depends on each dimension's bandwidth (its critical time, see critical_dims_changed)
+    is kept up to date as well, so that the bandwidths are only re-solved (see resolve) once an edit shifts it.
+
+    Only linear training loops are supported: an edit can move the critical path of a task graph anywhere,
+    so task graphs should be re-evaluated with Evaluator instead.
+    """
+
+    # relative tolerance of the dimensions tied as a phase's bottleneck
+    bottleneck_tolerance = 1e-6
+
+    # shift of the critical times (relative to the largest one) invalidating the anchored bandwidths
+    invalidation_tolerance = 1e-2
+
+    def __init__(self,
+                 network: Network,
+                 workload: Workload,
+                 communicator: Communicator,
+                 training_loop: Callable,
+                 bw: List[float],
+                 cost_model: Optional[CostModel] = None,
+                 bw_scale: Optional[List[float]] = None):
+        """
+        Initializer.
+
+        :param network: target network
+        :param workload: target workload (copied, never modified)
+        :param communicator: target communicator
+        :param training_loop: linear training loop function (see inputs/training_loop)
+        :param bw: initial bandwidth per each dimension (e.g., the solved bandwidths)
+        :param cost_model: cost model, required only to evaluate network cost and to re-solve
+        :param bw_scale: fraction of each dimension's bandwidth the workload gets (as in Model), 1 if None
+        """
+        if isinstance(training_loop, TaskGraphTrainingLoop):
+            raise EvaluatorError("Task graph training loops can't be evaluated incrementally, use Evaluator instead.")
+
+        evaluator = Evaluator(network=network, workload=workload, communicator=communicator,
+                              training_loop=training_loop, cost_model=cost_model, bw_scale=bw_scale)
+
+        self.network = network
+        self.communicator = communicator
+        self.training_loop = training_loop
+        self.cost_model = cost_model
+        self.bw_scale = np.asarray(bw_scale, dtype=float) if bw_scale is not None else None
+        self.name = workload.name
+
+        # layers are replaced, never modified, so that the given workload (and memoizations keyed by it) stay intact
+        self._layers = list(workload.layers)
+
+        # collective type (value) and communicator group (None for the phase type's) of each [layer, phase],
+        # to find the phases a communicator change affects
+        self._comm_types = np.array([[phase.comm_type.value for phase in (layer.forward, layer.input_grad,
+                                                                         layer.weight_grad)]
+                                     for layer in self._layers], dtype=int).reshape(len(self._layers), 3)
+        self._group_names = self._get_group_names(communicator=communicator)
+
+        # message size and latency per each [layer, phase, dim], and their weights in the e2e time
+        self._msg_sizes = np.array(evaluator.msg_sizes)
+        self._latencies = np.array(evaluator.latencies)
+        self._coll_time_weights = np.array(evaluator.coll_time_weights)
+        self._dim_time_weights = np.array(evaluator.dim_time_weights)
+        self._compiled_cost = evaluator.compiled_cost
+
+        # e2e time = constant + sum(compute_time * compute_weights) + sum(phase contributions)
+        # (without compute weights, i.e., if the training loop doesn't use compute times linearly,
+        # the constant includes the compute times and is recompiled whenever one changes)
+        self._compute_times = workload.compute_times()
+        self._compile_constant()
+
+        self._bw = np.array(bw, dtype=float)
+        if self._bw.shape != (network.dims_count,) or (self._bw < 0).any():
+            raise EvaluatorError(f"Bandwidths {bw} should be a non-negative value per each dimension.")
+
+        # number of phases re-evaluated by edits
+        self.updates_count = 0
+
+        # critical time of each dimension under the anchored (initial or re-solved) bandwidths
+        self._anchor_critical_times: Optional[np.ndarray] = None
+
+        self.refresh()
+        self._anchor_critical_times = self._critical_times.copy()
+
+    @property
+    def bw(self) -> np.ndarray:
+        return self._bw.copy()
+
+    @property
+    def workload(self) -> Workload:
+        """
+        Workload as edited.
+
+        :return: copy of the edited workload
+        """
+        return Workload(layers=list(self._layers), name=self.name)
+
+    @property
+    def e2e_time(self) -> float:
+        return float(self._constant + self._compute_total + self._comm_total)
+
+    @property
+    def phase_contributions(self) -> np.ndarray:
+        """
+        Contribution of each [layer, phase]'s communication to the e2e time.
+
+        :return: contributions of shape (layers_count, 3)
+        """
+        return self._contributions.copy()
+
+    @property
+    def critical_dims(self) -> np.ndarray:
+        """
+        Bottleneck dimension of each [layer, phase] under the current bandwidths.
+
+        :return: dimension of shape (layers_count, 3), -1 for phases without traffic
+        """
+        return np.where((self._msg_sizes > 0).any(axis=-1), self._dim_time.argmax(axis=-1), -1)
+
+    @property
+    def critical_times(self) -> np.ndarray:
+        """
+        Critical time of each dimension: the e2e time saved per GB/s added to it,
+        over the phases bottlenecked on it (the time of tied dimensions is charged to each of them).
+        At the optimum of a total bandwidth budget, it's balanced across the dimensions.
+
+        :return: critical times of shape (dims_count,), in ns per GB/s
+        """
+        return self._critical_times.copy()
+
+    @property
+    def critical_dims_changed(self) -> bool:
+        """
+        Whether edits shifted the critical time of a dimension by more than invalidation_tolerance of the largest
+        since the initial (or last re-solved) bandwidths, i.e., moved which dimensions the e2e time depends on.
+        """
+        if not np.isfinite(self._critical_times).all():
+            return True
+
+        scale = self._anchor_critical_times.max(initial=0.0)
+        shift = np.abs(self._critical_times - self._anchor_critical_times).max(initial=0.0)
+        return shift > IncrementalEvaluator.invalidation_tolerance * scale if scale > 0 else shift > 0
+
+    def network_cost(self) -> float:
+        """
+        Network cost under the current bandwidths.
+
+        :return: network cost
+        """
+        if self._compiled_cost is None:
+            raise EvaluatorError("Cost model is not given to the evaluator.")
+
+        return float(self._compiled_cost.evaluate(bw=self._bw))
+
+    def objective_value(self, objective: SolverObjective) -> float:
+        """
+        Solver objective value under the current bandwidths.
+
+        :param objective: solver objective
+        :return: objective value
+        """
+        if objective == SolverObjective.PerfOpt:
+            return self.e2e_time
+
+        if objective == SolverObjective.PerfPerCostOpt:
+            # same scaling as Model._set_objective
+            return self.e2e_time * self.network_cost() / 1e10
+
+        # should not reach here
+        raise EvaluatorError(f"Objective {objective} is unknown.")
+
+    def set_bw(self, dim: int, bw: float) -> float:
+        """
+        Change the bandwidth of a dimension, re-evaluating only the phases with traffic on it.
+
+        :param dim: dimension index
+        :param bw: new bandwidth (in GB/s)
+        :return: new e2e time
+        """
+        if not 0 <= dim < self.network.dims_count:
+            raise EvaluatorError(f"Dimension {dim} is out of the {self.network.dims_count} network dimensions.")
+        if bw < 0:
+            raise EvaluatorError(f"Bandwidth ({bw}) should be >= 0.")
+
+        self._bw[dim] = bw
+
+        layer_idx, phase_idx = np.nonzero(self._msg_sizes[:, :, dim] > 0)
+        self._update_phases(layer_idx=layer_idx, phase_idx=phase_idx)
+
+        return self.e2e_time
+
+    def set_phase(self, layer_idx: int, phase_idx: int, compute_time: Optional[float] = None,
+                  comm_type: Optional[Collective] = None, comm_size: Optional[float] = None) -> float:
+        """
+        Change the values of a phase (None keeps a value as is), re-evaluating only that phase.
+        A new collective type re-compiles the training loop (which may branch on it) instead.
+
+        :param layer_idx: layer index
+        :param phase_idx: phase type (0: Forward, 1: InputGrad, 2: WeightGrad)
+        :param compute_time: new compute time (in ns)
+        :param comm_type: new collective type
+        :param comm_size: new "initial" communication size (in Bytes)
+        :return: new e2e time
+        """
+        if not 0 <= layer_idx < len(self._layers) or not 0 <= phase_idx < 3:
+            raise EvaluatorError(f"Phase [{layer_idx}, {phase_idx}] is out of the workload.")
+
+        layer = self._layers[layer_idx]
+        phases = [layer.forward, layer.input_grad, layer.weight_grad]
+        phase = phases[phase_idx]
+
+        phases[phase_idx] = Phase(compute_time=phase.compute_time if compute_time is None else compute_time,
+                                  comm_type=phase.comm_type if comm_type is None else comm_type,
+                                  comm_size=phase.comm_size if comm_size is None else comm_size)
+        self._layers[layer_idx] = Layer(forward=phases[0], input_grad=phases[1], weight_grad=phases[2],
+                                        stage=layer.stage, name=layer.name)
+
+        if comm_type is not None and comm_type != phase.comm_type:
+            self._comm_types[layer_idx, phase_idx] = comm_type.value
+            msg_sizes, latencies = self._get_phase_collective(layer_idx=layer_idx, phase_idx=phase_idx)
+            self._msg_sizes[layer_idx, phase_idx] = msg_sizes
+            self._latencies[layer_idx, phase_idx] = latencies
+            self._compute_times[layer_idx, phase_idx] = phases[phase_idx].compute_time
+
+            _, self._coll_time_weights, self._dim_time_weights = compile_training_loop.__wrapped__(
+                training_loop=self.training_loop, workload=self.workload, dims_count=self.network.dims_count)
+            self._compile_constant()
+            self.refresh()
+            return self.e2e_time
+
+        if compute_time is not None and compute_time != phase.compute_time:
+            old_compute_time = self._compute_times[layer_idx, phase_idx]
+            self._compute_times[layer_idx, phase_idx] = compute_time
+
+            if self._compute_weights is not None:
+                self._compute_total += self._compute_weights[layer_idx, phase_idx] * (compute_time - old_compute_time)
+            else:
+                self._compile_constant()
+
+        if comm_size is not None and comm_size != phase.comm_size:
+            msg_sizes, latencies = self._get_phase_collective(layer_idx=layer_idx, phase_idx=phase_idx)
+            self._msg_sizes[layer_idx, phase_idx] = msg_sizes
+            self._latencies[layer_idx, phase_idx] = latencies
+            self._update_phases(layer_idx=np.array([layer_idx]), phase_idx=np.array([phase_idx]))
+
+        return self.e2e_time
+
+    def set_communicator(self, communicator: Communicator) -> float:
+        """
+        Change the communicator, re-evaluating only the phases over a changed communicator:
+        a phase type's or group's communicator, the pipeline communicator, or a collective's dimension order.
+        New layer groups re-match every distinct layer name, and re-evaluate the phases whose group changes.
+        The communicators are compared against the current one, so a communicator modified in place goes unnoticed.
+
+        :param communicator: new communicator
+        :return: new e2e time
+        """
+        old_communicator = self.communicator
+        self.communicator = communicator
+
+        changed = np.zeros(self._comm_types.shape, dtype=bool)
+        point_to_point = self._comm_types == Collective.PointToPoint.value
+
+        if communicator.layer_groups != old_communicator.layer_groups:
+            group_names = self._get_group_names(communicator=communicator)
+            changed |= group_names != self._group_names
+            self._group_names = group_names
+
+        old_communicators = (old_communicator.forward_communicator, old_communicator.input_grad_communicator,
+                             old_communicator.weight_grad_communicator)
+        communicators = (communicator.forward_communicator, communicator.input_grad_communicator,
+                         communicator.weight_grad_communicator)
+        for phase_idx, (old_phase_communicator, phase_communicator) in enumerate(zip(old_communicators,
+                                                                                     communicators)):
+            if old_phase_communicator != phase_communicator:
+                changed[:, phase_idx] |= np.equal(self._group_names[:, phase_idx], None)
+
+        for group_name in set(old_communicator.groups) | set(communicator.groups):
+            if old_communicator.groups.get(group_name) != communicator.groups.get(group_name):
+                changed |= np.equal(self._group_names, group_name)
+
+        # point-to-point sends only go over the pipeline communicator
+        changed &= ~point_to_point
+        if old_communicator.pipeline_communicator != communicator.pipeline_communicator:
+            changed |= point_to_point
+
+        for collective in set(old_communicator.dims_order) | set(communicator.dims_order):
+            if old_communicator.get_dims_order(collective) != communicator.get_dims_order(collective):
+                changed |= self._comm_types == collective.value
+
+        layer_idx, phase_idx = np.nonzero(changed)
+        for layer, phase in zip(layer_idx, phase_idx):
+            msg_sizes, latencies = self._get_phase_collective(layer_idx=int(layer), phase_idx=int(phase))
+            self._msg_sizes[layer, phase] = msg_sizes
+            self._latencies[layer, phase] = latencies
+
+        self._update_phases(layer_idx=layer_idx, phase_idx=phase_idx)
+
+        return self.e2e_time
+
+    def refresh(self) -> None:
+        """
+        Re-evaluate every phase from scratch (e.g., to discard the rounding accumulated over many edits).
+        """
+        layer_idx, phase_idx = np.indices(self._coll_time_weights.shape)
+        layer_idx, phase_idx = layer_idx.ravel(), phase_idx.ravel()
+
+        self._dim_time = self._get_dim_time(layer_idx=layer_idx, phase_idx=phase_idx).reshape(self._msg_sizes.shape)
+        self._coll_time = self._dim_time.max(axis=-1)
+        self._contributions = self._get_contributions(layer_idx=layer_idx, phase_idx=phase_idx,
+                                                      dim_time=self._dim_time.reshape(-1, self.network.dims_count)) \
+            .reshape(self._coll_time.shape)
+
+        self._phase_critical_times = self._get_critical_times(
+            layer_idx=layer_idx, phase_idx=phase_idx,
+            dim_time=self._dim_time.reshape(-1, self.network.dims_count)).reshape(self._msg_sizes.shape)
+
+        self._comm_total = float(self._contributions.sum())
+        self._critical_times = self._phase_critical_times.sum(axis=(0, 1))
+        self._compute_total = float((self._compute_weights * self._compute_times).sum()) \
+            if self._compute_weights is not None else 0.0
+
+    def resolve(self, constraint: Callable[[], None], objective: SolverObjective, force: bool = False,
+                verbose: bool = False) -> Optional[SolverResult]:
+        """
+        Re-solve the bandwidths of the edited workload, warm-started from the current bandwidths,
+        if edits shifted the critical dimensions (see critical_dims_changed), and adopt them.
+        The current Model state is discarded.
+
+        :param constraint: constraint function (see inputs/constraints)
+        :param objective: solver objective
+        :param force: re-solve even if the critical dimensions didn't shift
+        :param verbose: True to print the solver log
+        :return: solver result (None if no re-solve is needed)
+        """
+        if self.cost_model is None:
+            raise EvaluatorError("Cost model is not given to the evaluator.")
+
+        if not force and not self.critical_dims_changed:
+            return None
+
+        Model.reset_model()
+        Model.initialize_model(network=self.network, cost_model=self.cost_model)
+        Model.apply_constraint(constraint=constraint)
+
+        Model(workload=self.workload, communicator=self.communicator, training_loop=self.training_loop,
+              bw_scale=list(self.bw_scale) if self.bw_scale is not None else None)
+        Model.set_start(bw=list(self._bw))
+
+        result = Model.solve(objective=objective, verbose=verbose)
+
+        self._bw = np.array(result.bw, dtype=float)
+        self.refresh()
+        self._anchor_critical_times = self._critical_times.copy()
+
+        return result
+
+    def _compile_constant(self) -> None:
+        """
+        Compile the constant of the training loop, split into compute weights if possible.
+        """
+        compute_weights = compile_compute_weights(training_loop=self.training_loop, workload=self.workload,
+                                                  dims_count=self.network.dims_count)
+
+        if compute_weights is not None:
+            self._constant, self._compute_weights = compute_weights
+        else:
+            # recompiled as is (the memoized version would keep every edited workload)
+            self._constant, _, _ = compile_training_loop.__wrapped__(training_loop=self.training_loop,
+                                                                      workload=self.workload,
+                                                                      dims_count=self.network.dims_count)
+            self._compute_weights = None
+
+        self._compute_total = float((self._compute_weights * self._compute_times).sum()) \
+            if self._compute_weights is not None else 0.0
+
+    def _get_phase_collective(self, layer_idx: int, phase_idx: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Message size and latency per each dimension of a phase (as in Model._get_collectives).
+
+        :param layer_idx: layer index
+        :param phase_idx: phase type (0: Forward, 1: InputGrad, 2: WeightGrad)
+        :return: (message sizes, latencies), both of shape (dims_count,)
+        """
+        layer = self._layers[layer_idx]
+        phase = (layer.forward, layer.input_grad, layer.weight_grad)[phase_idx]
+
+        communicator = self.communicator.get_phase_communicator(phase_idx=phase_idx, comm_type=phase.comm_type,
+                                                                layer_name=layer.name)
+        dims_order = self.communicator.get_dims_order(phase.comm_type)
+        msg_sizes = np.array(memoized_message_sizes(comm_type=phase.comm_type, comm_size=phase.comm_size,
+                                                    communicator=tuple(communicator),
+                                                    dims_count=self.network.dims_count,
+                                                    dims_order=tuple(dims_order) if dims_order is not None else None))
+
+        # a scaled bandwidth takes as long as a message scaled inversely
+        if self.bw_scale is not None:
+            msg_sizes = msg_sizes / self.bw_scale
+
+        latencies = np.array(compute_latencies(comm_type=phase.comm_type, communicator=communicator,
+                                               network=self.network), dtype=float)
+
+        return msg_sizes, np.where(msg_sizes > 0, latencies, 0.0)
+
+    def _get_group_names(self, communicator: Communicator) -> np.ndarray:
+        """
+        Communicator group of each [layer, phase], matched once per each distinct layer name.
+
+        :param communicator: communicator to match the layer names against
+        :return: group names of shape (layers_count, 3), None for the phase type's communicator
+        """
+        layer_names, name_idx = np.unique([layer.name for layer in self._layers], return_inverse=True)
+        group_names = np.empty((len(layer_names), 3), dtype=object)
+        for i, layer_name in enumerate(layer_names):
+            group_names[i] = communicator.get_layer_group_names(layer_name=str(layer_name))
+
+        return group_names[name_idx.reshape(-1)].reshape(len(self._layers), 3)
+
+    def _get_dim_time(self, layer_idx: np.ndarray, phase_idx: np.ndarray) -> np.ndarray:
+        msg_sizes = self._msg_sizes[layer_idx, phase_idx]
+
+        # dims without traffic take no time, regardless of their bandwidth
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(msg_sizes > 0, self._latencies[layer_idx, phase_idx] + msg_sizes / self._bw, 0.0)
+
+    def _get_contributions(self, layer_idx: np.ndarray, phase_idx: np.ndarray, dim_time: np.ndarray) -> np.ndarray:
+        coll_time_weights = self._coll_time_weights[layer_idx, phase_idx]
+        dim_time_weights = self._dim_time_weights[layer_idx, phase_idx]
+
+        # unweighted times never contribute, even if infinite (i.e., zero bandwidth)
+        with np.errstate(invalid='ignore'):
+            coll_time_contribution = np.where(coll_time_weights != 0, dim_time.max(axis=-1) * coll_time_weights, 0.0)
+            dim_time_contribution = np.where(dim_time_weights != 0, dim_time * dim_time_weights, 0.0)
+
+        return coll_time_contribution + dim_time_contribution.sum(axis=-1)
+
+    def _update_phases(self, layer_idx: np.ndarray, phase_idx: np.ndarray) -> None:
+        """
+        Re-evaluate the given phases, and update the e2e time by the change of their contributions.
+
+        :param layer_idx: layer index of each phase
+        :param phase_idx: phase type of each phase
+        """
+        if len(layer_idx) == 0:
+            return
+
+        dim_time = self._get_dim_time(layer_idx=layer_idx, phase_idx=phase_idx)
+        contributions = self._get_contributions(layer_idx=layer_idx, phase_idx=phase_idx, dim_time=dim_time)
+        critical_times = self._get_critical_times(layer_idx=layer_idx, phase_idx=phase_idx, dim_time=dim_time)
+        old_contributions = self._contributions[layer_idx, phase_idx]
+        old_critical_times = self._phase_critical_times[layer_idx, phase_idx]
+
+        self._dim_time[layer_idx, phase_idx] = dim_time
+        self._coll_time[layer_idx, phase_idx] = dim_time.max(axis=-1)
+        self._contributions[layer_idx, phase_idx] = contributions
+        self._phase_critical_times[layer_idx, phase_idx] = critical_times
+
+        # infinite times (i.e., zero bandwidth) can't be subtracted back out
+        if np.isfinite(contributions).all() and np.isfinite(old_contributions).all():
+            self._comm_total += float(contributions.sum() - old_contributions.sum())
+        else:
+            self._comm_total = float(self._contributions.sum())
+
+        if np.isfinite(critical_times).all() and np.isfinite(old_critical_times).all():
+            self._critical_times += critical_times.sum(axis=0) - old_critical_times.sum(axis=0)
+        else:
+            self._critical_times = self._phase_critical_times.sum(axis=(0, 1))
+
+        self.updates_count += len(layer_idx)
+
+    def _get_critical_times(self, layer_idx: np.ndarray, phase_idx: np.ndarray, dim_time: np.ndarray) -> np.ndarray:
+        """
+        Critical time of each dimension of the given phases (see critical_times).
+
+        :param layer_idx: layer index of each phase
+        :param phase_idx: phase type of each phase
+        :param dim_time: dim time of each phase, of shape (phases_count, dims_count)
+        :return: critical times of shape (phases_count, dims_count)
+        """
+        msg_sizes = self._msg_sizes[layer_idx, phase_idx]
+
+        # collective times charge their bottleneck dimensions (every tied one), dim times charge their own
+        bottlenecks = (dim_time > 0) & np.isclose(dim_time, dim_time.max(axis=-1, keepdims=True),
+                                                  rtol=IncrementalEvaluator.bottleneck_tolerance, atol=0)
+        weights = np.where(bottlenecks, self._coll_time_weights[layer_idx, phase_idx][:, np.newaxis], 0.0) \
+            + self._dim_time_weights[layer_idx, phase_idx]
+
+        # d(latency + msg / bw)/d(bw) = -msg / bw^2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where((msg_sizes > 0) & (weights != 0), weights * msg_sizes / self._bw ** 2, 0.0)
@@ -3,11 +3,24 @@ This source code is licensed under the MIT license found in the
 LICENSE file in the root directory of this source tree.
 """
 
+import os
+
 from inputs.libra_configs import libra_configs
 from src.communicator import CommunicatorError
+from src.constraint import ConstraintError
 from src.cost_model import CostModelError
-from src.model import Model, ModelError
+from src.decomposition import DecompositionError, DecompositionSolver
+from src.evaluator import Evaluator, EvaluatorError
+from src.model import Model, ModelError, ParameterCache, WorkloadEntry
 from src.network import NetworkError
+from src.results_store import ResultsStore, ResultRecord, ResultsStoreError, compute_input_hash
+from src.robust import RobustError, scenario_aggregation, scenario_entries, score_scenarios
+from src.search import DiscreteBwSolver, SearchError
+from src.sensitivity import SensitivityError, analyze_sensitivity
+from src.simulator import Simulator, SimulatorError
+from src.task_graph import TaskGraphError
+from src.timeline import Timeline, TimelineError
+from src.trace import TraceError
 from src.workload import WorkloadError
 
 
@@ -27,18 +40,198 @@ def libra() -> None:
     cost_model = configs['cost_model']
     constraint = configs['constraint']
     objective = configs['objective']
+    model_scaling = configs['model_scaling']
+    parameter_tuning = configs['parameter_tuning']
+    workloads = configs['workloads']
+    aggregation = configs['aggregation']
+    scenarios = configs['scenarios']
+    robust_objective = configs['robust_objective']
+    compute_scaling = configs['compute_scaling']
+    compute_scale_sweep = configs['compute_scale_sweep']
+    results_store_path = configs['results_store']
+    sensitivity = configs['sensitivity']
+    discrete_bw = configs['discrete_bw']
+    decomposition = configs['decomposition']
+    decomposition_reference = configs['decomposition_reference']
+    simulation = configs['simulation']
+    timeline_path = configs['timeline']
 
     # initialize model
-    Model.initialize_model(network=network, cost_model=cost_model)
+    Model.initialize_model(network=network, cost_model=cost_model, scaling=model_scaling)
+
+    # solve with the tuned parameters of the problem class, if cached
+    if parameter_tuning is not None:
+        Model.set_parameter_cache(parameter_cache=ParameterCache(path=parameter_tuning['path']))
+
+    # apply constraints (named after the constraint function, for infeasibility reports)
+    Model.apply_constraint(constraint=constraint)
+
+    # rescale compute times (e.g., for another NPU generation), if requested
+    if compute_scaling is not None:
+        workload = compute_scaling.apply(workload=workload)
+        for entry in (workloads if workloads is not None else list()):
+            entry.workload = compute_scaling.apply(workload=entry.workload)
+
+    # formulate the scenarios of the workload as jointly optimized workloads
+    entries = workloads
+    if scenarios is not None:
+        if workloads is not None:
+            raise RobustError("Scenarios are given for a single workload, but several workloads are given.")
+
+        entries = scenario_entries(workload=workload, communicator=communicator, training_loop=training_loop,
+                                   scenarios=scenarios.scenarios)
+        aggregation = scenario_aggregation(objective=robust_objective)
+
+    if decomposition is not None:
+        if sensitivity or discrete_bw or compute_scale_sweep is not None:
+            raise DecompositionError("Sensitivity, discrete bandwidths, and compute scale sweeps "
+                                     "require the monolithic model.")
+
+        # solve by decomposition, without building the monolithic model
+        entries = entries if entries is not None else \
+            [WorkloadEntry(workload=workload, communicator=communicator, training_loop=training_loop)]
+        decomposition_solver = DecompositionSolver(entries=entries, **decomposition)
+        result = decomposition_solver.solve(objective=objective, aggregation=aggregation)
+
+        print("=" * 80)
+        print("LIBRA Decomposition Result:")
+        print(f"Status: {result.status}")
+        print("\t".join(f"{bw:.2f}" for bw in result.bw))
+
+        # compare against the monolithic solve (on small cases), if requested
+        reference = None
+        if decomposition_reference:
+            Model.add_workloads(entries=entries)
+            reference = Model.solve(objective=objective, verbose=False, aggregation=aggregation)
+        decomposition_solver.print_convergence(reference=reference)
+    else:
+        # instantiate target models
+        if entries is not None:
+            Model.add_workloads(entries=entries)
+        else:
+            Model(workload=workload, communicator=communicator, training_loop=training_loop)
+
+        # tune the solver parameters of the problem class first, if not cached yet
+        if parameter_tuning is not None and \
+                Model.get_problem_signature(objective=objective, aggregation=aggregation) not in Model.parameter_cache:
+            Model.tune(objective=objective, aggregation=aggregation, time_limit=parameter_tuning.get('time_limit', 60))
+
+        # execute QP solver
+        result = Model.solve(objective=objective, verbose=True, aggregation=aggregation)
+
+    # analyze sensitivity, if requested
+    if sensitivity:
+        analyze_sensitivity(result=result).print_report()
+
+    # pick discrete bandwidths, if requested
+    if discrete_bw:
+        result = DiscreteBwSolver(continuous_result=result).solve()
+
+        print("=" * 80)
+        print("Discrete BW:")
+        print(f"Status: {result.status}")
+        print("BW: ", end="")
+        for bw in result.bw:
+            print(f"{bw:.2f}", end="\t")
+        print()
+        print(f"E2E Time: {result.e2e_time:.2f}, Network Cost: {result.network_cost:.2f}")
+
+    # print the e2e time of each jointly optimized workload (or scenario)
+    if entries is not None:
+        for entry in entries:
+            e2e_time = result.workload_e2e_times[entry.name]
+            sla = f" (slowdown: {e2e_time / entry.sla:.3f})" if entry.sla is not None else ""
+            print(f"{entry.name} E2E Time: {e2e_time:.2f}{sla}")
+
+    # score the bandwidths against sampled scenarios, if requested
+    if scenarios is not None and scenarios.distribution is not None:
+        evaluator = Evaluator(network=network, workload=workload, communicator=communicator,
+                              training_loop=training_loop)
+        score_scenarios(evaluator=evaluator, bw=result.bw, distribution=scenarios.distribution).print_report()
+
+    # print the network cost breakdown
+    print("Network Cost Breakdown: ", end="")
+    print(", ".join(f"{name}: {cost:.2f}" for name, cost in result.cost_breakdown.items()))
+
+    # simulate the bandwidths on each (jointly optimized) workload, and export their timelines, if requested
+    simulators = list()
+    if simulation is not None or timeline_path is not None:
+        for entry in (entries if entries is not None else [WorkloadEntry(workload=workload, communicator=communicator,
+                                                                         training_loop=training_loop)]):
+            evaluator = Evaluator(network=network, workload=entry.workload, communicator=entry.communicator,
+                                  training_loop=entry.training_loop, bw_scale=entry.bw_scale)
+
+            # a timeline per workload, e.g., ./outputs/libra_timeline_GPT_3.json
+            root, extension = os.path.splitext(timeline_path if timeline_path is not None else '')
+            root = f"{root}_{entry.name}" if entries is not None else root
+            if timeline_path is not None:
+                Timeline.from_evaluator(evaluator=evaluator, bw=result.bw).write(path=root + extension)
+
+            if simulation is not None:
+                simulators.append(Simulator(evaluator=evaluator, **simulation))
+                simulation_result = simulators[-1].simulate(bw=result.bw)
+
+                if entries is not None:
+                    print(f"Simulating {entry.name}:")
+                simulation_result.print_report()
+
+                if timeline_path is not None:
+                    Timeline.from_simulation(result=simulation_result).write(path=f"{root}_simulated{extension}")
+
+    # sweep the compute scale (e.g., NPU speeds), reusing the compiled model
+    if compute_scale_sweep is not None:
+        sweep = list()
+        for compute_scale in compute_scale_sweep:
+            Model.set_compute_scale(compute_scale=compute_scale)
+            sweep.append((compute_scale, Model.solve(objective=objective, aggregation=aggregation)))
+        Model.set_compute_scale(compute_scale=1.0)
+
+        # validate every point of the sweep by simulation, if requested
+        simulated_times = [[simulation_result.iteration_time for simulation_result in
+                            simulator.simulate_batch(bw=[sweep_result.bw for _, sweep_result in sweep],
+                                                     compute_scale=compute_scale_sweep)]
+                           for simulator in simulators]
+
+        print("=" * 80)
+        print("Compute Scale Sweep:")
+        for i, (compute_scale, sweep_result) in enumerate(sweep):
+            simulated = "".join(f", Simulated Time: {times[i]:.2f}" for times in simulated_times)
+            print(f"Compute Scale: {compute_scale:.3f}, E2E Time: {sweep_result.e2e_time:.2f}{simulated}, "
+                  f"Network Cost: {sweep_result.network_cost:.2f}, BW: ", end="")
+            print("\t".join(f"{bw:.2f}" for bw in sweep_result.bw))
+
+    # store the result, if requested
+    if results_store_path is not None:
+        extra = dict()
+        if discrete_bw:
+            extra['bw_skus'] = cost_model.bw_skus
+
+        if workloads is not None:
+            # jointly optimized workloads are identified by each of their inputs, and recorded by the first one
+            extra['workloads'] = [(compute_input_hash(network=network, workload=entry.workload,
+                                                      communicator=entry.communicator, cost_model=cost_model,
+                                                      training_loop=entry.training_loop, constraint=constraint,
+                                                      objective=objective), entry.weight, entry.sla)
+                                  for entry in workloads]
+            extra['aggregation'] = aggregation.name
+            workload, communicator, training_loop = workloads[0].workload, workloads[0].communicator, \
+                workloads[0].training_loop
 
-    # apply constraints
-    constraint()
+        if scenarios is not None:
+            # scenarios are identified by their scalings, and recorded by the nominal workload they scale
+            extra['scenarios'] = [(scenario.name, scenario.probability, scenario.comm_scale, scenario.compute_scale,
+                                   scenario.bw_scale) for scenario in scenarios.scenarios]
+            extra['robust_objective'] = robust_objective.name
 
-    # instantiate target models
-    model = Model(workload=workload, communicator=communicator, training_loop=training_loop)
+        input_hash = compute_input_hash(network=network, workload=workload, communicator=communicator,
+                                        cost_model=cost_model, training_loop=training_loop,
+                                        constraint=constraint, objective=objective,
+                                        extra=extra if len(extra) > 0 else None)
+        record = ResultRecord.from_solver_result(result=result, input_hash=input_hash,
+                                                 network=network, workload=workload)
 
-    # execute QP solver
-    model.solve(objective=objective, verbose=True)
+        with ResultsStore(path=results_store_path) as results_store:
+            results_store.insert(record=record)
 
 
 def main() -> None:
@@ -54,6 +247,28 @@ def main() -> None:
         print(f"Communicator Error: {e}")
     except ModelError as e:
         print(f"Model Error: {e}")
+    except ResultsStoreError as e:
+        print(f"Results Store Error: {e}")
+    except SensitivityError as e:
+        print(f"Sensitivity Error: {e}")
+    except SearchError as e:
+        print(f"Search Error: {e}")
+    except RobustError as e:
+        print(f"Robust Error: {e}")
+    except DecompositionError as e:
+        print(f"Decomposition Error: {e}")
+    except ConstraintError as e:
+        print(f"Constraint Error: {e}")
+    except SimulatorError as e:
+        print(f"Simulator Error: {e}")
+    except TimelineError as e:
+        print(f"Timeline Error: {e}")
+    except TraceError as e:
+        print(f"Trace Error: {e}")
+    except EvaluatorError as e:
+        print(f"Evaluator Error: {e}")
+    except TaskGraphError as e:
+        print(f"Task Graph Error: {e}")
 
 
 if __name__ == '__main__':
@@ -3,6 +3,15 @@ This source code is licensed under the MIT license found in the
 LICENSE file in the root directory of this source tree.
 """
 
+from src.model.constraint_format import format_constraint, readable_senses
+from src.model.infeasibility_report import InfeasibilityReport
+from src.model.latency import compute_latencies
 from src.model.model import Model
 from src.model.model_error import ModelError
+from src.model.model_scaling import ModelScaling
+from src.model.parameter_cache import ParameterCache
 from src.model.solver_objective import SolverObjective
+from src.model.solver_result import SolverResult
+from src.model.message_sizes import compute_message_sizes, default_dims_order, memoized_message_sizes
+from src.model.workload_aggregation import WorkloadAggregation
+from src.model.workload_entry import WorkloadEntry
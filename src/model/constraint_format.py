@@ -0,0 +1,33 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+import gurobipy as gp
+from gurobipy import GRB
+
+# Gurobi constraint sense -> readable sense
+readable_senses = {GRB.LESS_EQUAL: '<=', GRB.GREATER_EQUAL: '>=', GRB.EQUAL: '=='}
+
+
+def format_constraint(row: gp.LinExpr, sense: str, rhs: float) -> str:
+    """
+    Readable form of a linear constraint, e.g., 'bw[0] - 2 bw[1] <= 0', by the names of its variables.
+
+    :param row: left-hand side (e.g., gp.Model.getRow() of the constraint)
+    :param sense: Gurobi constraint sense
+    :param rhs: right-hand side
+    :return: readable constraint
+    """
+    terms = [_format_term(coeff=row.getCoeff(i), name=row.getVar(i).VarName) for i in range(row.size())]
+    return f"{' + '.join(terms)} {readable_senses[sense]} {rhs:g}".replace('+ -', '- ')
+
+
+def _format_term(coeff: float, name: str) -> str:
+    if coeff == 1:
+        return name
+
+    if coeff == -1:
+        return f"-{name}"
+
+    return f"{coeff:g} {name}"
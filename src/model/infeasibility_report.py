@@ -0,0 +1,57 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from typing import List, Tuple
+
+
+class InfeasibilityReport:
+    """
+    InfeasibilityReport holds an irreducible infeasible subset (IIS) of a LIBRA problem:
+    a minimal set of constraints and variable bounds that can't hold together (dropping any one of them resolves it),
+    each named by the constraint function that added it (see Model.apply_constraint).
+    """
+
+    def __init__(self,
+                 stage: str,
+                 conflicts: List[Tuple[str, str]],
+                 dims: List[int],
+                 dim_names: List[str]):
+        """
+        Initializer.
+
+        :param stage: what found the conflict, i.e., 'the linear constraint check' (before solving) or 'the solve'
+        :param conflicts: (source, expression) of each conflicting constraint or bound,
+            where the source is a constraint function, 'bound', or part of the LIBRA model
+        :param dims: dimensions whose bandwidths are involved in the conflict
+        :param dim_names: cost dimension name of each involved dimension
+        """
+        self.stage = stage
+        self.conflicts = conflicts
+        self.dims = dims
+        self.dim_names = dim_names
+
+    @property
+    def sources(self) -> List[str]:
+        """
+        Sources (e.g., constraint functions) involved in the conflict, in order of appearance.
+        """
+        return list(dict.fromkeys(source for source, _ in self.conflicts))
+
+    def __str__(self) -> str:
+        lines = [f"Conflicting constraints (found by {self.stage}):"]
+        lines.extend(f"\t{source}: {expression}" for source, expression in self.conflicts)
+        lines.append(f"Sources: {', '.join(self.sources)}")
+        dims = [f"{dim} ({dim_name})" for dim, dim_name in zip(self.dims, self.dim_names)]
+        lines.append(f"Dimensions: {', '.join(dims) if len(dims) > 0 else 'none'}")
+
+        return "\n".join(lines)
+
+    def print_report(self) -> None:
+        """
+        Print the infeasibility report.
+        """
+        print("=" * 80)
+        print("LIBRA Infeasibility Report:")
+        print(self)
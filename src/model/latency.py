@@ -0,0 +1,50 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from typing import List
+
+from src.network import Network, NetworkBuildingBlock
+from src.workload import Collective
+
+
+def compute_latencies(comm_type: Collective, communicator: List[int], network: Network) -> List[float]:
+    """
+    Calculate the latency each network dimension adds to a hierarchical collective,
+    i.e., steps * latency, where a step on a building block of k NPUs takes
+    k - 1 links for a Ring, 1 for FullyConnected, and switch_hops for a Switch.
+    All-Reduce takes twice the steps (Reduce-Scatter then All-Gather).
+
+    :param comm_type: collective type
+    :param communicator: communicator size per each dimension (-1 if the dimension is not involved)
+    :param network: target network
+    :return: latency (in ns) per each dimension (all 0 if the network doesn't model latency)
+    """
+    latencies: List[float] = [0.0 for _ in range(network.dims_count)]
+
+    if network.latency is None or comm_type == Collective.NoComm:
+        return latencies
+
+    for dim in range(network.dims_count):
+        communicator_size = communicator[dim]
+
+        if communicator_size <= 1:
+            continue
+
+        # steps of a single pass over the dimension
+        topology = network.topology[dim]
+        if topology == NetworkBuildingBlock.Switch:
+            steps_count = network.switch_hops
+        elif topology == NetworkBuildingBlock.FullyConnected or comm_type == Collective.PointToPoint:
+            # point-to-point sends only reach the neighbor stage
+            steps_count = 1
+        else:
+            steps_count = communicator_size - 1
+
+        if comm_type == Collective.AllReduce:
+            steps_count *= 2
+
+        latencies[dim] = steps_count * network.latency[dim]
+
+    return latencies
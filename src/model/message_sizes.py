@@ -0,0 +1,136 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from src.model.model_error import ModelError
+from src.workload import Collective
+
+
+def compute_message_sizes(comm_type: Collective, comm_size: float, communicator: List[int],
+                          dims_count: int, dims_order: Optional[List[int]] = None) -> List[float]:
+    """
+    Calculate the message size each network dimension carries for a hierarchical collective.
+
+    :param comm_type: collective type
+    :param comm_size: "initial" communication size (in Bytes)
+    :param communicator: communicator size per each dimension (-1 if the dimension is not involved)
+    :param dims_count: number of network dimensions
+    :param dims_order: order the collective traverses the dimensions in. By default,
+        All-Gather traverses dimensions in reverse order, and the other collectives in index order.
+    :return: message size (in Bytes) per each dimension
+    """
+    if dims_order is None:
+        dims_order = default_dims_order(comm_type=comm_type, dims_count=dims_count)
+
+    # calculate message sizes per each dimension
+    msg_sizes_per_dim: List[float] = [0.0 for _ in range(dims_count)]
+
+    # carry over processed chunk size of last dimension
+    last_chunk_size = comm_size
+
+    if comm_type == Collective.NoComm:
+        # just keep message size as 0, so that the collective time becomes 0 as well
+        pass
+    elif comm_type == Collective.AllReduce:
+        for dim in dims_order:
+            communicator_size = communicator[dim]
+
+            if communicator_size < 0:
+                continue
+
+            # set collective size
+            all_reduce_size = 2 * last_chunk_size / communicator_size * (communicator_size - 1)
+            msg_sizes_per_dim[dim] = all_reduce_size
+
+            # resize last_chunk_size
+            last_chunk_size /= communicator_size
+    elif comm_type == Collective.AllGather:
+        for dim in dims_order:
+            communicator_size = communicator[dim]
+
+            if communicator_size < 0:
+                continue
+
+            # set collective size
+            all_gather_size = last_chunk_size * (communicator_size - 1)
+            msg_sizes_per_dim[dim] = all_gather_size
+
+            # resize last_chunk_size
+            last_chunk_size *= communicator_size
+    elif comm_type == Collective.ReduceScatter:
+        for dim in dims_order:
+            communicator_size = communicator[dim]
+
+            if communicator_size < 0:
+                continue
+
+            # set collective size
+            reduce_scatter_size = last_chunk_size / communicator_size * (communicator_size - 1)
+            msg_sizes_per_dim[dim] = reduce_scatter_size
+
+            # resize last_chunk_size
+            last_chunk_size /= communicator_size
+    elif comm_type == Collective.AllToAll:
+        for dim in dims_order:
+            communicator_size = communicator[dim]
+
+            if communicator_size < 0:
+                continue
+
+            # set collective size
+            all_to_all_size = last_chunk_size / communicator_size * (communicator_size - 1)
+            msg_sizes_per_dim[dim] = all_to_all_size
+
+            # don't resize since it's All-to-All
+    elif comm_type == Collective.PointToPoint:
+        for dim in dims_order:
+            communicator_size = communicator[dim]
+
+            if communicator_size < 0:
+                continue
+
+            # the whole message is sent to the neighbor stage, across every dimension the pipeline spans
+            msg_sizes_per_dim[dim] = last_chunk_size
+    else:
+        # shouldn't reach here
+        raise ModelError(f"Unknown communicator type: {comm_type}")
+
+    return msg_sizes_per_dim
+
+
+@lru_cache(maxsize=65536)
+def memoized_message_sizes(comm_type: Collective, comm_size: float, communicator: Tuple[int, ...],
+                           dims_count: int, dims_order: Optional[Tuple[int, ...]] = None) -> Tuple[float, ...]:
+    """
+    compute_message_sizes, memoized per (collective, size, communicator, dimension order),
+    as many layers repeat the same collectives over the same communicator groups.
+
+    :param comm_type: collective type
+    :param comm_size: "initial" communication size (in Bytes)
+    :param communicator: communicator size per each dimension (-1 if the dimension is not involved)
+    :param dims_count: number of network dimensions
+    :param dims_order: order the collective traverses the dimensions in (None for the default order)
+    :return: message size (in Bytes) per each dimension
+    """
+    return tuple(compute_message_sizes(comm_type=comm_type, comm_size=comm_size, communicator=list(communicator),
+                                       dims_count=dims_count,
+                                       dims_order=list(dims_order) if dims_order is not None else None))
+
+
+def default_dims_order(comm_type: Collective, dims_count: int) -> List[int]:
+    """
+    Default order a collective traverses the dimensions in:
+    All-Gather in reverse order, and the other collectives in index order.
+
+    :param comm_type: collective type
+    :param dims_count: number of network dimensions
+    :return: dimensions in traversal order
+    """
+    if comm_type == Collective.AllGather:
+        return list(range(dims_count - 1, -1, -1))
+
+    return list(range(dims_count))
@@ -3,17 +3,29 @@ This source code is licensed under the MIT license found in the
 LICENSE file in the root directory of this source tree.
 """
 
-from typing import Optional, List, Callable
+import math
+from functools import lru_cache
+from typing import Optional, List, Callable, Dict, Tuple, Any, Union, Iterator
 
 import gurobipy as gp
+import numpy as np
 from gurobipy import GRB
 
 from src.communicator import Communicator
 from src.cost_model import CostModel
+from src.model.constraint_format import format_constraint
+from src.model.infeasibility_report import InfeasibilityReport
+from src.model.latency import compute_latencies
+from src.model.message_sizes import memoized_message_sizes
 from src.model.model_error import ModelError
+from src.model.model_scaling import ModelScaling
+from src.model.parameter_cache import ParameterCache
 from src.model.solver_objective import SolverObjective
+from src.model.solver_result import SolverResult
 from src.network import Network
-from src.workload import Workload, Collective, Phase
+from src.model.workload_aggregation import WorkloadAggregation
+from src.model.workload_entry import WorkloadEntry
+from src.workload import Workload
 
 
 class Model:
@@ -22,54 +34,134 @@ class Model:
 
     # Network Bandwidths: LIBRA object to optimize for
     _bw: Optional[gp.tupledict] = None
-    _bw_inv: Optional[gp.tupledict] = None
+    _bw_inv: Optional[gp.tupledict] = None  # in 1 / scaling.bw_unit, added with the first workload
+
+    # units of the Gurobi model
+    scaling: Optional[ModelScaling] = None
 
     # Objective Variables
     _e2e_time = gp.LinExpr(0)
     _perf_per_cost = gp.LinExpr(0)
-    _network_cost = _gp_model.addVar(lb=0, vtype=GRB.CONTINUOUS)
+    _network_cost = _gp_model.addVar(lb=0, vtype=GRB.CONTINUOUS, name='network_cost')
+    _network_cost_constr: Optional[gp.Constr] = None
 
     # other models
     network: Optional[Network] = None
     cost_model: Optional[CostModel] = None
 
-    def __init__(self, workload: Workload, communicator: Communicator, training_loop: Callable[['Model'], gp.LinExpr]):
+    # workload models added to the Gurobi model
+    models: List['Model'] = list()
+
+    # (message size, latency) per each dim -> (dim time variables, collective time variable)
+    _collective_times: Dict[Tuple[Tuple[float, float], ...], Tuple[List[gp.Var], gp.Var]] = dict()
+
+    # scale of every compute time, relative to the workloads' (see set_compute_scale)
+    compute_scale: float = 1.0
+
+    # worst slowdown or e2e time among the workloads (MaxSlowdown and MaxE2ETime aggregations)
+    _max_time: Optional[gp.Var] = None
+    _max_time_constrs: List[gp.Constr] = list()
+
+    # tuned solver parameters per problem class (kept across reset_model), and the ones applied to the last solve
+    parameter_cache: Optional[ParameterCache] = None
+    _cached_params: List[str] = list()
+
+    def __init__(self, workload: Workload, communicator: Communicator, training_loop: Callable[['Model'], gp.LinExpr],
+                 name: Optional[str] = None, weight: float = 1.0, sla: Optional[float] = None,
+                 bw_scale: Optional[List[float]] = None):
+        """
+        Add a workload to the Gurobi model.
+
+        :param workload: target workload
+        :param communicator: communicator of the workload
+        :param training_loop: training loop function
+        :param name: name to report the workload by (the workload name if None)
+        :param weight: weight of the workload's e2e time (WeightedSum aggregation)
+        :param sla: target e2e time (in ns) of the workload (MaxSlowdown aggregation)
+        :param bw_scale: fraction of each dimension's bandwidth the workload gets (e.g., degraded links), 1 if None
+        """
+        if bw_scale is not None and (len(bw_scale) != self.network.dims_count or min(bw_scale) <= 0):
+            raise ModelError(f"Bandwidth scale {bw_scale} should have a positive value per each dimension.")
+
         # set class variables
         self.workload = workload
         self.communicator = communicator
+        self.training_loop = training_loop
+        self.name = name if name is not None else (workload.name or f"workload_{len(Model.models)}")
+        self.weight = weight
+        self.sla = sla
+        self.bw_scale = bw_scale
+
+        if any(model.name == self.name for model in Model.models):
+            raise ModelError(f"Workload {self.name} is already in the model.")
 
         # communication time per each dim * phase
-        # required for Gurobi implementation purposes
+        # collectives of identical message sizes and latencies (within or across workloads) share their variables
+
+        # self.dim_time[layer, phase, dim]
+        self.dim_time: Dict[Tuple[int, int, int], gp.Var] = dict()
 
-        # self.dim_time[layer][phase][dim]
-        self.dim_time = Model._gp_model.addVars(workload.layers_count, 3, Model.network.dims_count, lb=0,
-                                                vtype=GRB.CONTINUOUS)
+        # self.coll_time[layer, phase]
+        self.coll_time: Dict[Tuple[int, int], gp.Var] = dict()
 
-        # self.coll_time[layer][phase]
-        self.coll_time = Model._gp_model.addVars(workload.layers_count, 3, lb=0, vtype=GRB.CONTINUOUS)
+        # self.latency[layer, phase, dim] (in model time units, part of dim_time)
+        self.latency: Dict[Tuple[int, int, int], float] = dict()
+
+        # (message size, latency) per each dim of every [layer, phase]
+        collectives = self._get_collectives()
+
+        # the first workload sets the units of the model
+        if Model._bw_inv is None:
+            Model._apply_scaling(workload=workload, collectives=collectives)
 
         # apply constraints
-        self._apply_dim_time_constraints()
-        self._apply_coll_time_constraints()
+        self._apply_collective_constraints(collectives=collectives)
 
         # increment e2e time
         self._update_e2e_time(training_loop=training_loop)
 
+        # register this workload model
+        Model.models.append(self)
+
     @classmethod
-    def solve(cls, objective: SolverObjective.PerfOpt, verbose: bool = False) -> None:
+    def add_workloads(cls, entries: List[WorkloadEntry]) -> List['Model']:
+        """
+        Add several workloads sharing the network, to be optimized jointly.
+
+        :param entries: workloads with their weights and SLAs
+        :return: model of each workload
+        """
+        return [cls(workload=entry.workload, communicator=entry.communicator, training_loop=entry.training_loop,
+                    name=entry.name, weight=entry.weight, sla=entry.sla, bw_scale=entry.bw_scale)
+                for entry in entries]
+
+    @classmethod
+    def solve(cls, objective: SolverObjective.PerfOpt, verbose: bool = False,
+              aggregation: WorkloadAggregation = WorkloadAggregation.WeightedSum,
+              presolve_check: bool = True) -> SolverResult:
         """
         Set the objective and run the QP solver.
 
         :param objective: objective type.
         :param verbose: True if verbose mode is enabled, false otherwise
+        :param aggregation: how the e2e times of the workloads are aggregated into the objective
+        :param presolve_check: True to check the linear constraints (see check_feasibility) before solving
+        :return: optimized bandwidths, objective values, and solver statistics
         """
+        # fail fast on conflicting constraints, instead of searching the nonconvex problem
+        if presolve_check:
+            report = cls.check_feasibility()
+            if report is not None:
+                raise ModelError(f"Constraints are infeasible.\n{report}")
+
         # set solver parameters
-        cls._gp_model.setParam(paramname='OutputFlag', newval=verbose)  # verbose
-        cls._gp_model.setParam(paramname='NonConvex', newval=2)  # QP problem
-        cls._gp_model.setParam(paramname='ScaleFlag', newval=2)  # scaling for numerical stability
+        cls._set_solver_params(verbose=verbose)
 
         # set solver objective
-        cls._set_objective(objective=objective)
+        cls._set_objective(objective=objective, aggregation=aggregation)
+
+        # tuned solver parameters of the problem class, if cached
+        cls._apply_cached_params(objective=objective, aggregation=aggregation)
 
         # print statement if verbose if false
         if not verbose:
@@ -78,24 +170,486 @@ class Model:
         # run optimization
         cls._gp_model.optimize()
 
+        # check a solution is found (and diagnose why not, if infeasible)
+        if cls._gp_model.SolCount == 0:
+            report = cls._diagnose_infeasibility() \
+                if cls._gp_model.Status in (GRB.INFEASIBLE, GRB.INF_OR_UNBD) else None
+            raise ModelError(f"No solution found (status: {cls._get_status_name()})."
+                             + (f"\n{report}" if report is not None else ""))
+
         # print result
         print("=" * 80)
         print("LIBRA Optimization Result:")
         cls._print_bw()
 
+        # return result
+        return cls._get_result(objective=objective, aggregation=aggregation)
+
+    @classmethod
+    def apply_constraint(cls, constraint: Callable[[], None], name: Optional[str] = None) -> None:
+        """
+        Apply a constraint function, naming the constraints it adds after it (e.g., multiple_constraints[1]),
+        so that infeasibility reports point at it.
+
+        :param constraint: constraint function (see inputs/constraints)
+        :param name: name of the added constraints (the function's or class's name if None)
+        """
+        if name is None:
+            name = getattr(constraint, '__name__', type(constraint).__name__)
+
+        cls._gp_model.update()
+        constrs_count = cls._gp_model.NumConstrs
+        qconstrs_count = cls._gp_model.NumQConstrs
+
+        constraint()
+
+        # constraints named already (e.g., by a nested constraint function) keep their names
+        cls._gp_model.update()
+        constrs = [constr for constr in cls._gp_model.getConstrs()[constrs_count:]
+                   if constr.ConstrName == f"R{constr.index}"]
+        qconstrs = [qconstr for qconstr in cls._gp_model.getQConstrs()[qconstrs_count:]
+                    if qconstr.QCName == f"QC{qconstr.index}"]
+
+        for i, constr in enumerate(constrs):
+            constr.ConstrName = f"{name}[{i}]"
+        for i, qconstr in enumerate(qconstrs):
+            qconstr.QCName = f"{name}[{len(constrs) + i}]"
+
+    @classmethod
+    def check_feasibility(cls) -> Optional[InfeasibilityReport]:
+        """
+        Check whether the linear constraints over the bandwidths and the network cost (i.e., the constraint functions'
+        and the network cost's definition) can hold together, by an LP without any workload term.
+        It takes milliseconds, but only covers these constraints: the full problem may still be infeasible.
+
+        :return: report of a minimal conflicting subset of the constraints (None if they can hold together)
+        """
+        cls._gp_model.update()
+
+        lp_model = gp.Model("LibraFeasibility")
+        lp_model.setParam(paramname='OutputFlag', newval=False)
+
+        try:
+            # bandwidths keep any bound a constraint function set
+            variables = {var.index: lp_model.addVar(lb=var.LB, ub=var.UB, vtype=GRB.CONTINUOUS, name=var.VarName)
+                         for var in list(cls._bw.values()) + [cls._network_cost]}
+
+            # linear constraints over bandwidths and network cost only
+            for constr, row in cls._iter_bw_rows():
+                lhs = gp.LinExpr([row.getCoeff(i) for i in range(row.size())],
+                                 [variables[row.getVar(i).index] for i in range(row.size())])
+                lp_model.addLConstr(lhs, constr.Sense, constr.RHS, name=constr.ConstrName)
+
+            # without an objective, the LP is never unbounded
+            lp_model.optimize()
+            if lp_model.Status not in (GRB.INFEASIBLE, GRB.INF_OR_UNBD):
+                return None
+
+            lp_model.computeIIS()
+            return cls._get_infeasibility_report(gp_model=lp_model, stage='the linear constraint check')
+        finally:
+            lp_model.dispose()
+
+    @classmethod
+    def _diagnose_infeasibility(cls) -> Optional[InfeasibilityReport]:
+        """
+        Find a minimal conflicting subset of the constraints of the infeasible model:
+        among the linear constraints if they conflict already, and of the whole model otherwise.
+
+        :return: infeasibility report (None if the solver can't compute one)
+        """
+        report = cls.check_feasibility()
+        if report is not None:
+            return report
+
+        try:
+            cls._gp_model.computeIIS()
+        except gp.GurobiError:
+            return None
+
+        return cls._get_infeasibility_report(gp_model=cls._gp_model, stage='the solve')
+
+    @classmethod
+    def _get_infeasibility_report(cls, gp_model: gp.Model, stage: str) -> InfeasibilityReport:
+        """
+        Describe the IIS computed on a Gurobi model (the model itself, or the LP of check_feasibility).
+        Constraints and bounds over the workloads' variables are summarized per kind,
+        as they belong to the LIBRA model rather than to a constraint function.
+
+        :param gp_model: Gurobi model whose IIS is computed
+        :param stage: where the conflict was found
+        :return: infeasibility report
+        """
+        bw_dims = {var.VarName: dim for dim, var in cls._bw.items()}
+        named_vars = set(bw_dims) | {cls._network_cost.VarName}
+        dims = set()
+
+        conflicts: List[Tuple[str, str]] = list()
+        model_conflicts_count = 0
+
+        for constr in gp_model.getConstrs():
+            if not constr.IISConstr:
+                continue
+
+            row = gp_model.getRow(constr)
+            names = [row.getVar(i).VarName for i in range(row.size())]
+            dims.update(bw_dims[name] for name in names if name in bw_dims)
+
+            if not all(name in named_vars for name in names):
+                # constraint functions may constrain workload times too (e.g., the e2e time)
+                if constr.ConstrName != f"R{constr.index}":
+                    conflicts.append((constr.ConstrName.split('[')[0],
+                                      f"constraint over workload times ({constr.ConstrName})"))
+                else:
+                    model_conflicts_count += 1
+                continue
+
+            expression = format_constraint(row=row, sense=constr.Sense, rhs=constr.RHS)
+            conflicts.append((constr.ConstrName.split('[')[0], f"{expression} ({constr.ConstrName})"))
+
+        for var in gp_model.getVars():
+            if var.VarName not in named_vars:
+                model_conflicts_count += var.IISLB + var.IISUB
+                continue
+
+            for in_iis, operator, bound in ((var.IISLB, '>=', var.LB), (var.IISUB, '<=', var.UB)):
+                if in_iis:
+                    dims.update([bw_dims[var.VarName]] if var.VarName in bw_dims else [])
+                    conflicts.append(('bound', f"{var.VarName} {operator} {bound:g}"))
+
+        if gp_model is cls._gp_model:
+            # e.g., bw * bw_inv reciprocity (quadratic) and collective time maxima (general constraints)
+            model_conflicts_count += sum(qconstr.IISQConstr for qconstr in gp_model.getQConstrs())
+            model_conflicts_count += sum(genconstr.IISGenConstr for genconstr in gp_model.getGenConstrs())
+
+        if model_conflicts_count > 0:
+            conflicts.append(('workload model', f"{model_conflicts_count} constraints and bounds over workload times"))
+
+        dims = sorted(dims)
+        return InfeasibilityReport(stage=stage, conflicts=conflicts, dims=dims,
+                                   dim_names=[cls.network.cost_dimension[dim] for dim in dims])
+
+    @classmethod
+    def _set_solver_params(cls, verbose: bool) -> None:
+        # tuned parameters of the last solve go back to their defaults
+        for name in cls._cached_params:
+            cls._gp_model.setParam(paramname=name, newval=cls._gp_model.getParamInfo(name)[5])
+        cls._cached_params = list()
+
+        cls._gp_model.setParam(paramname='OutputFlag', newval=verbose)  # verbose
+        cls._gp_model.setParam(paramname='NonConvex', newval=2)  # QP problem
+        cls._gp_model.setParam(paramname='ScaleFlag', newval=2)  # scaling for numerical stability
+
+    @classmethod
+    def _apply_cached_params(cls, objective: SolverObjective, aggregation: WorkloadAggregation) -> None:
+        if cls.parameter_cache is None:
+            return
+
+        signature = cls.get_problem_signature(objective=objective, aggregation=aggregation)
+        params = cls.parameter_cache.get(signature=signature)
+        if params is None:
+            return
+
+        print(f"Tuned solver parameters of {signature}: {params if len(params) > 0 else 'defaults'}")
+        for name, value in params.items():
+            cls._gp_model.setParam(paramname=name, newval=value)
+        cls._cached_params = list(params)
+
+    @classmethod
+    def set_parameter_cache(cls, parameter_cache: Optional[ParameterCache]) -> None:
+        """
+        Solve every later problem whose class is in the cache with its tuned parameters (see tune).
+        The cache is kept across reset_model, so that every problem built in the process picks it up.
+
+        :param parameter_cache: tuned parameters per problem class (None to solve with the default parameters)
+        """
+        cls.parameter_cache = parameter_cache
+
+    @classmethod
+    def get_problem_signature(cls, objective: SolverObjective,
+                              aggregation: WorkloadAggregation = WorkloadAggregation.WeightedSum) -> str:
+        """
+        Structural signature of the current problem: problems of the same signature (network dims, formulation,
+        objective, and size bucket) share their tuned solver parameters.
+
+        :param objective: objective type
+        :param aggregation: workload aggregation
+        :return: problem signature
+        """
+        training_loops = sorted({getattr(model.training_loop, '__name__', type(model.training_loop).__name__)
+                                 for model in cls.models})
+        layers_count = sum(model.workload.layers_count for model in cls.models)
+
+        return '|'.join([f'{cls.network.dims_count}d',
+                         objective.name,
+                         aggregation.name,
+                         '+'.join(training_loops),
+                         'linear_cost' if cls.cost_model.is_linear() else 'tiered_cost',
+                         f'workloads_{len(cls.models)}',
+                         f'layers_2^{Model._size_bucket(layers_count)}',
+                         f'collectives_2^{Model._size_bucket(len(cls._collective_times))}'])
+
+    @staticmethod
+    def _size_bucket(size: int) -> int:
+        return int(math.log2(size)) if size > 0 else 0
+
     @classmethod
-    def _set_objective(cls, objective: SolverObjective) -> None:
+    def tune(cls, objective: SolverObjective, aggregation: WorkloadAggregation = WorkloadAggregation.WeightedSum,
+             time_limit: float = 60.0, verbose: bool = False) -> Dict[str, Union[int, float, str]]:
+        """
+        Tune the solver parameters of the current problem by Gurobi's tuner,
+        and store them into the parameter cache (if set) under the problem's signature,
+        so that later solves of the same problem class pick them up.
+
+        :param objective: objective type
+        :param aggregation: workload aggregation
+        :param time_limit: time limit (in seconds) of the tuner
+        :param verbose: True to print the tuner log
+        :return: tuned parameters differing from LIBRA's defaults (empty if the defaults are best)
+        """
+        if time_limit <= 0:
+            raise ModelError(f"Tuning time limit ({time_limit}) should be positive.")
+
+        cls._set_solver_params(verbose=False)
+        cls._set_objective(objective=objective, aggregation=aggregation)
+        defaults = cls._get_params()
+
+        # solve time under LIBRA's defaults
+        cls._gp_model.reset()
+        cls._gp_model.optimize()
+        baseline_runtime = cls._gp_model.Runtime
+
+        cls._gp_model.setParam(paramname='TuneTimeLimit', newval=time_limit)
+        cls._gp_model.setParam(paramname='TuneOutput', newval=1 if verbose else 0)
+        cls._gp_model.setParam(paramname='LogToConsole', newval=verbose)
+        cls._gp_model.tune()
+
+        # the best parameter set found comes first
+        params: Dict[str, Union[int, float, str]] = dict()
+        if cls._gp_model.TuneResultCount > 0:
+            cls._gp_model.getTuneResult(0)
+            params = {name: value for name, value in cls._get_params().items()
+                      if value != defaults[name] and not name.startswith('Tune') and name not in _untuned_params}
+
+        # parameters set by the tuner go back to LIBRA's defaults
+        for name, value in cls._get_params().items():
+            if value != defaults[name]:
+                cls._gp_model.setParam(paramname=name, newval=defaults[name])
+
+        # solve time under the tuned parameters
+        for name, value in params.items():
+            cls._gp_model.setParam(paramname=name, newval=value)
+        cls._cached_params = list(params)
+        cls._gp_model.reset()
+        cls._gp_model.optimize()
+        tuned_runtime = cls._gp_model.Runtime
+
+        signature = cls.get_problem_signature(objective=objective, aggregation=aggregation)
+        print(f"Tuned solver parameters of {signature}: {params if len(params) > 0 else 'defaults'} "
+              f"(solve time: {baseline_runtime:.3f}s -> {tuned_runtime:.3f}s)")
+
+        if cls.parameter_cache is not None:
+            cls.parameter_cache.put(signature=signature, params=params, baseline_runtime=baseline_runtime,
+                                    tuned_runtime=tuned_runtime)
+
+        return params
+
+    @classmethod
+    def _get_params(cls) -> Dict[str, Union[int, float, str]]:
+        """
+        Current value of every Gurobi parameter.
+
+        :return: parameter name -> value
+        """
+        return {name: cls._gp_model.getParamInfo(name)[2] for name in dir(GRB.Param) if not name.startswith('_')}
+
+    @classmethod
+    def _get_result(cls, objective: SolverObjective, aggregation: WorkloadAggregation) -> SolverResult:
+        """
+        Collect the optimized values and solver statistics of the last solve.
+
+        :param objective: objective type used for the last solve
+        :param aggregation: workload aggregation used for the last solve
+        :return: SolverResult of the last solve
+        """
+        bw = cls._gp_model.getAttr('x', cls._bw.values())
+
+        # map the objective back from model units (see _set_objective)
+        time_factor = cls._get_time_factor(aggregation=aggregation)
+        objective_unit = cls.scaling.cost_unit if objective == SolverObjective.PerfPerCostOpt else time_factor
+        objective_value = cls._gp_model.ObjVal * objective_unit
+        objective_bound = cls._get_objective_bound()
+        if objective_bound is not None:
+            objective_bound *= objective_unit
+
+        # solver statistics of the solve (before the e2e times are tightened)
+        status, runtime = cls._get_status_name(), cls._gp_model.Runtime
+        iterations_count, nodes_count = cls._gp_model.IterCount, cls._gp_model.NodeCount
+        network_cost = cls._network_cost.X
+
+        # under a max aggregation, only the worst e2e time is pushed onto its value by the objective
+        e2e_times = [model.e2e_time.getValue() for model in cls.models]
+        if aggregation != WorkloadAggregation.WeightedSum:
+            e2e_times = cls._tighten_e2e_times(e2e_times=e2e_times)
+
+        time_unit = cls.scaling.time_unit
+        return SolverResult(objective=objective,
+                            status=status,
+                            bw=bw,
+                            e2e_time=sum(model.weight * e2e_time
+                                         for model, e2e_time in zip(cls.models, e2e_times)) * time_unit,
+                            network_cost=network_cost,
+                            objective_value=objective_value,
+                            runtime=runtime,
+                            iterations_count=iterations_count,
+                            nodes_count=nodes_count,
+                            cost_breakdown=cls.cost_model.get_cost_coefficients().breakdown(bw=bw),
+                            aggregation=aggregation,
+                            workload_e2e_times={model.name: e2e_time * time_unit
+                                                for model, e2e_time in zip(cls.models, e2e_times)},
+                            objective_bound=objective_bound)
+
+    @classmethod
+    def _get_objective_bound(cls) -> Optional[float]:
+        """
+        Lower bound of the optimal objective value proven by the last solve (the objective value itself is only
+        the best solution found of the nonconvex problem).
+
+        :return: objective bound (in model units), or None if the solver doesn't provide one
+        """
+        try:
+            return cls._gp_model.ObjBound
+        except gp.GurobiError:
+            return None
+
+    @classmethod
+    def _tighten_e2e_times(cls, e2e_times: List[float]) -> List[float]:
+        """
+        E2e time of every workload under the solved bandwidths.
+        The e2e times of the workloads other than the worst one are only bounded from above by the solve
+        (e.g., the finish times of their task graphs may lag), so they're minimized again with the bandwidths fixed.
+
+        :param e2e_times: e2e time (in model time units) per each workload, as solved
+        :return: tightened e2e time (in model time units) per each workload
+        """
+        bw_inv = list(cls._bw_inv.values())
+        bounds = [(var.LB, var.UB) for var in bw_inv]
+        output_flag = cls._gp_model.Params.OutputFlag
+
+        for var, value in zip(bw_inv, cls._gp_model.getAttr('x', bw_inv)):
+            var.LB, var.UB = value, value
+        cls._gp_model.setParam(paramname='OutputFlag', newval=False)
+        cls._gp_model.setObjective(expr=gp.quicksum(model.e2e_time for model in cls.models), sense=GRB.MINIMIZE)
+
+        try:
+            cls._gp_model.optimize()
+            if cls._gp_model.SolCount == 0:
+                # keep the bounds of the solve
+                return e2e_times
+
+            return [min(model.e2e_time.getValue(), e2e_time) for model, e2e_time in zip(cls.models, e2e_times)]
+        finally:
+            for var, (lb, ub) in zip(bw_inv, bounds):
+                var.LB, var.UB = lb, ub
+            cls._gp_model.setParam(paramname='OutputFlag', newval=output_flag)
+
+    @classmethod
+    def get_time_bounds(cls, aggregation: WorkloadAggregation) -> Optional[List[float]]:
+        """
+        Divisor of each workload's e2e time under a max aggregation (its SLA, or 1 for the worst e2e time).
+
+        :param aggregation: workload aggregation
+        :return: divisor per each workload, or None for the weighted sum
+        """
+        if aggregation == WorkloadAggregation.WeightedSum:
+            return None
+
+        if aggregation == WorkloadAggregation.MaxSlowdown:
+            for model in cls.models:
+                if model.sla is None:
+                    raise ModelError(f"SLA of workload {model.name} is required to bound its slowdown.")
+            return [model.sla for model in cls.models]
+
+        if aggregation == WorkloadAggregation.MaxE2ETime:
+            return [1.0 for _ in cls.models]
+
+        # should not reach here
+        raise ModelError(f"Aggregation {aggregation} is unknown.")
+
+    @staticmethod
+    def get_time_scale(aggregation: WorkloadAggregation) -> float:
+        """
+        Divisor of time * network cost in the PerfPerCostOpt objective, keeping it well-scaled.
+
+        :param aggregation: workload aggregation
+        :return: 1 for slowdowns, 1e10 for e2e times (in ns)
+        """
+        return 1 if aggregation == WorkloadAggregation.MaxSlowdown else 1e10
+
+    @classmethod
+    def _get_time_factor(cls, aggregation: WorkloadAggregation) -> float:
+        """
+        Time term of the objective in model units -> in input units (slowdowns have no unit).
+
+        :param aggregation: workload aggregation
+        :return: factor of the time term
+        """
+        return 1.0 if aggregation == WorkloadAggregation.MaxSlowdown else cls.scaling.time_unit
+
+    @classmethod
+    def _set_objective(cls, objective: SolverObjective, aggregation: WorkloadAggregation) -> None:
+        if cls._bw_inv is None:
+            raise ModelError("No workload is added to the model.")
+
+        # time term of the objective (e2e times are in model time units)
+        time_bounds = cls.get_time_bounds(aggregation=aggregation)
+        time_factor = cls._get_time_factor(aggregation=aggregation)
+        time_scale = cls.get_time_scale(aggregation=aggregation)
+        time = cls._e2e_time if time_bounds is None else \
+            cls._set_max_time(time_bounds=[time_bound * time_factor / cls.scaling.time_unit
+                                           for time_bound in time_bounds])
+
         if objective == SolverObjective.PerfOpt:
             # set minimize(perf) as objective
-            cls._gp_model.setObjective(expr=cls._e2e_time, sense=GRB.MINIMIZE)
+            cls._gp_model.setObjective(expr=time, sense=GRB.MINIMIZE)
         elif objective == SolverObjective.PerfPerCostOpt:
             # set minimize(perf-per-cost) as objective
-            cls._perf_per_cost = cls._e2e_time * cls._network_cost / 1e10
+            # (the time scale is taken in model time units, so that the objective keeps its magnitude in any of them)
+            cls._perf_per_cost = time * cls._network_cost / (time_scale / time_factor * cls.scaling.cost_unit)
             cls._gp_model.setObjective(expr=cls._perf_per_cost, sense=GRB.MINIMIZE)
         else:
             # should not reach here
             raise ModelError(f"Objective {objective} is unknown.")
 
+    @classmethod
+    def _set_max_time(cls, time_bounds: List[float]) -> gp.Var:
+        """
+        Bound the worst e2e time / time bound (e.g., slowdown) among the workloads by an epigraph variable.
+
+        :param time_bounds: divisor of each workload's e2e time (in model units)
+        :return: worst (divided) e2e time variable
+        """
+        # replace the bounds of the last solve, as workloads may have been added since
+        if cls._max_time is None:
+            cls._max_time = cls._gp_model.addVar(lb=0, vtype=GRB.CONTINUOUS)
+        for constr in cls._max_time_constrs:
+            cls._gp_model.remove(constr)
+
+        cls._max_time_constrs = [cls._gp_model.addLConstr(cls._max_time * time_bound >= model.e2e_time)
+                                 for model, time_bound in zip(cls.models, time_bounds)]
+
+        return cls._max_time
+
+    @classmethod
+    def _get_status_name(cls) -> str:
+        """
+        Get the name of the current Gurobi optimization status (e.g., 2 -> OPTIMAL).
+
+        :return: status name
+        """
+        status_names = {getattr(GRB.Status, name): name for name in dir(GRB.Status) if name.isupper()}
+        return status_names.get(cls._gp_model.Status, str(cls._gp_model.Status))
+
     @classmethod
     def _print_bw(cls) -> None:
         """
@@ -110,125 +664,334 @@ class Model:
         print()
 
     @classmethod
-    def initialize_model(cls, network: Network, cost_model: CostModel) -> None:
+    def get_bw_constraints(cls) -> Tuple[np.ndarray, List[str], np.ndarray]:
+        """
+        Get the linear constraints over bandwidths only (i.e., the ones added by constraint functions),
+        with the network cost substituted by its definition.
+
+        :return: (coefficients of shape (constraints_count, dims_count), senses ('<', '>', or '='), right-hand sides)
+        """
+        cls._gp_model.update()
+
+        bw_dims = {bw.index: dim for dim, bw in cls._bw.items()}
+
+        # variable index -> coefficients it contributes per each dimension
+        contributions = {index: np.eye(cls.network.dims_count)[dim] for index, dim in bw_dims.items()}
+
+        # network cost = fixed cost + sum(cost_coefficients * bw) (only substitutable if linear in bw)
+        cost_coefficients = cls.cost_model.get_cost_coefficients()
+        if cost_coefficients.is_linear():
+            contributions[cls._network_cost.index] = cost_coefficients.coefficients
+            cost_constant = cost_coefficients.fixed_cost
+        else:
+            cost_constant = 0.0
+
+        coefficients: List[np.ndarray] = list()
+        senses: List[str] = list()
+        rhs: List[float] = list()
+
+        for constr, row in cls._iter_bw_rows():
+            if constr.sameAs(cls._network_cost_constr):
+                continue
+
+            indices = [row.getVar(i).index for i in range(row.size())]
+            if cls._network_cost.index in indices and cls._network_cost.index not in contributions:
+                raise ModelError(f"Constraint {constr.ConstrName} on the network cost isn't linear in bandwidths "
+                                 f"under a tiered cost model.")
+
+            coefficients.append(sum(row.getCoeff(i) * contributions[indices[i]] for i in range(row.size())))
+            senses.append(constr.Sense)
+
+            # fixed network cost moves to the right-hand side
+            network_cost_coeff = sum(row.getCoeff(i) for i in range(row.size())
+                                     if indices[i] == cls._network_cost.index)
+            rhs.append(constr.RHS - network_cost_coeff * cost_constant)
+
+        return (np.array(coefficients).reshape(len(coefficients), cls.network.dims_count),
+                senses, np.array(rhs, dtype=float))
+
+    @classmethod
+    def _iter_bw_rows(cls) -> Iterator[Tuple[gp.Constr, gp.LinExpr]]:
+        """
+        Iterate the linear constraints that only involve bandwidths and the network cost
+        (i.e., the constraint functions' and the network cost's definition).
+
+        :return: iterator of (constraint, its row)
+        """
+        cls._gp_model.update()
+
+        indices = {bw.index for bw in cls._bw.values()} | {cls._network_cost.index}
+        for constr in cls._gp_model.getConstrs():
+            row = cls._gp_model.getRow(constr)
+            if row.size() > 0 and all(row.getVar(i).index in indices for i in range(row.size())):
+                yield constr, row
+
+    @classmethod
+    def initialize_model(cls, network: Network, cost_model: CostModel, scaling: Optional[ModelScaling] = None) -> None:
+        """
+        Initialize the Gurobi model of a network.
+
+        :param network: target network
+        :param cost_model: cost model of the network
+        :param scaling: units of the Gurobi model (input units if None)
+        """
         # set class variables
         cls.network = network
         cls.cost_model = cost_model
+        cls.scaling = scaling if scaling is not None else ModelScaling.unscaled()
 
         # attach network to the cost model
         cls.cost_model.set_network(network=cls.network)
 
-        # initialize bw variables
-        cls._bw = cls._gp_model.addVars(network.dims_count, lb=0, vtype=GRB.CONTINUOUS)
-        cls._bw_inv = cls._gp_model.addVars(network.dims_count, lb=0, vtype=GRB.CONTINUOUS)
+        # initialize bw variables (inverse bandwidths are added with the first workload, once units are set)
+        cls._bw = cls._gp_model.addVars(network.dims_count, lb=0, vtype=GRB.CONTINUOUS, name='bw')
 
         # apply (trivial) initial constraints
         cls._apply_trivial_constraints()
 
     @classmethod
-    def _apply_trivial_constraints(cls) -> None:
-        # bw and bw_inv reciprocity
-        for i in range(cls.network.dims_count):
-            cls._gp_model.addConstr(cls._bw[i] * cls._bw_inv[i] == 1)
+    def reset_model(cls) -> None:
+        """
+        Discard the current Gurobi model (with every workload and constraint added to it),
+        so that a new problem can be built and solved in the same process.
+        """
+        cls._gp_model.dispose()
+        cls._gp_model = gp.Model("LibraSolver")
+
+        cls._bw = None
+        cls._bw_inv = None
+        cls.scaling = None
+
+        cls._e2e_time = gp.LinExpr(0)
+        cls._perf_per_cost = gp.LinExpr(0)
+        cls._network_cost = cls._gp_model.addVar(lb=0, vtype=GRB.CONTINUOUS, name='network_cost')
+        cls._network_cost_constr = None
+
+        cls.network = None
+        cls.cost_model = None
+        cls.models = list()
+        cls._collective_times = dict()
+        cls._max_time = None
+        cls._max_time_constrs = list()
+        cls._cached_params = list()
+        cls.compute_scale = 1.0
 
+    @classmethod
+    def _apply_trivial_constraints(cls) -> None:
         # calculate cost
-        network_cost = cls.cost_model.compute_network_cost(bw=cls._bw)
-        cls._gp_model.addLConstr(cls._network_cost == network_cost)
+        network_cost = cls.cost_model.compute_network_cost(bw=cls._bw, gp_model=cls._gp_model)
+        cls._network_cost_constr = cls._gp_model.addLConstr(cls._network_cost == network_cost, name='network_cost')
 
-    def _apply_coll_time_constraints(self) -> None:
-        # for every layer and phase:
-        for layer in range(self.workload.layers_count):
-            for phase in range(3):
-                # coll time = max[dim time]
-                coll_time = gp.max_([self.dim_time[layer, phase, dim] for dim in range(self.network.dims_count)])
-                Model._gp_model.addConstr(self.coll_time[layer, phase] == coll_time)
+    @classmethod
+    def _apply_scaling(cls, workload: Workload,
+                       collectives: Dict[Tuple[int, int], Tuple[Tuple[float, float], ...]]) -> None:
+        """
+        Set the units of the Gurobi model (from the magnitudes of the first workload, if automatic),
+        and add the inverse bandwidths in them.
+
+        :param workload: first workload added to the model
+        :param collectives: (message size, latency) per each dim of every [layer, phase] of the workload
+        """
+        dims_count = cls.network.dims_count
+
+        if cls.scaling.is_automatic:
+            cls.scaling = ModelScaling.from_magnitudes(
+                compute_times=workload.compute_times().reshape(-1),
+                msg_sizes=[msg_size for key in collectives.values() for msg_size, _ in key])
+
+        # bw and bw_inv reciprocity (bw_inv in 1 / bw_unit)
+        cls._bw_inv = cls._gp_model.addVars(dims_count, lb=0, vtype=GRB.CONTINUOUS, name='bw_inv')
+        for i in range(dims_count):
+            cls._gp_model.addConstr(cls._bw[i] * cls._bw_inv[i] == cls.scaling.bw_unit, name=f'bw_inv[{i}]')
+
+    def _get_collectives(self) -> Dict[Tuple[int, int], Tuple[Tuple[float, float], ...]]:
+        """
+        Message size and latency per each dimension of every [layer, phase].
+        Dims without traffic take no time, regardless of their latency, so their latency is 0.
+
+        :return: (message size, latency) per each dim of every [layer, phase]
+        """
+        collectives = dict()
 
-    def _apply_dim_time_constraints(self) -> None:
         # for every layer and phase:
-        for layer in range(self.workload.layers_count):
-            self._apply_dim_time_sub_constraints(layer_idx=layer, phase_idx=0,
-                                                 phase=self.workload.layers[layer].forward,
-                                                 communicator=self.communicator.forward_communicator)
-
-            # input grad pass
-            self._apply_dim_time_sub_constraints(layer_idx=layer, phase_idx=1,
-                                                 phase=self.workload.layers[layer].input_grad,
-                                                 communicator=self.communicator.input_grad_communicator)
-
-            self._apply_dim_time_sub_constraints(layer_idx=layer, phase_idx=2,
-                                                 phase=self.workload.layers[layer].weight_grad,
-                                                 communicator=self.communicator.weight_grad_communicator)
-
-    def _apply_dim_time_sub_constraints(self, layer_idx: int, phase_idx: int, phase: Phase,
-                                        communicator: List[int]) -> None:
-        # calculate message sizes per each dimension
-        msg_sizes_per_dim: List[float] = [0.0 for _ in range(self.network.dims_count)]
-
-        # carry over processed chunk size of last dimension
-        last_chunk_size = phase.comm_size
-
-        if phase.comm_type == Collective.NoComm:
-            # just keep message size as 0, so that the collective time becomes 0 as well
-            pass
-        elif phase.comm_type == Collective.AllReduce:
-            for dim, communicator_size in enumerate(communicator):
-                if communicator_size < 0:
-                    continue
-
-                # set collective size
-                all_reduce_size = 2 * last_chunk_size / communicator_size * (communicator_size - 1)
-                msg_sizes_per_dim[dim] = all_reduce_size
-
-                # resize last_chunk_size
-                last_chunk_size /= communicator_size
-        elif phase.comm_type == Collective.AllGather:
-            for dim in range(self.network.dims_count - 1, -1, -1):
-                # All-gather traverses in reversed order
-                communicator_size = communicator[dim]
-
-                # All-Gather traverses dimensions in reverse order
-                if communicator_size < 0:
-                    continue
-
-                # set collective size
-                all_gather_size = last_chunk_size * (communicator_size - 1)
-                msg_sizes_per_dim[dim] = all_gather_size
-
-                # resize last_chunk_size
-                last_chunk_size *= communicator_size
-        elif phase.comm_type == Collective.ReduceScatter:
-            for dim, communicator_size in enumerate(communicator):
-                if communicator_size < 0:
-                    continue
-
-                # set collective size
-                reduce_scatter_size = last_chunk_size / communicator_size * (communicator_size - 1)
-                msg_sizes_per_dim[dim] = reduce_scatter_size
-
-                # resize last_chunk_size
-                last_chunk_size /= communicator_size
-        elif phase.comm_type == Collective.AllToAll:
-            for dim, communicator_size in enumerate(communicator):
-                if communicator_size < 0:
-                    continue
-
-                # set collective size
-                all_to_all_size = last_chunk_size / communicator_size * (communicator_size - 1)
-                msg_sizes_per_dim[dim] = all_to_all_size
-
-                # don't resize since it's All-to-All
-        else:
-            # shouldn't reach here
-            raise ModelError(f"Unknown communicator type: {phase.comm_type}")
+        for layer_idx, layer in enumerate(self.workload.layers):
+            for phase_idx, phase in enumerate((layer.forward, layer.input_grad, layer.weight_grad)):
+                communicator = self.communicator.get_phase_communicator(phase_idx=phase_idx,
+                                                                        comm_type=phase.comm_type,
+                                                                        layer_name=layer.name)
+
+                # calculate message sizes per each dimension (memoized, as layers repeat the same collectives)
+                dims_order = self.communicator.get_dims_order(phase.comm_type)
+                msg_sizes_per_dim = memoized_message_sizes(comm_type=phase.comm_type, comm_size=phase.comm_size,
+                                                           communicator=tuple(communicator),
+                                                           dims_count=self.network.dims_count,
+                                                           dims_order=tuple(dims_order)
+                                                           if dims_order is not None else None)
+
+                # a scaled bandwidth takes as long as a message scaled inversely
+                if self.bw_scale is not None:
+                    msg_sizes_per_dim = [msg_size / scale for msg_size, scale in zip(msg_sizes_per_dim, self.bw_scale)]
+
+                # calculate latency per each dimension (0 if the network doesn't model latency)
+                latencies_per_dim = compute_latencies(comm_type=phase.comm_type, communicator=communicator,
+                                                      network=self.network)
+
+                collectives[layer_idx, phase_idx] = tuple(
+                    (float(msg_size), float(latency) if msg_size > 0 else 0.0)
+                    for msg_size, latency in zip(msg_sizes_per_dim, latencies_per_dim))
+
+        return collectives
+
+    def _apply_collective_constraints(self, collectives: Dict[Tuple[int, int], Tuple[Tuple[float, float], ...]]) \
+            -> None:
+        for (layer_idx, phase_idx), key in collectives.items():
+            dim_times, coll_time = Model._get_collective_time(key=key)
+
+            for dim in range(self.network.dims_count):
+                self.dim_time[layer_idx, phase_idx, dim] = dim_times[dim]
+                self.latency[layer_idx, phase_idx, dim] = key[dim][1] / Model.scaling.time_unit
+            self.coll_time[layer_idx, phase_idx] = coll_time
 
-        # calculate dim_time
-        for dim in range(self.network.dims_count):
-            dim_time = msg_sizes_per_dim[dim] * Model._bw_inv[dim]
-            Model._gp_model.addLConstr(self.dim_time[layer_idx, phase_idx, dim] == dim_time)
+    @classmethod
+    def _get_collective_time(cls, key: Tuple[Tuple[float, float], ...]) -> Tuple[List[gp.Var], gp.Var]:
+        """
+        Get the dim time and collective time variables of a collective,
+        shared by every collective of the same message sizes and latencies.
+
+        :param key: (message size, latency) per each dimension
+        :return: (dim time variable per each dimension, collective time variable)
+        """
+        if key not in cls._collective_times:
+            time_unit = cls.scaling.time_unit
+            msg_unit = time_unit * cls.scaling.bw_unit
+
+            dim_times = list()
+            for dim, (msg_size, latency) in enumerate(key):
+                # dim time = latency + msg size / bw (in model units)
+                dim_time = cls._gp_model.addVar(lb=0, vtype=GRB.CONTINUOUS)
+                cls._gp_model.addLConstr(dim_time == (msg_size / msg_unit) * cls._bw_inv[dim] + latency / time_unit)
+                dim_times.append(dim_time)
+
+            # coll time = max[dim time]
+            coll_time = cls._gp_model.addVar(lb=0, vtype=GRB.CONTINUOUS)
+            cls._gp_model.addConstr(coll_time == gp.max_(dim_times))
+
+            cls._collective_times[key] = (dim_times, coll_time)
+
+        return cls._collective_times[key]
 
     def _update_e2e_time(self, training_loop: Callable[['Model'], gp.LinExpr]) -> None:
-        # get e2e time
-        e2e_time = training_loop(self)
+        # constraints the training loop adds (e.g., of task graphs) start from here
+        Model._gp_model.update()
+        constrs_count = Model._gp_model.NumConstrs
+        nonlinear_constrs_count = Model._gp_model.NumGenConstrs + Model._gp_model.NumQConstrs
+
+        # get e2e time (in model time units: the training loop sees compute times in them)
+        self.e2e_time = gp.LinExpr(training_loop(_ScaledModelView(model=self, workload=_scaled_workload(
+            workload=self.workload, time_unit=Model.scaling.time_unit))))
+
+        # compute times only enter the training loop as constants (the e2e time constant, and constraint rhs),
+        # so they are rescaled by updating the constants (see set_compute_scale)
+        Model._gp_model.update()
+        self._compute_constrs = Model._gp_model.getConstrs()[constrs_count:]
+        self._compute_rhs = [constr.RHS for constr in self._compute_constrs]
+        self._compute_constant = self.e2e_time.getConstant()
+        self._compute_rescalable = (Model._gp_model.NumGenConstrs + Model._gp_model.NumQConstrs
+                                    == nonlinear_constrs_count)
+
+        # update global (weighted) e2e time
+        Model._e2e_time += self.weight * self.e2e_time
+
+        # workloads added after a rescale follow it
+        self._rescale_compute(old_scale=1.0, new_scale=Model.compute_scale)
+
+    @classmethod
+    def set_compute_scale(cls, compute_scale: float) -> None:
+        """
+        Scale every compute time of every workload (e.g., 0.5 for a 2x faster NPU), relative to the workloads as given.
+        Only the constants of the compiled model are updated, so that sweeps reuse the same model.
+
+        :param compute_scale: scale of every compute time
+        """
+        if compute_scale < 0:
+            raise ModelError(f"Compute scale ({compute_scale}) should be non-negative.")
+
+        for model in cls.models:
+            model._rescale_compute(old_scale=cls.compute_scale, new_scale=compute_scale)
+
+        cls.compute_scale = compute_scale
+
+    @classmethod
+    def set_start(cls, bw: List[float]) -> None:
+        """
+        Warm-start the next solve from the given bandwidths (e.g., the optimum of a slightly different problem).
+        The solver completes the start into a full solution, and ignores it if it's infeasible.
+
+        :param bw: bandwidth per each dimension (in GB/s)
+        """
+        if len(bw) != cls.network.dims_count:
+            raise ModelError(f"Start {bw} should have a bandwidth per each of the {cls.network.dims_count} dimensions.")
+
+        for dim, value in enumerate(bw):
+            cls._bw[dim].Start = value
+
+            # inverse bandwidths are in model units (see _apply_scaling)
+            if cls._bw_inv is not None and value > 0:
+                cls._bw_inv[dim].Start = cls.scaling.bw_unit / value
+
+    def _rescale_compute(self, old_scale: float, new_scale: float) -> None:
+        if old_scale == new_scale:
+            return
+
+        if not self._compute_rescalable:
+            raise ModelError(f"Training loop of workload {self.name} adds nonlinear constraints, "
+                             f"whose compute times can't be rescaled.")
+
+        delta = self._compute_constant * (new_scale - old_scale)
+        self.e2e_time.addConstant(delta)
+        Model._e2e_time.addConstant(self.weight * delta)
+
+        for constr, rhs in zip(self._compute_constrs, self._compute_rhs):
+            constr.RHS = rhs * new_scale
+
+    def get_solved_workload(self) -> Workload:
+        """
+        Workload as currently solved, i.e., with its compute times scaled by Model.compute_scale.
+
+        :return: solved workload
+        """
+        if Model.compute_scale == 1:
+            return self.workload
+
+        return self.workload.with_compute_times(compute_times=self.workload.compute_times() * Model.compute_scale)
+
+
+# parameters of the solver output, not of how it solves
+_untuned_params = ('OutputFlag', 'LogToConsole', 'LogFile')
+
+@lru_cache(maxsize=64)
+def _scaled_workload(workload: Workload, time_unit: float) -> Workload:
+    """
+    Workload with its compute times in the given time unit, memoized so that task graphs cached per workload are reused.
+
+    :param workload: workload in ns
+    :param time_unit: time unit (in ns)
+    :return: scaled workload
+    """
+    if time_unit == 1:
+        return workload
+
+    return workload.with_compute_times(compute_times=workload.compute_times() / time_unit)
+
+
+class _ScaledModelView:
+    """
+    A workload model as its training loop sees it: the same variables, with compute times in model time units.
+    """
+
+    def __init__(self, model: Model, workload: Workload):
+        self._model = model
+        self.workload = workload
 
-        # update global e2e time
-        self._e2e_time += e2e_time
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._model, name)
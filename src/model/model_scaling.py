@@ -0,0 +1,89 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+import math
+from typing import List
+
+import numpy as np
+
+from src.model.model_error import ModelError
+
+
+class ModelScaling:
+    """
+    ModelScaling holds the units the Gurobi model is built in, so that its coefficients are well-conditioned:
+    times (dim, collective, compute, and e2e times) in time_unit ns, inverse bandwidths in 1 / bw_unit GB/s,
+    and the PerfPerCostOpt objective in cost_unit times its reported value
+    (its time scale, see Model.get_time_scale, is taken in time_unit ns as well).
+    Bandwidths and network costs stay in their input units, as constraint functions and cost models are written in them,
+    and every result is mapped back to input units.
+    Automatic units are powers of 2, so that scaling and mapping back are exact.
+    """
+
+    def __init__(self, time_unit: float = 1.0, bw_unit: float = 1.0, cost_unit: float = 1.0):
+        """
+        Initializer.
+
+        :param time_unit: time unit of the model (in ns)
+        :param bw_unit: bandwidth unit of the model's inverse bandwidths (in GB/s)
+        :param cost_unit: unit of the PerfPerCostOpt objective, relative to its reported value
+        """
+        for name, unit in (('Time', time_unit), ('Bandwidth', bw_unit), ('Cost', cost_unit)):
+            if not (unit > 0 and math.isfinite(unit)):
+                raise ModelError(f"{name} unit given ({unit}) should be positive.")
+
+        self.time_unit = time_unit
+        self.bw_unit = bw_unit
+        self.cost_unit = cost_unit
+
+        # units are chosen from the first workload added to the model (see automatic)
+        self.is_automatic = False
+
+    @classmethod
+    def unscaled(cls) -> 'ModelScaling':
+        """
+        The formulation in input units (ns, GB/s).
+
+        :return: scaling keeping the input units
+        """
+        return cls()
+
+    @classmethod
+    def automatic(cls) -> 'ModelScaling':
+        """
+        Units chosen from the magnitudes of the first workload added to the model (see from_magnitudes).
+
+        :return: scaling to be chosen by the model
+        """
+        scaling = cls()
+        scaling.is_automatic = True
+        return scaling
+
+    @classmethod
+    def from_magnitudes(cls, compute_times: List[float], msg_sizes: List[float]) -> 'ModelScaling':
+        """
+        Units from the magnitudes of a workload: the total compute time becomes the unit of times,
+        so that e2e times are around 1, and the bandwidth at which a typical message takes a typical compute time
+        becomes the unit of inverse bandwidths, so that they are around 1 rather than near the feasibility tolerance.
+        Network costs stay in $, as the PerfPerCostOpt objective keeps its magnitude in any time unit.
+
+        :param compute_times: compute time of each phase (in ns)
+        :param msg_sizes: message size of each collective on each dimension (in Bytes)
+        :return: automatic scaling
+        """
+        compute_times = np.asarray(compute_times, dtype=float)
+        msg_sizes = np.asarray(msg_sizes, dtype=float)
+        compute_times = compute_times[compute_times > 0]
+        msg_sizes = msg_sizes[msg_sizes > 0]
+
+        if len(compute_times) == 0 or len(msg_sizes) == 0:
+            return cls()
+
+        return cls(time_unit=ModelScaling._power_of_2(float(compute_times.sum())),
+                   bw_unit=ModelScaling._power_of_2(float(np.median(msg_sizes)) / float(np.median(compute_times))))
+
+    @staticmethod
+    def _power_of_2(value: float) -> float:
+        return float(2.0 ** round(math.log2(value)))
@@ -0,0 +1,82 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+import json
+import os
+from typing import Any, Dict, Optional, Union
+
+from src.model.model_error import ModelError
+
+
+class ParameterCache:
+    """
+    ParameterCache persists the best Gurobi parameters found per problem class (see Model.get_problem_signature)
+    in a json file, so that later solves of the same class pick them up (see Model.set_parameter_cache).
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (or create) a parameter cache.
+
+        :param path: path to the json file
+        """
+        self.path = path
+
+        # problem signature -> {'params': tuned parameters, 'baseline_runtime': ..., 'tuned_runtime': ...}
+        self.entries: Dict[str, Dict[str, Any]] = dict()
+
+        if os.path.exists(path):
+            with open(path, 'r') as json_file:
+                entries = json.load(json_file)
+
+            if not isinstance(entries, dict) or \
+                    not all(isinstance(entry, dict) and isinstance(entry.get('params'), dict)
+                            for entry in entries.values()):
+                raise ModelError(f"Parameter cache {path} is not a map of problem signatures to parameters.")
+            self.entries = entries
+
+    def __contains__(self, signature: str) -> bool:
+        return signature in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, signature: str) -> Optional[Dict[str, Union[int, float, str]]]:
+        """
+        Get the tuned parameters of a problem class.
+
+        :param signature: problem signature
+        :return: parameter name -> value (None if the class isn't tuned)
+        """
+        entry = self.entries.get(signature)
+        return dict(entry['params']) if entry is not None else None
+
+    def put(self, signature: str, params: Dict[str, Union[int, float, str]], baseline_runtime: float,
+            tuned_runtime: float) -> None:
+        """
+        Store the tuned parameters of a problem class, and persist the cache.
+
+        :param signature: problem signature
+        :param params: parameter name -> value, of the parameters differing from LIBRA's defaults
+        :param baseline_runtime: solve time (in seconds) under LIBRA's default parameters
+        :param tuned_runtime: solve time (in seconds) under the tuned parameters
+        """
+        self.entries[signature] = {'params': dict(params), 'baseline_runtime': baseline_runtime,
+                                   'tuned_runtime': tuned_runtime}
+        self.save()
+
+    def save(self) -> None:
+        """
+        Write the cache, replacing the file at once (so that concurrent readers never see a partial file).
+        """
+        # create parent directory if needed
+        directory = os.path.dirname(self.path)
+        if directory != '' and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        temp_path = f'{self.path}.{os.getpid()}.tmp'
+        with open(temp_path, 'w') as json_file:
+            json.dump(self.entries, json_file, indent=2, sort_keys=True)
+        os.replace(temp_path, self.path)
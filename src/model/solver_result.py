@@ -0,0 +1,62 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from typing import Dict, List, Optional
+
+from src.model.solver_objective import SolverObjective
+from src.model.workload_aggregation import WorkloadAggregation
+
+
+class SolverResult:
+    """
+    SolverResult holds the outcome of a single LIBRA solve:
+    the optimized bandwidths, the resulting e2e time and network cost,
+    and the solver statistics.
+    """
+
+    def __init__(self,
+                 objective: SolverObjective,
+                 status: str,
+                 bw: List[float],
+                 e2e_time: float,
+                 network_cost: float,
+                 objective_value: float,
+                 runtime: float,
+                 iterations_count: float,
+                 nodes_count: float,
+                 cost_breakdown: Optional[Dict[str, float]] = None,
+                 aggregation: WorkloadAggregation = WorkloadAggregation.WeightedSum,
+                 workload_e2e_times: Optional[Dict[str, float]] = None,
+                 objective_bound: Optional[float] = None):
+        """
+        Initializer.
+
+        :param objective: solver objective used
+        :param status: Gurobi optimization status name (e.g., OPTIMAL)
+        :param bw: optimized bandwidth (in GB/s) per each dimension
+        :param e2e_time: end-to-end time (in ns) under the optimized bandwidths (weighted sum over the workloads)
+        :param network_cost: network cost (in $) under the optimized bandwidths
+        :param objective_value: final objective value
+        :param runtime: solver wall-clock time (in seconds)
+        :param iterations_count: simplex/barrier iterations taken by the solver
+        :param nodes_count: branch-and-bound nodes explored by the solver
+        :param cost_breakdown: network cost per cost element (and fixed cost source) name
+        :param aggregation: how the e2e times of the workloads were aggregated into the objective
+        :param workload_e2e_times: e2e time (in ns) per each workload name
+        :param objective_bound: lower bound of the optimal objective value proven by the solver (None if unknown)
+        """
+        self.objective = objective
+        self.status = status
+        self.bw = bw
+        self.e2e_time = e2e_time
+        self.network_cost = network_cost
+        self.objective_value = objective_value
+        self.runtime = runtime
+        self.iterations_count = iterations_count
+        self.nodes_count = nodes_count
+        self.cost_breakdown = cost_breakdown if cost_breakdown is not None else dict()
+        self.aggregation = aggregation
+        self.workload_e2e_times = workload_e2e_times if workload_e2e_times is not None else dict()
+        self.objective_bound = objective_bound
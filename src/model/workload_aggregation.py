@@ -0,0 +1,17 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from enum import Enum, auto
+
+
+class WorkloadAggregation(Enum):
+    """
+    How the e2e times of jointly optimized workloads are aggregated:
+    either their weighted sum, the worst slowdown (e2e time / SLA) among them,
+    or the worst e2e time among them (e.g., the worst-case scenario of a workload).
+    """
+    WeightedSum = auto()
+    MaxSlowdown = auto()
+    MaxE2ETime = auto()
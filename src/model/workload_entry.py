@@ -0,0 +1,51 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from typing import Callable, List, Optional
+
+from src.communicator import Communicator
+from src.model.model_error import ModelError
+from src.workload import Workload
+
+
+class WorkloadEntry:
+    """
+    WorkloadEntry is one workload of a jointly optimized cluster:
+    its workload, communicator, and training loop, with its weight (for the weighted sum of e2e times)
+    and SLA (the target e2e time, for the worst slowdown).
+    """
+
+    def __init__(self,
+                 workload: Workload,
+                 communicator: Communicator,
+                 training_loop: Callable,
+                 name: Optional[str] = None,
+                 weight: float = 1.0,
+                 sla: Optional[float] = None,
+                 bw_scale: Optional[List[float]] = None):
+        """
+        Initializer.
+
+        :param workload: target workload
+        :param communicator: communicator of the workload
+        :param training_loop: training loop function
+        :param name: name to report the workload by (the workload name if None)
+        :param weight: weight of the workload's e2e time
+        :param sla: target e2e time (in ns) of the workload
+        :param bw_scale: fraction of each dimension's bandwidth the workload gets, 1 if None
+        """
+        if weight < 0:
+            raise ModelError(f"Weight of workload {name} ({weight}) should be non-negative.")
+
+        if sla is not None and sla <= 0:
+            raise ModelError(f"SLA of workload {name} ({sla}) should be a positive value.")
+
+        self.workload = workload
+        self.communicator = communicator
+        self.training_loop = training_loop
+        self.name = name if name is not None else workload.name
+        self.weight = weight
+        self.sla = sla
+        self.bw_scale = bw_scale
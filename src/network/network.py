@@ -4,7 +4,7 @@ LICENSE file in the root directory of this source tree.
 """
 
 import math
-from typing import List
+from typing import List, Optional
 
 from src.network.network_building_block import NetworkBuildingBlock
 from src.network.network_error import NetworkError
@@ -19,18 +19,24 @@ class Network:
     def __init__(self,
                  topology: List[NetworkBuildingBlock],
                  npus_count: List[int],
-                 cost_dimension: List[str]):
+                 cost_dimension: List[str],
+                 latency: Optional[List[float]] = None,
+                 switch_hops: int = 2):
         """
         Initializer.
 
         :param topology: network building blocks per each dimension
         :param npus_count: npus_count per each dimensino
         :param cost_dimension: cost_dimension name per each dimensino
+        :param latency: latency of a single link traversal (in ns) per each dimension (None to ignore latency)
+        :param switch_hops: links a message traverses through a Switch (e.g., NPU -> switch -> NPU)
         """
         # set values
         self.topology = topology
         self.npus_count = npus_count
         self.cost_dimension = cost_dimension
+        self.latency = latency
+        self.switch_hops = switch_hops
         self.dims_count = len(self.topology)
 
         # check validity
@@ -40,6 +46,16 @@ class Network:
         if len(self.cost_dimension) != self.dims_count:
             raise NetworkError(f"Given CostDimension ({self.cost_dimension} is not {self.dims_count}D.")
 
+        if self.latency is not None:
+            if len(self.latency) != self.dims_count:
+                raise NetworkError(f"Given Latency ({self.latency}) is not {self.dims_count}D.")
+
+            if any(latency < 0 for latency in self.latency):
+                raise NetworkError(f"Given Latency ({self.latency}) should be >= 0.")
+
+        if self.switch_hops < 1:
+            raise NetworkError(f"Given SwitchHops ({self.switch_hops}) should be >= 1.")
+
         for dim in range(self.dims_count):
             if self.npus_count[dim] <= 1:
                 raise NetworkError(f"NpusCount at dim {dim + 1} ({self.npus_count[dim]}) should be larger than 1.")
@@ -46,10 +46,16 @@ class NetworkParser:
         npus_count = network_data['NpusCount']
         cost_dimension = network_data['CostDimension']
 
+        # optional latency model
+        latency = network_data.get('Latency')
+        switch_hops = network_data.get('SwitchHops', 2)
+
         # create and return parsed network
         return Network(topology=topology,
                        npus_count=npus_count,
-                       cost_dimension=cost_dimension)
+                       cost_dimension=cost_dimension,
+                       latency=latency,
+                       switch_hops=switch_hops)
 
     @staticmethod
     def parse_topology_name(topology_names: List[str]) -> List[NetworkBuildingBlock]:
@@ -0,0 +1,9 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from src.results_store.input_hash import compute_input_hash
+from src.results_store.result_record import ResultRecord
+from src.results_store.results_store import ResultsStore
+from src.results_store.results_store_error import ResultsStoreError
@@ -0,0 +1,103 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+import hashlib
+import json
+from typing import Any, Callable, Dict, Optional
+
+from src.communicator import Communicator
+from src.constraint import ConstraintSet
+from src.network import Network
+from src.workload import Workload
+
+
+def compute_input_hash(network: Network,
+                       workload: Workload,
+                       communicator: Communicator,
+                       cost_model: Any,
+                       training_loop: Callable,
+                       constraint: Callable,
+                       objective: Any,
+                       extra: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Compute a stable hash of every LIBRA input that determines a solve result.
+    Two runs with the same input hash are guaranteed to solve the identical problem.
+
+    Constraint and training loop functions are identified by their qualified names,
+    so editing the body of a registered function should come with a new name.
+    Declarative constraints (ConstraintSet) are identified by their expressions and bounds.
+
+    :param network: target network
+    :param workload: target workload
+    :param communicator: target communicator
+    :param cost_model: cost model (src.cost_model.CostModel)
+    :param training_loop: training loop function
+    :param constraint: constraint function
+    :param objective: solver objective (src.model.SolverObjective)
+    :param extra: additional json-serializable sweep parameters to distinguish runs
+    :return: sha256 hex digest of the inputs
+    """
+    payload: Dict[str, Any] = dict()
+
+    payload['network'] = {
+        'topology': [topology.name for topology in network.topology],
+        'npus_count': list(network.npus_count),
+        'cost_dimension': list(network.cost_dimension),
+    }
+
+    if network.latency is not None:
+        payload['network']['latency'] = list(network.latency)
+        payload['network']['switch_hops'] = network.switch_hops
+
+    payload['workload'] = [[(phase.compute_time, phase.comm_type.name, phase.comm_size)
+                            for phase in (layer.forward, layer.input_grad, layer.weight_grad)]
+                           for layer in workload.layers]
+
+    payload['communicator'] = [list(communicator.forward_communicator),
+                               list(communicator.input_grad_communicator),
+                               list(communicator.weight_grad_communicator)]
+
+    if communicator.pipeline_communicator is not None:
+        payload['pipeline'] = list(communicator.pipeline_communicator)
+
+    if workload.stages_count > 1:
+        payload['stages'] = [layer.stage for layer in workload.layers]
+
+    if len(communicator.layer_groups) > 0:
+        # in order, as the first matching pattern wins
+        payload['layer_groups'] = [[pattern, [list(communicator.groups[name]) if name is not None else None
+                                              for name in group_names]]
+                                   for pattern, group_names in communicator.layer_groups.items()]
+
+    if len(communicator.dims_order) > 0:
+        payload['dims_order'] = {collective.name: list(order) for collective, order in communicator.dims_order.items()}
+
+    payload['cost_model'] = {cost_dim: {cost_element.name: cost for cost_element, cost in costs.items()}
+                             for cost_dim, costs in cost_model.cost_model.items()}
+
+    if not cost_model.is_linear():
+        payload['cost_tiers'] = {cost_dim: {cost_element.name: tiers for cost_element, tiers in costs.items()}
+                                 for cost_dim, costs in cost_model.cost_tiers.items()}
+
+    if len(cost_model.switch_device_cost) > 0:
+        payload['switch_devices'] = {cost_dim: (cost, cost_model.switch_radix.get(cost_dim))
+                                     for cost_dim, cost in cost_model.switch_device_cost.items()}
+
+    if cost_model.npu_cost > 0:
+        payload['npu_cost'] = cost_model.npu_cost
+
+    payload['training_loop'] = f"{training_loop.__module__}.{training_loop.__qualname__}"
+    if isinstance(constraint, ConstraintSet):
+        # declarative constraints are identified by their content
+        payload['constraint'] = {'expressions': list(constraint.expressions),
+                                 'bounds': {str(key): list(bound) for key, bound in constraint.bounds.items()}}
+    else:
+        payload['constraint'] = f"{constraint.__module__}.{constraint.__qualname__}"
+    payload['objective'] = objective.name
+    payload['extra'] = extra if extra is not None else dict()
+
+    # serialize deterministically and hash
+    serialized = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
@@ -0,0 +1,161 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from typing import Any, Dict, List
+
+from src.network import Network
+from src.results_store.results_store_error import ResultsStoreError
+from src.workload import Workload
+
+
+class ResultRecord:
+    """
+    ResultRecord is a flat, solver-independent view of a single LIBRA result,
+    as stored in the ResultsStore.
+    """
+
+    # keys every serialized record must have
+    required_keys = ('input_hash', 'workload_name', 'topology', 'npus_count', 'cost_dimension',
+                     'objective', 'bw', 'e2e_time', 'network_cost')
+
+    def __init__(self,
+                 input_hash: str,
+                 workload_name: str,
+                 topology: List[str],
+                 npus_count: List[int],
+                 cost_dimension: List[str],
+                 objective: str,
+                 bw: List[float],
+                 e2e_time: float,
+                 network_cost: float,
+                 status: str = '',
+                 runtime: float = 0.0,
+                 iterations_count: float = 0.0,
+                 nodes_count: float = 0.0):
+        """
+        Initializer.
+
+        :param input_hash: hash of all inputs that produced this result
+        :param workload_name: name of the workload (e.g., GPT_3)
+        :param topology: topology name per each dimension
+        :param npus_count: npus_count per each dimension
+        :param cost_dimension: cost_dimension name per each dimension
+        :param objective: solver objective name (e.g., PerfOpt)
+        :param bw: optimized bandwidth (in GB/s) per each dimension
+        :param e2e_time: end-to-end time (in ns)
+        :param network_cost: network cost (in $)
+        :param status: solver status name
+        :param runtime: solver runtime (in seconds)
+        :param iterations_count: solver iterations count
+        :param nodes_count: solver branch-and-bound nodes count
+        """
+        self.input_hash = input_hash
+        self.workload_name = workload_name
+        self.topology = list(topology)
+        self.npus_count = list(npus_count)
+        self.cost_dimension = list(cost_dimension)
+        self.objective = objective
+        self.bw = list(bw)
+        self.e2e_time = e2e_time
+        self.network_cost = network_cost
+        self.status = status
+        self.runtime = runtime
+        self.iterations_count = iterations_count
+        self.nodes_count = nodes_count
+
+        # check validity
+        dims_count = len(self.topology)
+        if len(self.npus_count) != dims_count or len(self.cost_dimension) != dims_count:
+            raise ResultsStoreError(f"Network shape of result {input_hash} is inconsistent.")
+
+        if len(self.bw) != dims_count:
+            raise ResultsStoreError(f"BW of result {input_hash} ({self.bw}) is not {dims_count}D.")
+
+    @property
+    def network_shape(self) -> str:
+        """
+        Canonical network shape string, e.g., Ring(4)_FullyConnected(8)_Ring(4)_Switch(32).
+        """
+        return '_'.join(f"{topology}({npus_count})" for topology, npus_count in zip(self.topology, self.npus_count))
+
+    @property
+    def total_bw(self) -> float:
+        """
+        Sum of the bandwidths of all dimensions.
+        """
+        return sum(self.bw)
+
+    @staticmethod
+    def from_solver_result(result: Any, input_hash: str, network: Network, workload: Workload) -> 'ResultRecord':
+        """
+        Create a record out of a solver result.
+
+        :param result: src.model.SolverResult of the solve
+        :param input_hash: input hash of the solve (see compute_input_hash)
+        :param network: network used for the solve
+        :param workload: workload used for the solve
+        :return: ResultRecord instance
+        """
+        return ResultRecord(input_hash=input_hash,
+                            workload_name=workload.name,
+                            topology=[topology.name for topology in network.topology],
+                            npus_count=network.npus_count,
+                            cost_dimension=network.cost_dimension,
+                            objective=result.objective.name,
+                            bw=result.bw,
+                            e2e_time=result.e2e_time,
+                            network_cost=result.network_cost,
+                            status=result.status,
+                            runtime=result.runtime,
+                            iterations_count=result.iterations_count,
+                            nodes_count=result.nodes_count)
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> 'ResultRecord':
+        """
+        Create a record out of its dictionary (e.g., json) representation.
+
+        :param data: dictionary with (at least) ResultRecord.required_keys
+        :return: ResultRecord instance
+        """
+        missing_keys = [key for key in ResultRecord.required_keys if key not in data]
+        if len(missing_keys) > 0:
+            raise ResultsStoreError(f"Result is missing keys: {missing_keys}.")
+
+        return ResultRecord(input_hash=data['input_hash'],
+                            workload_name=data['workload_name'],
+                            topology=data['topology'],
+                            npus_count=data['npus_count'],
+                            cost_dimension=data['cost_dimension'],
+                            objective=data['objective'],
+                            bw=data['bw'],
+                            e2e_time=data['e2e_time'],
+                            network_cost=data['network_cost'],
+                            status=data.get('status', ''),
+                            runtime=data.get('runtime', 0.0),
+                            iterations_count=data.get('iterations_count', 0.0),
+                            nodes_count=data.get('nodes_count', 0.0))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the record into its dictionary (json-serializable) representation.
+
+        :return: dictionary representation of the record
+        """
+        return {
+            'input_hash': self.input_hash,
+            'workload_name': self.workload_name,
+            'topology': self.topology,
+            'npus_count': self.npus_count,
+            'cost_dimension': self.cost_dimension,
+            'objective': self.objective,
+            'bw': self.bw,
+            'e2e_time': self.e2e_time,
+            'network_cost': self.network_cost,
+            'status': self.status,
+            'runtime': self.runtime,
+            'iterations_count': self.iterations_count,
+            'nodes_count': self.nodes_count,
+        }
@@ -0,0 +1,310 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+import json
+import math
+import os
+import sqlite3
+from typing import Any, Dict, Iterable, List, Tuple
+
+from src.results_store.result_record import ResultRecord
+from src.results_store.results_store_error import ResultsStoreError
+
+
+class ResultsStore:
+    """
+    ResultsStore keeps LIBRA results in an indexed SQLite database,
+    deduplicated by input hash, and answers top-k / Pareto / group-by queries over them.
+    It doesn't depend on the solver, so it can be used offline.
+    """
+
+    # table schema
+    _schema = """
+        CREATE TABLE IF NOT EXISTS results (
+            id INTEGER PRIMARY KEY,
+            input_hash TEXT NOT NULL UNIQUE,
+            workload_name TEXT NOT NULL,
+            network_shape TEXT NOT NULL,
+            topology TEXT NOT NULL,
+            npus_count TEXT NOT NULL,
+            cost_dimension TEXT NOT NULL,
+            dims_count INTEGER NOT NULL,
+            total_npus_count INTEGER NOT NULL,
+            objective TEXT NOT NULL,
+            bw TEXT NOT NULL,
+            total_bw REAL NOT NULL,
+            e2e_time REAL NOT NULL,
+            network_cost REAL NOT NULL,
+            status TEXT NOT NULL,
+            runtime REAL NOT NULL,
+            iterations_count REAL NOT NULL,
+            nodes_count REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS results_workload_e2e_time ON results (workload_name, e2e_time);
+        CREATE INDEX IF NOT EXISTS results_workload_network_cost ON results (workload_name, network_cost);
+        CREATE INDEX IF NOT EXISTS results_workload_shape ON results (workload_name, network_shape);
+        CREATE INDEX IF NOT EXISTS results_dims_count ON results (dims_count, total_npus_count);
+    """
+
+    # columns of each row, in insertion order
+    _columns = ('input_hash', 'workload_name', 'network_shape', 'topology', 'npus_count', 'cost_dimension',
+                'dims_count', 'total_npus_count', 'objective', 'bw', 'total_bw', 'e2e_time', 'network_cost',
+                'status', 'runtime', 'iterations_count', 'nodes_count')
+
+    # columns that can be filtered by equality, grouped by, or ranked on
+    _filter_columns = ('workload_name', 'network_shape', 'dims_count', 'total_npus_count', 'objective', 'status')
+    _metric_columns = ('e2e_time', 'network_cost', 'total_bw', 'runtime')
+    _aggregates = ('min', 'max', 'avg', 'sum', 'count')
+
+    def __init__(self, path: str):
+        """
+        Open (or create) a results store.
+
+        :param path: path to the SQLite database file (':memory:' for an in-memory store)
+        """
+        # create parent directory if needed
+        directory = os.path.dirname(path)
+        if path != ':memory:' and directory != '' and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self.path = path
+        self.connection = sqlite3.connect(path)
+
+        # faster bulk inserts, still safe against corruption
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+
+        # create tables and indices
+        self.connection.executescript(ResultsStore._schema)
+
+    def __enter__(self) -> 'ResultsStore':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the database connection.
+        """
+        self.connection.close()
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def insert(self, record: ResultRecord) -> bool:
+        """
+        Insert a single record.
+
+        :param record: record to insert
+        :return: True if inserted, False if a record with the same input hash already exists
+        """
+        return self.insert_many(records=[record]) == 1
+
+    def insert_many(self, records: Iterable[ResultRecord]) -> int:
+        """
+        Bulk-insert records in a single transaction.
+        Records whose input hash already exists are skipped.
+
+        :param records: records to insert
+        :return: number of newly inserted records
+        """
+        placeholders = ', '.join('?' for _ in ResultsStore._columns)
+        query = f"INSERT OR IGNORE INTO results ({', '.join(ResultsStore._columns)}) VALUES ({placeholders})"
+
+        changes_before = self.connection.total_changes
+        with self.connection:
+            self.connection.executemany(query, (ResultsStore._to_row(record) for record in records))
+
+        return self.connection.total_changes - changes_before
+
+    def ingest_json(self, paths: Iterable[str]) -> int:
+        """
+        Bulk-ingest result json files.
+        Each file holds either a single record or a list of records (see ResultRecord.to_dict).
+
+        :param paths: json files to ingest
+        :return: number of newly inserted records
+        """
+        inserted_count = 0
+
+        for path in paths:
+            if not os.path.exists(path):
+                raise ResultsStoreError(f"Result file {path} does not exist.")
+
+            with open(path, 'r') as json_file:
+                data = json.load(json_file)
+
+            if isinstance(data, dict):
+                data = [data]
+
+            inserted_count += self.insert_many(records=(ResultRecord.from_dict(entry) for entry in data))
+
+        return inserted_count
+
+    def contains(self, input_hash: str) -> bool:
+        """
+        Check whether a result of the given inputs is already stored,
+        so that a sweep can skip solving it again.
+
+        :param input_hash: input hash to query
+        :return: True if stored, False otherwise
+        """
+        row = self.connection.execute("SELECT 1 FROM results WHERE input_hash = ?", (input_hash,)).fetchone()
+        return row is not None
+
+    def get(self, input_hash: str) -> ResultRecord:
+        """
+        Get the record of the given input hash.
+
+        :param input_hash: input hash to query
+        :return: stored record
+        """
+        rows = self._select(where="input_hash = ?", params=[input_hash])
+        if len(rows) == 0:
+            raise ResultsStoreError(f"Result {input_hash} does not exist.")
+
+        return rows[0]
+
+    def top_k(self, k: int, metric: str = 'e2e_time', descending: bool = False, **filters: Any) -> List[ResultRecord]:
+        """
+        Get the k best records ranked by the given metric.
+        e.g., best 4D shape for GPT-3 under $X:
+        top_k(1, workload_name='GPT_3', dims_count=4, max_network_cost=X)
+
+        :param k: number of records to return
+        :param metric: metric to rank with (e2e_time, network_cost, total_bw, or runtime)
+        :param descending: rank larger metric first if True
+        :param filters: equality filters on workload_name, network_shape, dims_count, total_npus_count,
+            objective, or status; and upper bounds max_e2e_time, max_network_cost, max_total_bw, max_runtime
+        :return: top k records
+        """
+        ResultsStore._check_metric(metric)
+
+        where, params = ResultsStore._build_where(filters)
+        order = 'DESC' if descending else 'ASC'
+        return self._select(where=where, params=params, order_by=f"{metric} {order}", limit=k)
+
+    def pareto(self, x_metric: str = 'network_cost', y_metric: str = 'e2e_time', **filters: Any) -> List[ResultRecord]:
+        """
+        Get the Pareto frontier minimizing both metrics (by default, network cost and e2e time).
+
+        :param x_metric: first metric to minimize
+        :param y_metric: second metric to minimize
+        :param filters: filters (see top_k)
+        :return: Pareto-optimal records, sorted by x_metric
+        """
+        ResultsStore._check_metric(x_metric)
+        ResultsStore._check_metric(y_metric)
+
+        where, params = ResultsStore._build_where(filters)
+        rows = self._select(where=where, params=params, order_by=f"{x_metric} ASC, {y_metric} ASC")
+
+        # single sweep over x-sorted rows: keep rows strictly improving y
+        frontier: List[ResultRecord] = list()
+        best_y = float('inf')
+
+        for record in rows:
+            y = getattr(record, y_metric)
+            if y < best_y:
+                frontier.append(record)
+                best_y = y
+
+        return frontier
+
+    def group_by(self, column: str, metric: str = 'e2e_time', aggregate: str = 'min',
+                 **filters: Any) -> List[Tuple[Any, float, int]]:
+        """
+        Aggregate a metric per each group.
+        e.g., best e2e time per network shape of GPT-3:
+        group_by('network_shape', workload_name='GPT_3')
+
+        :param column: column to group by (see top_k filters)
+        :param metric: metric to aggregate
+        :param aggregate: aggregate function (min, max, avg, sum, or count)
+        :param filters: filters (see top_k)
+        :return: list of (group value, aggregated metric, records count), sorted by the aggregated metric
+        """
+        if column not in ResultsStore._filter_columns:
+            raise ResultsStoreError(f"Cannot group by {column}.")
+        ResultsStore._check_metric(metric)
+        if aggregate not in ResultsStore._aggregates:
+            raise ResultsStoreError(f"{aggregate} is not a valid aggregate function.")
+
+        where, params = ResultsStore._build_where(filters)
+        query = (f"SELECT {column}, {aggregate.upper()}({metric}), COUNT(*) FROM results WHERE {where} "
+                 f"GROUP BY {column} ORDER BY 2 ASC")
+
+        return [(row[0], row[1], row[2]) for row in self.connection.execute(query, params)]
+
+    def _select(self, where: str, params: List[Any], order_by: str = 'id ASC', limit: int = -1) -> List[ResultRecord]:
+        query = (f"SELECT {', '.join(ResultsStore._columns)} FROM results WHERE {where} "
+                 f"ORDER BY {order_by} LIMIT ?")
+        return [ResultsStore._from_row(row) for row in self.connection.execute(query, params + [limit])]
+
+    @staticmethod
+    def _check_metric(metric: str) -> None:
+        if metric not in ResultsStore._metric_columns:
+            raise ResultsStoreError(f"{metric} is not a valid metric.")
+
+    @staticmethod
+    def _build_where(filters: Dict[str, Any]) -> Tuple[str, List[Any]]:
+        """
+        Translate keyword filters into a parameterized SQL WHERE clause.
+
+        :param filters: equality filters and max_<metric> upper bounds
+        :return: (where clause, parameters)
+        """
+        clauses: List[str] = ['1']
+        params: List[Any] = list()
+
+        for key, value in filters.items():
+            if key in ResultsStore._filter_columns:
+                clauses.append(f"{key} = ?")
+            elif key.startswith('max_') and key[len('max_'):] in ResultsStore._metric_columns:
+                clauses.append(f"{key[len('max_'):]} <= ?")
+            else:
+                raise ResultsStoreError(f"{key} is not a valid filter.")
+
+            params.append(value)
+
+        return ' AND '.join(clauses), params
+
+    @staticmethod
+    def _to_row(record: ResultRecord) -> Tuple[Any, ...]:
+        return (record.input_hash,
+                record.workload_name,
+                record.network_shape,
+                json.dumps(record.topology),
+                json.dumps(record.npus_count),
+                json.dumps(record.cost_dimension),
+                len(record.topology),
+                math.prod(record.npus_count),
+                record.objective,
+                json.dumps(record.bw),
+                record.total_bw,
+                record.e2e_time,
+                record.network_cost,
+                record.status,
+                record.runtime,
+                record.iterations_count,
+                record.nodes_count)
+
+    @staticmethod
+    def _from_row(row: Tuple[Any, ...]) -> ResultRecord:
+        values = dict(zip(ResultsStore._columns, row))
+        return ResultRecord(input_hash=values['input_hash'],
+                            workload_name=values['workload_name'],
+                            topology=json.loads(values['topology']),
+                            npus_count=json.loads(values['npus_count']),
+                            cost_dimension=json.loads(values['cost_dimension']),
+                            objective=values['objective'],
+                            bw=json.loads(values['bw']),
+                            e2e_time=values['e2e_time'],
+                            network_cost=values['network_cost'],
+                            status=values['status'],
+                            runtime=values['runtime'],
+                            iterations_count=values['iterations_count'],
+                            nodes_count=values['nodes_count'])
@@ -0,0 +1,13 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from src.robust.robust_error import RobustError
+from src.robust.robust_objective import RobustObjective
+from src.robust.robust_optimization import scenario_aggregation, scenario_entries, score_scenarios
+from src.robust.scenario import Scenario
+from src.robust.scenario_distribution import ScenarioDistribution
+from src.robust.scenario_parser import ScenarioParser
+from src.robust.scenario_scores import ScenarioScores
+from src.robust.scenario_set import ScenarioSet
@@ -0,0 +1,15 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from enum import Enum, auto
+
+
+class RobustObjective(Enum):
+    """
+    Which e2e time over the scenarios is optimized:
+    either its expectation (probability-weighted sum), or its worst case.
+    """
+    Expected = auto()
+    WorstCase = auto()
@@ -0,0 +1,78 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from typing import Callable, List
+
+import numpy as np
+
+from src.communicator import Communicator
+from src.evaluator import Evaluator
+from src.model import WorkloadAggregation, WorkloadEntry
+from src.robust.robust_error import RobustError
+from src.robust.robust_objective import RobustObjective
+from src.robust.scenario import Scenario
+from src.robust.scenario_distribution import ScenarioDistribution
+from src.robust.scenario_scores import ScenarioScores
+from src.workload import Workload
+
+
+def scenario_entries(workload: Workload, communicator: Communicator, training_loop: Callable,
+                     scenarios: List[Scenario]) -> List[WorkloadEntry]:
+    """
+    Formulate the scenarios of a workload as jointly optimized workloads sharing the network,
+    weighted by their normalized probabilities.
+    Collectives left unchanged by a scenario share their solver variables with the other scenarios.
+
+    :param workload: nominal workload
+    :param communicator: communicator of the workload
+    :param training_loop: training loop function
+    :param scenarios: scenarios to optimize over
+    :return: workload entry per each scenario (for Model.add_workloads)
+    """
+    total_probability = sum(scenario.probability for scenario in scenarios)
+    if total_probability <= 0:
+        raise RobustError("Probabilities of the scenarios should sum up to a positive value.")
+
+    return [WorkloadEntry(workload=workload.scaled(comm_scale=scenario.comm_scale,
+                                                   compute_scale=scenario.compute_scale),
+                          communicator=communicator,
+                          training_loop=training_loop,
+                          name=scenario.name,
+                          weight=scenario.probability / total_probability,
+                          bw_scale=scenario.bw_scale)
+            for scenario in scenarios]
+
+
+def scenario_aggregation(objective: RobustObjective) -> WorkloadAggregation:
+    """
+    Workload aggregation optimizing the given robust objective over the scenario entries.
+
+    :param objective: robust objective
+    :return: WeightedSum for the expected e2e time, MaxE2ETime for the worst case
+    """
+    if objective == RobustObjective.Expected:
+        return WorkloadAggregation.WeightedSum
+
+    if objective == RobustObjective.WorstCase:
+        return WorkloadAggregation.MaxE2ETime
+
+    # should not reach here
+    raise RobustError(f"Robust objective {objective} is unknown.")
+
+
+def score_scenarios(evaluator: Evaluator, bw: List[float], distribution: ScenarioDistribution) -> ScenarioScores:
+    """
+    Score fixed bandwidths against scenarios drawn from the distribution, without running the solver.
+
+    :param evaluator: evaluator of the nominal workload
+    :param bw: bandwidths to score
+    :param distribution: distribution to draw the scenarios from
+    :return: e2e time per each drawn scenario
+    """
+    bw = np.asarray(bw, dtype=float)
+    comm_scale, compute_scale, bw_scale = distribution.sample(dims_count=len(bw))
+
+    return ScenarioScores(e2e_times=evaluator.scenario_e2e_time(bw=bw, comm_scale=comm_scale,
+                                                                 compute_scale=compute_scale, bw_scale=bw_scale))
@@ -0,0 +1,47 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from typing import List, Optional
+
+from src.robust.robust_error import RobustError
+
+
+class Scenario:
+    """
+    Scenario is one possible realization of the workload and network:
+    every communication size and compute time of the workload scaled,
+    and each network dimension delivering a fraction of its bandwidth (e.g., degraded links).
+    """
+
+    def __init__(self,
+                 name: str,
+                 probability: float = 1.0,
+                 comm_scale: float = 1.0,
+                 compute_scale: float = 1.0,
+                 bw_scale: Optional[List[float]] = None):
+        """
+        Initializer.
+
+        :param name: name of the scenario
+        :param probability: probability (or relative weight) of the scenario
+        :param comm_scale: scale of every communication size
+        :param compute_scale: scale of every compute time
+        :param bw_scale: fraction of each dimension's bandwidth delivered, 1 if None
+        """
+        if probability < 0:
+            raise RobustError(f"Probability of scenario {name} ({probability}) should be non-negative.")
+
+        if comm_scale <= 0 or compute_scale < 0:
+            raise RobustError(f"Scales of scenario {name} (comm: {comm_scale}, compute: {compute_scale}) "
+                              f"should be positive.")
+
+        if bw_scale is not None and any(scale <= 0 for scale in bw_scale):
+            raise RobustError(f"Bandwidth scale of scenario {name} ({bw_scale}) should be positive.")
+
+        self.name = name
+        self.probability = probability
+        self.comm_scale = comm_scale
+        self.compute_scale = compute_scale
+        self.bw_scale = bw_scale
@@ -0,0 +1,69 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from src.robust.robust_error import RobustError
+
+
+class ScenarioDistribution:
+    """
+    ScenarioDistribution draws scenarios with every scale uniformly distributed over its [low, high] range.
+    """
+
+    def __init__(self,
+                 comm_scale: Tuple[float, float] = (1.0, 1.0),
+                 compute_scale: Tuple[float, float] = (1.0, 1.0),
+                 bw_scale: Optional[List[Tuple[float, float]]] = None,
+                 samples_count: int = 1000,
+                 seed: Optional[int] = None):
+        """
+        Initializer.
+
+        :param comm_scale: (low, high) range of the communication size scale
+        :param compute_scale: (low, high) range of the compute time scale
+        :param bw_scale: (low, high) range of the bandwidth scale per each dimension, 1 if None
+        :param samples_count: number of scenarios to draw
+        :param seed: random seed (nondeterministic if None)
+        """
+        ranges = [comm_scale, compute_scale] + (list(bw_scale) if bw_scale is not None else [])
+        for low, high in ranges:
+            if low <= 0 or high < low:
+                raise RobustError(f"Scale range [{low}, {high}] should be positive and non-empty.")
+
+        if samples_count <= 0:
+            raise RobustError(f"Samples count ({samples_count}) should be positive.")
+
+        self.comm_scale = comm_scale
+        self.compute_scale = compute_scale
+        self.bw_scale = bw_scale
+        self.samples_count = samples_count
+        self.seed = seed
+
+    def sample(self, dims_count: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Draw samples_count scenarios.
+
+        :param dims_count: number of network dimensions
+        :return: (comm scale of shape (N,), compute scale of shape (N,), bw scale of shape (N, dims_count))
+        """
+        if self.bw_scale is not None and len(self.bw_scale) != dims_count:
+            raise RobustError(f"Bandwidth scale ranges ({len(self.bw_scale)}) don't match dims count ({dims_count}).")
+
+        rng = np.random.default_rng(self.seed)
+        size = self.samples_count
+
+        comm_scale = rng.uniform(*self.comm_scale, size=size)
+        compute_scale = rng.uniform(*self.compute_scale, size=size)
+
+        if self.bw_scale is None:
+            bw_scale = np.ones((size, dims_count))
+        else:
+            low, high = np.array(self.bw_scale, dtype=float).T
+            bw_scale = rng.uniform(low, high, size=(size, dims_count))
+
+        return comm_scale, compute_scale, bw_scale
@@ -0,0 +1,66 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+import os
+from typing import List, Optional
+
+import yaml
+
+from src.robust.robust_error import RobustError
+from src.robust.scenario import Scenario
+from src.robust.scenario_distribution import ScenarioDistribution
+from src.robust.scenario_set import ScenarioSet
+
+
+class ScenarioParser:
+    """
+    ScenarioParser helps parse the yaml scenario file.
+    """
+
+    def __init__(self):
+        """
+        ScenarioParser initializer.
+        """
+        pass
+
+    def parse(self, path: str) -> ScenarioSet:
+        """
+        Parse the given yaml scenarios.
+
+        :param path: path to the yaml scenarios
+        :return: parsed ScenarioSet
+        """
+        # check the file exists
+        if not os.path.exists(path):
+            raise RobustError(f"Scenarios {path} does not exist.")
+
+        # load yaml file
+        with open(path, 'r') as yaml_file:
+            scenario_data = yaml.safe_load(yaml_file)
+
+        # parse scenarios to optimize over
+        scenarios: List[Scenario] = list()
+        for name, scales in scenario_data['Scenarios'].items():
+            scales = scales if scales is not None else dict()
+            scenarios.append(Scenario(name=name,
+                                      probability=scales.get('Probability', 1.0),
+                                      comm_scale=scales.get('CommScale', 1.0),
+                                      compute_scale=scales.get('ComputeScale', 1.0),
+                                      bw_scale=scales.get('BwScale')))
+
+        # parse scenario distribution to score against, if given
+        distribution: Optional[ScenarioDistribution] = None
+        if 'Samples' in scenario_data:
+            samples = scenario_data['Samples']
+            bw_scale = samples.get('BwScale')
+            distribution = ScenarioDistribution(comm_scale=tuple(samples.get('CommScale', (1.0, 1.0))),
+                                                compute_scale=tuple(samples.get('ComputeScale', (1.0, 1.0))),
+                                                bw_scale=[tuple(scale) for scale in bw_scale]
+                                                if bw_scale is not None else None,
+                                                samples_count=samples.get('Count', 1000),
+                                                seed=samples.get('Seed'))
+
+        # create and return parsed scenario set
+        return ScenarioSet(scenarios=scenarios, distribution=distribution)
@@ -0,0 +1,52 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+import numpy as np
+
+
+class ScenarioScores:
+    """
+    ScenarioScores is the e2e time of fixed bandwidths under each of many sampled scenarios.
+    """
+
+    def __init__(self, e2e_times: np.ndarray):
+        """
+        Initializer.
+
+        :param e2e_times: e2e time (in ns) per each scenario
+        """
+        self.e2e_times = e2e_times
+
+    @property
+    def mean(self) -> float:
+        """
+        Expected e2e time over the scenarios.
+        """
+        return float(self.e2e_times.mean())
+
+    @property
+    def worst(self) -> float:
+        """
+        Worst e2e time over the scenarios.
+        """
+        return float(self.e2e_times.max())
+
+    def percentile(self, q: float) -> float:
+        """
+        E2e time percentile over the scenarios.
+
+        :param q: percentile, in [0, 100]
+        :return: e2e time that q% of the scenarios don't exceed
+        """
+        return float(np.percentile(self.e2e_times, q))
+
+    def print_report(self) -> None:
+        """
+        Print the e2e time statistics over the scenarios.
+        """
+        print("=" * 80)
+        print(f"Scenario Scores ({len(self.e2e_times)} scenarios):")
+        print(f"Mean E2E Time: {self.mean:.2f}, P95 E2E Time: {self.percentile(95):.2f}, "
+              f"Worst E2E Time: {self.worst:.2f}")
@@ -0,0 +1,34 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from typing import List, Optional
+
+from src.robust.robust_error import RobustError
+from src.robust.scenario import Scenario
+from src.robust.scenario_distribution import ScenarioDistribution
+
+
+class ScenarioSet:
+    """
+    ScenarioSet is the uncertainty of a workload and network:
+    the scenarios the bandwidths are optimized over,
+    and optionally a distribution of scenarios the optimized bandwidths are scored against.
+    """
+
+    def __init__(self, scenarios: List[Scenario], distribution: Optional[ScenarioDistribution] = None):
+        """
+        Initializer.
+
+        :param scenarios: scenarios to optimize over
+        :param distribution: distribution to draw scenarios from for scoring (None to skip scoring)
+        """
+        if len(scenarios) == 0:
+            raise RobustError("At least one scenario should be given.")
+
+        if sum(scenario.probability for scenario in scenarios) <= 0:
+            raise RobustError("Probabilities of the scenarios should sum up to a positive value.")
+
+        self.scenarios = scenarios
+        self.distribution = distribution
@@ -0,0 +1,107 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+import contextlib
+import io
+from typing import Tuple
+
+import gurobipy as gp
+import numpy as np
+
+from inputs.constraints import constraints
+from inputs.training_loop import training_loops
+from src.communicator import Communicator, CommunicatorParser
+from src.cost_model import CostModelParser
+from src.evaluator import Evaluator
+from src.model import Model, ModelError, ModelScaling, SolverObjective, SolverResult
+from src.network import Network, NetworkParser
+from src.workload import Workload, WorkloadParser
+
+# (workload, communicator, network dimensions) of each bundled case
+_cases = [
+    ('GPT_3', 'GPT_3_3d', '3d'),
+    ('GPT_3', 'GPT_3_4d', '4d'),
+    ('MSFT_1T', 'MSFT_1T_3d', '3d'),
+    ('MSFT_1T', 'MSFT_1T_4d', '4d'),
+    ('Turing_NLG', 'Turing_NLG_3D', '3d'),
+    ('Turing_NLG', 'Turing_NLG_4D', '4d'),
+    ('ResNet_50', 'ResNet_50_3d', '3d'),
+    ('ResNet_50', 'ResNet_50_4d', '4d'),
+    ('DLRM', 'DLRM_4d', '4d'),
+]
+
+
+def scaling_benchmark() -> None:
+    """
+    Solve every bundled workload in input units (ModelScaling.unscaled) and in automatic units,
+    and compare the solve times, simplex iterations, and objective values,
+    as well as how far the e2e time of each solve is from the Evaluator's e2e time of its bandwidths (its error).
+    """
+    network_parser = NetworkParser()
+    workload_parser = WorkloadParser()
+    communicator_parser = CommunicatorParser()
+
+    print("=" * 80)
+    print("LIBRA Scaling Benchmark:")
+    print("Case\tObjective\tTime (Unscaled, Scaled)\tIterations (Unscaled, Scaled)\tError (Unscaled, Scaled)\t"
+          "Objective Difference")
+
+    for workload_name, communicator_name, dims in _cases:
+        network = network_parser.parse(path=f'./inputs/network/{dims}_network.yml')
+        workload = workload_parser.parse(path=f'./inputs/workload/{workload_name}.txt')
+        communicator = communicator_parser.parse(path=f'./inputs/communicator/{communicator_name}.yml')
+
+        for objective in (SolverObjective.PerfOpt, SolverObjective.PerfPerCostOpt):
+            case = f"{communicator_name}\t{objective.name}"
+            try:
+                (unscaled, unscaled_error), (scaled, scaled_error) = [
+                    _solve(network=network, cost_model_path=f'./inputs/cost_model/{dims}_cost_model.yml',
+                           workload=workload, communicator=communicator, objective=objective, scaling=scaling)
+                    for scaling in (ModelScaling.unscaled(), ModelScaling.automatic())]
+            except (gp.GurobiError, ModelError) as e:
+                print(f"{case}\tskipped ({e})")
+                continue
+
+            difference = (scaled.objective_value - unscaled.objective_value) / unscaled.objective_value
+            print(f"{case}\t{unscaled.runtime:.3f}, {scaled.runtime:.3f}\t"
+                  f"{unscaled.iterations_count:.0f}, {scaled.iterations_count:.0f}\t"
+                  f"{unscaled_error:.1e}, {scaled_error:.1e}\t{difference * 100:+.4f}%")
+
+    Model.reset_model()
+
+
+def _solve(network: Network, cost_model_path: str, workload: Workload, communicator: Communicator,
+           objective: SolverObjective, scaling: ModelScaling) -> Tuple[SolverResult, float]:
+    """
+    Solve a case from scratch in the given units (the solve log is skipped).
+
+    :param network: target network
+    :param cost_model_path: path of the network's cost model
+    :param workload: target workload
+    :param communicator: communicator of the workload
+    :param objective: objective type
+    :param scaling: units of the Gurobi model
+    :return: (solver result, relative error of its e2e time)
+    """
+    cost_model = CostModelParser().parse(path=cost_model_path)
+    training_loop = training_loops['no_overlap']
+
+    Model.reset_model()
+    Model.initialize_model(network=network, cost_model=cost_model, scaling=scaling)
+    constraints['total_bw_500gbps']()
+    Model(workload=workload, communicator=communicator, training_loop=training_loop)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = Model.solve(objective=objective, verbose=False)
+
+    evaluator = Evaluator(network=network, workload=workload, communicator=communicator, training_loop=training_loop,
+                          cost_model=cost_model)
+    e2e_time = evaluator.e2e_time(bw=np.array(result.bw))
+
+    return result, abs(result.e2e_time - e2e_time) / e2e_time
+
+
+if __name__ == '__main__':
+    scaling_benchmark()
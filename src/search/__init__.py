@@ -0,0 +1,16 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from src.search.adaptive_explorer import AdaptiveExplorer
+from src.search.candidate_solver import TotalBwConstraint, bound_candidate, prune_candidates, solve_candidate, \
+    solve_candidates
+from src.search.communicator_search import CommunicatorSearch
+from src.search.dims_order_search import DimsOrderSearch
+from src.search.discrete_bw_solver import DiscreteBwSolver
+from src.search.network_search_space import NetworkSearchSpace
+from src.search.network_search_space_parser import NetworkSearchSpaceParser
+from src.search.network_shape_search import NetworkShapeSearch
+from src.search.search_candidate import SearchCandidate
+from src.search.search_error import SearchError
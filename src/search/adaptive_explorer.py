@@ -0,0 +1,220 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, List, Optional
+
+import gurobipy as gp
+import numpy as np
+
+from src.cost_model import CostModel
+from src.model import Model, SolverObjective
+from src.search.candidate_solver import solve_candidate
+from src.search.search_candidate import SearchCandidate
+from src.search.search_error import SearchError
+from src.workload import Workload
+
+
+class AdaptiveExplorer:
+    """
+    AdaptiveExplorer solves the candidates of a design-space search adaptively instead of exhaustively.
+    A surrogate fitted to the solved candidates predicts each candidate's objective from its evaluator bounds
+    (the log gap over its lower bound, regressed on its log lower and heuristic upper bounds),
+    and the candidates of the lowest optimistic prediction (lower confidence bound) are solved next, in parallel,
+    until the k-th best objective stops improving.
+    As in solve_candidates, candidates whose lower bound can't beat the k-th best solved objective are never solved,
+    so the exploration ends as exhaustive (and provably optimal) if it runs out of candidates first.
+    """
+
+    def __init__(self,
+                 processes: Optional[int] = None,
+                 patience: int = 8,
+                 min_improvement: float = 1e-3,
+                 exploration: float = 1.0,
+                 max_solves: Optional[int] = None):
+        """
+        Initializer.
+
+        :param processes: number of worker processes, i.e., of solves in flight (defaults to the number of CPUs)
+        :param patience: number of consecutive solves not improving the k-th best objective to stop after
+        :param min_improvement: relative decrease of the k-th best objective counted as an improvement
+        :param exploration: number of residual standard deviations the optimistic prediction is below the surrogate's
+        :param max_solves: maximum number of candidates to solve (unlimited if None)
+        """
+        if patience < 1:
+            raise SearchError(f"Patience ({patience}) should be >= 1.")
+        if min_improvement < 0 or exploration < 0:
+            raise SearchError(f"Minimum improvement ({min_improvement}) and exploration ({exploration}) "
+                              f"should be non-negative.")
+
+        self.processes = processes
+        self.patience = patience
+        self.min_improvement = min_improvement
+        self.exploration = exploration
+        self.max_solves = max_solves
+
+        # exploration statistics, set by explore()
+        self.solves_count = 0
+        self.stop_reason = ''  # exhausted, converged, or max_solves
+        self.history: List[float] = list()  # k-th best objective after each solve
+
+    def explore(self,
+                candidates: List[SearchCandidate],
+                workload: Workload,
+                cost_model: CostModel,
+                training_loop: Callable[[Model], gp.LinExpr],
+                constraint: Callable[[], None],
+                objective: SolverObjective,
+                top_k: int,
+                tolerance: float = 1e-6) -> List[SearchCandidate]:
+        """
+        Solve the most promising candidates in parallel, until the k-th best objective stops improving.
+        Candidates already solved (e.g., by a previous exploration) train the surrogate without being solved again.
+
+        :param candidates: bounded candidates
+        :param workload: target workload
+        :param cost_model: cost model
+        :param training_loop: training loop function
+        :param constraint: constraint function, must be picklable (e.g., a module-level function)
+        :param objective: solver objective
+        :param top_k: number of best candidates to return
+        :param tolerance: relative tolerance of the pruning, covering the solver's own feasibility tolerance
+        :return: top_k solved candidates, best first
+        """
+        self.solves_count = 0
+        self.history = list()
+
+        lower_bounds = np.array([candidate.lower_bound for candidate in candidates], dtype=float)
+        features = AdaptiveExplorer._features(candidates=candidates)
+
+        solved = [candidate for candidate in candidates if candidate.solved and candidate.result is not None]
+        solved.sort(key=lambda candidate: candidate.objective_value)
+        unsolved = np.array([not candidate.solved for candidate in candidates], dtype=bool)
+        stalled_count = 0
+
+        # spawn workers, so that they never share the parent's Gurobi environment
+        context = multiprocessing.get_context('spawn')
+        workers_count = self.processes if self.processes is not None else os.cpu_count()
+
+        with ProcessPoolExecutor(max_workers=workers_count, mp_context=context) as executor:
+            pending = dict()
+
+            while True:
+                threshold = AdaptiveExplorer._kth_best(solved=solved, top_k=top_k)
+                threshold += abs(threshold) * tolerance
+
+                # keep workers busy with the most promising candidates that can still beat the k-th best
+                if stalled_count < self.patience:
+                    promising = np.flatnonzero(unsolved & (lower_bounds <= threshold))
+                    acquisition = self._acquisition(candidates=candidates, features=features,
+                                                    lower_bounds=lower_bounds)
+
+                    for index in promising[np.argsort(acquisition[promising], kind='stable')]:
+                        if len(pending) >= workers_count:
+                            break
+                        if self.max_solves is not None and self.solves_count >= self.max_solves:
+                            break
+
+                        candidate = candidates[index]
+                        future = executor.submit(solve_candidate, network=candidate.network, workload=workload,
+                                                 communicator=candidate.communicator, cost_model=cost_model,
+                                                 training_loop=training_loop, constraint=constraint,
+                                                 objective=objective)
+                        pending[future] = candidate
+                        unsolved[index] = False
+                        self.solves_count += 1
+
+                if len(pending) == 0:
+                    break
+
+                # collect finished solves
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    candidate = pending.pop(future)
+                    candidate.result = future.result()
+                    candidate.solved = True
+
+                    previous_best = AdaptiveExplorer._kth_best(solved=solved, top_k=top_k)
+                    if candidate.result is not None:
+                        solved.append(candidate)
+                        solved.sort(key=lambda solved_candidate: solved_candidate.objective_value)
+
+                    best = AdaptiveExplorer._kth_best(solved=solved, top_k=top_k)
+                    # until k candidates are solved, every solution improves the top k
+                    improved = candidate.result is not None and \
+                        (not np.isfinite(previous_best)
+                         or best < previous_best - abs(previous_best) * self.min_improvement)
+                    stalled_count = 0 if improved else stalled_count + 1
+                    self.history.append(best)
+
+        # candidates left unsolved that could still beat the k-th best
+        threshold = AdaptiveExplorer._kth_best(solved=solved, top_k=top_k)
+        threshold += abs(threshold) * tolerance
+        if not (unsolved & (lower_bounds <= threshold)).any():
+            self.stop_reason = 'exhausted'
+        elif stalled_count >= self.patience:
+            self.stop_reason = 'converged'
+        else:
+            self.stop_reason = 'max_solves'
+
+        return solved[:top_k]
+
+    def _acquisition(self, candidates: List[SearchCandidate], features: Optional[np.ndarray],
+                     lower_bounds: np.ndarray) -> np.ndarray:
+        """
+        Optimistic prediction of each candidate's objective by the surrogate fitted to the solved candidates
+        (never below its lower bound). Until enough candidates are solved to fit it,
+        candidates are ranked by the better of their lower bound and heuristic upper bound ranks.
+
+        :param candidates: bounded candidates
+        :param features: surrogate features of each candidate (None if the bounds can't be regressed in log)
+        :param lower_bounds: lower bound of each candidate
+        :return: acquisition value of each candidate (lower is more promising)
+        """
+        if features is None:
+            return lower_bounds
+
+        solved = np.array([candidate.result is not None for candidate in candidates], dtype=bool)
+        objective_values = np.array([candidate.objective_value for candidate in candidates], dtype=float)
+        solved &= objective_values > 0
+
+        features_count = features.shape[1]
+        if solved.sum() <= features_count:
+            ranks = np.argsort(np.argsort(features[:, 1:], axis=0, kind='stable'), axis=0)
+            return ranks.min(axis=1).astype(float)
+
+        # log gap of the objective over the lower bound
+        gaps = np.log(objective_values[solved] / lower_bounds[solved])
+        coefficients, _, _, _ = np.linalg.lstsq(features[solved], gaps, rcond=None)
+        residuals = gaps - features[solved] @ coefficients
+        deviation = np.sqrt((residuals ** 2).sum() / (solved.sum() - features_count))
+
+        return lower_bounds * np.exp(np.maximum(features @ coefficients - self.exploration * deviation, 0.0))
+
+    @staticmethod
+    def _features(candidates: List[SearchCandidate]) -> Optional[np.ndarray]:
+        """
+        Surrogate features of each candidate: 1, log lower bound, and log upper bound (if every one is finite).
+
+        :param candidates: bounded candidates
+        :return: features of shape (candidates_count, features_count), None if a lower bound isn't positive
+        """
+        lower_bounds = np.array([candidate.lower_bound for candidate in candidates], dtype=float)
+        upper_bounds = np.array([candidate.upper_bound for candidate in candidates], dtype=float)
+
+        if len(candidates) == 0 or not (lower_bounds > 0).all() or not np.isfinite(lower_bounds).all():
+            return None
+
+        features = [np.ones(len(candidates)), np.log(lower_bounds)]
+        if np.isfinite(upper_bounds).all() and (upper_bounds > 0).all():
+            features.append(np.log(upper_bounds))
+
+        return np.stack(features, axis=1)
+
+    @staticmethod
+    def _kth_best(solved: List[SearchCandidate], top_k: int) -> float:
+        return solved[top_k - 1].objective_value if len(solved) >= top_k else float('inf')
@@ -0,0 +1,230 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+import contextlib
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, List, Optional
+
+import gurobipy as gp
+
+from src.communicator import Communicator
+from src.constraint import ConstraintSet
+from src.cost_model import CostModel
+from src.evaluator import Evaluator
+from src.model import Model, ModelError, SolverObjective, SolverResult
+from src.network import Network
+from src.search.search_candidate import SearchCandidate
+from src.workload import Workload
+
+
+class TotalBwConstraint:
+    """
+    Constraint sum(bw) == total_bw, followed by an optional additional constraint function.
+    Unlike a closure, it can be sent to worker processes.
+    """
+
+    def __init__(self, total_bw: float, constraint: Optional[Callable[[], None]] = None):
+        """
+        Initializer.
+
+        :param total_bw: total bandwidth budget
+        :param constraint: additional constraint function (see inputs/constraints)
+        """
+        self.total_bw = total_bw
+        self.constraint = constraint
+
+    def __call__(self) -> None:
+        Model._gp_model.addLConstr(gp.quicksum(Model._bw) == self.total_bw, name='total_bw')
+
+        if self.constraint is not None:
+            Model.apply_constraint(constraint=self.constraint)
+
+
+def bound_candidate(network: Network,
+                    communicator: Communicator,
+                    workload: Workload,
+                    cost_model: CostModel,
+                    training_loop: Callable[[Model], gp.LinExpr],
+                    total_bw: float,
+                    objective: SolverObjective,
+                    constraint: Optional[Callable[[], None]] = None) -> SearchCandidate:
+    """
+    Create a candidate with the evaluator's analytic lower bound and heuristic upper bound of its objective,
+    under the total bandwidth budget sum(bw) == total_bw and an optional additional constraint.
+
+    The lower bound relaxes the additional constraint. The upper bound only counts the heuristic allocations
+    satisfying it, which can only be checked for declarative constraints (ConstraintSet):
+    under any other constraint function, the upper bound is infinite.
+
+    :param network: candidate network
+    :param communicator: candidate communicator
+    :param workload: target workload
+    :param cost_model: cost model
+    :param training_loop: training loop function
+    :param total_bw: total bandwidth budget
+    :param objective: solver objective
+    :param constraint: additional constraint function (see inputs/constraints)
+    :return: bounded candidate
+    """
+    evaluator = Evaluator(network=network, workload=workload, communicator=communicator,
+                          training_loop=training_loop, cost_model=cost_model)
+
+    lower_bound = evaluator.objective_lower_bound(total_bw=total_bw, objective=objective)
+    heuristic_bw = evaluator.heuristic_bw(total_bw=total_bw)
+
+    if constraint is not None:
+        if isinstance(constraint, ConstraintSet):
+            heuristic_bw = heuristic_bw[constraint.compile(network=network).is_feasible(bw=heuristic_bw)]
+        else:
+            heuristic_bw = heuristic_bw[:0]
+
+    upper_bound = float(evaluator.objective_value(bw=heuristic_bw, objective=objective).min()) \
+        if len(heuristic_bw) > 0 else float('inf')
+
+    return SearchCandidate(network=network, communicator=communicator,
+                           lower_bound=lower_bound, upper_bound=upper_bound)
+
+
+def prune_candidates(candidates: List[SearchCandidate], top_k: int,
+                     tolerance: float = 1e-6) -> List[SearchCandidate]:
+    """
+    Drop every candidate whose lower bound exceeds the k-th best upper bound,
+    as it can never be among the top_k candidates.
+    Upper bounds are only valid if their heuristic allocations satisfy every constraint of the solve.
+
+    :param candidates: bounded candidates
+    :param top_k: number of best candidates to keep
+    :param tolerance: relative tolerance of the pruning, covering the solver's own feasibility tolerance
+    :return: surviving candidates
+    """
+    if len(candidates) == 0:
+        return candidates
+
+    upper_bounds = sorted(candidate.upper_bound for candidate in candidates)
+    threshold = upper_bounds[min(top_k, len(upper_bounds)) - 1]
+    threshold += abs(threshold) * tolerance
+
+    return [candidate for candidate in candidates if candidate.lower_bound <= threshold]
+
+
+def solve_candidate(network: Network,
+                    workload: Workload,
+                    communicator: Communicator,
+                    cost_model: CostModel,
+                    training_loop: Callable[[Model], gp.LinExpr],
+                    constraint: Callable[[], None],
+                    objective: SolverObjective) -> Optional[SolverResult]:
+    """
+    Build and solve a LIBRA problem from scratch, discarding the current Model state.
+
+    :param network: target network
+    :param workload: target workload
+    :param communicator: target communicator
+    :param cost_model: cost model
+    :param training_loop: training loop function
+    :param constraint: constraint function
+    :param objective: solver objective
+    :return: solver result (None if the solver found no solution)
+    """
+    # keep worker logs quiet
+    with contextlib.redirect_stdout(io.StringIO()):
+        Model.reset_model()
+        Model.initialize_model(network=network, cost_model=cost_model)
+        Model.apply_constraint(constraint=constraint)
+
+        model = Model(workload=workload, communicator=communicator, training_loop=training_loop)
+
+        try:
+            return model.solve(objective=objective)
+        except ModelError:
+            return None
+
+
+def solve_candidates(candidates: List[SearchCandidate],
+                     workload: Workload,
+                     cost_model: CostModel,
+                     training_loop: Callable[[Model], gp.LinExpr],
+                     constraint: Callable[[], None],
+                     objective: SolverObjective,
+                     top_k: int,
+                     processes: Optional[int] = None,
+                     max_solves: Optional[int] = None,
+                     tolerance: float = 1e-6) -> List[SearchCandidate]:
+    """
+    Solve candidates in parallel, best-first (lowest lower bound first),
+    skipping every candidate whose lower bound can't beat the k-th best solved objective.
+
+    :param candidates: candidates to solve
+    :param workload: target workload
+    :param cost_model: cost model
+    :param training_loop: training loop function
+    :param constraint: constraint function, must be picklable (e.g., a module-level function)
+    :param objective: solver objective
+    :param top_k: number of best candidates to return
+    :param processes: number of worker processes (defaults to the number of CPUs)
+    :param max_solves: maximum number of candidates to solve (unlimited if None)
+    :param tolerance: relative tolerance of the pruning, covering the solver's own feasibility tolerance
+    :return: top_k solved candidates, best first
+    """
+    # most promising candidates first
+    queue = sorted(candidates, key=lambda candidate: candidate.lower_bound)
+    queue_idx = 0
+
+    solved: List[SearchCandidate] = list()
+    solves_count = 0
+
+    # spawn workers, so that they never share the parent's Gurobi environment
+    context = multiprocessing.get_context('spawn')
+
+    workers_count = processes if processes is not None else os.cpu_count()
+
+    with ProcessPoolExecutor(max_workers=workers_count, mp_context=context) as executor:
+        pending = dict()
+
+        while True:
+            # k-th best objective value so far
+            threshold = solved[top_k - 1].objective_value if len(solved) >= top_k else float('inf')
+            threshold += abs(threshold) * tolerance
+
+            # keep workers busy with the most promising candidates
+            while queue_idx < len(queue) and len(pending) < workers_count:
+                candidate = queue[queue_idx]
+
+                # every remaining candidate has an even larger lower bound
+                if candidate.lower_bound > threshold:
+                    queue_idx = len(queue)
+                    break
+
+                if max_solves is not None and solves_count >= max_solves:
+                    queue_idx = len(queue)
+                    break
+
+                future = executor.submit(solve_candidate, network=candidate.network, workload=workload,
+                                         communicator=candidate.communicator, cost_model=cost_model,
+                                         training_loop=training_loop, constraint=constraint, objective=objective)
+                pending[future] = candidate
+
+                queue_idx += 1
+                solves_count += 1
+
+            if len(pending) == 0:
+                break
+
+            # collect finished solves
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                candidate = pending.pop(future)
+                candidate.result = future.result()
+                candidate.solved = True
+
+                if candidate.result is not None:
+                    solved.append(candidate)
+
+            solved.sort(key=lambda candidate: candidate.objective_value)
+
+    return solved[:top_k]
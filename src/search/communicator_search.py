@@ -0,0 +1,129 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+import gurobipy as gp
+
+from src.communicator import CommunicatorError, enumerate_communicators
+from src.cost_model import CostModel
+from src.model import Model, SolverObjective
+from src.network import Network
+from src.search.adaptive_explorer import AdaptiveExplorer
+from src.search.candidate_solver import TotalBwConstraint, bound_candidate, prune_candidates, solve_candidates
+from src.search.search_candidate import SearchCandidate
+from src.search.search_error import SearchError
+from src.workload import Workload
+
+
+class CommunicatorSearch:
+    """
+    CommunicatorSearch jointly finds the best parallelism mapping (Communicator) and BW allocation of a network.
+    Every valid mapping of the parallelism degrees onto the network dimensions is bounded with the fixed-BW evaluator
+    (sharing message sizes among mappings with the same per-phase communicator),
+    dominated mappings are pruned, and only the promising ones are solved in parallel.
+    """
+
+    def __init__(self,
+                 network: Network,
+                 workload: Workload,
+                 parallelism: Dict[str, int],
+                 cost_model: CostModel,
+                 training_loop: Callable[[Model], gp.LinExpr],
+                 total_bw: float,
+                 constraint: Optional[Callable[[], None]] = None,
+                 objective: SolverObjective = SolverObjective.PerfOpt,
+                 phase_groups: Tuple[str, str, str] = ('TP', 'TP', 'DP'),
+                 layer_phase_groups: Optional[Dict[str, Tuple[Optional[str], ...]]] = None):
+        """
+        Initializer.
+
+        :param network: target network
+        :param workload: target workload
+        :param parallelism: degree per each parallelism group (e.g., {'TP': 16, 'DP': 256})
+        :param cost_model: cost model
+        :param training_loop: training loop function
+        :param total_bw: total bandwidth (per NPU) budget, i.e., sum(bw) == total_bw
+        :param constraint: additional constraint function (see inputs/constraints)
+        :param objective: solver objective
+        :param phase_groups: group that Forward, InputGrad, and WeightGrad phases communicate over
+        :param layer_phase_groups: group that the phases of the layers matching each layer name pattern
+            communicate over instead (None for phase_groups), e.g., {'*moe*': ('EP', 'EP', None)}
+        """
+        self.network = network
+        self.workload = workload
+        self.parallelism = parallelism
+        self.cost_model = cost_model
+        self.training_loop = training_loop
+        self.total_bw = total_bw
+        self.constraint = constraint
+        self.objective = objective
+        self.phase_groups = phase_groups
+        self.layer_phase_groups = layer_phase_groups
+
+        # search statistics, set by search()
+        self.candidates_count = 0
+        self.pruned_count = 0
+        self.solved_count = 0
+
+    def search(self, top_k: int = 5, processes: Optional[int] = None,
+               max_solves: Optional[int] = None, explorer: Optional[AdaptiveExplorer] = None) -> List[SearchCandidate]:
+        """
+        Run the communicator search.
+
+        :param top_k: number of best mappings to return
+        :param processes: number of worker processes (defaults to the number of CPUs)
+        :param max_solves: maximum number of mappings to solve (unlimited if None)
+        :param explorer: solve the candidates adaptively by the explorer (with its own processes and max_solves),
+            instead of every candidate that can beat the k-th best
+        :return: top_k solved mappings with their BW allocations, best first
+        """
+        candidates = self.bound_candidates()
+        self.candidates_count = len(candidates)
+
+        # upper bounds only count heuristic allocations known to satisfy the constraints
+        candidates = prune_candidates(candidates=candidates, top_k=top_k)
+
+        constraint = TotalBwConstraint(total_bw=self.total_bw, constraint=self.constraint)
+        if explorer is not None:
+            # solve adaptively, until the best objective stops improving
+            best_candidates = explorer.explore(candidates=candidates, workload=self.workload,
+                                               cost_model=self.cost_model, training_loop=self.training_loop,
+                                               constraint=constraint, objective=self.objective, top_k=top_k)
+        else:
+            best_candidates = solve_candidates(candidates=candidates, workload=self.workload,
+                                               cost_model=self.cost_model, training_loop=self.training_loop,
+                                               constraint=constraint, objective=self.objective, top_k=top_k,
+                                               processes=processes, max_solves=max_solves)
+
+        # update statistics
+        self.solved_count = sum(1 for candidate in candidates if candidate.solved)
+        self.pruned_count = self.candidates_count - self.solved_count
+
+        return best_candidates
+
+    def bound_candidates(self) -> List[SearchCandidate]:
+        """
+        Enumerate every valid communicator of the network,
+        with analytic lower and heuristic upper bounds of its optimal objective value.
+
+        :return: bounded candidates
+        """
+        try:
+            communicators = list(enumerate_communicators(npus_count=self.network.npus_count,
+                                                         parallelism=self.parallelism,
+                                                         phase_groups=self.phase_groups,
+                                                         layer_phase_groups=self.layer_phase_groups))
+        except CommunicatorError as e:
+            raise SearchError(e.message)
+
+        if len(communicators) == 0:
+            raise SearchError(f"Parallelism {self.parallelism} cannot be mapped onto "
+                              f"NpusCount {self.network.npus_count}.")
+
+        return [bound_candidate(network=self.network, communicator=communicator, workload=self.workload,
+                                cost_model=self.cost_model, training_loop=self.training_loop,
+                                total_bw=self.total_bw, objective=self.objective, constraint=self.constraint)
+                for communicator in communicators]
@@ -0,0 +1,210 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+import itertools
+from typing import Callable, Dict, List, Optional, Tuple
+
+import gurobipy as gp
+import numpy as np
+
+from src.communicator import Communicator
+from src.cost_model import CostModel
+from src.evaluator import Evaluator
+from src.model import Model, SolverObjective, default_dims_order
+from src.network import Network
+from src.search.adaptive_explorer import AdaptiveExplorer
+from src.search.candidate_solver import TotalBwConstraint, bound_candidate, prune_candidates, solve_candidates
+from src.search.search_candidate import SearchCandidate
+from src.workload import Collective, Workload
+
+
+class DimsOrderSearch:
+    """
+    DimsOrderSearch finds the order each collective type traverses the network dimensions in, jointly with BW.
+    Orders of one collective type at a time are bounded with the fixed-BW evaluator (coordinate descent),
+    and the most promising order combinations are solved in parallel.
+    """
+
+    # collectives whose message sizes depend on the traversal order
+    ordered_collectives = (Collective.AllReduce, Collective.ReduceScatter, Collective.AllGather)
+
+    # networks up to this many dimensions try every permutation; larger ones try heuristic orders
+    max_exhaustive_dims_count = 5
+
+    def __init__(self,
+                 network: Network,
+                 workload: Workload,
+                 communicator: Communicator,
+                 cost_model: CostModel,
+                 training_loop: Callable[[Model], gp.LinExpr],
+                 total_bw: float,
+                 constraint: Optional[Callable[[], None]] = None,
+                 objective: SolverObjective = SolverObjective.PerfOpt):
+        """
+        Initializer.
+
+        :param network: target network
+        :param workload: target workload
+        :param communicator: target communicator (its DimsOrder, if any, is the starting point)
+        :param cost_model: cost model
+        :param training_loop: training loop function
+        :param total_bw: total bandwidth (per NPU) budget, i.e., sum(bw) == total_bw
+        :param constraint: additional constraint function (see inputs/constraints)
+        :param objective: solver objective
+        """
+        self.network = network
+        self.workload = workload
+        self.communicator = communicator
+        self.cost_model = cost_model
+        self.training_loop = training_loop
+        self.total_bw = total_bw
+        self.constraint = constraint
+        self.objective = objective
+
+        # collective types of the workload to order
+        used_collectives = {phase.comm_type for layer in workload.layers
+                            for phase in (layer.forward, layer.input_grad, layer.weight_grad)}
+        self.collectives = [collective for collective in DimsOrderSearch.ordered_collectives
+                            if collective in used_collectives]
+
+        # search statistics, set by search()
+        self.candidates_count = 0
+        self.pruned_count = 0
+        self.solved_count = 0
+
+    def search(self, top_k: int = 5, processes: Optional[int] = None, max_solves: Optional[int] = None,
+               rounds: int = 2, explorer: Optional[AdaptiveExplorer] = None) -> List[SearchCandidate]:
+        """
+        Run the dimension order search.
+        The chosen orders are reported in each candidate's communicator.dims_order.
+
+        :param top_k: number of best order combinations to return
+        :param processes: number of worker processes (defaults to the number of CPUs)
+        :param max_solves: maximum number of order combinations to solve (unlimited if None)
+        :param rounds: number of coordinate descent rounds over the collective types
+        :param explorer: solve the candidates adaptively by the explorer (with its own processes and max_solves),
+            instead of every candidate that can beat the k-th best
+        :return: top_k solved order combinations with their BW allocations, best first
+        """
+        candidates = self.bound_candidates(rounds=rounds)
+        self.candidates_count = len(candidates)
+
+        # upper bounds only count heuristic allocations known to satisfy the constraints
+        candidates = prune_candidates(candidates=candidates, top_k=top_k)
+
+        constraint = TotalBwConstraint(total_bw=self.total_bw, constraint=self.constraint)
+        if explorer is not None:
+            # solve adaptively, until the best objective stops improving
+            best_candidates = explorer.explore(candidates=candidates, workload=self.workload,
+                                               cost_model=self.cost_model, training_loop=self.training_loop,
+                                               constraint=constraint, objective=self.objective, top_k=top_k)
+        else:
+            best_candidates = solve_candidates(candidates=candidates, workload=self.workload,
+                                               cost_model=self.cost_model, training_loop=self.training_loop,
+                                               constraint=constraint, objective=self.objective, top_k=top_k,
+                                               processes=processes, max_solves=max_solves)
+
+        # update statistics
+        self.solved_count = sum(1 for candidate in candidates if candidate.solved)
+        self.pruned_count = self.candidates_count - self.solved_count
+
+        return best_candidates
+
+    def bound_candidates(self, rounds: int = 2) -> List[SearchCandidate]:
+        """
+        Bound order combinations by coordinate descent: the orders of one collective type are varied at a time,
+        keeping the best (lowest lower bound) order of the other types.
+        Combinations yielding identical message sizes are bounded only once.
+
+        :param rounds: number of coordinate descent rounds over the collective types
+        :return: bounded candidates
+        """
+        # start from the communicator's (or default) orders
+        current_orders: Dict[Collective, List[int]] = {
+            collective: self._initial_order(collective=collective) for collective in self.collectives}
+
+        # bounded candidates, keyed by their message sizes
+        candidates: Dict[bytes, SearchCandidate] = dict()
+        self._bound(dims_order=current_orders, candidates=candidates)
+
+        for _ in range(rounds):
+            for collective in self.collectives:
+                best_candidate: Optional[SearchCandidate] = None
+
+                for order in self.candidate_orders(collective=collective):
+                    dims_order = dict(current_orders)
+                    dims_order[collective] = list(order)
+
+                    candidate = self._bound(dims_order=dims_order, candidates=candidates)
+                    if best_candidate is None or candidate.lower_bound < best_candidate.lower_bound:
+                        best_candidate = candidate
+
+                current_orders = dict(best_candidate.communicator.dims_order)
+
+        return list(candidates.values())
+
+    def candidate_orders(self, collective: Collective) -> List[Tuple[int, ...]]:
+        """
+        Dimension orders to try for the given collective type:
+        every permutation for small networks, heuristic orders otherwise
+        (default, reversed, by dimension cost, and by dimension size, in both directions).
+
+        :param collective: collective type
+        :return: dimension orders
+        """
+        dims_count = self.network.dims_count
+
+        if dims_count <= DimsOrderSearch.max_exhaustive_dims_count:
+            return list(itertools.permutations(range(dims_count)))
+
+        evaluator = Evaluator(network=self.network, workload=self.workload, communicator=self.communicator,
+                              training_loop=self.training_loop, cost_model=self.cost_model)
+        by_cost = tuple(int(dim) for dim in np.argsort(evaluator.cost_coefficients, kind='stable'))
+        by_size = tuple(int(dim) for dim in np.argsort(self.network.npus_count, kind='stable'))
+        default_order = tuple(default_dims_order(comm_type=collective, dims_count=dims_count))
+
+        orders: List[Tuple[int, ...]] = list()
+        for order in (default_order, by_cost, by_size):
+            for candidate_order in (order, tuple(reversed(order))):
+                if candidate_order not in orders:
+                    orders.append(candidate_order)
+
+        return orders
+
+    def _initial_order(self, collective: Collective) -> List[int]:
+        dims_order = self.communicator.get_dims_order(collective)
+        if dims_order is not None:
+            return list(dims_order)
+
+        return default_dims_order(comm_type=collective, dims_count=self.network.dims_count)
+
+    def _bound(self, dims_order: Dict[Collective, List[int]],
+               candidates: Dict[bytes, SearchCandidate]) -> SearchCandidate:
+        """
+        Bound the communicator with the given orders, reusing the candidate with identical message sizes if any.
+
+        :param dims_order: dimension order per each collective type
+        :param candidates: bounded candidates so far, keyed by their message sizes (updated in place)
+        :return: bounded candidate
+        """
+        communicator = Communicator(forward_communicator=self.communicator.forward_communicator,
+                                    input_grad_communicator=self.communicator.input_grad_communicator,
+                                    weight_grad_communicator=self.communicator.weight_grad_communicator,
+                                    dims_order=dims_order,
+                                    pipeline_communicator=self.communicator.pipeline_communicator,
+                                    groups=self.communicator.groups,
+                                    layer_groups=self.communicator.layer_groups)
+
+        # orders only differing in dimensions a collective doesn't span carry identical traffic
+        key = Evaluator(network=self.network, workload=self.workload, communicator=communicator,
+                        training_loop=self.training_loop).msg_sizes.tobytes()
+
+        if key not in candidates:
+            candidates[key] = bound_candidate(network=self.network, communicator=communicator,
+                                              workload=self.workload, cost_model=self.cost_model,
+                                              training_loop=self.training_loop, total_bw=self.total_bw,
+                                              objective=self.objective, constraint=self.constraint)
+
+        return candidates[key]
@@ -0,0 +1,311 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+import itertools
+import math
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from src.constraint import BwConstraints
+from src.evaluator import Evaluator
+from src.model import Model, SolverObjective, SolverResult
+from src.search.search_error import SearchError
+
+
+class DiscreteBwSolver:
+    """
+    DiscreteBwSolver picks each dimension's bandwidth from the BwSkus of its cost dimension,
+    for the problem currently built in Model (every workload and constraint added to it).
+
+    The continuous optimum guides the search, and the solver's bound of it is a lower bound of the discrete one:
+    a local search around the rounded continuous optimum finds a first plan, and a depth-first branch-and-bound
+    over the dimensions proves optimality, evaluating the last dimensions' combinations in vectorized batches.
+    Partial plans are pruned when their constraints can no longer be met, or when even the largest remaining
+    bandwidths (and, for PerfPerCostOpt, the cheapest ones) can't beat the best plan so far.
+    """
+
+    def __init__(self,
+                 continuous_result: SolverResult,
+                 time_limit: Optional[float] = None,
+                 batch_dims_count: int = 2,
+                 tolerance: float = 1e-6):
+        """
+        Initializer.
+
+        :param continuous_result: result of the continuous Model.solve() of the same problem
+        :param time_limit: time limit (in seconds) of the branch-and-bound (unlimited if None)
+        :param batch_dims_count: number of last dimensions whose combinations are evaluated at once
+        :param tolerance: relative tolerance of constraint satisfaction and of the optimality gap
+        """
+        if Model._bw is None or len(Model.models) == 0:
+            raise SearchError("No solved model to discretize.")
+
+        self.continuous_result = continuous_result
+        self.objective = continuous_result.objective
+        self.aggregation = continuous_result.aggregation
+        self.time_limit = time_limit
+        self.batch_dims_count = max(1, batch_dims_count)
+        self.tolerance = tolerance
+
+        network = Model.network
+        self.dims_count = network.dims_count
+
+        # available bandwidths per each dimension
+        self.bw_skus: List[np.ndarray] = list()
+        for dim in range(self.dims_count):
+            bw_skus = Model.cost_model.get_bw_skus(cost_dim=network.cost_dimension[dim])
+            if bw_skus is None:
+                raise SearchError(f"BwSkus of cost dimension {network.cost_dimension[dim]} is not given.")
+            self.bw_skus.append(np.array(bw_skus))
+
+        self.models = list(Model.models)
+        self.time_bounds = Model.get_time_bounds(aggregation=self.aggregation)
+        self.evaluators = [Evaluator(network=network, workload=model.get_solved_workload(),
+                                     communicator=model.communicator, training_loop=model.training_loop,
+                                     cost_model=Model.cost_model, bw_scale=model.bw_scale)
+                           for model in Model.models]
+
+        # partial plans can only be bounded if more bandwidth never slows the e2e time down
+        self.monotone = all(evaluator.task_graph is not None or
+                            ((evaluator.coll_time_weights >= 0).all() and (evaluator.dim_time_weights >= 0).all())
+                            for evaluator in self.evaluators)
+
+        # linear constraints over bw
+        self.constraints = BwConstraints.from_model()
+
+        # search statistics, set by solve()
+        self.nodes_count = 0
+        self.evaluations_count = 0
+
+    def solve(self) -> SolverResult:
+        """
+        Find the best discrete bandwidth plan.
+
+        :return: discrete plan (status OPTIMAL if proven optimal, TIME_LIMIT if the time limit was reached first)
+        """
+        start_time = time.time()
+        self.nodes_count = 0
+        self.evaluations_count = 0
+
+        # branch on dimensions with fewer options first, so that the batched last dimensions are the widest
+        order = sorted(range(self.dims_count), key=lambda dim: len(self.bw_skus[dim]))
+        remaining_bounds = self._remaining_constraint_bounds(order=order)
+
+        best_bw, best_value = self._local_search()
+        stopped = False
+
+        def branch(bw: np.ndarray, position: int) -> None:
+            nonlocal best_bw, best_value, stopped
+
+            if stopped or self._proven(best_value=best_value):
+                return
+
+            if self.time_limit is not None and time.time() - start_time > self.time_limit:
+                stopped = True
+                return
+
+            self.nodes_count += 1
+            dims = order[position:]
+
+            # evaluate every combination of the last dimensions at once
+            if len(dims) <= self.batch_dims_count:
+                candidates = np.repeat(bw[np.newaxis], np.prod([len(self.bw_skus[dim]) for dim in dims]), axis=0)
+                candidates[:, dims] = np.array(list(itertools.product(*(self.bw_skus[dim] for dim in dims))))
+
+                candidates = candidates[self._feasible(bw=candidates)]
+                if len(candidates) == 0:
+                    return
+
+                values = self._objective_values(bw=candidates)
+                best = int(values.argmin())
+                if values[best] < best_value:
+                    best_bw, best_value = candidates[best], float(values[best])
+                return
+
+            # branch on the next dimension, most promising value first
+            dim = dims[0]
+            children = np.repeat(bw[np.newaxis], len(self.bw_skus[dim]), axis=0)
+            children[:, dim] = self.bw_skus[dim]
+
+            feasible = self._partially_feasible(bw=children, assigned_dims=order[:(position + 1)],
+                                                remaining_bounds=remaining_bounds[position + 1])
+            lower_bounds = self._lower_bounds(bw=children, unassigned_dims=dims[1:])
+
+            for child in np.argsort(lower_bounds, kind='stable'):
+                if feasible[child] and lower_bounds[child] < best_value:
+                    branch(bw=children[child], position=position + 1)
+
+        branch(bw=np.zeros(self.dims_count), position=0)
+
+        if best_bw is None:
+            raise SearchError("No bandwidth plan from BwSkus satisfies the constraints.")
+
+        e2e_times = [evaluator.e2e_time(bw=best_bw) for evaluator in self.evaluators]
+        e2e_time = float(sum(model.weight * e2e_time for model, e2e_time in zip(self.models, e2e_times)))
+
+        return SolverResult(objective=self.objective,
+                            status='TIME_LIMIT' if stopped else 'OPTIMAL',
+                            bw=[float(bw) for bw in best_bw],
+                            e2e_time=e2e_time,
+                            network_cost=self.evaluators[0].network_cost(bw=best_bw),
+                            objective_value=best_value,
+                            runtime=time.time() - start_time,
+                            iterations_count=self.evaluations_count,
+                            nodes_count=self.nodes_count,
+                            cost_breakdown=self.evaluators[0].network_cost_breakdown(bw=best_bw),
+                            aggregation=self.aggregation,
+                            workload_e2e_times={model.name: e2e_time
+                                                for model, e2e_time in zip(self.models, e2e_times)})
+
+    def _local_search(self, max_iterations: int = 100) -> Tuple[Optional[np.ndarray], float]:
+        """
+        Start from the continuous optimum rounded to the nearest SKUs, and repeatedly move to the best feasible plan
+        that shifts one or two dimensions to their adjacent SKUs.
+
+        :param max_iterations: maximum number of moves
+        :return: (best plan found (None if none is feasible), its objective value)
+        """
+        skus_counts = [len(bw_skus) for bw_skus in self.bw_skus]
+        indices = np.array([int(np.abs(self.bw_skus[dim] - self.continuous_result.bw[dim]).argmin())
+                            for dim in range(self.dims_count)])
+
+        current_bw = self._to_bw(indices=indices[np.newaxis])
+        best_bw, best_value = None, float('inf')
+        if self._feasible(bw=current_bw)[0]:
+            best_bw, best_value = current_bw[0], float(self._objective_values(bw=current_bw)[0])
+
+        # single and pairwise moves to adjacent SKUs
+        moves: List[np.ndarray] = list()
+        for dim in range(self.dims_count):
+            for step in (-1, 1):
+                move = np.zeros(self.dims_count, dtype=int)
+                move[dim] = step
+                moves.append(move)
+        for dim_a, dim_b in itertools.combinations(range(self.dims_count), 2):
+            for step_a, step_b in itertools.product((-1, 1), repeat=2):
+                move = np.zeros(self.dims_count, dtype=int)
+                move[dim_a], move[dim_b] = step_a, step_b
+                moves.append(move)
+        moves = np.array(moves)
+
+        for _ in range(max_iterations):
+            neighbors = indices + moves
+            neighbors = neighbors[((neighbors >= 0) & (neighbors < np.array(skus_counts))).all(axis=1)]
+
+            neighbors_bw = self._to_bw(indices=neighbors)
+            feasible = self._feasible(bw=neighbors_bw)
+            if not feasible.any():
+                break
+
+            values = self._objective_values(bw=neighbors_bw[feasible])
+            best = int(values.argmin())
+            if values[best] >= best_value:
+                break
+
+            indices = neighbors[feasible][best]
+            best_bw, best_value = neighbors_bw[feasible][best], float(values[best])
+
+        return best_bw, best_value
+
+    def _to_bw(self, indices: np.ndarray) -> np.ndarray:
+        return np.stack([self.bw_skus[dim][indices[:, dim]] for dim in range(self.dims_count)], axis=1)
+
+    def _proven(self, best_value: float) -> bool:
+        # the continuous optimum is a lower bound of every discrete plan, but only the solver's bound of it is proven
+        lower_bound = self.continuous_result.objective_bound
+        if lower_bound is None or not math.isfinite(lower_bound):
+            return False
+
+        return best_value <= lower_bound + abs(lower_bound) * self.tolerance
+
+    def _objective_values(self, bw: np.ndarray) -> np.ndarray:
+        self.evaluations_count += len(bw)
+        time = self._aggregated_time(bw=bw)
+
+        if self.objective == SolverObjective.PerfOpt:
+            return time
+
+        if self.objective == SolverObjective.PerfPerCostOpt:
+            return time * self.evaluators[0].network_cost(bw=bw) / self._time_scale()
+
+        # should not reach here
+        raise SearchError(f"Objective {self.objective} is unknown.")
+
+    def _lower_bounds(self, bw: np.ndarray, unassigned_dims: List[int]) -> np.ndarray:
+        """
+        Lower bound of the objective of every completion of the given partial plans:
+        unassigned dimensions take their largest SKU for the e2e time, and their smallest for the network cost.
+
+        :param bw: partial plans of shape (N, dims_count)
+        :param unassigned_dims: dimensions not yet assigned
+        :return: lower bounds of shape (N,)
+        """
+        if not self.monotone:
+            return np.full(len(bw), -float('inf'))
+
+        fastest_bw = bw.copy()
+        cheapest_bw = bw.copy()
+        for dim in unassigned_dims:
+            fastest_bw[:, dim] = self.bw_skus[dim][-1]
+            cheapest_bw[:, dim] = self.bw_skus[dim][0]
+
+        time = self._aggregated_time(bw=fastest_bw)
+
+        if self.objective == SolverObjective.PerfPerCostOpt:
+            return time * self.evaluators[0].network_cost(bw=cheapest_bw) / self._time_scale()
+
+        return time
+
+    def _aggregated_time(self, bw: np.ndarray) -> np.ndarray:
+        # same aggregation as Model._set_objective
+        e2e_times = [evaluator.e2e_time(bw=bw) for evaluator in self.evaluators]
+
+        if self.time_bounds is not None:
+            return np.maximum.reduce([e2e_time / time_bound
+                                      for time_bound, e2e_time in zip(self.time_bounds, e2e_times)])
+
+        return sum(model.weight * e2e_time for model, e2e_time in zip(self.models, e2e_times))
+
+    def _time_scale(self) -> float:
+        # same scaling as Model._set_objective
+        return Model.get_time_scale(aggregation=self.aggregation)
+
+    def _remaining_constraint_bounds(self, order: List[int]) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Range of each constraint's lhs contributed by the dimensions from each branching position onwards.
+
+        :param order: branching order of the dimensions
+        :return: (lowest, highest) contributions per each branching position (plus the end)
+        """
+        constraints_count = self.constraints.constraints_count
+        bounds = [(np.zeros(constraints_count), np.zeros(constraints_count))]
+
+        for dim in reversed(order):
+            contributions = self.constraints.coefficients[:, dim, np.newaxis] * self.bw_skus[dim]
+            lowest, highest = bounds[0]
+            bounds.insert(0, (lowest + contributions.min(axis=1), highest + contributions.max(axis=1)))
+
+        return bounds
+
+    def _partially_feasible(self, bw: np.ndarray, assigned_dims: List[int],
+                            remaining_bounds: Tuple[np.ndarray, np.ndarray]) -> np.ndarray:
+        """
+        Whether each partial plan can still be completed into one satisfying every constraint.
+
+        :param bw: partial plans of shape (N, dims_count)
+        :param assigned_dims: dimensions assigned so far
+        :param remaining_bounds: range of each constraint's lhs the unassigned dimensions can contribute
+        :return: feasibility of shape (N,)
+        """
+        lhs = bw[:, assigned_dims] @ self.constraints.coefficients[:, assigned_dims].T
+        lowest, highest = remaining_bounds
+
+        return self.constraints.satisfied(lowest_lhs=lhs + lowest, highest_lhs=lhs + highest,
+                                          tolerance=self.tolerance)
+
+    def _feasible(self, bw: np.ndarray) -> np.ndarray:
+        return self.constraints.is_feasible(bw=bw, tolerance=self.tolerance)
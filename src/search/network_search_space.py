@@ -0,0 +1,112 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+import itertools
+from typing import Iterator, List, Tuple
+
+from src.network import Network, NetworkBuildingBlock
+from src.search.search_error import SearchError
+
+
+class NetworkSearchSpace:
+    """
+    NetworkSearchSpace defines the network shapes to search over:
+    every factorization of TotalNpusCount into DimsCount dimensions,
+    where each dimension is built at one of the given levels (innermost first),
+    with one of the building blocks allowed at that level.
+    """
+
+    def __init__(self,
+                 total_npus_count: int,
+                 min_dims_count: int,
+                 max_dims_count: int,
+                 levels_cost_dimension: List[str],
+                 levels_topology: List[List[NetworkBuildingBlock]],
+                 levels_max_npus_count: List[int]):
+        """
+        Initializer.
+
+        :param total_npus_count: total number of NPUs of every network shape
+        :param min_dims_count: minimum number of network dimensions
+        :param max_dims_count: maximum number of network dimensions
+        :param levels_cost_dimension: cost_dimension name per each level
+        :param levels_topology: allowed network building blocks per each level
+        :param levels_max_npus_count: maximum npus_count per each level (e.g., switch radix)
+        """
+        self.total_npus_count = total_npus_count
+        self.min_dims_count = min_dims_count
+        self.max_dims_count = max_dims_count
+        self.levels_cost_dimension = levels_cost_dimension
+        self.levels_topology = levels_topology
+        self.levels_max_npus_count = levels_max_npus_count
+        self.levels_count = len(levels_cost_dimension)
+
+        # check validity
+        if self.total_npus_count <= 1:
+            raise SearchError(f"TotalNpusCount ({self.total_npus_count}) should be larger than 1.")
+
+        if not (1 <= self.min_dims_count <= self.max_dims_count):
+            raise SearchError(f"DimsCount range [{self.min_dims_count}, {self.max_dims_count}] is invalid.")
+
+        if len(self.levels_topology) != self.levels_count or len(self.levels_max_npus_count) != self.levels_count:
+            raise SearchError(f"Levels should all define CostDimension, Topology, and MaxNpusCount.")
+
+        if self.max_dims_count > self.levels_count:
+            raise SearchError(f"Max DimsCount ({self.max_dims_count}) exceeds the number of levels "
+                              f"({self.levels_count}).")
+
+        for level, topology in enumerate(self.levels_topology):
+            if len(topology) == 0:
+                raise SearchError(f"Level {level + 1} doesn't allow any topology.")
+
+    def shapes(self) -> Iterator[Tuple[Tuple[int, ...], Tuple[int, ...]]]:
+        """
+        Enumerate (levels, npus_count) pairs of every network shape, regardless of the building blocks.
+
+        :return: iterator of (level index per each dimension, npus_count per each dimension)
+        """
+        for dims_count in range(self.min_dims_count, self.max_dims_count + 1):
+            for levels in itertools.combinations(range(self.levels_count), dims_count):
+                max_npus_count = [self.levels_max_npus_count[level] for level in levels]
+
+                for npus_count in NetworkSearchSpace._factorizations(self.total_npus_count, max_npus_count):
+                    yield levels, npus_count
+
+    def networks(self, levels: Tuple[int, ...], npus_count: Tuple[int, ...]) -> Iterator[Network]:
+        """
+        Enumerate networks of a shape, one per each combination of allowed building blocks.
+
+        :param levels: level index per each dimension
+        :param npus_count: npus_count per each dimension
+        :return: iterator of Network
+        """
+        cost_dimension = [self.levels_cost_dimension[level] for level in levels]
+
+        for topology in itertools.product(*[self.levels_topology[level] for level in levels]):
+            yield Network(topology=list(topology),
+                          npus_count=list(npus_count),
+                          cost_dimension=cost_dimension)
+
+    @staticmethod
+    def _factorizations(npus_count: int, max_npus_count: List[int]) -> Iterator[Tuple[int, ...]]:
+        """
+        Enumerate ordered factorizations of npus_count into len(max_npus_count) factors,
+        each factor larger than 1 and at most its max_npus_count.
+
+        :param npus_count: number to factorize
+        :param max_npus_count: upper bound per each factor
+        :return: iterator of factorizations
+        """
+        if len(max_npus_count) == 1:
+            if 1 < npus_count <= max_npus_count[0]:
+                yield npus_count,
+            return
+
+        for factor in range(2, min(npus_count, max_npus_count[0]) + 1):
+            if npus_count % factor != 0:
+                continue
+
+            for rest in NetworkSearchSpace._factorizations(npus_count // factor, max_npus_count[1:]):
+                yield (factor,) + rest
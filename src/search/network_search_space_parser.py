@@ -0,0 +1,67 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+import os
+from typing import List
+
+import yaml
+
+from src.network import NetworkBuildingBlock, NetworkParser, NetworkError
+from src.search.network_search_space import NetworkSearchSpace
+from src.search.search_error import SearchError
+
+
+class NetworkSearchSpaceParser:
+    """
+    NetworkSearchSpaceParser helps parse the yaml network search space file.
+    """
+
+    def __init__(self):
+        """
+        NetworkSearchSpaceParser initializer.
+        """
+        pass
+
+    def parse(self, path: str) -> NetworkSearchSpace:
+        """
+        Parse the given yaml network search space.
+
+        :param path: path to the yaml network search space
+        :return: parsed NetworkSearchSpace
+        """
+        # check the file exists
+        if not os.path.exists(path):
+            raise SearchError(f"Network search space {path} does not exist.")
+
+        # load yaml file
+        with open(path, 'r') as yaml_file:
+            search_space_data = yaml.safe_load(yaml_file)
+
+        # parse data
+        total_npus_count = search_space_data['TotalNpusCount']
+        min_dims_count, max_dims_count = search_space_data['DimsCount']
+
+        levels_cost_dimension: List[str] = list()
+        levels_topology: List[List[NetworkBuildingBlock]] = list()
+        levels_max_npus_count: List[int] = list()
+
+        for level in search_space_data['Levels']:
+            levels_cost_dimension.append(level['CostDimension'])
+
+            try:
+                levels_topology.append(NetworkParser.parse_topology_name(level['Topology']))
+            except NetworkError as e:
+                raise SearchError(e.message)
+
+            # unbounded unless the level limits it
+            levels_max_npus_count.append(level.get('MaxNpusCount', total_npus_count))
+
+        # create and return parsed search space
+        return NetworkSearchSpace(total_npus_count=total_npus_count,
+                                  min_dims_count=min_dims_count,
+                                  max_dims_count=max_dims_count,
+                                  levels_cost_dimension=levels_cost_dimension,
+                                  levels_topology=levels_topology,
+                                  levels_max_npus_count=levels_max_npus_count)
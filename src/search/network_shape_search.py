@@ -0,0 +1,129 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from typing import Callable, List, Optional
+
+import gurobipy as gp
+
+from src.communicator import CommunicatorError, create_tp_dp_communicator
+from src.cost_model import CostModel
+from src.model import Model, SolverObjective
+from src.search.adaptive_explorer import AdaptiveExplorer
+from src.search.candidate_solver import TotalBwConstraint, bound_candidate, prune_candidates, solve_candidates
+from src.search.network_search_space import NetworkSearchSpace
+from src.search.search_candidate import SearchCandidate
+from src.search.search_error import SearchError
+from src.workload import Workload
+
+
+class NetworkShapeSearch:
+    """
+    NetworkShapeSearch finds the best network shapes (and their BW allocations) for a fixed NPU count.
+    Every shape of the search space is bounded with the fixed-BW evaluator,
+    dominated shapes are pruned, and only the surviving shapes are solved in parallel.
+    """
+
+    def __init__(self,
+                 search_space: NetworkSearchSpace,
+                 workload: Workload,
+                 tp_size: int,
+                 cost_model: CostModel,
+                 training_loop: Callable[[Model], gp.LinExpr],
+                 total_bw: float,
+                 constraint: Optional[Callable[[], None]] = None,
+                 objective: SolverObjective = SolverObjective.PerfOpt):
+        """
+        Initializer.
+
+        :param search_space: network shapes to search over
+        :param workload: target workload
+        :param tp_size: TP size of the workload (TP takes the innermost NPUs, DP the rest)
+        :param cost_model: cost model
+        :param training_loop: training loop function
+        :param total_bw: total bandwidth (per NPU) budget, i.e., sum(bw) == total_bw
+        :param constraint: additional constraint function, must not depend on the number of dimensions
+        :param objective: solver objective
+        """
+        self.search_space = search_space
+        self.workload = workload
+        self.tp_size = tp_size
+        self.cost_model = cost_model
+        self.training_loop = training_loop
+        self.total_bw = total_bw
+        self.constraint = constraint
+        self.objective = objective
+
+        # search statistics, set by search()
+        self.candidates_count = 0
+        self.pruned_count = 0
+        self.solved_count = 0
+
+        # check validity
+        if self.search_space.total_npus_count % self.tp_size != 0:
+            raise SearchError(f"TP-{self.tp_size} doesn't divide TotalNpusCount "
+                              f"({self.search_space.total_npus_count}).")
+
+    def search(self, top_k: int = 5, processes: Optional[int] = None,
+               max_solves: Optional[int] = None, explorer: Optional[AdaptiveExplorer] = None) -> List[SearchCandidate]:
+        """
+        Run the network shape search.
+
+        :param top_k: number of best network shapes to return
+        :param processes: number of worker processes (defaults to the number of CPUs)
+        :param max_solves: maximum number of shapes to solve (unlimited if None)
+        :param explorer: solve the candidates adaptively by the explorer (with its own processes and max_solves),
+            instead of every candidate that can beat the k-th best
+        :return: top_k solved shapes with their BW allocations, best first
+        """
+        candidates = self.bound_candidates()
+        self.candidates_count = len(candidates)
+
+        if self.candidates_count == 0:
+            raise SearchError("No network shape in the search space can map the workload.")
+
+        # upper bounds only count heuristic allocations known to satisfy the constraints
+        candidates = prune_candidates(candidates=candidates, top_k=top_k)
+
+        constraint = TotalBwConstraint(total_bw=self.total_bw, constraint=self.constraint)
+        if explorer is not None:
+            # solve adaptively, until the best objective stops improving
+            best_candidates = explorer.explore(candidates=candidates, workload=self.workload,
+                                               cost_model=self.cost_model, training_loop=self.training_loop,
+                                               constraint=constraint, objective=self.objective, top_k=top_k)
+        else:
+            best_candidates = solve_candidates(candidates=candidates, workload=self.workload,
+                                               cost_model=self.cost_model, training_loop=self.training_loop,
+                                               constraint=constraint, objective=self.objective, top_k=top_k,
+                                               processes=processes, max_solves=max_solves)
+
+        # update statistics
+        self.solved_count = sum(1 for candidate in candidates if candidate.solved)
+        self.pruned_count = self.candidates_count - self.solved_count
+
+        return best_candidates
+
+    def bound_candidates(self) -> List[SearchCandidate]:
+        """
+        Enumerate every network of the search space the workload can be mapped onto,
+        with analytic lower and heuristic upper bounds of its optimal objective value.
+
+        :return: bounded candidates
+        """
+        candidates: List[SearchCandidate] = list()
+
+        for levels, npus_count in self.search_space.shapes():
+            try:
+                communicator = create_tp_dp_communicator(npus_count=list(npus_count), tp_size=self.tp_size)
+            except CommunicatorError:
+                # TP group cannot be mapped onto this shape
+                continue
+
+            for network in self.search_space.networks(levels=levels, npus_count=npus_count):
+                candidates.append(bound_candidate(network=network, communicator=communicator,
+                                                  workload=self.workload, cost_model=self.cost_model,
+                                                  training_loop=self.training_loop, total_bw=self.total_bw,
+                                                  objective=self.objective, constraint=self.constraint))
+
+        return candidates
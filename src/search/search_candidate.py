@@ -0,0 +1,49 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from typing import Optional
+
+from src.communicator import Communicator
+from src.model import SolverResult
+from src.network import Network
+
+
+class SearchCandidate:
+    """
+    SearchCandidate is a single design point of a design-space search,
+    with its analytic objective bounds and (once solved) its solver result.
+    """
+
+    def __init__(self,
+                 network: Network,
+                 communicator: Communicator,
+                 lower_bound: float,
+                 upper_bound: float = float('inf')):
+        """
+        Initializer.
+
+        :param network: candidate network
+        :param communicator: candidate communicator
+        :param lower_bound: lower bound of the candidate's optimal objective value
+        :param upper_bound: upper bound of the candidate's optimal objective value
+        """
+        self.network = network
+        self.communicator = communicator
+        self.lower_bound = lower_bound
+        self.upper_bound = upper_bound
+
+        # set after solving the candidate
+        self.solved = False
+        self.result: Optional[SolverResult] = None
+
+    @property
+    def objective_value(self) -> float:
+        """
+        Solved objective value (inf if not solved, or if the solver found no solution).
+        """
+        if self.result is None:
+            return float('inf')
+
+        return self.result.objective_value
@@ -0,0 +1,8 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from src.sensitivity.sensitivity_analysis import analyze_sensitivity
+from src.sensitivity.sensitivity_error import SensitivityError
+from src.sensitivity.sensitivity_report import ConstraintSensitivity, SensitivityReport
@@ -0,0 +1,214 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from typing import Dict, List, Tuple
+
+import gurobipy as gp
+import numpy as np
+from gurobipy import GRB
+
+from src.evaluator import Evaluator
+from src.model import Model, SolverObjective, SolverResult, format_constraint, readable_senses
+from src.sensitivity.sensitivity_error import SensitivityError
+from src.sensitivity.sensitivity_report import ConstraintSensitivity, SensitivityReport
+
+
+def analyze_sensitivity(result: SolverResult) -> SensitivityReport:
+    """
+    Analyze the sensitivity of the last Model.solve() result, without re-solving the QP.
+
+    Around the optimum, every dim time latency + msg / bw is replaced by its tangent plane,
+    which turns the problem into an LP sharing the optimum (and its first-order behavior) with the QP.
+    Duals of the LP give the constraint shadow prices and per-dimension marginal values of bandwidth,
+    and its ranging gives where they stay valid.
+
+    :param result: result of the last Model.solve()
+    :return: sensitivity report
+    """
+    if Model._bw is None or len(Model.models) == 0:
+        raise SensitivityError("No solved model to analyze.")
+
+    bw_opt = np.array(result.bw, dtype=float)
+    if (bw_opt <= 0).any():
+        raise SensitivityError(f"Sensitivity is undefined for non-positive bandwidths: {result.bw}.")
+
+    dims_count = Model.network.dims_count
+    evaluators = [Evaluator(network=Model.network, workload=model.get_solved_workload(),
+                            communicator=model.communicator, training_loop=model.training_loop,
+                            cost_model=Model.cost_model, bw_scale=model.bw_scale)
+                  for model in Model.models]
+
+    # gradient of the aggregated e2e time, with other dimensions fixed
+    models = Model.models
+    time_bounds = Model.get_time_bounds(aggregation=result.aggregation)
+    time_scale = Model.get_time_scale(aggregation=result.aggregation)
+    if time_bounds is not None:
+        times = [result.workload_e2e_times[model.name] / time_bound for model, time_bound in zip(models, time_bounds)]
+        worst = int(np.argmax(times))
+        bw_gradient = evaluators[worst].e2e_time_gradient(bw=bw_opt) / time_bounds[worst]
+        time_opt = times[worst]
+    else:
+        bw_gradient = sum(model.weight * evaluator.e2e_time_gradient(bw=bw_opt)
+                          for model, evaluator in zip(models, evaluators))
+        time_opt = result.e2e_time
+
+    lp_model = gp.Model("LibraSensitivity")
+    lp_model.setParam(paramname='OutputFlag', newval=False)
+
+    try:
+        bw = lp_model.addVars(dims_count, lb=0, vtype=GRB.CONTINUOUS)
+        network_cost = lp_model.addVar(lb=0, vtype=GRB.CONTINUOUS)
+
+        # extra bandwidth granted to each dimension, fixed to 0 (its dual is the marginal value of bandwidth)
+        extra_bw = lp_model.addVars(dims_count, lb=-GRB.INFINITY, vtype=GRB.CONTINUOUS)
+        extra_bw_constrs = [lp_model.addLConstr(extra_bw[dim] == 0) for dim in range(dims_count)]
+        effective_bw = [bw[dim] + extra_bw[dim] for dim in range(dims_count)]
+
+        # linearized e2e time of each workload, aggregated as in Model._set_objective
+        e2e_times = [_linearize_e2e_time(lp_model=lp_model, evaluator=evaluator, bw=effective_bw, bw_opt=bw_opt)
+                     for evaluator in evaluators]
+
+        if time_bounds is not None:
+            max_time = lp_model.addVar(lb=0, vtype=GRB.CONTINUOUS)
+            for time_bound, e2e_time in zip(time_bounds, e2e_times):
+                lp_model.addLConstr(max_time * time_bound >= e2e_time)
+            time = gp.LinExpr(max_time)
+        else:
+            time = gp.quicksum(model.weight * e2e_time for model, e2e_time in zip(models, e2e_times))
+
+        # linear constraints of the solved model over bw (and network cost)
+        constrs = _copy_bw_constraints(lp_model=lp_model, bw=bw, network_cost=network_cost)
+
+        # a tiered network cost isn't linear: take its tangent instead of its definition
+        if not Model.cost_model.is_linear():
+            cost_gradient = evaluators[0].network_cost_gradient(bw=bw_opt)
+            lp_model.addLConstr(network_cost == result.network_cost + gp.quicksum(
+                cost_gradient[dim] * (bw[dim] - bw_opt[dim]) for dim in range(dims_count)))
+
+        # linearized objective
+        if result.objective == SolverObjective.PerfOpt:
+            lp_model.setObjective(expr=time, sense=GRB.MINIMIZE)
+        elif result.objective == SolverObjective.PerfPerCostOpt:
+            # same scaling as Model._set_objective
+            lp_model.setObjective(expr=(result.network_cost * time + time_opt * network_cost
+                                        - time_opt * result.network_cost) / time_scale,
+                                  sense=GRB.MINIMIZE)
+        else:
+            # should not reach here
+            raise SensitivityError(f"Objective {result.objective} is unknown.")
+
+        lp_model.optimize()
+        if lp_model.Status != GRB.OPTIMAL:
+            raise SensitivityError(f"Linearized model could not be solved (status: {lp_model.Status}).")
+
+        constraints = [ConstraintSensitivity(name=name,
+                                             expression=expression,
+                                             sense=readable_senses[constr.Sense],
+                                             rhs=constr.RHS,
+                                             slack=constr.Slack,
+                                             shadow_price=constr.Pi,
+                                             rhs_low=constr.SARHSLow,
+                                             rhs_up=constr.SARHSUp)
+                       for name, expression, constr in constrs]
+
+        return SensitivityReport(objective=result.objective,
+                                 objective_value=result.objective_value,
+                                 bw=list(result.bw),
+                                 bw_gradient=[float(gradient) for gradient in bw_gradient],
+                                 bw_marginal_value=[constr.Pi for constr in extra_bw_constrs],
+                                 bw_marginal_value_low=[constr.SARHSLow for constr in extra_bw_constrs],
+                                 bw_marginal_value_up=[constr.SARHSUp for constr in extra_bw_constrs],
+                                 constraints=constraints)
+    finally:
+        lp_model.dispose()
+
+
+def _linearize_e2e_time(lp_model: gp.Model, evaluator: Evaluator, bw: List[gp.LinExpr],
+                        bw_opt: np.ndarray) -> gp.LinExpr:
+    """
+    E2e time of one workload with every dim time latency + msg / bw replaced by its tangent
+    latency + msg * (2 / bw* - bw / bw*^2),
+    and every collective time by an epigraph variable above the tangents of its dimensions.
+
+    :param lp_model: LP to add the collective time variables and constraints to
+    :param evaluator: evaluator of the workload
+    :param bw: bandwidth expression per each dimension
+    :param bw_opt: optimized bandwidths to linearize around
+    :return: linearized e2e time
+    """
+    layers_count, _, dims_count = evaluator.msg_sizes.shape
+
+    # tangent of each dim time
+    dim_time: Dict[Tuple[int, int, int], gp.LinExpr] = dict()
+    for (layer, phase, dim), msg_size in np.ndenumerate(evaluator.msg_sizes):
+        if msg_size > 0:
+            dim_time[layer, phase, dim] = (evaluator.latencies[layer, phase, dim] + msg_size * (2 / bw_opt[dim])
+                                           - (msg_size / bw_opt[dim] ** 2) * bw[dim])
+        else:
+            dim_time[layer, phase, dim] = gp.LinExpr(0)
+
+    def coll_time(layer: int, phase: int) -> gp.LinExpr:
+        # collective time = max(dim times), via an epigraph (minimization pushes it onto the max)
+        dims = [dim for dim in range(dims_count) if evaluator.msg_sizes[layer, phase, dim] > 0]
+        if len(dims) == 0:
+            return gp.LinExpr(0)
+
+        epigraph = lp_model.addVar(lb=0, vtype=GRB.CONTINUOUS)
+        for dim in dims:
+            lp_model.addLConstr(epigraph >= dim_time[layer, phase, dim])
+
+        return gp.LinExpr(epigraph)
+
+    if evaluator.task_graph is not None:
+        coll_times = {(layer, phase): coll_time(layer=layer, phase=phase)
+                      for layer in range(layers_count) for phase in range(3)}
+        latencies = {index: latency for index, latency in np.ndenumerate(evaluator.latencies)}
+        return evaluator.task_graph.compile(gp_model=lp_model, coll_time=coll_times, dim_time=dim_time,
+                                            dims_count=dims_count, latency=latencies)
+
+    if (evaluator.coll_time_weights < 0).any():
+        raise SensitivityError("Training loops with negatively weighted collective times cannot be linearized.")
+
+    e2e_time = gp.LinExpr(evaluator.e2e_constant)
+    for (layer, phase, dim), weight in np.ndenumerate(evaluator.dim_time_weights):
+        if weight != 0:
+            e2e_time += weight * dim_time[layer, phase, dim]
+
+    for (layer, phase), weight in np.ndenumerate(evaluator.coll_time_weights):
+        if weight != 0:
+            e2e_time += weight * coll_time(layer=layer, phase=phase)
+
+    return e2e_time
+
+
+def _copy_bw_constraints(lp_model: gp.Model, bw: gp.tupledict,
+                         network_cost: gp.Var) -> List[Tuple[str, str, gp.Constr]]:
+    """
+    Copy every linear constraint of the solved model that only involves bandwidths and the network cost
+    (i.e., the user constraints) into the LP.
+
+    :param lp_model: LP to copy the constraints into
+    :param bw: LP bandwidth variables
+    :param network_cost: LP network cost variable
+    :return: (name, readable expression, LP constraint) per each copied user constraint
+    """
+    # solved model variable index -> LP variable
+    variables: Dict[int, gp.Var] = {var.index: bw[dim] for dim, var in Model._bw.items()}
+    variables[Model._network_cost.index] = network_cost
+
+    constrs = list()
+    for constr, row in Model._iter_bw_rows():
+        lhs = gp.LinExpr([row.getCoeff(i) for i in range(row.size())],
+                         [variables[row.getVar(i).index] for i in range(row.size())])
+        lp_constr = lp_model.addLConstr(lhs, constr.Sense, constr.RHS)
+
+        # network cost definition is part of the model, not a user constraint
+        if constr.sameAs(Model._network_cost_constr):
+            continue
+
+        expression = format_constraint(row=row, sense=constr.Sense, rhs=constr.RHS)
+        constrs.append((constr.ConstrName, expression, lp_constr))
+
+    return constrs
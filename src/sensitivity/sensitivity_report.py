@@ -0,0 +1,129 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from typing import List
+
+from src.model import SolverObjective
+from src.sensitivity.sensitivity_error import SensitivityError
+
+
+class ConstraintSensitivity:
+    """
+    ConstraintSensitivity is the marginal value of a single linear bandwidth constraint at the optimum.
+    """
+
+    def __init__(self,
+                 name: str,
+                 expression: str,
+                 sense: str,
+                 rhs: float,
+                 slack: float,
+                 shadow_price: float,
+                 rhs_low: float,
+                 rhs_up: float):
+        """
+        Initializer.
+
+        :param name: Gurobi constraint name
+        :param expression: human-readable constraint (e.g., "bw[0] + bw[1] == 1000")
+        :param sense: constraint sense ('<=', '>=', or '==')
+        :param rhs: right-hand side of the constraint
+        :param slack: rhs - lhs at the optimum
+        :param shadow_price: change of the objective value per unit increase of rhs
+        :param rhs_low: lowest rhs the shadow price stays valid for
+        :param rhs_up: highest rhs the shadow price stays valid for
+        """
+        self.name = name
+        self.expression = expression
+        self.sense = sense
+        self.rhs = rhs
+        self.slack = slack
+        self.shadow_price = shadow_price
+        self.rhs_low = rhs_low
+        self.rhs_up = rhs_up
+
+    @property
+    def binding(self) -> bool:
+        """
+        True if the constraint holds with equality at the optimum.
+        """
+        return abs(self.slack) <= 1e-6 * max(1.0, abs(self.rhs))
+
+    def objective_change(self, rhs: float) -> float:
+        """
+        Estimate the change of the objective value if the rhs of the constraint were moved, without re-solving.
+
+        :param rhs: new right-hand side, within [rhs_low, rhs_up]
+        :return: estimated change of the objective value
+        """
+        if not (self.rhs_low <= rhs <= self.rhs_up):
+            raise SensitivityError(f"rhs {rhs} of constraint {self.expression} is outside of its valid range "
+                                   f"[{self.rhs_low}, {self.rhs_up}].")
+
+        return self.shadow_price * (rhs - self.rhs)
+
+
+class SensitivityReport:
+    """
+    SensitivityReport holds the marginal values of bandwidth and of the linear constraints around a solved optimum.
+    Prices are exact first-order derivatives; ranges are where the set of bottleneck dimensions
+    and binding constraints of the optimum is unchanged, so estimates far from the optimum are approximate.
+    """
+
+    def __init__(self,
+                 objective: SolverObjective,
+                 objective_value: float,
+                 bw: List[float],
+                 bw_gradient: List[float],
+                 bw_marginal_value: List[float],
+                 bw_marginal_value_low: List[float],
+                 bw_marginal_value_up: List[float],
+                 constraints: List[ConstraintSensitivity]):
+        """
+        Initializer.
+
+        :param objective: solver objective the optimum was solved for
+        :param objective_value: objective value at the optimum
+        :param bw: optimized bandwidth (in GB/s) per each dimension
+        :param bw_gradient: d(e2e time)/d(bw) per each dimension (of the e2e time aggregated over the workloads),
+            keeping the other dimensions fixed (in ns per GB/s)
+        :param bw_marginal_value: change of the objective value per extra GB/s granted to each dimension
+            on top of the constraints, with the other dimensions re-optimized
+        :param bw_marginal_value_low: lowest extra bandwidth (in GB/s) each marginal value stays valid for
+        :param bw_marginal_value_up: highest extra bandwidth (in GB/s) each marginal value stays valid for
+        :param constraints: sensitivity of each linear bandwidth constraint
+        """
+        self.objective = objective
+        self.objective_value = objective_value
+        self.bw = bw
+        self.bw_gradient = bw_gradient
+        self.bw_marginal_value = bw_marginal_value
+        self.bw_marginal_value_low = bw_marginal_value_low
+        self.bw_marginal_value_up = bw_marginal_value_up
+        self.constraints = constraints
+
+    @property
+    def binding_constraints(self) -> List[ConstraintSensitivity]:
+        """
+        Constraints holding with equality at the optimum.
+        """
+        return [constraint for constraint in self.constraints if constraint.binding]
+
+    def print_report(self) -> None:
+        """
+        Print the sensitivity report.
+        """
+        print("=" * 80)
+        print(f"LIBRA Sensitivity Analysis ({self.objective.name}: {self.objective_value:.2f}):")
+
+        print("Dim\tBW\td(e2e)/d(bw)\td(obj)/d(extra bw)\tValid Extra BW")
+        for dim, bw in enumerate(self.bw):
+            print(f"{dim}\t{bw:.2f}\t{self.bw_gradient[dim]:.4g}\t{self.bw_marginal_value[dim]:.4g}\t"
+                  f"[{self.bw_marginal_value_low[dim]:.4g}, {self.bw_marginal_value_up[dim]:.4g}]")
+
+        print("Constraint\tSlack\tShadow Price\tValid RHS")
+        for constraint in self.constraints:
+            print(f"{constraint.expression}\t{constraint.slack:.4g}\t{constraint.shadow_price:.4g}\t"
+                  f"[{constraint.rhs_low:.4g}, {constraint.rhs_up:.4g}]")
@@ -0,0 +1,8 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from src.simulator.simulation_result import SimulationResult
+from src.simulator.simulator import Simulator
+from src.simulator.simulator_error import SimulatorError
@@ -0,0 +1,90 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from typing import List
+
+import numpy as np
+
+
+class SimulationResult:
+    """
+    SimulationResult is the timeline of a simulated training iteration under fixed bandwidths:
+    when each task ran, when each dimension was busy, and how the iteration time compares to the analytical e2e time.
+    """
+
+    def __init__(self,
+                 bw: np.ndarray,
+                 iteration_time: float,
+                 analytical_time: float,
+                 task_names: List[str],
+                 task_streams: List[str],
+                 task_start_times: np.ndarray,
+                 task_finish_times: np.ndarray,
+                 link_dims: np.ndarray,
+                 link_tasks: np.ndarray,
+                 link_start_times: np.ndarray,
+                 link_end_times: np.ndarray):
+        """
+        Initializer.
+
+        :param bw: simulated bandwidth (in GB/s) per each dimension
+        :param iteration_time: simulated iteration time (in ns)
+        :param analytical_time: e2e time of the bandwidths by the analytical (Evaluator) model (in ns)
+        :param task_names: name of each task
+        :param task_streams: stream of each task
+        :param task_start_times: start time of each task
+        :param task_finish_times: finish time of each task
+        :param link_dims: dimension of each chunk transfer
+        :param link_tasks: task index of each chunk transfer
+        :param link_start_times: time each chunk transfer started occupying its dimension
+        :param link_end_times: time each chunk transfer released its dimension
+        """
+        self.bw = bw
+        self.iteration_time = iteration_time
+        self.analytical_time = analytical_time
+        self.task_names = task_names
+        self.task_streams = task_streams
+        self.task_start_times = task_start_times
+        self.task_finish_times = task_finish_times
+        self.link_dims = link_dims
+        self.link_tasks = link_tasks
+        self.link_start_times = link_start_times
+        self.link_end_times = link_end_times
+
+        # time each dimension spent transferring
+        self.dim_busy_time = np.bincount(link_dims, weights=link_end_times - link_start_times, minlength=len(bw))
+
+    @property
+    def dim_utilization(self) -> np.ndarray:
+        """
+        Fraction of the iteration time each dimension spent transferring.
+        """
+        if self.iteration_time <= 0:
+            return np.zeros(len(self.bw))
+
+        return self.dim_busy_time / self.iteration_time
+
+    @property
+    def relative_error(self) -> float:
+        """
+        Relative deviation of the analytical e2e time from the simulated iteration time.
+        """
+        if self.iteration_time <= 0:
+            return 0.0
+
+        return (self.analytical_time - self.iteration_time) / self.iteration_time
+
+    def print_report(self) -> None:
+        """
+        Print the simulation report.
+        """
+        print("=" * 80)
+        print("LIBRA Simulation:")
+        print(f"Simulated Iteration Time: {self.iteration_time:.2f}, Analytical E2E Time: {self.analytical_time:.2f} "
+              f"(error: {self.relative_error * 100:+.2f}%)")
+
+        print("Dim\tBW\tBusy Time\tUtilization")
+        for dim, bw in enumerate(self.bw):
+            print(f"{dim}\t{bw:.2f}\t{self.dim_busy_time[dim]:.2f}\t{self.dim_utilization[dim] * 100:.2f}%")
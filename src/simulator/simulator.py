@@ -0,0 +1,247 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+import heapq
+from collections import deque
+from itertools import count
+from typing import Deque, List, Tuple, Union
+
+import numpy as np
+
+from src.evaluator import Evaluator, EvaluatorError
+from src.simulator.simulation_result import SimulationResult
+from src.simulator.simulator_error import SimulatorError
+from src.task_graph import TaskType
+
+# event kinds
+_task_done = 0
+_link_free = 1
+_chunk_arrive = 2
+
+
+class Simulator:
+    """
+    Simulator replays a training iteration as discrete events under fixed bandwidths,
+    to validate the analytical model (collective time = max dim time) against a timeline.
+
+    Tasks start once their predecessors finish (so tasks of a stream execute in order, as the training loop declares).
+    A collective splits its messages into chunks that traverse its dimensions hierarchically (in its dims order),
+    pipelined so that a chunk moves on to the next dimension while the next chunk is sent on the previous one.
+    Each dimension transfers one chunk at a time (serving the chunks of concurrent collectives round-robin),
+    and a chunk reaches the next dimension after the dimension's latency.
+    With a single chunk, a collective takes the sum of its dim times; with many, their max (plus contention).
+    """
+
+    def __init__(self, evaluator: Evaluator, chunks_count: int = 4):
+        """
+        Initializer.
+
+        :param evaluator: evaluator of the network, workload, communicator, and training loop to simulate
+        :param chunks_count: number of chunks each collective is split into
+        """
+        if chunks_count < 1:
+            raise SimulatorError(f"Chunks count given ({chunks_count}) should be >= 1.")
+
+        self.evaluator = evaluator
+        self.chunks_count = chunks_count
+        self.dims_count = evaluator.network.dims_count
+
+        try:
+            self.task_graph = evaluator.iteration_task_graph()
+        except EvaluatorError as e:
+            raise SimulatorError(f"Training loop cannot be simulated: {e}")
+        tasks = self.task_graph.tasks
+        self.tasks_count = len(tasks)
+
+        self.successors: List[List[int]] = [list() for _ in tasks]
+        for index, task in enumerate(tasks):
+            for predecessor in task.predecessors:
+                self.successors[predecessor].append(index)
+        self.predecessors_count = [len(task.predecessors) for task in tasks]
+
+        self.compute_times = np.array([task.compute_time if task.task_type == TaskType.Compute else 0.0
+                                       for task in tasks])
+        self.collective_tasks = np.array([index for index, task in enumerate(tasks)
+                                          if task.task_type == TaskType.Collective], dtype=int)
+
+        # flattened [layer * 3 + phase] indices of the phases of every collective task (in collective task order),
+        # so that per-task message sizes are summed in bulk
+        phases = [tasks[index].phases for index in self.collective_tasks]
+        self._phase_indices = np.array([layer_idx * 3 + phase_idx for task_phases in phases
+                                        for layer_idx, phase_idx in task_phases], dtype=int)
+        self._phase_offsets = np.cumsum([0] + [len(task_phases) for task_phases in phases[:-1]]).astype(int)
+
+        # dimension traversal order of each collective task (by the collective type of its first phase)
+        self._dims_orders: List[List[int]] = list()
+        for task_phases in phases:
+            layer_idx, phase_idx = task_phases[0]
+            layer = evaluator.workload.layers[layer_idx]
+            comm_type = (layer.forward, layer.input_grad, layer.weight_grad)[phase_idx].comm_type
+            dims_order = evaluator.communicator.get_dims_order(collective=comm_type)
+            self._dims_orders.append(list(dims_order) if dims_order is not None else list(range(self.dims_count)))
+
+    def simulate(self, bw: np.ndarray, compute_scale: float = 1.0) -> SimulationResult:
+        """
+        Simulate a training iteration under the given bandwidths.
+
+        :param bw: bandwidths of shape (dims_count,)
+        :param compute_scale: scale of every compute time
+        :return: simulation result
+        """
+        bw = np.asarray(bw, dtype=float)
+        analytical_time = self._analytical_times(bw=bw[np.newaxis], compute_scale=np.array([compute_scale]))[0]
+
+        return self._simulate(bw=bw, compute_scale=compute_scale, analytical_time=float(analytical_time))
+
+    def simulate_batch(self, bw: np.ndarray, compute_scale: Union[float, np.ndarray] = 1.0) -> List[SimulationResult]:
+        """
+        Simulate a training iteration under each of N bandwidth vectors (e.g., every point of a sweep),
+        evaluating their analytical e2e times as a single batch.
+
+        :param bw: bandwidths of shape (N, dims_count)
+        :param compute_scale: scale of every compute time, a scalar or of shape (N,)
+        :return: simulation result per each bandwidth vector
+        """
+        bw = np.asarray(bw, dtype=float)
+        compute_scale = np.broadcast_to(np.asarray(compute_scale, dtype=float), (len(bw),))
+        analytical_times = self._analytical_times(bw=bw, compute_scale=compute_scale)
+
+        return [self._simulate(bw=bw[i], compute_scale=float(compute_scale[i]),
+                               analytical_time=float(analytical_times[i])) for i in range(len(bw))]
+
+    def _analytical_times(self, bw: np.ndarray, compute_scale: np.ndarray) -> np.ndarray:
+        return self.evaluator.scenario_e2e_time(bw=np.ones(self.dims_count), comm_scale=np.ones(len(bw)),
+                                                compute_scale=compute_scale, bw_scale=bw)
+
+    def _simulate(self, bw: np.ndarray, compute_scale: float, analytical_time: float) -> SimulationResult:
+        if bw.shape != (self.dims_count,):
+            raise SimulatorError(f"Bandwidths of shape {bw.shape} don't match the {self.dims_count}D network.")
+
+        routes = self._routes(bw=bw)
+        durations = (self.compute_times * compute_scale).tolist()
+
+        # event: (time, sequence (breaks ties in insertion order), kind, task index, chunk, hop)
+        events: List[Tuple[float, int, int, int, int, int]] = list()
+        sequence = count()
+
+        remaining_predecessors = list(self.predecessors_count)
+        remaining_chunks = [0] * self.tasks_count
+        start_times = [0.0] * self.tasks_count
+        finish_times = [0.0] * self.tasks_count
+
+        link_queues: List[Deque[Tuple[int, int, int]]] = [deque() for _ in range(self.dims_count)]
+        link_busy = [False] * self.dims_count
+        link_records: List[Tuple[int, int, float, float]] = list()
+
+        def start_task(index: int, time: float) -> None:
+            start_times[index] = time
+            if len(routes[index]) == 0:
+                heapq.heappush(events, (time + durations[index], next(sequence), _task_done, index, 0, 0))
+                return
+
+            remaining_chunks[index] = self.chunks_count
+            request_link(index=index, chunk=0, hop=0, time=time)
+
+        def request_link(index: int, chunk: int, hop: int, time: float) -> None:
+            dim = routes[index][hop][0]
+            if link_busy[dim]:
+                link_queues[dim].append((index, chunk, hop))
+            else:
+                transfer(index=index, chunk=chunk, hop=hop, time=time)
+
+        def transfer(index: int, chunk: int, hop: int, time: float) -> None:
+            dim, serialization_time, _ = routes[index][hop]
+            link_busy[dim] = True
+            link_records.append((dim, index, time, time + serialization_time))
+            heapq.heappush(events, (time + serialization_time, next(sequence), _link_free, index, chunk, hop))
+
+        for index in range(self.tasks_count):
+            if remaining_predecessors[index] == 0:
+                start_task(index=index, time=0.0)
+
+        while len(events) > 0:
+            time, _, kind, index, chunk, hop = heapq.heappop(events)
+
+            if kind == _task_done:
+                finish_times[index] = time
+                for successor in self.successors[index]:
+                    remaining_predecessors[successor] -= 1
+                    if remaining_predecessors[successor] == 0:
+                        start_task(index=successor, time=time)
+
+            elif kind == _link_free:
+                dim, _, latency = routes[index][hop]
+                heapq.heappush(events, (time + latency, next(sequence), _chunk_arrive, index, chunk, hop))
+
+                # the next chunk queues up behind the chunks of other collectives already waiting
+                if hop == 0 and chunk + 1 < self.chunks_count:
+                    link_queues[dim].append((index, chunk + 1, 0))
+
+                if len(link_queues[dim]) > 0:
+                    next_index, next_chunk, next_hop = link_queues[dim].popleft()
+                    transfer(index=next_index, chunk=next_chunk, hop=next_hop, time=time)
+                else:
+                    link_busy[dim] = False
+
+            elif kind == _chunk_arrive:
+                if hop + 1 < len(routes[index]):
+                    request_link(index=index, chunk=chunk, hop=hop + 1, time=time)
+                    continue
+
+                remaining_chunks[index] -= 1
+                if remaining_chunks[index] == 0:
+                    heapq.heappush(events, (time, next(sequence), _task_done, index, 0, 0))
+
+            else:
+                # should not reach here
+                raise SimulatorError(f"Event kind {kind} is unknown.")
+
+        link_dims, link_tasks, link_start_times, link_end_times = zip(*link_records) if len(link_records) > 0 \
+            else ((), (), (), ())
+
+        return SimulationResult(bw=bw, iteration_time=max(finish_times, default=0.0), analytical_time=analytical_time,
+                                task_names=[task.name for task in self.task_graph.tasks],
+                                task_streams=[task.stream for task in self.task_graph.tasks],
+                                task_start_times=np.array(start_times), task_finish_times=np.array(finish_times),
+                                link_dims=np.array(link_dims, dtype=int), link_tasks=np.array(link_tasks, dtype=int),
+                                link_start_times=np.array(link_start_times, dtype=float),
+                                link_end_times=np.array(link_end_times, dtype=float))
+
+    def _routes(self, bw: np.ndarray) -> List[List[Tuple[int, float, float]]]:
+        """
+        (dimension, serialization time of a chunk, latency) of each hop of every task, computed in bulk.
+        Compute tasks have no hop.
+
+        :param bw: bandwidths of shape (dims_count,)
+        :return: hops of every task
+        """
+        routes: List[List[Tuple[int, float, float]]] = [list() for _ in range(self.tasks_count)]
+        if len(self.collective_tasks) == 0:
+            return routes
+
+        # [layer * 3 + phase, dim]
+        msg_sizes = self.evaluator.msg_sizes.reshape(-1, self.dims_count)
+        latencies = self.evaluator.latencies.reshape(-1, self.dims_count)
+
+        # [collective task, dim] (fused phases' messages are summed, and their largest latency is paid once)
+        task_msg_sizes = np.add.reduceat(msg_sizes[self._phase_indices], self._phase_offsets, axis=0)
+        task_latencies = np.maximum.reduceat(latencies[self._phase_indices], self._phase_offsets, axis=0)
+
+        starved_dims = np.flatnonzero((task_msg_sizes > 0).any(axis=0) & (bw <= 0))
+        if len(starved_dims) > 0:
+            raise SimulatorError(f"Dimensions {starved_dims.tolist()} carry traffic but have no bandwidth.")
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            serialization_times = np.where(task_msg_sizes > 0, task_msg_sizes / bw / self.chunks_count, 0.0)
+
+        has_traffic = (task_msg_sizes > 0).tolist()
+        serialization_times = serialization_times.tolist()
+        task_latencies = task_latencies.tolist()
+
+        for i, index in enumerate(self.collective_tasks.tolist()):
+            routes[index] = [(dim, serialization_times[i][dim], task_latencies[i][dim])
+                             for dim in self._dims_orders[i] if has_traffic[i][dim]]
+
+        return routes
@@ -0,0 +1,11 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from src.task_graph.pipeline_schedule import PipelineSchedule
+from src.task_graph.task import Task
+from src.task_graph.task_graph import TaskGraph
+from src.task_graph.task_graph_error import TaskGraphError
+from src.task_graph.task_graph_training_loop import TaskGraphTrainingLoop
+from src.task_graph.task_type import TaskType
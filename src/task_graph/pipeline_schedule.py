@@ -0,0 +1,184 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from typing import Mapping, Optional, Tuple, Union
+
+import gurobipy as gp
+import numpy as np
+from gurobipy import GRB
+
+from src.task_graph.task_graph import TaskGraph
+from src.task_graph.task_graph_error import TaskGraphError
+from src.workload import Workload
+
+
+class PipelineSchedule:
+    """
+    PipelineSchedule is the closed-form e2e time of a pipeline-parallel (1F1B or GPipe) training iteration.
+    The workload describes the layers of a single microbatch, each assigned to a pipeline stage,
+    with point-to-point sends between stages as phases of the layers.
+
+    Each microbatch takes stage_time[s] (forward and backward compute and collectives of its layers) on stage s.
+    Once filled, the pipeline advances at the pace of its slowest stage, so
+        e2e time = (microbatches - 1) * max_s(stage_time[s]) + sum_s(stage_time[s]) + max_s(weight_grad_time[s]),
+    where weight gradients are communicated once per iteration, by all stages in parallel after the pipeline drains.
+    The formulation has one variable per max regardless of the number of microbatches.
+    It has the same compile, evaluate, and critical_path interface as TaskGraph.
+    """
+
+    def __init__(self, workload: Workload, microbatches_count: int):
+        """
+        Initializer.
+
+        :param workload: target workload (layers of a single microbatch)
+        :param microbatches_count: number of microbatches per iteration
+        """
+        if microbatches_count < 1:
+            raise TaskGraphError(f"Microbatches count given ({microbatches_count}) should be >= 1.")
+
+        self.workload = workload
+        self.microbatches_count = microbatches_count
+        self.stages_count = workload.stages_count
+
+        # stage_membership[layer, stage] = 1 if the layer belongs to the stage
+        self.stage_membership = np.zeros((workload.layers_count, self.stages_count))
+        for layer_idx, layer in enumerate(workload.layers):
+            self.stage_membership[layer_idx, layer.stage] = 1
+
+        # forward and backward compute time of a microbatch on each stage
+        compute_time = np.array([layer.forward.compute_time + layer.input_grad.compute_time
+                                 + layer.weight_grad.compute_time for layer in workload.layers])
+        self.stage_compute_time = compute_time @ self.stage_membership
+
+    def compile(self, gp_model: gp.Model, coll_time: Mapping, dim_time: Mapping, dims_count: int,
+                latency: Optional[Mapping] = None) -> gp.LinExpr:
+        """
+        Compile the schedule into a linear formulation of the e2e time.
+        Maxima are taken by epigraph variables, which is exact as long as the e2e time is minimized.
+
+        :param gp_model: Gurobi model to add the variables and constraints to
+        :param coll_time: collective time per each [layer, phase]
+        :param dim_time: communication time per each [layer, phase, dim] (unused)
+        :param dims_count: number of network dimensions (unused)
+        :param latency: latency per each [layer, phase, dim] (unused)
+        :return: e2e time expression
+        """
+        max_stage_time = gp_model.addVar(lb=0, vtype=GRB.CONTINUOUS)
+        max_weight_grad_time = gp_model.addVar(lb=0, vtype=GRB.CONTINUOUS)
+        stage_times_sum = gp.LinExpr(0)
+
+        for stage in range(self.stages_count):
+            layers = [layer_idx for layer_idx, layer in enumerate(self.workload.layers) if layer.stage == stage]
+
+            stage_time = gp.LinExpr(self.stage_compute_time[stage])
+            weight_grad_time = gp.LinExpr(0)
+            for layer_idx in layers:
+                stage_time += coll_time[layer_idx, 0] + coll_time[layer_idx, 1]
+                weight_grad_time += coll_time[layer_idx, 2]
+
+            gp_model.addLConstr(max_stage_time >= stage_time)
+            gp_model.addLConstr(max_weight_grad_time >= weight_grad_time)
+            stage_times_sum += stage_time
+
+        return (self.microbatches_count - 1) * max_stage_time + stage_times_sum + max_weight_grad_time
+
+    def evaluate(self, coll_time: np.ndarray, dim_time: np.ndarray, compute_scale: Union[float, np.ndarray] = 1.0,
+                 latency: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        E2e time for fixed collective times, vectorized over any leading batch dimensions.
+
+        :param coll_time: collective time of shape (..., layers_count, 3)
+        :param dim_time: communication time of shape (..., layers_count, 3, dims_count) (unused)
+        :param compute_scale: scale of every compute time, a scalar or of shape (...)
+        :param latency: latency of shape (layers_count, 3, dims_count) (unused)
+        :return: e2e time of shape (...)
+        """
+        stage_time, weight_grad_time = self._stage_times(coll_time=coll_time, compute_scale=compute_scale)
+
+        return ((self.microbatches_count - 1) * stage_time.max(axis=-1) + stage_time.sum(axis=-1)
+                + weight_grad_time.max(axis=-1))
+
+    def critical_path(self, coll_time: np.ndarray, dim_time: np.ndarray,
+                      latency: Optional[np.ndarray] = None) -> Tuple[float, np.ndarray, np.ndarray]:
+        """
+        Weights of the schedule with its maxima fixed to the slowest stages under the given collective times,
+        in the form of a linear training loop. They lower-bound the e2e time under any bandwidths.
+
+        :param coll_time: collective time of shape (layers_count, 3)
+        :param dim_time: communication time of shape (layers_count, 3, dims_count)
+        :param latency: latency of shape (layers_count, 3, dims_count) (unused)
+        :return: (constant, coll_time_weights of shape (layers, 3), dim_time_weights of shape (layers, 3, dims))
+        """
+        stage_time, weight_grad_time = self._stage_times(coll_time=coll_time)
+        slowest_stage = int(stage_time.argmax())
+        slowest_weight_grad_stage = int(weight_grad_time.argmax())
+
+        constant = float((self.microbatches_count - 1) * self.stage_compute_time[slowest_stage]
+                         + self.stage_compute_time.sum())
+
+        coll_time_weights = np.zeros(coll_time.shape)
+        coll_time_weights[:, 0:2] = (1 + (self.microbatches_count - 1)
+                                     * self.stage_membership[:, slowest_stage])[:, np.newaxis]
+        coll_time_weights[:, 2] = self.stage_membership[:, slowest_weight_grad_stage]
+
+        return constant, coll_time_weights, np.zeros(dim_time.shape)
+
+    def task_graph(self) -> TaskGraph:
+        """
+        Task graph executing the schedule as its closed form assumes, e.g., to be simulated:
+        each stage processes one microbatch at a time (the forward and backward of its layers)
+        once the previous stage finished the microbatch, and communicates its weight gradients after its last one.
+
+        :return: task graph of the schedule
+        """
+        task_graph = TaskGraph()
+        stage_layers = [[layer_idx for layer_idx, layer in enumerate(self.workload.layers) if layer.stage == stage]
+                        for stage in range(self.stages_count)]
+
+        last_tasks = [''] * self.stages_count
+        for microbatch in range(self.microbatches_count):
+            previous_task = None
+            for stage, layers in enumerate(stage_layers):
+                stream = f'stage_{stage}'
+                deps = [previous_task] if previous_task is not None else []
+
+                for layer_idx in layers:
+                    layer = self.workload.layers[layer_idx]
+                    task_graph.add_compute(name=f'mb_{microbatch}_fwd_compute_{layer_idx}',
+                                           compute_time=layer.forward.compute_time, deps=deps, stream=stream)
+                    previous_task = task_graph.add_collective(name=f'mb_{microbatch}_fwd_comm_{layer_idx}',
+                                                              layer_idx=layer_idx, phase_idx=0, stream=stream)
+                    deps = []
+
+                for layer_idx in reversed(layers):
+                    layer = self.workload.layers[layer_idx]
+                    task_graph.add_compute(name=f'mb_{microbatch}_ig_compute_{layer_idx}',
+                                           compute_time=layer.input_grad.compute_time, stream=stream)
+                    task_graph.add_collective(name=f'mb_{microbatch}_ig_comm_{layer_idx}',
+                                              layer_idx=layer_idx, phase_idx=1, stream=stream)
+                    previous_task = task_graph.add_compute(name=f'mb_{microbatch}_wg_compute_{layer_idx}',
+                                                           compute_time=layer.weight_grad.compute_time,
+                                                           stream=stream)
+
+                last_tasks[stage] = previous_task if len(layers) > 0 else last_tasks[stage]
+
+        # weight gradients are communicated once the stage drained
+        for stage, layers in enumerate(stage_layers):
+            deps = [last_tasks[stage]] if len(layers) > 0 else []
+            for layer_idx in reversed(layers):
+                task_graph.add_collective(name=f'wg_comm_{layer_idx}', layer_idx=layer_idx, phase_idx=2,
+                                          deps=deps, stream=f'stage_{stage}_comm')
+                deps = []
+
+        return task_graph
+
+    def _stage_times(self, coll_time: np.ndarray,
+                     compute_scale: Union[float, np.ndarray] = 1.0) -> Tuple[np.ndarray, np.ndarray]:
+        # (..., stages)
+        stage_compute_time = self.stage_compute_time * np.asarray(compute_scale, dtype=float)[..., np.newaxis]
+        stage_time = (coll_time[..., 0] + coll_time[..., 1]) @ self.stage_membership + stage_compute_time
+        weight_grad_time = coll_time[..., 2] @ self.stage_membership
+
+        return stage_time, weight_grad_time
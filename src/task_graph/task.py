@@ -0,0 +1,39 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from typing import List, Tuple
+
+from src.task_graph.task_type import TaskType
+
+
+class Task:
+    """
+    Task is a single node of a task graph: either a compute task of fixed duration,
+    or a collective over one or more (fused) workload phases.
+    """
+
+    def __init__(self,
+                 name: str,
+                 task_type: TaskType,
+                 stream: str,
+                 predecessors: List[int],
+                 compute_time: float = 0,
+                 phases: Tuple[Tuple[int, int], ...] = ()):
+        """
+        Initializer.
+
+        :param name: unique task name
+        :param task_type: task type
+        :param stream: resource stream the task executes on (tasks of a stream execute one at a time, in order)
+        :param predecessors: indices of the tasks that must finish before this task starts
+        :param compute_time: duration of a compute task (in ns)
+        :param phases: (layer index, phase index) of each phase a collective task communicates
+        """
+        self.name = name
+        self.task_type = task_type
+        self.stream = stream
+        self.predecessors = predecessors
+        self.compute_time = compute_time
+        self.phases = phases
@@ -0,0 +1,387 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import gurobipy as gp
+import numpy as np
+from gurobipy import GRB
+
+from src.task_graph.task import Task
+from src.task_graph.task_graph_error import TaskGraphError
+from src.task_graph.task_type import TaskType
+
+
+class TaskGraph:
+    """
+    TaskGraph declares a training iteration as compute and collective tasks with dependencies.
+    Tasks on the same stream execute one at a time in the order they were added,
+    so collectives on a separate stream overlap with compute. The e2e time is the critical (longest) path.
+    Tasks can only depend on tasks added before them, so the insertion order is always a topological order.
+    """
+
+    def __init__(self):
+        """
+        Initializer.
+        """
+        self.tasks: List[Task] = list()
+
+        # task name -> task index
+        self._task_indices: Dict[str, int] = dict()
+
+        # stream name -> index of the last task added to the stream
+        self._stream_tails: Dict[str, int] = dict()
+
+        # (tasks count, compute task indices, compute times, single-phase collective task indices,
+        #  their [layer * 3 + phase] indices, fused collective task indices), gathering durations in bulk
+        self._task_arrays: Optional[Tuple] = None
+
+    def add_compute(self, name: str, compute_time: float, deps: Sequence[str] = (), stream: str = 'compute') -> str:
+        """
+        Add a compute task of fixed duration.
+
+        :param name: unique task name
+        :param compute_time: compute time (in ns)
+        :param deps: names of the tasks that must finish before this task starts
+        :param stream: stream the task executes on
+        :return: task name
+        """
+        return self._add_task(name=name, task_type=TaskType.Compute, deps=deps, stream=stream,
+                              compute_time=compute_time)
+
+    def add_collective(self, name: str, layer_idx: int, phase_idx: int, deps: Sequence[str] = (),
+                       stream: str = 'compute') -> str:
+        """
+        Add a collective task communicating one phase of the workload.
+        By default, collectives execute on the compute stream, i.e., block the following compute.
+
+        :param name: unique task name
+        :param layer_idx: layer index
+        :param phase_idx: phase index (0: Forward, 1: InputGrad, 2: WeightGrad)
+        :param deps: names of the tasks that must finish before this task starts
+        :param stream: stream the task executes on
+        :return: task name
+        """
+        return self._add_task(name=name, task_type=TaskType.Collective, deps=deps, stream=stream,
+                              phases=((layer_idx, phase_idx),))
+
+    def add_fused_collective(self, name: str, phases: Sequence[Tuple[int, int]], deps: Sequence[str] = (),
+                             stream: str = 'compute') -> str:
+        """
+        Add a collective task communicating several phases at once (e.g., a gradient bucket).
+        Fused phases should share their collective type and communicator:
+        their messages are summed per dimension, and the fused collective takes the slowest dimension's time
+        (with latency modeled, latency is paid once per dimension, as the fused phases' largest).
+
+        :param name: unique task name
+        :param phases: (layer index, phase index) of each fused phase
+        :param deps: names of the tasks that must finish before this task starts
+        :param stream: stream the task executes on
+        :return: task name
+        """
+        if len(phases) == 0:
+            raise TaskGraphError(f"Fused collective {name} has no phase.")
+
+        return self._add_task(name=name, task_type=TaskType.Collective, deps=deps, stream=stream,
+                              phases=tuple(phases))
+
+    def _add_task(self, name: str, task_type: TaskType, deps: Sequence[str], stream: str,
+                  compute_time: float = 0, phases: Tuple[Tuple[int, int], ...] = ()) -> str:
+        if name in self._task_indices:
+            raise TaskGraphError(f"Task {name} is already in the task graph.")
+
+        predecessors: List[int] = list()
+        for dep in deps:
+            if dep not in self._task_indices:
+                raise TaskGraphError(f"Task {name} depends on unknown task {dep}.")
+            predecessors.append(self._task_indices[dep])
+
+        # tasks of a stream execute in order
+        if stream in self._stream_tails and self._stream_tails[stream] not in predecessors:
+            predecessors.append(self._stream_tails[stream])
+
+        index = len(self.tasks)
+        self.tasks.append(Task(name=name, task_type=task_type, stream=stream, predecessors=predecessors,
+                               compute_time=compute_time, phases=phases))
+        self._task_indices[name] = index
+        self._stream_tails[stream] = index
+
+        return name
+
+    def sinks(self) -> List[int]:
+        """
+        Tasks no other task depends on.
+
+        :return: sink task indices
+        """
+        has_successor = [False] * len(self.tasks)
+        for task in self.tasks:
+            for predecessor in task.predecessors:
+                has_successor[predecessor] = True
+
+        return [index for index in range(len(self.tasks)) if not has_successor[index]]
+
+    def compile(self, gp_model: gp.Model, coll_time: Mapping, dim_time: Mapping, dims_count: int,
+                latency: Optional[Mapping] = None) -> gp.LinExpr:
+        """
+        Compile the critical path into a linear formulation of the e2e time.
+        A task's finish time is a variable greater than or equal to each predecessor's finish time plus its duration,
+        so that every constraint only refers to its direct dependencies (exact as long as the e2e time is minimized).
+        A compute task after a single predecessor just offsets that finish time by its compute time instead.
+
+        :param gp_model: Gurobi model to add the variables and constraints to
+        :param coll_time: collective time per each [layer, phase]
+        :param dim_time: communication time per each [layer, phase, dim]
+        :param dims_count: number of network dimensions
+        :param latency: latency per each [layer, phase, dim], included in dim_time (None if not modeled)
+        :return: e2e time expression
+        """
+        if len(self.tasks) == 0:
+            return gp.LinExpr(0)
+
+        # latency saved by fusing is a coefficient of a variable fixed to 1, not a constant, so that constraint
+        # right-hand sides only hold compute times (which Model.set_compute_scale rescales)
+        latency_unit = gp_model.addVar(lb=1, ub=1, vtype=GRB.CONTINUOUS) \
+            if latency is not None and any(len(task.phases) > 1 for task in self.tasks) else None
+
+        # finish time of every task: a constant, or a finish time variable plus a constant
+        finish_times: List[gp.LinExpr] = list()
+
+        for task in self.tasks:
+            if task.task_type == TaskType.Compute and len(task.predecessors) <= 1:
+                start_time = finish_times[task.predecessors[0]] if len(task.predecessors) == 1 else gp.LinExpr(0)
+                finish_times.append(start_time + task.compute_time)
+                continue
+
+            duration = self._duration_expr(task=task, gp_model=gp_model, coll_time=coll_time, dim_time=dim_time,
+                                           dims_count=dims_count, latency=latency, latency_unit=latency_unit)
+
+            finish_time = gp_model.addVar(lb=0, vtype=GRB.CONTINUOUS)
+            if len(task.predecessors) == 0:
+                gp_model.addLConstr(finish_time >= duration)
+            for predecessor in task.predecessors:
+                gp_model.addLConstr(finish_time >= finish_times[predecessor] + duration)
+
+            finish_times.append(gp.LinExpr(finish_time))
+
+        sinks = self.sinks()
+        if len(sinks) == 1:
+            return finish_times[sinks[0]]
+
+        e2e_time = gp_model.addVar(lb=0, vtype=GRB.CONTINUOUS)
+        for sink in sinks:
+            gp_model.addLConstr(e2e_time >= finish_times[sink])
+
+        return gp.LinExpr(e2e_time)
+
+    @staticmethod
+    def _duration_expr(task: Task, gp_model: gp.Model, coll_time: Mapping, dim_time: Mapping, dims_count: int,
+                       latency: Optional[Mapping], latency_unit: Optional[gp.Var]) -> Union[float, gp.LinExpr, gp.Var]:
+        if task.task_type == TaskType.Compute:
+            return task.compute_time
+
+        if len(task.phases) == 1:
+            return coll_time[task.phases[0]]
+
+        # fused collective time >= summed time of every dimension, paying its latency once
+        fused_time = gp_model.addVar(lb=0, vtype=GRB.CONTINUOUS)
+        for dim in range(dims_count):
+            fused_dim_time = gp.quicksum(dim_time[layer_idx, phase_idx, dim] for layer_idx, phase_idx in task.phases)
+            if latency_unit is not None:
+                latencies = [latency[layer_idx, phase_idx, dim] for layer_idx, phase_idx in task.phases]
+                fused_dim_time -= (sum(latencies) - max(latencies)) * latency_unit
+            gp_model.addLConstr(fused_time >= fused_dim_time)
+
+        return fused_time
+
+    def evaluate(self, coll_time: np.ndarray, dim_time: np.ndarray, compute_scale: Union[float, np.ndarray] = 1.0,
+                 latency: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Critical path length for fixed collective times, vectorized over any leading batch dimensions.
+
+        :param coll_time: collective time of shape (..., layers_count, 3)
+        :param dim_time: communication time of shape (..., layers_count, 3, dims_count)
+        :param compute_scale: scale of every compute time, a scalar or of shape (...)
+        :param latency: latency of shape (layers_count, 3, dims_count), included in dim_time (None if not modeled)
+        :return: e2e time of shape (...)
+        """
+        _, finish_times = self._schedule(coll_time=coll_time, dim_time=dim_time, compute_scale=compute_scale,
+                                         latency=latency)
+
+        if len(finish_times) == 0:
+            return np.zeros(coll_time.shape[:-2])
+
+        return np.maximum.reduce([finish_times[sink] for sink in self.sinks()])
+
+    def schedule(self, coll_time: np.ndarray, dim_time: np.ndarray, compute_scale: Union[float, np.ndarray] = 1.0,
+                 latency: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Start and finish time of every task (each starting as soon as its predecessors finish)
+        for fixed collective times, vectorized over any leading batch dimensions.
+
+        :param coll_time: collective time of shape (..., layers_count, 3)
+        :param dim_time: communication time of shape (..., layers_count, 3, dims_count)
+        :param compute_scale: scale of every compute time, a scalar or of shape (...)
+        :param latency: latency of shape (layers_count, 3, dims_count), included in dim_time (None if not modeled)
+        :return: (start times, finish times), each of shape (..., tasks_count)
+        """
+        start_times, finish_times = self._schedule(coll_time=coll_time, dim_time=dim_time,
+                                                   compute_scale=compute_scale, latency=latency)
+
+        if len(self.tasks) == 0:
+            batch_shape = coll_time.shape[:-2]
+            return np.zeros(batch_shape + (0,)), np.zeros(batch_shape + (0,))
+
+        return np.moveaxis(np.array(start_times), 0, -1), np.moveaxis(np.array(finish_times), 0, -1)
+
+    def _schedule(self, coll_time: np.ndarray, dim_time: np.ndarray, compute_scale: Union[float, np.ndarray],
+                  latency: Optional[np.ndarray]) -> Tuple[List, List]:
+        durations = self._durations(coll_time=coll_time, dim_time=dim_time, compute_scale=compute_scale,
+                                    latency=latency)
+
+        # a single schedule is walked in floats, a batch of schedules in arrays
+        if durations.ndim == 1:
+            durations, no_time, latest = durations.tolist(), 0.0, max
+        else:
+            durations, no_time, latest = list(np.moveaxis(durations, -1, 0)), np.zeros(durations.shape[:-1]), \
+                np.maximum.reduce
+
+        start_times: List = list()
+        finish_times: List = list()
+
+        for task, duration in zip(self.tasks, durations):
+            if len(task.predecessors) == 0:
+                start_time = no_time
+            elif len(task.predecessors) == 1:
+                start_time = finish_times[task.predecessors[0]]
+            else:
+                start_time = latest([finish_times[predecessor] for predecessor in task.predecessors])
+
+            start_times.append(start_time)
+            finish_times.append(start_time + duration)
+
+        return start_times, finish_times
+
+    def _durations(self, coll_time: np.ndarray, dim_time: np.ndarray, compute_scale: Union[float, np.ndarray],
+                   latency: Optional[np.ndarray]) -> np.ndarray:
+        """
+        Duration of every task, gathered in bulk.
+
+        :param coll_time: collective time of shape (..., layers_count, 3)
+        :param dim_time: communication time of shape (..., layers_count, 3, dims_count)
+        :param compute_scale: scale of every compute time, a scalar or of shape (...)
+        :param latency: latency of shape (layers_count, 3, dims_count), included in dim_time (None if not modeled)
+        :return: durations of shape (..., tasks_count)
+        """
+        # (re)index the tasks once they changed
+        if self._task_arrays is None or self._task_arrays[0] != len(self.tasks):
+            compute_tasks = [index for index, task in enumerate(self.tasks) if task.task_type == TaskType.Compute]
+            collective_tasks = [index for index, task in enumerate(self.tasks)
+                                if task.task_type == TaskType.Collective and len(task.phases) == 1]
+            self._task_arrays = (len(self.tasks), np.array(compute_tasks, dtype=int),
+                                 np.array([self.tasks[index].compute_time for index in compute_tasks], dtype=float),
+                                 np.array(collective_tasks, dtype=int),
+                                 np.array([self.tasks[index].phases[0][0] * 3 + self.tasks[index].phases[0][1]
+                                           for index in collective_tasks], dtype=int),
+                                 [index for index, task in enumerate(self.tasks) if len(task.phases) > 1])
+        _, compute_tasks, compute_times, collective_tasks, collective_phases, fused_tasks = self._task_arrays
+
+        batch_shape = coll_time.shape[:-2]
+        durations = np.zeros(batch_shape + (len(self.tasks),))
+        durations[..., compute_tasks] = compute_times * np.asarray(compute_scale, dtype=float)[..., np.newaxis]
+        durations[..., collective_tasks] = coll_time.reshape(batch_shape + (-1,))[..., collective_phases]
+        for index in fused_tasks:
+            durations[..., index] = self._duration(task=self.tasks[index], coll_time=coll_time, dim_time=dim_time,
+                                                   latency=latency)
+
+        return durations
+
+    def critical_path(self, coll_time: np.ndarray, dim_time: np.ndarray,
+                      latency: Optional[np.ndarray] = None) -> Tuple[float, np.ndarray, np.ndarray]:
+        """
+        Weights of the critical path for fixed collective times, in the form of a linear training loop,
+        i.e., its length = constant + sum(coll_time * coll_time_weights) + sum(dim_time * dim_time_weights).
+        As the critical path is the longest path, these weights lower-bound the e2e time under any bandwidths.
+
+        :param coll_time: collective time of shape (layers_count, 3)
+        :param dim_time: communication time of shape (layers_count, 3, dims_count)
+        :param latency: latency of shape (layers_count, 3, dims_count), included in dim_time (None if not modeled)
+        :return: (constant, coll_time_weights of shape (layers, 3), dim_time_weights of shape (layers, 3, dims))
+        """
+        finish_times: List[float] = list()
+        critical_predecessors: List[int] = list()
+
+        for task in self.tasks:
+            if len(task.predecessors) == 0:
+                start_time, critical_predecessor = 0.0, -1
+            else:
+                critical_predecessor = max(task.predecessors, key=lambda predecessor: finish_times[predecessor])
+                start_time = finish_times[critical_predecessor]
+
+            finish_times.append(start_time + float(self._duration(task=task, coll_time=coll_time, dim_time=dim_time,
+                                                                  latency=latency)))
+            critical_predecessors.append(critical_predecessor)
+
+        constant = 0.0
+        coll_time_weights = np.zeros(coll_time.shape)
+        dim_time_weights = np.zeros(dim_time.shape)
+
+        if len(self.tasks) == 0:
+            return constant, coll_time_weights, dim_time_weights
+
+        # walk back from the latest sink
+        index = max(self.sinks(), key=lambda sink: finish_times[sink])
+        while index >= 0:
+            task = self.tasks[index]
+
+            if task.task_type == TaskType.Compute:
+                constant += task.compute_time
+            elif len(task.phases) == 1:
+                coll_time_weights[task.phases[0]] += 1
+            else:
+                # the fused collective is bottlenecked by its slowest summed dimension,
+                # less the latency it saves there (a constant)
+                saved_latency = TaskGraph._saved_latency(task=task, dims_count=dim_time.shape[-1], latency=latency)
+                layers, phases = zip(*task.phases)
+                bottleneck_dim = int((dim_time[list(layers), list(phases)].sum(axis=0) - saved_latency).argmax())
+                for phase in task.phases:
+                    dim_time_weights[phase + (bottleneck_dim,)] += 1
+                constant -= float(saved_latency[bottleneck_dim])
+
+            index = critical_predecessors[index]
+
+        return constant, coll_time_weights, dim_time_weights
+
+    @staticmethod
+    def _duration(task: Task, coll_time: np.ndarray, dim_time: np.ndarray,
+                  compute_scale: Union[float, np.ndarray] = 1.0,
+                  latency: Optional[np.ndarray] = None) -> Union[float, np.ndarray]:
+        if task.task_type == TaskType.Compute:
+            return task.compute_time * compute_scale
+
+        if len(task.phases) == 1:
+            return coll_time[(..., ) + task.phases[0]]
+
+        layers, phases = zip(*task.phases)
+        saved_latency = TaskGraph._saved_latency(task=task, dims_count=dim_time.shape[-1], latency=latency)
+        return (dim_time[..., list(layers), list(phases), :].sum(axis=-2) - saved_latency).max(axis=-1)
+
+    @staticmethod
+    def _saved_latency(task: Task, dims_count: int, latency: Optional[np.ndarray]) -> np.ndarray:
+        """
+        Latency a fused collective saves per each dimension over its phases communicated one by one:
+        it pays the largest latency of its phases once, rather than the latency of every phase.
+
+        :param task: fused collective task
+        :param dims_count: number of network dimensions
+        :param latency: latency of shape (layers_count, 3, dims_count) (None if not modeled)
+        :return: saved latency of shape (dims_count,)
+        """
+        if latency is None:
+            return np.zeros(dims_count)
+
+        layers, phases = zip(*task.phases)
+        latencies = latency[list(layers), list(phases)]
+        return latencies.sum(axis=0) - latencies.max(axis=0)
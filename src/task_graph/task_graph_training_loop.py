@@ -0,0 +1,60 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+import functools
+from typing import Callable, Union
+
+import gurobipy as gp
+
+from src.model import Model
+from src.task_graph.pipeline_schedule import PipelineSchedule
+from src.task_graph.task_graph import TaskGraph
+from src.workload import Workload
+
+
+class TaskGraphTrainingLoop:
+    """
+    TaskGraphTrainingLoop turns a function declaring the task graph (or pipeline schedule) of a workload
+    into a training loop, which can be registered (see inputs/training_loop) and used wherever a training loop function is.
+    """
+
+    def __init__(self, build: Callable[[Workload], Union[TaskGraph, PipelineSchedule]]):
+        """
+        Initializer.
+
+        :param build: function declaring the task graph (or pipeline schedule) of the given workload
+        """
+        self.build = build
+
+        # identify the training loop by its build function (e.g., in the results store input hash)
+        functools.update_wrapper(self, build)
+
+    def __call__(self, model: Model) -> gp.LinExpr:
+        """
+        Compile the task graph of the model's workload into its e2e time expression.
+
+        :param model: workload model
+        :return: e2e time expression
+        """
+        return self.task_graph(workload=model.workload).compile(gp_model=Model._gp_model,
+                                                                coll_time=model.coll_time,
+                                                                dim_time=model.dim_time,
+                                                                dims_count=Model.network.dims_count,
+                                                                latency=model.latency)
+
+    def task_graph(self, workload: Workload) -> Union[TaskGraph, PipelineSchedule]:
+        """
+        Task graph (or pipeline schedule) of the given workload, built once per workload.
+
+        :param workload: target workload
+        :return: task graph
+        """
+        return _build_task_graph(training_loop=self, workload=workload)
+
+
+@functools.lru_cache(maxsize=64)
+def _build_task_graph(training_loop: TaskGraphTrainingLoop,
+                      workload: Workload) -> Union[TaskGraph, PipelineSchedule]:
+    return training_loop.build(workload)
@@ -0,0 +1,14 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from enum import Enum, auto
+
+
+class TaskType(Enum):
+    """
+    Task types of a task graph
+    """
+    Compute = auto()
+    Collective = auto()
@@ -0,0 +1,7 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from src.timeline.timeline import Timeline
+from src.timeline.timeline_error import TimelineError
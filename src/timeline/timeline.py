@@ -0,0 +1,199 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+import json
+import os
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from src.evaluator import Evaluator, EvaluatorError
+from src.simulator import SimulationResult
+from src.task_graph import TaskType
+from src.timeline.timeline_error import TimelineError
+
+# name of each phase type
+_phase_names = ('Forward', 'InputGrad', 'WeightGrad')
+
+
+class Timeline:
+    """
+    Timeline lays out a training iteration as spans on tracks, one per stream and one per network dimension,
+    and exports it as a Chrome trace-event JSON (viewable in chrome://tracing or https://ui.perfetto.dev).
+    Spans are kept as arrays, so that the timelines of large workloads are laid out and written in bulk.
+    """
+
+    def __init__(self,
+                 stream_names: List[str],
+                 dim_names: List[str],
+                 names: List[str],
+                 span_tracks: np.ndarray,
+                 span_names: np.ndarray,
+                 start_times: np.ndarray,
+                 durations: np.ndarray,
+                 metadata: Optional[Dict[str, Union[str, float]]] = None):
+        """
+        Initializer.
+
+        :param stream_names: name of each stream track
+        :param dim_names: name of each network dimension track
+        :param names: span names (indexed by span_names)
+        :param span_tracks: track of each span (stream tracks first, then dimension tracks)
+        :param span_names: name index of each span
+        :param start_times: start time of each span (in ns)
+        :param durations: duration of each span (in ns)
+        :param metadata: extra information stored into the trace (e.g., the iteration time)
+        """
+        self.stream_names = stream_names
+        self.dim_names = dim_names
+        self.names = names
+        self.span_tracks = np.asarray(span_tracks, dtype=int)
+        self.span_names = np.asarray(span_names, dtype=int)
+        self.start_times = np.asarray(start_times, dtype=float)
+        self.durations = np.asarray(durations, dtype=float)
+        self.metadata = metadata if metadata is not None else dict()
+
+        if not (len(self.span_tracks) == len(self.span_names) == len(self.start_times) == len(self.durations)):
+            raise TimelineError("Span tracks, names, start times, and durations don't describe the same spans.")
+
+    @property
+    def spans_count(self) -> int:
+        """
+        Number of spans.
+        """
+        return len(self.span_tracks)
+
+    @classmethod
+    def from_evaluator(cls, evaluator: Evaluator, bw: np.ndarray, compute_scale: float = 1.0) -> 'Timeline':
+        """
+        Timeline of the iteration as modeled by the evaluator under the given bandwidths:
+        tasks start as soon as their predecessors finish, and each phase of a collective occupies every dimension
+        it communicates over for its dim time (fused phases one after another, paying their largest latency once).
+
+        :param evaluator: evaluator of the network, workload, communicator, and training loop
+        :param bw: bandwidths of shape (dims_count,)
+        :param compute_scale: scale of every compute time
+        :return: modeled timeline
+        """
+        bw = np.asarray(bw, dtype=float)
+        try:
+            task_graph = evaluator.iteration_task_graph()
+        except EvaluatorError as e:
+            raise TimelineError(f"Training loop cannot be laid out: {e}")
+
+        dim_time = evaluator.dim_time(bw=bw)
+        start_times, finish_times = task_graph.schedule(coll_time=dim_time.max(axis=-1), dim_time=dim_time,
+                                                        compute_scale=compute_scale, latency=evaluator.latencies)
+
+        # task spans on their stream tracks
+        tasks = task_graph.tasks
+        stream_names = list(dict.fromkeys(task.stream for task in tasks))
+        task_tracks = Timeline._stream_indices(streams=[task.stream for task in tasks], stream_names=stream_names)
+        names = [task.name for task in tasks]
+
+        # phases of every collective task, flattened in task order
+        collective_tasks = [index for index, task in enumerate(tasks) if task.task_type == TaskType.Collective]
+        phase_tasks = np.array([index for index in collective_tasks for _ in tasks[index].phases], dtype=int)
+        phases = np.array([layer_idx * 3 + phase_idx for index in collective_tasks
+                           for layer_idx, phase_idx in tasks[index].phases], dtype=int).reshape(-1)
+        dims_count = evaluator.network.dims_count
+
+        # fused phases occupy a dimension one after another: offset each by the dim times of the task's previous phases
+        phase_dim_time = dim_time.reshape(-1, dims_count)[phases]
+        first_phases = np.flatnonzero(np.r_[True, phase_tasks[1:] != phase_tasks[:-1]]) if len(phases) > 0 \
+            else np.zeros(0, dtype=int)
+
+        # a task pays its phases' largest latency once, on its first phase (as TaskGraph charges fused collectives)
+        if len(phases) > 0:
+            phase_latency = evaluator.latencies.reshape(-1, dims_count)[phases]
+            phase_dim_time = phase_dim_time - phase_latency
+            phase_dim_time[first_phases] += np.maximum.reduceat(phase_latency, first_phases, axis=0)
+
+        phase_ends = np.cumsum(phase_dim_time, axis=0)
+        task_offsets = np.repeat(phase_ends[first_phases] - phase_dim_time[first_phases],
+                                 np.diff(np.r_[first_phases, len(phases)]), axis=0)
+        phase_starts = start_times[phase_tasks][:, np.newaxis] + phase_ends - phase_dim_time - task_offsets
+
+        # phase spans on the dimensions they communicate over, named after their layer and phase type
+        span_phases, span_dims = np.nonzero(phase_dim_time > 0)
+        phase_names = [f'{layer.name if len(layer.name) > 0 else layer_idx} {phase_name}'
+                       for layer_idx, layer in enumerate(evaluator.workload.layers) for phase_name in _phase_names]
+
+        task_spans = np.flatnonzero(finish_times > start_times)
+        dim_names = [f'Dim {dim} ({bw[dim]:.2f} GB/s)' for dim in range(dims_count)]
+
+        return cls(stream_names=stream_names, dim_names=dim_names, names=names + phase_names,
+                   span_tracks=np.concatenate([task_tracks[task_spans], len(stream_names) + span_dims]),
+                   span_names=np.concatenate([task_spans, len(names) + phases[span_phases]]),
+                   start_times=np.concatenate([start_times[task_spans], phase_starts[span_phases, span_dims]]),
+                   durations=np.concatenate([(finish_times - start_times)[task_spans],
+                                             phase_dim_time[span_phases, span_dims]]),
+                   metadata={'source': 'model', 'iteration_time_ns': float(finish_times.max(initial=0.0))})
+
+    @classmethod
+    def from_simulation(cls, result: SimulationResult) -> 'Timeline':
+        """
+        Timeline of a simulated iteration: tasks on their stream tracks, and each chunk transfer on its dimension.
+
+        :param result: simulation result
+        :return: simulated timeline
+        """
+        stream_names = list(dict.fromkeys(result.task_streams))
+        task_tracks = Timeline._stream_indices(streams=result.task_streams, stream_names=stream_names)
+        task_spans = np.flatnonzero(result.task_finish_times > result.task_start_times)
+        dim_names = [f'Dim {dim} ({bw:.2f} GB/s)' for dim, bw in enumerate(result.bw)]
+
+        return cls(stream_names=stream_names, dim_names=dim_names, names=list(result.task_names),
+                   span_tracks=np.concatenate([task_tracks[task_spans], len(stream_names) + result.link_dims]),
+                   span_names=np.concatenate([task_spans, result.link_tasks]),
+                   start_times=np.concatenate([result.task_start_times[task_spans], result.link_start_times]),
+                   durations=np.concatenate([(result.task_finish_times - result.task_start_times)[task_spans],
+                                             result.link_end_times - result.link_start_times]),
+                   metadata={'source': 'simulation', 'iteration_time_ns': result.iteration_time,
+                             'analytical_time_ns': result.analytical_time})
+
+    def write(self, path: str) -> None:
+        """
+        Write the timeline as a Chrome trace-event JSON, in microseconds (the trace-event time unit).
+
+        :param path: path to write the trace to
+        """
+        if not (np.isfinite(self.start_times).all() and np.isfinite(self.durations).all()):
+            raise TimelineError("Timeline has spans of infinite time (a dimension carries traffic without bandwidth).")
+
+        # create parent directory if needed
+        directory = os.path.dirname(path)
+        if directory != '' and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        # streams and dimensions are two processes, each track a thread
+        tracks = [(0, tid) for tid in range(len(self.stream_names))] + [(1, tid) for tid in range(len(self.dim_names))]
+        track_prefixes = [f',"ph":"X","pid":{pid},"tid":{tid},"ts":' for pid, tid in tracks]
+        names = [json.dumps(name) for name in self.names]
+
+        metadata_events = [json.dumps({'name': 'process_name', 'ph': 'M', 'pid': pid, 'args': {'name': name}})
+                           for pid, name in ((0, 'Streams'), (1, 'Network'))]
+        for (pid, tid), name in zip(tracks, self.stream_names + self.dim_names):
+            metadata_events.append(json.dumps({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+                                               'args': {'name': name}}))
+            metadata_events.append(json.dumps({'name': 'thread_sort_index', 'ph': 'M', 'pid': pid, 'tid': tid,
+                                               'args': {'sort_index': tid}}))
+
+        # spans are formatted in bulk, from plain lists
+        span_events = ['{"name":' + names[name] + track_prefixes[track] + f'{start:.3f},"dur":{duration:.3f}}}'
+                       for track, name, start, duration in zip(self.span_tracks.tolist(), self.span_names.tolist(),
+                                                               (self.start_times / 1e3).tolist(),
+                                                               (self.durations / 1e3).tolist())]
+
+        with open(path, 'w') as trace_file:
+            trace_file.write('{"displayTimeUnit":"ns","otherData":' + json.dumps(self.metadata)
+                             + ',"traceEvents":[\n')
+            trace_file.write(',\n'.join(metadata_events + span_events))
+            trace_file.write('\n]}\n')
+
+    @staticmethod
+    def _stream_indices(streams: List[str], stream_names: List[str]) -> np.ndarray:
+        stream_indices = {stream: index for index, stream in enumerate(stream_names)}
+        return np.array([stream_indices[stream] for stream in streams], dtype=int)
@@ -0,0 +1,8 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from src.trace.trace_error import TraceError
+from src.trace.trace_importer import TraceAggregate, TraceImporter, aggregate_trace
+from src.trace.trace_reader import read_trace_nodes
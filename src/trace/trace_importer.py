@@ -0,0 +1,340 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.trace.trace_error import TraceError
+from src.trace.trace_reader import read_trace_nodes
+from src.workload import Collective, Layer, Phase, Workload
+
+# Chakra node types
+_compute_node_types = {'COMP_NODE', 4}
+_collective_node_types = {'COMM_COLL_NODE', 7}
+_send_node_types = {'COMM_SEND_NODE', 5}
+_ignored_node_types = {'INVALID_NODE', 'METADATA_NODE', 'MEM_LOAD_NODE', 'MEM_STORE_NODE', 'COMM_RECV_NODE',
+                       0, 1, 2, 3, 6}
+
+# Chakra collective types
+_collective_ids = {0: Collective.AllReduce, 2: Collective.AllGather, 6: Collective.AllToAll,
+                   7: Collective.ReduceScatter, 8: Collective.ReduceScatter, 9: Collective.NoComm}
+
+# collective names (lowercase alphanumerics) found in collective types and node names, e.g., ncclKernel_AllReduce_RING
+_collective_names = {'allreduce': Collective.AllReduce, 'allgather': Collective.AllGather,
+                     'reducescatter': Collective.ReduceScatter, 'alltoall': Collective.AllToAll,
+                     'barrier': Collective.NoComm, 'send': Collective.PointToPoint}
+
+# phase names given by node attributes
+_phase_names = {'forward': 0, 'fwd': 0, 'inputgrad': 1, 'backward': 1, 'bwd': 1, 'weightgrad': 2, 'wgrad': 2}
+
+# phase of a node by its name, checked in order (Forward otherwise)
+_default_phase_patterns = ((2, r'weight_?grad|wgrad|grad_?sync'), (1, r'input_?grad|igrad|backward|bwd'))
+
+
+class TraceAggregate:
+    """
+    Compute time and communication sizes of each layer phase of one rank's execution trace.
+    """
+
+    def __init__(self):
+        """
+        Initializer.
+        """
+        # layers in the order they first appear
+        self.layers: List[str] = list()
+        self.stages: Dict[str, int] = dict()
+
+        # (layer, phase) -> compute time, and (layer, phase, collective) -> communication size
+        self.compute_times: Dict[Tuple[str, int], float] = dict()
+        self.comm_sizes: Dict[Tuple[str, int, Collective], float] = dict()
+
+        self.nodes_count = 0
+
+    def add_layer(self, layer: str, stage: Optional[int]) -> None:
+        if layer not in self.stages:
+            self.layers.append(layer)
+            self.stages[layer] = 0
+
+        if stage is not None:
+            self.stages[layer] = max(self.stages[layer], stage)
+
+    def merge(self, other: 'TraceAggregate') -> None:
+        """
+        Merge another rank's aggregate: ranks run in lockstep, so the slowest rank's compute time counts,
+        and each collective's size is the largest any rank contributes.
+
+        :param other: aggregate of another rank
+        """
+        for layer in other.layers:
+            self.add_layer(layer=layer, stage=other.stages[layer])
+
+        for key, compute_time in other.compute_times.items():
+            self.compute_times[key] = max(self.compute_times.get(key, 0.0), compute_time)
+
+        for key, comm_size in other.comm_sizes.items():
+            self.comm_sizes[key] = max(self.comm_sizes.get(key, 0.0), comm_size)
+
+        self.nodes_count += other.nodes_count
+
+
+class TraceImporter:
+    """
+    TraceImporter aggregates json execution traces (e.g., Chakra / ASTRA-sim 2.0 traces converted to json)
+    into a LIBRA workload: compute nodes into the compute time of layer phases,
+    and collective nodes into their collective type and size.
+
+    Each node is assigned to a layer and phase by its "layer" and "phase" attributes, if given,
+    and by its name otherwise (nodes whose names don't name a layer belong to the last named one).
+    """
+
+    def __init__(self,
+                 layer_pattern: Optional[str] = r'^(?P<layer>[^.]+)\.',
+                 phase_patterns: Optional[List[Tuple[int, str]]] = None,
+                 time_scale: float = 1e3,
+                 processes: Optional[int] = None):
+        """
+        Initializer.
+
+        :param layer_pattern: regex whose "layer" group extracts the layer from a node name
+            (e.g., "decoder_3.attn.matmul" -> "decoder_3"), None to only use "layer" attributes
+        :param phase_patterns: (phase type, regex) searched in node names in order (Forward if none matches),
+            defaults to WeightGrad for "weight_grad|wgrad|grad_sync" and InputGrad for "input_grad|igrad|backward|bwd"
+        :param time_scale: node durations are multiplied by it into ns (1e3 for the durations in microseconds)
+        :param processes: number of worker processes reading rank traces in parallel (defaults to the number of CPUs)
+        """
+        self.layer_pattern = layer_pattern
+        self.phase_patterns = list(phase_patterns) if phase_patterns is not None else list(_default_phase_patterns)
+        self.time_scale = time_scale
+        self.processes = processes
+
+        # check regex validity early
+        try:
+            if self.layer_pattern is not None and 'layer' not in re.compile(self.layer_pattern).groupindex:
+                raise TraceError(f"Layer pattern {self.layer_pattern} has no \"layer\" group.")
+            for _, pattern in self.phase_patterns:
+                re.compile(pattern)
+        except re.error as e:
+            raise TraceError(f"Invalid pattern: {e}.")
+
+    def import_traces(self, paths: List[str], name: Optional[str] = None) -> Workload:
+        """
+        Import the execution traces of every rank into a single workload.
+
+        :param paths: paths to the trace of each rank
+        :param name: name of the workload (defaults to the first trace's file name)
+        :return: imported workload
+        """
+        if len(paths) == 0:
+            raise TraceError("No trace is given.")
+
+        workers_count = min(self.processes if self.processes is not None else os.cpu_count(), len(paths))
+        options = dict(layer_pattern=self.layer_pattern, phase_patterns=self.phase_patterns,
+                       time_scale=self.time_scale)
+
+        if workers_count <= 1:
+            aggregates = [aggregate_trace(path=path, **options) for path in paths]
+        else:
+            # spawn workers, as in the searches
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=workers_count, mp_context=context) as executor:
+                aggregates = list(executor.map(partial(aggregate_trace, **options), paths))
+
+        aggregate = aggregates[0]
+        for other in aggregates[1:]:
+            aggregate.merge(other=other)
+
+        if len(aggregate.layers) == 0:
+            raise TraceError(f"Traces {paths} have no compute or communication node.")
+
+        if name is None:
+            name = os.path.basename(paths[0]).split('.')[0]
+
+        return Workload(layers=_create_layers(aggregate=aggregate), name=name)
+
+
+def aggregate_trace(path: str, layer_pattern: Optional[str], phase_patterns: List[Tuple[int, str]],
+                    time_scale: float) -> TraceAggregate:
+    """
+    Aggregate one rank's execution trace, streaming its nodes.
+
+    :param path: path to the trace
+    :param layer_pattern: regex whose "layer" group extracts the layer from a node name
+    :param phase_patterns: (phase type, regex) searched in node names in order
+    :param time_scale: node durations are multiplied by it into ns
+    :return: aggregated compute times and communication sizes of the trace
+    """
+    layer_regex = re.compile(layer_pattern) if layer_pattern is not None else None
+    phase_regexes = [(phase_idx, re.compile(pattern, re.IGNORECASE)) for phase_idx, pattern in phase_patterns]
+
+    aggregate = TraceAggregate()
+    current_layer = 'layer_0'
+
+    # node name -> (layer, phase) it names, memoized as names repeat across layers and iterations
+    named: Dict[str, Tuple[Optional[str], int]] = dict()
+
+    for node in read_trace_nodes(path=path):
+        attrs = _node_attrs(node=node)
+        node_name = str(attrs.get('name', ''))
+        node_type = attrs.get('type')
+
+        if node_type in _ignored_node_types:
+            continue
+
+        # classify the node (untyped nodes are collectives if they have a collective type)
+        if node_type in _collective_node_types or node_type in _send_node_types or \
+                (node_type is None and ('comm_type' in attrs or 'comm_size' in attrs)):
+            collective = _infer_collective(attrs=attrs, send=node_type in _send_node_types, path=path)
+        elif node_type in _compute_node_types or node_type is None:
+            collective = None
+        else:
+            raise TraceError(f"Node {node_name} of trace {path} has an unknown type {node_type}.")
+
+        if node_name not in named:
+            match = layer_regex.search(node_name) if layer_regex is not None else None
+            named[node_name] = (match.group('layer') if match is not None else None,
+                                next((phase_idx for phase_idx, regex in phase_regexes
+                                      if regex.search(node_name) is not None), 0))
+        named_layer, phase_idx = named[node_name]
+
+        # assign the node to a layer (nodes not naming one belong to the last one)
+        layer = attrs.get('layer', named_layer)
+        current_layer = str(layer) if layer is not None else current_layer
+
+        stage = attrs.get('stage')
+        aggregate.add_layer(layer=current_layer, stage=int(stage) if stage is not None else None)
+
+        # and to a phase
+        phase = attrs.get('phase')
+        if phase is not None:
+            phase_idx = _phase_index(phase=phase, node_name=node_name, path=path)
+        aggregate.nodes_count += 1
+
+        if collective is None:
+            duration = float(attrs.get('duration_micros', attrs.get('durationMicros', attrs.get('dur', 0.0))))
+            key = (current_layer, phase_idx)
+            aggregate.compute_times[key] = aggregate.compute_times.get(key, 0.0) + duration * time_scale
+        elif collective != Collective.NoComm:
+            comm_size = attrs.get('comm_size', attrs.get('commSize'))
+            if comm_size is None:
+                raise TraceError(f"Communication node {node_name} of trace {path} has no comm_size.")
+
+            key = (current_layer, phase_idx, collective)
+            aggregate.comm_sizes[key] = aggregate.comm_sizes.get(key, 0.0) + float(comm_size)
+
+    return aggregate
+
+
+def _node_attrs(node: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Node fields and attributes, flattened into the node itself.
+    Attributes are either a dictionary, or a list of {"name": ..., <value key>: ...} (e.g., "int64_val").
+
+    :param node: trace node (updated in place)
+    :return: attribute name -> value
+    """
+    node_attrs = node.pop('attr', None)
+    if node_attrs is None:
+        node_attrs = node.pop('attrs', list())
+
+    if isinstance(node_attrs, dict):
+        node.update(node_attrs)
+    else:
+        for attr in node_attrs:
+            for key, value in attr.items():
+                if key != 'name' and key != 'type':
+                    node[attr['name']] = value
+                    break
+
+    return node
+
+
+def _infer_collective(attrs: Dict[str, Any], send: bool, path: str) -> Collective:
+    """
+    Collective type of a communication node, by its comm_type attribute (a Chakra collective type or a name),
+    or by its name (e.g., ncclKernel_AllReduce_RING_LL_Sum_float).
+
+    :param attrs: node attributes
+    :param send: whether the node is a point-to-point send
+    :param path: path to the trace (for error messages)
+    :return: collective type (NoComm for barriers)
+    """
+    if send:
+        return Collective.PointToPoint
+
+    comm_type = attrs.get('comm_type', attrs.get('commType'))
+    if isinstance(comm_type, int) and not isinstance(comm_type, bool):
+        if comm_type not in _collective_ids:
+            raise TraceError(f"Collective type {comm_type} of node {attrs.get('name')} in trace {path} "
+                             f"is not supported.")
+        return _collective_ids[comm_type]
+
+    for text in (comm_type, attrs.get('name')):
+        if text is None:
+            continue
+
+        normalized = re.sub(r'[^a-z0-9]', '', str(text).lower())
+        for collective_name, collective in _collective_names.items():
+            if collective_name in normalized:
+                return collective
+
+    raise TraceError(f"Collective type of node {attrs.get('name')} in trace {path} cannot be inferred "
+                     f"(comm_type: {comm_type}).")
+
+
+def _phase_index(phase: Any, node_name: str, path: str) -> int:
+    """
+    Phase type given by a node's phase attribute.
+
+    :param phase: phase name (e.g., Forward, InputGrad, WeightGrad, fwd, or bwd)
+    :param node_name: node name (for error messages)
+    :param path: path to the trace (for error messages)
+    :return: phase type (0: Forward, 1: InputGrad, 2: WeightGrad)
+    """
+    normalized = re.sub(r'[^a-z]', '', str(phase).lower())
+    if normalized not in _phase_names:
+        raise TraceError(f"Phase {phase} of node {node_name} in trace {path} is not a valid phase name.")
+
+    return _phase_names[normalized]
+
+
+def _create_layers(aggregate: TraceAggregate) -> List[Layer]:
+    """
+    Create a layer per each traced layer. A phase communicates its largest collective,
+    and every other collective of the phase is carried by an extra layer (without compute) right after it.
+
+    :param aggregate: aggregated traces
+    :return: workload layers
+    """
+    # collectives of each [layer][phase]
+    layer_collectives: Dict[str, List[List[Tuple[Collective, float]]]] = {
+        layer_name: [list(), list(), list()] for layer_name in aggregate.layers}
+    for (layer_name, phase_idx, collective), comm_size in aggregate.comm_sizes.items():
+        layer_collectives[layer_name][phase_idx].append((collective, comm_size))
+
+    layers: List[Layer] = list()
+
+    for layer_name in aggregate.layers:
+        # largest collective first
+        phase_collectives = [sorted(collectives, key=lambda pair: (-pair[1], pair[0].value))
+                             for collectives in layer_collectives[layer_name]]
+        extra_layers_count = max(max(len(collectives) for collectives in phase_collectives) - 1, 0)
+
+        for layer_idx in range(extra_layers_count + 1):
+            phases: List[Phase] = list()
+            for phase_idx, collectives in enumerate(phase_collectives):
+                compute_time = aggregate.compute_times.get((layer_name, phase_idx), 0.0) if layer_idx == 0 else 0.0
+                comm_type, comm_size = collectives[layer_idx] if layer_idx < len(collectives) \
+                    else (Collective.NoComm, 0.0)
+                phases.append(Phase(compute_time=compute_time, comm_type=comm_type, comm_size=comm_size))
+
+            layers.append(Layer(forward=phases[0], input_grad=phases[1], weight_grad=phases[2],
+                                stage=aggregate.stages[layer_name],
+                                name=layer_name if layer_idx == 0 else f"{layer_name}_comm_{layer_idx}"))
+
+    return layers
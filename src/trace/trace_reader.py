@@ -0,0 +1,126 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+import gzip
+import json
+import os
+import re
+from typing import Any, Dict, Iterator, List, TextIO
+
+from src.trace.trace_error import TraceError
+
+# start of the node array of a json trace, e.g., {"schema": ..., "nodes": [
+_nodes_start = re.compile(r'"nodes"\s*:\s*\[')
+
+
+def read_trace_nodes(path: str, chunk_size: int = 1 << 20) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the nodes of a json execution trace, without loading the whole trace into memory.
+    Traces are either a json object with a "nodes" array (e.g., Chakra or PyTorch execution traces converted to json),
+    or json lines of one node each, optionally gzip-compressed (.gz).
+
+    :param path: path to the trace
+    :param chunk_size: number of characters read at a time
+    :return: iterator of nodes
+    """
+    # check the file exists
+    if not os.path.exists(path):
+        raise TraceError(f"Trace {path} does not exist.")
+
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt') as trace_file:
+        buffer = trace_file.read(chunk_size)
+
+        # read up to the end of the first line, unless it's the start of a node array (e.g., a minified trace)
+        while '\n' not in buffer.lstrip() and _nodes_start.search(buffer) is None:
+            chunk = trace_file.read(chunk_size)
+            if len(chunk) == 0:
+                break
+            buffer += chunk
+
+        # json lines: the first line is a node (e.g., with a name) on its own
+        first_line = buffer.lstrip().split('\n', 1)[0]
+        try:
+            first_node = json.loads(first_line)
+        except json.JSONDecodeError:
+            first_node = None
+
+        if isinstance(first_node, dict) and 'nodes' not in first_node and \
+                any(key in first_node for key in ('id', 'name', 'type')):
+            yield from _read_json_lines(trace_file=trace_file, buffer=buffer, path=path)
+        else:
+            yield from _read_node_array(trace_file=trace_file, buffer=buffer, path=path, chunk_size=chunk_size)
+
+
+def _read_json_lines(trace_file: TextIO, buffer: str, path: str) -> Iterator[Dict[str, Any]]:
+    # complete the last (partially read) line of the buffer
+    lines = (buffer + trace_file.readline()).split('\n')
+
+    for line_idx, line in enumerate(_chain_lines(lines=lines, trace_file=trace_file)):
+        line = line.strip()
+        if len(line) == 0:
+            continue
+
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            raise TraceError(f"Line {line_idx + 1} of trace {path} is not a json node.")
+
+
+def _chain_lines(lines: List[str], trace_file: TextIO) -> Iterator[str]:
+    yield from lines
+    yield from trace_file
+
+
+def _read_node_array(trace_file: TextIO, buffer: str, path: str, chunk_size: int) -> Iterator[Dict[str, Any]]:
+    # find the node array
+    match = _nodes_start.search(buffer)
+    while match is None:
+        chunk = trace_file.read(chunk_size)
+        if len(chunk) == 0:
+            raise TraceError(f"Trace {path} has no \"nodes\" array.")
+
+        # keep a tail, in case the key is split across chunks
+        buffer = buffer[-64:] + chunk
+        match = _nodes_start.search(buffer)
+
+    decoder = json.JSONDecoder()
+    position = match.end()
+
+    while True:
+        # skip separators, reading more if the buffer runs out
+        while True:
+            while position < len(buffer) and buffer[position] in ' \t\r\n,':
+                position += 1
+
+            if position < len(buffer):
+                break
+
+            chunk = trace_file.read(chunk_size)
+            if len(chunk) == 0:
+                raise TraceError(f"Trace {path} ends inside its \"nodes\" array.")
+            buffer, position = chunk, 0
+
+        if buffer[position] == ']':
+            return
+
+        try:
+            node, position = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            # the node continues in the next chunk
+            chunk = trace_file.read(chunk_size)
+            if len(chunk) == 0:
+                raise TraceError(f"Trace {path} has an invalid node at character {position} of its last chunk.")
+            buffer, position = buffer[position:] + chunk, 0
+            continue
+
+        if not isinstance(node, dict):
+            raise TraceError(f"Trace {path} has a node that is not a json object: {node}.")
+
+        yield node
+
+        # drop consumed nodes
+        if position > chunk_size:
+            buffer, position = buffer[position:], 0
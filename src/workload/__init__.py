@@ -4,8 +4,10 @@ LICENSE file in the root directory of this source tree.
 """
 
 from src.workload.collective import Collective
+from src.workload.compute_scaling import ComputeScaling
 from src.workload.layer import Layer
 from src.workload.phase import Phase
 from src.workload.workload import Workload
 from src.workload.workload_error import WorkloadError
 from src.workload.workload_parser import WorkloadParser
+from src.workload.workload_writer import WorkloadWriter
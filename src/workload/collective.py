@@ -15,3 +15,4 @@ class Collective(Enum):
     AllGather = auto()
     AllReduce = auto()
     AllToAll = auto()
+    PointToPoint = auto()
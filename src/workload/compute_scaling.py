@@ -0,0 +1,83 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from fnmatch import fnmatchcase
+from typing import Dict, Optional
+
+import numpy as np
+
+from src.workload.workload import Workload
+from src.workload.workload_error import WorkloadError
+
+
+class ComputeScaling:
+    """
+    ComputeScaling rescales the compute times of a parsed workload (e.g., for another NPU generation),
+    without rewriting its trace. Factors multiply:
+        - a global factor,
+        - a factor per layer type, matched by a glob pattern over layer names (e.g., 'softmax*'),
+          the first matching pattern applying,
+        - a FLOP-based factor: compute times are taken as FLOPs run at reference_tflops,
+          and rerun at target_tflops (i.e., reference_tflops / target_tflops).
+    """
+
+    def __init__(self,
+                 factor: float = 1.0,
+                 layer_factors: Optional[Dict[str, float]] = None,
+                 reference_tflops: Optional[float] = None,
+                 target_tflops: Optional[float] = None):
+        """
+        Initializer.
+
+        :param factor: global compute time scale
+        :param layer_factors: layer name pattern -> compute time scale of the matching layers
+        :param reference_tflops: throughput (in TFLOPS) of the NPU the workload trace was taken on
+        :param target_tflops: throughput (in TFLOPS) of the target NPU
+        """
+        layer_factors = layer_factors if layer_factors is not None else dict()
+
+        if factor < 0 or any(layer_factor < 0 for layer_factor in layer_factors.values()):
+            raise WorkloadError(f"Compute scaling factors ({factor}, {layer_factors}) should be non-negative.")
+
+        if (reference_tflops is None) != (target_tflops is None):
+            raise WorkloadError("Both reference and target NPU throughputs should be given for FLOP-based scaling.")
+
+        if reference_tflops is not None and (reference_tflops <= 0 or target_tflops <= 0):
+            raise WorkloadError(f"NPU throughputs ({reference_tflops}, {target_tflops}) should be positive.")
+
+        self.factor = factor
+        self.layer_factors = layer_factors
+        self.reference_tflops = reference_tflops
+        self.target_tflops = target_tflops
+
+    def get_layer_factors(self, workload: Workload) -> np.ndarray:
+        """
+        Compute time scale of each layer of the workload.
+
+        :param workload: target workload
+        :return: scale of shape (layers_count,)
+        """
+        factors = np.full(workload.layers_count, self.factor, dtype=float)
+
+        if self.reference_tflops is not None:
+            factors *= self.reference_tflops / self.target_tflops
+
+        for layer_idx, layer in enumerate(workload.layers):
+            for pattern, layer_factor in self.layer_factors.items():
+                if fnmatchcase(layer.name, pattern):
+                    factors[layer_idx] *= layer_factor
+                    break
+
+        return factors
+
+    def apply(self, workload: Workload) -> Workload:
+        """
+        Rescale the compute times of the workload.
+
+        :param workload: target workload
+        :return: copy of the workload with rescaled compute times
+        """
+        compute_times = workload.compute_times() * self.get_layer_factors(workload=workload)[:, np.newaxis]
+        return workload.with_compute_times(compute_times=compute_times)
@@ -4,6 +4,7 @@ LICENSE file in the root directory of this source tree.
 """
 
 from src.workload.phase import Phase
+from src.workload.workload_error import WorkloadError
 
 
 class Layer:
@@ -15,14 +16,24 @@ class Layer:
     def __init__(self,
                  forward: Phase,
                  input_grad: Phase,
-                 weight_grad: Phase):
+                 weight_grad: Phase,
+                 stage: int = 0,
+                 name: str = ''):
         """
         Initializer
 
         :param forward: forward phase of the layer
         :param input_grad: input gradient phase of the layer
         :param weight_grad: weight gradient phase of the layer
+        :param stage: pipeline stage the layer belongs to
+        :param name: name of the layer (e.g., softmax1)
         """
         self.forward = forward
         self.input_grad = input_grad
         self.weight_grad = weight_grad
+        self.stage = stage
+        self.name = name
+
+        # check validity
+        if self.stage < 0:
+            raise WorkloadError(f"Pipeline stage given ({self.stage}) should be >= 0")
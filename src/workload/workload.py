@@ -5,7 +5,11 @@ LICENSE file in the root directory of this source tree.
 
 from typing import List
 
+import numpy as np
+
 from src.workload.layer import Layer
+from src.workload.phase import Phase
+from src.workload.workload_error import WorkloadError
 
 
 class Workload:
@@ -14,11 +18,67 @@ class Workload:
     such as communication type, size, or computation times.
     """
 
-    def __init__(self, layers: List[Layer]):
+    def __init__(self, layers: List[Layer], name: str = ''):
         """
         Initializer.
 
         :param layers: all layers of the workload.
+        :param name: name of the workload (e.g., GPT_3)
         """
         self.layers = layers
         self.layers_count = len(layers)
+        self.name = name
+
+        # number of pipeline stages
+        self.stages_count = max((layer.stage for layer in layers), default=0) + 1
+
+    def compute_times(self) -> np.ndarray:
+        """
+        Compute time of each [layer, phase].
+
+        :return: compute times of shape (layers_count, 3)
+        """
+        return np.array([[layer.forward.compute_time, layer.input_grad.compute_time, layer.weight_grad.compute_time]
+                         for layer in self.layers], dtype=float).reshape(self.layers_count, 3)
+
+    def with_compute_times(self, compute_times: np.ndarray) -> 'Workload':
+        """
+        Copy of the workload with the given compute times, and the same communications.
+
+        :param compute_times: compute time of each [layer, phase], of shape (layers_count, 3)
+        :return: workload with the given compute times
+        """
+        compute_times = np.asarray(compute_times, dtype=float)
+        if compute_times.shape != (self.layers_count, 3):
+            raise WorkloadError(f"Compute times of shape {compute_times.shape} don't match "
+                                f"the workload of {self.layers_count} layers.")
+
+        layers = [Layer(forward=Phase(compute_time=float(compute_times[layer_idx, 0]),
+                                      comm_type=layer.forward.comm_type, comm_size=layer.forward.comm_size),
+                        input_grad=Phase(compute_time=float(compute_times[layer_idx, 1]),
+                                         comm_type=layer.input_grad.comm_type, comm_size=layer.input_grad.comm_size),
+                        weight_grad=Phase(compute_time=float(compute_times[layer_idx, 2]),
+                                          comm_type=layer.weight_grad.comm_type,
+                                          comm_size=layer.weight_grad.comm_size),
+                        stage=layer.stage, name=layer.name)
+                  for layer_idx, layer in enumerate(self.layers)]
+
+        return Workload(layers=layers, name=self.name)
+
+    def scaled(self, comm_scale: float = 1.0, compute_scale: float = 1.0) -> 'Workload':
+        """
+        Copy of the workload with every communication size and compute time scaled.
+
+        :param comm_scale: scale of every communication size
+        :param compute_scale: scale of every compute time
+        :return: scaled workload
+        """
+        def scale_phase(phase: Phase) -> Phase:
+            return Phase(compute_time=phase.compute_time * compute_scale, comm_type=phase.comm_type,
+                         comm_size=phase.comm_size * comm_scale)
+
+        layers = [Layer(forward=scale_phase(layer.forward), input_grad=scale_phase(layer.input_grad),
+                        weight_grad=scale_phase(layer.weight_grad), stage=layer.stage, name=layer.name)
+                  for layer in self.layers]
+
+        return Workload(layers=layers, name=self.name)
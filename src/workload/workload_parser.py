@@ -46,14 +46,18 @@ class WorkloadParser:
             layer = WorkloadParser.parse_layer_str(layer_str)
             layers.append(layer)
 
+        # workload is named after its file (e.g., ./inputs/workload/GPT_3.txt -> GPT_3)
+        name = os.path.splitext(os.path.basename(path))[0]
+
         # create and return workload
-        return Workload(layers=layers)
+        return Workload(layers=layers, name=name)
 
     @staticmethod
     def parse_layer_str(layer_str: str) -> Layer:
         """
         Parse a given string with layer info (in ASTRA-sim1.0 format)
         and create a Layer instance from it.
+        An optional 13th column assigns the layer to a pipeline stage.
 
         :param layer_str: string with layer information (in ASTRA-sim1.0 format)
         :return: Layer instance
@@ -61,11 +65,16 @@ class WorkloadParser:
         # split layer info
         layer_info = layer_str.strip().split()
 
-        # assert it has 12 info (ASTRA-sim1.0 workload format)
-        if len(layer_info) != 12:
+        # assert it has 12 info (ASTRA-sim1.0 workload format), plus an optional pipeline stage
+        if len(layer_info) not in (12, 13):
             raise WorkloadError(
                 f"Make sure layer ({layer_str.strip()}) follows the ASTRA-sim1.0 workload representation format.")
 
+        try:
+            stage = int(layer_info[12]) if len(layer_info) == 13 else 0
+        except ValueError:
+            raise WorkloadError(f"Invalid pipeline stage: {layer_info[12]}.")
+
         # create layer phases
         forward_phase = WorkloadParser.create_phase(info=layer_info[2:5])
         input_grad_phase = WorkloadParser.create_phase(info=layer_info[5:8])
@@ -74,7 +83,9 @@ class WorkloadParser:
         # create and return layer
         layer = Layer(forward=forward_phase,
                       input_grad=input_grad_phase,
-                      weight_grad=weight_grad_phase)
+                      weight_grad=weight_grad_phase,
+                      stage=stage,
+                      name=layer_info[0])
         return layer
 
     @staticmethod
@@ -105,6 +116,7 @@ class WorkloadParser:
         - "ALLGATHER" -> AllGather
         - "ALLREDUCE" -> AllReduce
         - "ALLTOALL" -> AllToAll
+        - "P2P" -> PointToPoint
 
         name is case-insensitive, but shouldn't have hyphens (e.g., "All-Reduce" wouldn't work).
 
@@ -128,5 +140,8 @@ class WorkloadParser:
         if query == 'alltoall':
             return Collective.AllToAll
 
+        if query == 'p2p':
+            return Collective.PointToPoint
+
         # shouldn't reach here
         raise WorkloadError(f"{name} is not a valid communication type.")
@@ -0,0 +1,59 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+from typing import List
+
+from src.workload.collective import Collective
+from src.workload.phase import Phase
+from src.workload.workload import Workload
+
+# collective type -> communication name of the ASTRA-sim1.0 workload format
+_comms_names = {Collective.NoComm: 'NONE', Collective.ReduceScatter: 'REDUCESCATTER', Collective.AllGather: 'ALLGATHER',
+                Collective.AllReduce: 'ALLREDUCE', Collective.AllToAll: 'ALLTOALL', Collective.PointToPoint: 'P2P'}
+
+
+class WorkloadWriter:
+    """
+    WorkloadWriter helps write a workload in the ASTRA-sim1.0 format WorkloadParser reads,
+    e.g., to keep an imported workload instead of importing it again.
+    """
+
+    def __init__(self, update_time: int = 10):
+        """
+        WorkloadWriter initializer.
+
+        :param update_time: weight update time of each layer (the 12th column, unused by LIBRA)
+        """
+        self.update_time = update_time
+
+    def write(self, workload: Workload, path: str) -> None:
+        """
+        Write the workload, with the pipeline stage column if it has more than one stage.
+
+        :param workload: workload to write
+        :param path: path to write the workload to
+        """
+        with open(path, 'w') as workload_file:
+            for layer in workload.layers:
+                # layer names can't have whitespaces
+                columns = ['_'.join(layer.name.split()) if len(layer.name.strip()) > 0 else 'layer', '-1']
+                for phase in (layer.forward, layer.input_grad, layer.weight_grad):
+                    columns.extend(WorkloadWriter._phase_columns(phase=phase))
+                columns.append(str(self.update_time))
+
+                if workload.stages_count > 1:
+                    columns.append(str(layer.stage))
+
+                workload_file.write(' '.join(columns) + '\n')
+
+    @staticmethod
+    def _phase_columns(phase: Phase) -> List[str]:
+        return [WorkloadWriter._format_number(value=phase.compute_time), _comms_names[phase.comm_type],
+                WorkloadWriter._format_number(value=phase.comm_size)]
+
+    @staticmethod
+    def _format_number(value: float) -> str:
+        # integral values without a decimal point, others without losing precision
+        return str(int(value)) if float(value).is_integer() else repr(float(value))
@@ -0,0 +1,25 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+import pytest
+
+from src.cost_model import CostModel, CostModelError
+
+
+@pytest.mark.parametrize('radix', [1, 2, 3])
+def test_switch_radix_too_small_is_rejected(radix: int) -> None:
+    # a folded Clos of devices with fewer than 4 ports never grows, so counting its devices wouldn't end
+    with pytest.raises(CostModelError):
+        CostModel().set_switch_device_cost(cost_dim='InterNode', cost=30000, radix=radix)
+
+
+@pytest.mark.parametrize('ports_count, radix, devices_count', [
+    (64, None, 1),
+    (64, 64, 1),
+    (65, 64, 3 + 2),  # 2 levels: 3 devices below a top of 2
+    (128, 4, 5 * 64 + 32),  # 6 levels: 5 of 64 devices below a top of 32
+])
+def test_switch_devices_count(ports_count: int, radix: int, devices_count: int) -> None:
+    assert CostModel._get_switch_devices_count(ports_count=ports_count, radix=radix) == devices_count
@@ -0,0 +1,49 @@
+"""
+This source code is licensed under the MIT license found in the
+LICENSE file in the root directory of this source tree.
+"""
+
+import pytest
+
+from inputs.training_loop import training_loops
+from src.communicator import CommunicatorParser
+from src.cost_model import CostModelParser
+from src.evaluator import Evaluator
+from src.model import Model, SolverObjective, WorkloadAggregation, WorkloadEntry
+from src.network import NetworkParser
+from src.workload import Workload, WorkloadParser
+
+
+def _workload(name: str, compute_time: int) -> Workload:
+    # a few layers, each all-reducing its weight gradient
+    layers = [WorkloadParser.parse_layer_str(f"layer_{i} -1 {compute_time} NONE 0 {compute_time} NONE 0 "
+                                             f"{compute_time} ALLREDUCE {(i + 1) * 1048576} 100")
+              for i in range(4)]
+    return Workload(layers=layers, name=name)
+
+
+@pytest.mark.parametrize('training_loop', ['no_overlap', 'overlap', 'bucketed_overlap'])
+@pytest.mark.parametrize('aggregation', [WorkloadAggregation.MaxE2ETime, WorkloadAggregation.MaxSlowdown])
+def test_workload_e2e_times_match_evaluator(training_loop: str, aggregation: WorkloadAggregation) -> None:
+    # only the worst workload is pushed onto its e2e time by a max aggregation, the others are reported exactly too
+    network = NetworkParser().parse(path='./inputs/network/4d_network.yml')
+    communicator = CommunicatorParser().parse(path='./inputs/communicator/ResNet_50_4d.yml')
+
+    Model.reset_model()
+    Model.initialize_model(network=network, cost_model=CostModelParser().parse(
+        path='./inputs/cost_model/4d_cost_model.yml'))
+    Model.apply_constraint(constraint=lambda: Model._gp_model.addLConstr(Model._bw.sum() <= 500), name='total_bw')
+
+    entries = [WorkloadEntry(workload=_workload(name='fast', compute_time=1000), communicator=communicator,
+                             training_loop=training_loops[training_loop], sla=1e5),
+               WorkloadEntry(workload=_workload(name='slow', compute_time=100000), communicator=communicator,
+                             training_loop=training_loops[training_loop], sla=1e6)]
+    Model.add_workloads(entries=entries)
+    result = Model.solve(objective=SolverObjective.PerfOpt, aggregation=aggregation)
+
+    for entry in entries:
+        evaluator = Evaluator(network=network, workload=entry.workload, communicator=entry.communicator,
+                              training_loop=entry.training_loop)
+        assert result.workload_e2e_times[entry.name] == pytest.approx(evaluator.e2e_time(bw=result.bw), rel=1e-6)
+
+    assert result.e2e_time == pytest.approx(sum(result.workload_e2e_times.values()), rel=1e-6)